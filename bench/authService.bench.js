@@ -0,0 +1,167 @@
+// authService 벤치마크 정의 (bench/run.js가 환경 변수 설정 후 로드)
+const {
+  registerUser,
+  loginUser,
+  generateTokenPair,
+  verifyAccessToken,
+  verifyAndRefreshToken,
+  revokeAllUserTokens,
+  getUserById,
+} = require("../src/services/authService");
+const { createDynamoAccess, PROJECTIONS } = require("../src/services/dynamoAccess");
+const { hashPassword } = require("../src/services/passwordHasher");
+const { createLoginWriteBehind } = require("../src/services/loginWriteBehind");
+const { TABLES } = require("../src/config/constants");
+const { createFakeDynamoClient } = require("./fakeDynamoClient");
+
+const PASSWORD = "bench-password";
+const USER_COUNT = 64;
+const TOKENS_PER_USER = 5;
+
+/**
+ * 가짜 클라이언트에 사용자 USER_COUNT명 생성 (현재 bcrypt cost로 해시)
+ * @param {Object} client
+ * @returns {Promise<Object[]>} 생성된 사용자
+ */
+async function seedUsers(client) {
+  const passwordHash = await hashPassword(PASSWORD);
+  const users = Array.from({ length: USER_COUNT }, (_, i) => ({
+    user_id: `bench-user-${i}`,
+    username: `bench_user_${i}`,
+    password_hash: passwordHash,
+    created_at: new Date().toISOString(),
+    last_login_at: new Date().toISOString(),
+    is_active: true,
+  }));
+  client.seed(TABLES.USERS, users);
+  return users;
+}
+
+/**
+ * 활성 refresh token 항목 (revokeAllUserTokens 대상)
+ * @param {string} userId
+ * @returns {Object[]}
+ */
+function activeTokenRecords(userId) {
+  return Array.from({ length: TOKENS_PER_USER }, (_, i) => ({
+    token_id: `${userId}-token-${i}`,
+    user_id: userId,
+    token_hash: "bench",
+    expires_at: Math.floor(Date.now() / 1000) + 3600,
+    created_at: new Date().toISOString(),
+    is_revoked: false,
+  }));
+}
+
+/**
+ * 벤치마크 목록
+ * @param {Object} clientOptions - createFakeDynamoClient 옵션 (지연 등)
+ * @returns {Object[]}
+ */
+function createBenchmarks(clientOptions) {
+  return [
+    {
+      name: "registerUser",
+      // bcrypt 해시가 대부분이라 반복 수를 줄임
+      iterations: 40,
+      warmup: 5,
+      allocationIterations: 10,
+      async setup() {
+        return { client: createFakeDynamoClient(clientOptions), next: 0 };
+      },
+      op: (ctx) => registerUser(`bench_new_${ctx.next++}`, PASSWORD, ctx.client),
+    },
+    {
+      name: "loginUser",
+      iterations: 40,
+      warmup: 5,
+      allocationIterations: 10,
+      async setup() {
+        const client = createFakeDynamoClient(clientOptions);
+        const users = await seedUsers(client);
+        // 운영과 같이 last_login_at은 write-behind 버퍼로 (플러시는 측정하지 않음)
+        return { client, users, recorder: createLoginWriteBehind({ dynamoDBClient: client }) };
+      },
+      op: (ctx, i) => loginUser(ctx.users[i % USER_COUNT].username, PASSWORD, ctx.client, ctx.recorder),
+    },
+    {
+      name: "generateTokenPair",
+      async setup() {
+        const client = createFakeDynamoClient(clientOptions);
+        return { client, users: await seedUsers(client) };
+      },
+      op: (ctx, i) => {
+        const user = ctx.users[i % USER_COUNT];
+        return generateTokenPair(user.user_id, user.username, ctx.client);
+      },
+    },
+    {
+      name: "verifyAccessToken",
+      async setup() {
+        const client = createFakeDynamoClient(clientOptions);
+        const users = await seedUsers(client);
+        const tokens = [];
+        for (const user of users) {
+          tokens.push((await generateTokenPair(user.user_id, user.username, client)).accessToken);
+        }
+        return { tokens };
+      },
+      op: async (ctx, i) => verifyAccessToken(ctx.tokens[i % ctx.tokens.length]),
+    },
+    {
+      name: "verifyAndRefreshToken",
+      async setup() {
+        const client = createFakeDynamoClient(clientOptions);
+        const users = await seedUsers(client);
+        // refresh token은 한 번만 쓸 수 있으므로 사용자별로 새로 받은 토큰을 이어서 사용
+        const chains = [];
+        for (const user of users) {
+          chains.push((await generateTokenPair(user.user_id, user.username, client)).refreshToken);
+        }
+        return { client, chains };
+      },
+      op: async (ctx, i) => {
+        const slot = i % ctx.chains.length;
+        const tokens = await verifyAndRefreshToken(ctx.chains[slot], ctx.client);
+        ctx.chains[slot] = tokens.refreshToken;
+      },
+    },
+    {
+      name: "revokeAllUserTokens",
+      async setup() {
+        const client = createFakeDynamoClient(clientOptions);
+        return { client, users: await seedUsers(client) };
+      },
+      op: (ctx, i) => {
+        // 매번 활성 토큰 TOKENS_PER_USER개를 다시 채워 실제 폐기 경로를 측정
+        const userId = ctx.users[i % USER_COUNT].user_id;
+        ctx.client.seed(TABLES.REFRESH_TOKENS, activeTokenRecords(userId));
+        return revokeAllUserTokens(userId, ctx.client);
+      },
+    },
+    {
+      // 꼬리 지연 비교 기준: SDK 클라이언트를 그대로 사용
+      name: "getUserById",
+      async setup() {
+        const client = createFakeDynamoClient(clientOptions);
+        return { client, users: await seedUsers(client) };
+      },
+      op: (ctx, i) => getUserById(ctx.users[i % USER_COUNT].user_id, ctx.client, PROJECTIONS.AUTH_USER),
+    },
+    {
+      // 같은 조회를 접근 계층(시도별 타임아웃 + 헤지 읽기)으로: --slow-probability와 함께 p99 비교
+      name: "getUserByIdHedged",
+      async setup() {
+        const client = createFakeDynamoClient(clientOptions);
+        const users = await seedUsers(client);
+        // ddb/op에는 헤지로 보낸 중복 요청도 포함되도록 하네스에는 원래 클라이언트를 노출
+        return { client, access: createDynamoAccess(client, { HEDGE_ENABLED: true }), users };
+      },
+      op: (ctx, i) => getUserById(ctx.users[i % USER_COUNT].user_id, ctx.access, PROJECTIONS.AUTH_USER),
+    },
+  ];
+}
+
+module.exports = {
+  createBenchmarks,
+};
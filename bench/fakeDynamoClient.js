@@ -0,0 +1,269 @@
+const { TABLES } = require("../src/config/constants");
+
+// 테이블별 파티션 키와 GSI (AWS 테이블 정의와 동일)
+const SCHEMAS = {
+  [TABLES.USERS]: { key: "user_id", indexes: { "username-index": "username" } },
+  [TABLES.REFRESH_TOKENS]: { key: "token_id", indexes: { "user-id-index": "user_id" } },
+};
+
+// "a = :a", "attribute_not_exists(a)", "attribute_exists(a)" 를 AND/OR로 연결한 단순 조건식만 지원
+const COMPARISON = /^(#?\w+)\s*=\s*(:\w+)$/;
+const EXISTS = /^attribute_(not_)?exists\((#?\w+)\)$/;
+
+function resolveName(name, names = {}) {
+  return name.startsWith("#") ? names[name] : name;
+}
+
+/**
+ * 조건식/필터식 평가
+ * @param {string} expression
+ * @param {Object|undefined} item
+ * @param {Object} input - ExpressionAttributeNames/Values를 포함한 커맨드 입력
+ * @returns {boolean}
+ */
+function evaluate(expression, item, input) {
+  if (!expression) {
+    return true;
+  }
+  return expression.split(/\s+OR\s+/).some((clause) =>
+    clause.split(/\s+AND\s+/).every((term) => {
+      const trimmed = term.trim().replace(/^\((.*)\)$/, "$1");
+      const exists = trimmed.match(EXISTS);
+      if (exists) {
+        const present = Boolean(item) && item[resolveName(exists[2], input.ExpressionAttributeNames)] !== undefined;
+        return exists[1] ? !present : present;
+      }
+      const comparison = trimmed.match(COMPARISON);
+      if (!comparison) {
+        throw new Error(`Unsupported expression in fake client: ${trimmed}`);
+      }
+      return Boolean(item) &&
+        item[resolveName(comparison[1], input.ExpressionAttributeNames)] === input.ExpressionAttributeValues[comparison[2]];
+    })
+  );
+}
+
+function conditionalCheckFailed() {
+  const error = new Error("The conditional request failed");
+  error.name = "ConditionalCheckFailedException";
+  return error;
+}
+
+/**
+ * authService가 쓰는 DynamoDB Document Client 커맨드를 메모리에서 처리하는 가짜 클라이언트
+ *
+ * GSI는 해시 인덱스로 유지해 조회 비용이 데이터 양과 무관하도록 한다
+ * (하네스 비용이 측정 대상 함수의 CPU 시간에 섞이지 않도록).
+ * @param {Object} [options]
+ * @param {number} [options.latencyMs=0] - 요청당 지연 (0이면 마이크로태스크 한 번만 양보)
+ * @param {number} [options.jitterMs=0] - 지연에 더할 무작위 범위
+ * @param {number} [options.slowProbability=0] - 느린 요청 비율 (꼬리 지연 재현)
+ * @param {number} [options.slowMs=0] - 느린 요청에 더할 지연
+ * @returns {{send: Function, seed: Function, calls: Object, resetCalls: Function, tables: Map}}
+ */
+function createFakeDynamoClient({ latencyMs = 0, jitterMs = 0, slowProbability = 0, slowMs = 0 } = {}) {
+  const tables = new Map();
+  const indexes = new Map();
+  const calls = {};
+
+  function table(name) {
+    if (!tables.has(name)) {
+      tables.set(name, new Map());
+      indexes.set(name, {});
+      for (const [indexName, attribute] of Object.entries((SCHEMAS[name] || {}).indexes || {})) {
+        indexes.get(name)[indexName] = { attribute, values: new Map() };
+      }
+    }
+    return tables.get(name);
+  }
+
+  function keyOf(tableName, keyOrItem) {
+    return keyOrItem[SCHEMAS[tableName].key];
+  }
+
+  function unindex(tableName, item) {
+    for (const index of Object.values(indexes.get(tableName))) {
+      const bucket = index.values.get(item[index.attribute]);
+      if (bucket) {
+        bucket.delete(keyOf(tableName, item));
+      }
+    }
+  }
+
+  function put(tableName, item) {
+    const rows = table(tableName);
+    const key = keyOf(tableName, item);
+    if (rows.has(key)) {
+      unindex(tableName, rows.get(key));
+    }
+    rows.set(key, item);
+    for (const index of Object.values(indexes.get(tableName))) {
+      if (item[index.attribute] === undefined) {
+        continue;
+      }
+      if (!index.values.has(item[index.attribute])) {
+        index.values.set(item[index.attribute], new Set());
+      }
+      index.values.get(item[index.attribute]).add(key);
+    }
+  }
+
+  function remove(tableName, key) {
+    const rows = table(tableName);
+    const id = keyOf(tableName, key);
+    if (rows.has(id)) {
+      unindex(tableName, rows.get(id));
+      rows.delete(id);
+    }
+  }
+
+  function update(input) {
+    const current = table(input.TableName).get(keyOf(input.TableName, input.Key));
+    const next = { ...(current || input.Key) };
+    const assignments = input.UpdateExpression.replace(/^SET\s+/, "").split(/\s*,\s*/);
+    for (const assignment of assignments) {
+      const [name, value] = assignment.split(/\s*=\s*/);
+      next[resolveName(name, input.ExpressionAttributeNames)] = input.ExpressionAttributeValues[value];
+    }
+    put(input.TableName, next);
+  }
+
+  function check(input, item) {
+    if (!evaluate(input.ConditionExpression, item, input)) {
+      throw conditionalCheckFailed();
+    }
+  }
+
+  function current(input) {
+    return table(input.TableName).get(keyOf(input.TableName, input.Key || input.Item));
+  }
+
+  const handlers = {
+    PutCommand(input) {
+      check(input, current(input));
+      put(input.TableName, { ...input.Item });
+      return {};
+    },
+    GetCommand(input) {
+      const item = current(input);
+      return { Item: item ? { ...item } : undefined };
+    },
+    UpdateCommand(input) {
+      check(input, current(input));
+      update(input);
+      return {};
+    },
+    DeleteCommand(input) {
+      check(input, current(input));
+      remove(input.TableName, input.Key);
+      return {};
+    },
+    QueryCommand(input) {
+      const index = indexes.get(input.TableName) && indexes.get(input.TableName)[input.IndexName];
+      const [, , placeholder] = input.KeyConditionExpression.match(COMPARISON);
+      const rows = table(input.TableName);
+      const keys = index
+        ? index.values.get(input.ExpressionAttributeValues[placeholder]) || []
+        : [input.ExpressionAttributeValues[placeholder]];
+      const items = [];
+      for (const key of keys) {
+        const item = rows.get(key);
+        if (item && evaluate(input.FilterExpression, item, input)) {
+          items.push({ ...item });
+        }
+      }
+      return { Items: items, Count: items.length };
+    },
+    BatchGetCommand(input) {
+      const responses = {};
+      for (const [tableName, request] of Object.entries(input.RequestItems)) {
+        responses[tableName] = request.Keys
+          .map((key) => table(tableName).get(keyOf(tableName, key)))
+          .filter(Boolean)
+          .map((item) => ({ ...item }));
+      }
+      return { Responses: responses, UnprocessedKeys: {} };
+    },
+    BatchWriteCommand(input) {
+      for (const [tableName, requests] of Object.entries(input.RequestItems)) {
+        for (const request of requests) {
+          if (request.PutRequest) put(tableName, { ...request.PutRequest.Item });
+          if (request.DeleteRequest) remove(tableName, request.DeleteRequest.Key);
+        }
+      }
+      return { UnprocessedItems: {} };
+    },
+    TransactWriteCommand(input) {
+      // 모든 조건을 먼저 확인한 뒤 한꺼번에 적용 (실제 트랜잭션과 같은 원자성)
+      const reasons = input.TransactItems.map((entry) => {
+        const [operation] = Object.values(entry);
+        return evaluate(operation.ConditionExpression, current(operation), operation)
+          ? { Code: "None" }
+          : { Code: "ConditionalCheckFailed" };
+      });
+      if (reasons.some((reason) => reason.Code !== "None")) {
+        const error = new Error("Transaction cancelled");
+        error.name = "TransactionCanceledException";
+        error.CancellationReasons = reasons;
+        throw error;
+      }
+      for (const entry of input.TransactItems) {
+        if (entry.Put) put(entry.Put.TableName, { ...entry.Put.Item });
+        if (entry.Update) update(entry.Update);
+        if (entry.Delete) remove(entry.Delete.TableName, entry.Delete.Key);
+      }
+      return {};
+    },
+  };
+
+  /**
+   * 지연 대기 (abortSignal이 오면 SDK처럼 AbortError로 중단)
+   * @param {number} ms
+   * @param {AbortSignal} [signal]
+   * @returns {Promise<void>}
+   */
+  function wait(ms, signal) {
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(resolve, ms);
+      if (signal) {
+        signal.addEventListener("abort", () => {
+          clearTimeout(timer);
+          const error = new Error("Request aborted");
+          error.name = "AbortError";
+          reject(error);
+        }, { once: true });
+      }
+    });
+  }
+
+  async function send(command, options = {}) {
+    const name = command.constructor.name;
+    calls[name] = (calls[name] || 0) + 1;
+    const handler = handlers[name];
+    if (!handler) {
+      throw new Error(`Unsupported command in fake client: ${name}`);
+    }
+
+    const delay = latencyMs
+      + (jitterMs ? Math.random() * jitterMs : 0)
+      + (slowProbability && Math.random() < slowProbability ? slowMs : 0);
+    if (delay > 0) {
+      await wait(delay, options.abortSignal);
+    } else {
+      await Promise.resolve();
+    }
+    return handler(command.input);
+  }
+
+  return {
+    send,
+    tables,
+    calls,
+    seed: (tableName, items) => items.forEach((item) => put(tableName, { ...item })),
+    resetCalls: () => Object.keys(calls).forEach((name) => delete calls[name]),
+  };
+}
+
+module.exports = {
+  createFakeDynamoClient,
+};
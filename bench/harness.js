@@ -0,0 +1,233 @@
+const inspector = require("inspector");
+const { performance } = require("perf_hooks");
+
+/**
+ * inspector 세션 메서드 호출
+ * @param {inspector.Session} session
+ * @param {string} method
+ * @param {Object} [params]
+ * @returns {Promise<Object>}
+ */
+function post(session, method, params = {}) {
+  return new Promise((resolve, reject) => {
+    session.post(method, params, (error, result) => (error ? reject(error) : resolve(result)));
+  });
+}
+
+/**
+ * 정렬된 배열의 분위수
+ * @param {number[]} sorted
+ * @param {number} q
+ * @returns {number}
+ */
+function quantile(sorted, q) {
+  if (sorted.length === 0) {
+    return 0;
+  }
+  return sorted[Math.min(Math.floor(q * sorted.length), sorted.length - 1)];
+}
+
+/**
+ * 동시성 concurrency로 op를 iterations번 실행
+ * @param {Function} op - (index) => Promise
+ * @param {number} iterations
+ * @param {number} concurrency
+ * @param {number[]} [latencies] - 지정하면 op별 소요 시간(ms) 기록
+ */
+async function runOps(op, iterations, concurrency, latencies) {
+  let next = 0;
+  const worker = async () => {
+    while (next < iterations) {
+      const index = next++;
+      const startedAt = latencies ? performance.now() : 0;
+      await op(index);
+      if (latencies) {
+        latencies.push(performance.now() - startedAt);
+      }
+    }
+  };
+  await Promise.all(Array.from({ length: Math.min(concurrency, iterations) }, worker));
+}
+
+/**
+ * 이벤트 루프에 양보
+ * @returns {Promise<void>}
+ */
+function yieldToLoop() {
+  return new Promise((resolve) => setImmediate(resolve));
+}
+
+/**
+ * op별 이벤트 루프 블로킹 측정 (양보 없이 연속 실행된 가장 긴 구간, ms)
+ *
+ * op를 하나씩 실행하면서 setImmediate 틱을 이어 걸고, 틱 사이 간격을 performance.now()로 잰다.
+ * 가짜 DynamoDB 지연이 0이면 op 전체가 마이크로태스크로 이어져 한 번도 양보하지 않으므로
+ * 타이머 기반 샘플링(monitorEventLoopDelay)은 아무것도 잡지 못하지만, 이 방식은 그 구간 전체를 블로킹으로 센다.
+ * 틱이 계속 걸려 있어 루프가 바쁘게 돌기 때문에 처리량/CPU 측정과 분리해 실행한다.
+ * @param {Function} op - (index) => Promise
+ * @param {number} iterations
+ * @returns {Promise<number[]>} op별 최대 블로킹 시간 (ms, 오름차순)
+ */
+async function measureBlocking(op, iterations) {
+  const blocking = [];
+  for (let index = 0; index < iterations; index++) {
+    await yieldToLoop();
+    let done = false;
+    let longest = 0;
+    let last = performance.now();
+    const tick = () => {
+      const now = performance.now();
+      longest = Math.max(longest, now - last);
+      last = now;
+      if (!done) {
+        setImmediate(tick);
+      }
+    };
+    setImmediate(tick);
+    await op(index);
+    done = true;
+    // 마지막 틱 이후 op가 끝날 때까지의 구간
+    blocking.push(Math.max(longest, performance.now() - last));
+  }
+  return blocking.sort((a, b) => a - b);
+}
+
+/**
+ * 샘플링 힙 프로파일러로 op당 할당 바이트 측정 (GC로 회수된 객체 포함)
+ * @param {Function} op
+ * @param {number} iterations
+ * @returns {Promise<number>} op당 할당 바이트
+ */
+async function measureAllocations(op, iterations) {
+  const session = new inspector.Session();
+  session.connect();
+  try {
+    await post(session, "HeapProfiler.enable");
+    await post(session, "HeapProfiler.startSampling", {
+      samplingInterval: 512,
+      includeObjectsCollectedByMajorGC: true,
+      includeObjectsCollectedByMinorGC: true,
+    });
+    await runOps(op, iterations, 1);
+    const { profile } = await post(session, "HeapProfiler.stopSampling");
+
+    let total = 0;
+    const walk = (node) => {
+      total += node.selfSize;
+      node.children.forEach(walk);
+    };
+    walk(profile.head);
+    return total / iterations;
+  } finally {
+    session.disconnect();
+  }
+}
+
+/**
+ * 벤치마크 하나 실행
+ *
+ * 1. 워밍업 (JIT 최적화)
+ * 2. 측정: 처리량, op당 CPU 시간, 지연 분포
+ * 3. 이벤트 루프 블로킹(한 번에 양보 없이 실행된 최대 시간)과 할당량: 각각 별도 실행에서 측정
+ *    (측정 오버헤드가 2에 섞이지 않도록)
+ * @param {Object} benchmark - { name, setup: async () => ctx, op: (ctx, index) => Promise, teardown? }
+ * @param {Object} options - { iterations, warmup, concurrency, allocationIterations }
+ * @returns {Promise<Object>} 결과
+ */
+async function runBenchmark(benchmark, { iterations, warmup, concurrency, allocationIterations }) {
+  const context = await benchmark.setup();
+  const op = (index) => benchmark.op(context, index);
+  const count = benchmark.iterations || iterations;
+
+  try {
+    await runOps(op, benchmark.warmup || warmup, concurrency);
+    if (context.client) {
+      context.client.resetCalls();
+    }
+
+    const latencies = [];
+    const cpuBefore = process.cpuUsage();
+    const startedAt = performance.now();
+
+    await runOps(op, count, concurrency, latencies);
+
+    const elapsedMs = performance.now() - startedAt;
+    const cpu = process.cpuUsage(cpuBefore);
+
+    const dynamoCalls = context.client
+      ? Object.values(context.client.calls).reduce((sum, value) => sum + value, 0)
+      : 0;
+    const sampleIterations = Math.min(benchmark.allocationIterations || allocationIterations, count);
+    const blocking = await measureBlocking(op, sampleIterations);
+    const bytesPerOp = await measureAllocations(op, sampleIterations);
+
+    latencies.sort((a, b) => a - b);
+
+    return {
+      name: benchmark.name,
+      iterations: count,
+      opsPerSec: count / (elapsedMs / 1000),
+      cpuUsPerOp: (cpu.user + cpu.system) / count,
+      bytesPerOp,
+      latencyP50Ms: quantile(latencies, 0.5),
+      latencyP99Ms: quantile(latencies, 0.99),
+      blockingP99Ms: quantile(blocking, 0.99),
+      blockingMaxMs: blocking.length ? blocking[blocking.length - 1] : 0,
+      dynamoCallsPerOp: dynamoCalls / count,
+    };
+  } finally {
+    if (benchmark.teardown) {
+      await benchmark.teardown(context);
+    }
+  }
+}
+
+/**
+ * 기준선 대비 비교 및 예산 확인
+ *
+ * - 상대 예산(tolerance): 기준선 대비 허용 악화율. 처리량은 감소, 나머지는 증가가 악화
+ * - 절대 예산(max): 기준선과 무관한 상한 (예: 토큰 검증은 이벤트 루프를 5ms 이상 막으면 안 됨)
+ * @param {Object} result - runBenchmark 결과
+ * @param {Object|undefined} baseline - 같은 함수의 기준선 결과
+ * @param {Object} budgets - bench/budgets.json
+ * @returns {{deltas: Object, violations: string[]}}
+ */
+function checkBudget(result, baseline, budgets) {
+  const override = (budgets.functions || {})[result.name] || {};
+  const tolerance = { ...budgets.tolerance, ...(override.tolerance || {}) };
+  const limits = { ...(budgets.max || {}), ...(override.max || {}) };
+  const deltas = {};
+  const violations = [];
+
+  if (baseline) {
+    for (const [metric, allowed] of Object.entries(tolerance)) {
+      const before = baseline[metric];
+      if (!before) {
+        continue;
+      }
+      const change = (result[metric] - before) / before;
+      deltas[metric] = change;
+      const worse = metric === "opsPerSec" ? -change : change;
+      if (worse > allowed) {
+        violations.push(
+          `${metric} ${change >= 0 ? "+" : ""}${(change * 100).toFixed(1)}% vs baseline (budget ${(allowed * 100).toFixed(0)}%)`
+        );
+      }
+    }
+  }
+
+  for (const [metric, limit] of Object.entries(limits)) {
+    if (result[metric] > limit) {
+      violations.push(`${metric} ${result[metric].toFixed(2)} exceeds limit ${limit}`);
+    }
+  }
+
+  return { deltas, violations };
+}
+
+module.exports = {
+  runBenchmark,
+  measureBlocking,
+  checkBudget,
+  quantile,
+};
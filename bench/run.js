@@ -0,0 +1,184 @@
+#!/usr/bin/env node
+/**
+ * authService 마이크로 벤치마크 실행
+ *
+ *   npm run bench                          # 측정 + 기준선/예산 비교 (위반 시 exit 1)
+ *   npm run bench -- --filter login        # 이름에 login이 들어간 벤치마크만
+ *   npm run bench -- --latency-ms 5        # 가짜 DynamoDB 지연 5ms
+ *   npm run bench -- --filter getUserById --latency-ms 2 --slow-probability 0.02 --slow-ms 50
+ *                                          # 요청 2%에 50ms 꼬리 지연 (헤지 읽기 p99 비교)
+ *   npm run bench:update-baseline          # 현재 결과를 bench/baseline.json에 저장
+ *
+ * 환경 변수: BENCH_HASH_COST (기본 10, 운영 기본 cost와 동일)
+ */
+const fs = require("fs");
+const os = require("os");
+const path = require("path");
+
+// authService 로드 전에 설정 (실제 DynamoDB 클라이언트/백그라운드 작업 비활성화, cost 고정)
+process.env.NODE_ENV = "test";
+process.env.PASSWORD_HASH_COST = process.env.BENCH_HASH_COST || "10";
+process.env.PASSWORD_HASH_CALIBRATE = "false";
+
+const { runBenchmark, checkBudget } = require("./harness");
+
+const BASELINE_PATH = path.join(__dirname, "baseline.json");
+const BUDGETS_PATH = path.join(__dirname, "budgets.json");
+const RESULTS_PATH = path.join(__dirname, "results", "latest.json");
+
+function parseArgs(argv) {
+  const args = {
+    filter: null,
+    latencyMs: 0,
+    jitterMs: 0,
+    slowProbability: 0,
+    slowMs: 0,
+    iterations: 2000,
+    warmup: 200,
+    concurrency: 1,
+    allocationIterations: 200,
+    updateBaseline: false,
+  };
+  for (let i = 0; i < argv.length; i++) {
+    const flag = argv[i];
+    const value = () => argv[++i];
+    switch (flag) {
+      case "--filter": args.filter = value(); break;
+      case "--latency-ms": args.latencyMs = Number(value()); break;
+      case "--jitter-ms": args.jitterMs = Number(value()); break;
+      case "--slow-probability": args.slowProbability = Number(value()); break;
+      case "--slow-ms": args.slowMs = Number(value()); break;
+      case "--iterations": args.iterations = Number(value()); break;
+      case "--warmup": args.warmup = Number(value()); break;
+      case "--concurrency": args.concurrency = Number(value()); break;
+      case "--update-baseline": args.updateBaseline = true; break;
+      default:
+        throw new Error(`Unknown option: ${flag}`);
+    }
+  }
+  return args;
+}
+
+function readJson(file) {
+  return fs.existsSync(file) ? JSON.parse(fs.readFileSync(file, "utf8")) : null;
+}
+
+function writeJson(file, data) {
+  fs.mkdirSync(path.dirname(file), { recursive: true });
+  fs.writeFileSync(file, `${JSON.stringify(data, null, 2)}\n`);
+}
+
+function environment(args) {
+  return {
+    node: process.version,
+    cpu: (os.cpus()[0] || {}).model || "unknown",
+    hashCost: Number(process.env.PASSWORD_HASH_COST),
+    latencyMs: args.latencyMs,
+    jitterMs: args.jitterMs,
+    slowProbability: args.slowProbability,
+    slowMs: args.slowMs,
+    concurrency: args.concurrency,
+  };
+}
+
+/**
+ * 기준선과 측정 조건이 같은지 (다르면 상대 비교가 의미 없음)
+ * @returns {string[]} 달라진 항목
+ */
+function environmentMismatch(current, baseline) {
+  return Object.keys(current).filter((key) => baseline[key] !== current[key]);
+}
+
+function formatRow(result, deltas) {
+  const delta = (metric) => (deltas[metric] === undefined ? "" : ` (${deltas[metric] >= 0 ? "+" : ""}${(deltas[metric] * 100).toFixed(0)}%)`);
+  return [
+    result.name.padEnd(22),
+    `${result.opsPerSec.toFixed(0)}${delta("opsPerSec")}`.padStart(14),
+    `${result.cpuUsPerOp.toFixed(0)}${delta("cpuUsPerOp")}`.padStart(16),
+    `${(result.bytesPerOp / 1024).toFixed(1)}${delta("bytesPerOp")}`.padStart(15),
+    result.blockingMaxMs.toFixed(1).padStart(10),
+    result.latencyP99Ms.toFixed(2).padStart(10),
+    result.dynamoCallsPerOp.toFixed(1).padStart(8),
+  ].join(" ");
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2));
+  const print = console.log.bind(console);
+  // 서비스 로그(console.log)는 측정 중 출력하지 않음
+  console.log = () => {};
+  console.error = () => {};
+
+  const { createBenchmarks } = require("./authService.bench");
+  const benchmarks = createBenchmarks({
+    latencyMs: args.latencyMs,
+    jitterMs: args.jitterMs,
+    slowProbability: args.slowProbability,
+    slowMs: args.slowMs,
+  })
+    .filter((benchmark) => !args.filter || benchmark.name.toLowerCase().includes(args.filter.toLowerCase()));
+
+  const budgets = readJson(BUDGETS_PATH) || { tolerance: {} };
+  const baseline = args.updateBaseline ? null : readJson(BASELINE_PATH);
+  const env = environment(args);
+
+  let comparable = Boolean(baseline);
+  if (baseline) {
+    const mismatch = environmentMismatch(env, baseline.environment || {});
+    if (mismatch.length > 0) {
+      comparable = false;
+      print(`⚠️  Baseline was recorded with different ${mismatch.join(", ")}; relative budgets skipped`);
+    }
+  } else if (!args.updateBaseline) {
+    print("⚠️  No bench/baseline.json; run `npm run bench:update-baseline` to record one. Only absolute limits apply");
+  }
+
+  print(`node ${env.node}, ${env.cpu}, bcrypt cost ${env.hashCost}, fake DynamoDB latency ${env.latencyMs}ms (+${env.slowMs}ms for ${env.slowProbability * 100}%), concurrency ${env.concurrency}`);
+  print(
+    `${"function".padEnd(22)} ${"ops/s".padStart(14)} ${"cpu µs/op".padStart(16)} ${"alloc KiB/op".padStart(15)} ` +
+    `${"block ms".padStart(10)} ${"p99 ms".padStart(10)} ${"ddb/op".padStart(8)}`
+  );
+
+  const results = {};
+  const failures = [];
+  for (const benchmark of benchmarks) {
+    const result = await runBenchmark(benchmark, args);
+    const { deltas, violations } = checkBudget(
+      result,
+      comparable ? baseline.results[result.name] : undefined,
+      budgets
+    );
+    results[result.name] = result;
+    print(formatRow(result, deltas));
+    for (const violation of violations) {
+      failures.push(`${result.name}: ${violation}`);
+    }
+  }
+
+  const report = { environment: env, recordedAt: new Date().toISOString(), results };
+  writeJson(RESULTS_PATH, report);
+
+  if (args.updateBaseline) {
+    // 일부만 측정한 경우 나머지 함수의 기준선은 유지
+    const previous = readJson(BASELINE_PATH);
+    if (previous && args.filter) {
+      report.results = { ...previous.results, ...results };
+    }
+    writeJson(BASELINE_PATH, report);
+    print(`✅ Baseline written to ${path.relative(process.cwd(), BASELINE_PATH)}`);
+    return;
+  }
+
+  if (failures.length > 0) {
+    print("❌ Performance budget exceeded:");
+    failures.forEach((failure) => print(`  - ${failure}`));
+    process.exitCode = 1;
+  } else {
+    print("✅ All benchmarks within budget");
+  }
+}
+
+main().catch((error) => {
+  process.stderr.write(`${error.stack || error}\n`);
+  process.exit(1);
+});
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+AuthCore 배포 CLI (build → setup → deploy → gateway를 한 프로세스에서 실행)
+
+각 단계 모듈과 boto3는 해당 단계가 실행될 때 처음 import된다. 여러 단계를 함께 실행하면
+boto3 세션/클라이언트와 앞 단계에서 확정된 값(이미지 URI, EC2 IP, kubeconfig)을 공유한다.
+
+사용 예:
+    python scripts/authcore.py build
+    python scripts/authcore.py setup deploy gateway
+    python scripts/authcore.py all
+    python scripts/authcore.py build deploy gateway --targets deploy-targets.json
+    RATE_LIMIT_MAX=200 python scripts/authcore.py config
+    SLO_TEST_PASSWORD=... python scripts/authcore.py verify
+
+--targets(또는 DEPLOY_TARGETS)를 주면 build는 한 번만 실행하고, 나머지 단계는 대상마다
+별도 프로세스로 동시에 실행한다 (fanout.py 참고).
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+
+# 인터프리터가 이 파일을 실행하기 시작한 시점 (import 비용 측정 기준)
+_STARTED_AT = time.perf_counter()
+
+from common import DeployContext, print_info, print_step, run_main
+
+# 서브커맨드 → 단계 모듈 (main(ctx)를 가진 스크립트)
+COMMANDS = {
+    'build': 'build_and_push',
+    'setup': 'setup_k8s',
+    'deploy': 'deploy_to_k8s',
+    'gateway': 'update_apigateway_backend',
+    # 이미지 배포 없이 ConfigMap/Secret만 갱신 (Pod 재시작 없음, PIPELINE/all에는 포함하지 않음)
+    'config': 'update_runtime_config',
+    # 배포 후 API Gateway/백엔드 경로 지연 SLO 검증 (PIPELINE/all에는 포함하지 않음)
+    'verify': 'verify_slo',
+}
+
+PIPELINE = ['build', 'setup', 'deploy', 'gateway']
+
+
+def run_phase(ctx, command):
+    """단계 하나 실행 (모듈 import와 실행 시간을 따로 기록)"""
+    if command == 'gateway' and not os.getenv('API_GATEWAY_ID'):
+        print_info("API_GATEWAY_ID not set, skipping gateway update")
+        return
+
+    with ctx.timer.phase(f"import {COMMANDS[command]}"):
+        module = importlib.import_module(COMMANDS[command])
+
+    print_step(f"[{command}]")
+    with ctx.timer.phase(command):
+        module.main(ctx)
+
+
+def run_fanout_phases(ctx, commands, args):
+    """build는 이 프로세스에서 한 번, 나머지 단계는 대상별로 동시에 실행"""
+    from fanout import load_targets, run_fanout
+
+    targets, file_max_parallel = load_targets(args.targets)
+    max_parallel = args.max_parallel or file_max_parallel or int(os.getenv('FANOUT_MAX_PARALLEL', '4'))
+
+    if 'build' in commands:
+        run_phase(ctx, 'build')
+    target_commands = [command for command in commands if command != 'build']
+    if not target_commands:
+        return
+
+    with ctx.timer.phase(f"fanout {' '.join(target_commands)}"):
+        if not run_fanout(targets, target_commands, max_parallel, ctx.values):
+            sys.exit(1)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='authcore',
+        description='AuthCore build/deploy CLI'
+    )
+    parser.add_argument(
+        'commands',
+        nargs='+',
+        choices=list(COMMANDS) + ['all'],
+        help="단계 (여러 개를 주면 순서대로 실행, all = build setup deploy gateway)"
+    )
+    parser.add_argument(
+        '--targets',
+        default=os.getenv('DEPLOY_TARGETS', ''),
+        help="배포 대상 목록 JSON (여러 클러스터/리전에 동시에 배포)"
+    )
+    parser.add_argument(
+        '--max-parallel',
+        type=int,
+        default=None,
+        help="동시에 배포할 대상 수 (기본: 대상 파일의 max_parallel 또는 FANOUT_MAX_PARALLEL, 4)"
+    )
+    args = parser.parse_args(argv)
+
+    commands = []
+    for command in args.commands:
+        for expanded in (PIPELINE if command == 'all' else [command]):
+            if expanded not in commands:
+                commands.append(expanded)
+    return commands, args
+
+
+def main(argv=None):
+    """메인 함수"""
+    commands, args = parse_args(sys.argv[1:] if argv is None else argv)
+    ctx = DeployContext()
+    ctx.timer.phases.append({
+        'name': 'startup',
+        'seconds': round(time.perf_counter() - _STARTED_AT, 3),
+        'ok': True
+    })
+
+    # 배포 단계가 게이트웨이를 직접 갱신하지 않도록 함 (gateway 단계가 따로 실행됨)
+    if 'gateway' in commands:
+        os.environ['UPDATE_API_GATEWAY'] = 'false'
+
+    try:
+        if args.targets:
+            run_fanout_phases(ctx, commands, args)
+        else:
+            for command in commands:
+                run_phase(ctx, command)
+    finally:
+        ctx.timer.print_report()
+
+
+if __name__ == '__main__':
+    run_main(main)
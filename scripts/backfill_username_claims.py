@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+기존 사용자에 대한 닉네임 점유 항목(USERNAME#<닉네임>)을 백필하는 마이그레이션 스크립트
+
+회원가입/닉네임 변경은 닉네임 점유 항목에 대한 조건부 쓰기로 중복을 막으므로,
+점유 항목이 없는 기존 사용자가 있으면 같은 닉네임으로 새 가입이 가능해집니다.
+새 버전을 배포하기 전에 반드시 한 번 실행해야 합니다 (여러 번 실행해도 안전).
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from itertools import islice
+
+import boto3
+from botocore.exceptions import ClientError
+
+from common import print_success, print_error, print_info, run_main
+
+# src/config/constants.js의 USERNAME_CLAIM과 동일해야 함
+USERNAME_CLAIM_PREFIX = 'USERNAME#'
+USERNAME_CLAIM_ITEM_TYPE = 'username_claim'
+
+def create_dynamodb_client(region: str):
+    """DynamoDB 클라이언트 생성 (DYNAMODB_ENDPOINT가 있으면 로컬 엔드포인트 사용)"""
+    endpoint_url = os.getenv('DYNAMODB_ENDPOINT') or None
+    return boto3.client('dynamodb', region_name=region, endpoint_url=endpoint_url)
+
+def iter_users(client, table_name: str):
+    """Users 테이블의 실제 사용자 항목만 순회 (점유 항목 제외)"""
+    paginator = client.get_paginator('scan')
+    pages = paginator.paginate(
+        TableName=table_name,
+        ProjectionExpression='user_id, #username',
+        FilterExpression='attribute_exists(#username) AND NOT begins_with(user_id, :prefix)',
+        ExpressionAttributeNames={'#username': 'username'},
+        ExpressionAttributeValues={':prefix': {'S': USERNAME_CLAIM_PREFIX}},
+    )
+    for page in pages:
+        for item in page.get('Items', []):
+            yield item['user_id']['S'], item['username']['S']
+
+def backfill_claim(client, table_name: str, user_id: str, username: str, dry_run: bool) -> str:
+    """사용자 한 명의 점유 항목 생성. 결과: created | exists | conflict | dry-run"""
+    claim_key = f"{USERNAME_CLAIM_PREFIX}{username}"
+    if dry_run:
+        return 'dry-run'
+
+    try:
+        client.put_item(
+            TableName=table_name,
+            Item={
+                'user_id': {'S': claim_key},
+                'item_type': {'S': USERNAME_CLAIM_ITEM_TYPE},
+                'owner_user_id': {'S': user_id},
+                'claimed_at': {'S': datetime.now(timezone.utc).isoformat()},
+            },
+            ConditionExpression='attribute_not_exists(user_id)',
+        )
+        return 'created'
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+
+    # 이미 점유 항목이 있음 → 본인 소유인지 확인
+    existing = client.get_item(
+        TableName=table_name,
+        Key={'user_id': {'S': claim_key}},
+        ConsistentRead=True,
+    ).get('Item', {})
+    owner = existing.get('owner_user_id', {}).get('S')
+    return 'exists' if owner == user_id else 'conflict'
+
+def run_backfill(client, table_name: str, workers: int, batch_size: int, dry_run: bool):
+    """작업자 풀로 점유 항목 생성. 진행 중인 작업은 batch_size개까지만 두므로 메모리는 테이블 크기와 무관"""
+    counts = {'created': 0, 'exists': 0, 'conflict': 0, 'dry-run': 0}
+    conflicts = []
+    users = iter_users(client, table_name)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+
+        def submit(count):
+            for user_id, username in islice(users, count):
+                future = executor.submit(backfill_claim, client, table_name, user_id, username, dry_run)
+                pending[future] = (user_id, username)
+
+        submit(batch_size)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                user_id, username = pending.pop(future)
+                outcome = future.result()
+                counts[outcome] += 1
+                if outcome == 'conflict':
+                    conflicts.append((user_id, username))
+            submit(batch_size - len(pending))
+
+    return counts, conflicts
+
+def parse_args(argv):
+    dry_run_default = os.getenv('DRY_RUN', 'false').lower() == 'true'
+    parser = argparse.ArgumentParser(prog='backfill_username_claims', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--table', default=os.getenv('USERS_TABLE', 'AuthCore_Users'))
+    parser.add_argument('--region', default=os.getenv('AWS_REGION', 'ap-northeast-2'))
+    parser.add_argument('--workers', type=int, default=int(os.getenv('BACKFILL_WORKERS', '8')))
+    parser.add_argument('--batch-size', type=int, default=1000, help="동시에 대기시키는 최대 작업 수")
+    parser.add_argument('--dry-run', action='store_true', default=dry_run_default, help="쓰지 않고 대상만 확인")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """메인 함수"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    print("🚀 Backfilling username claim items...")
+
+    print_info("Configuration:")
+    print(f"  AWS Region: {args.region}")
+    print(f"  Users Table: {args.table}")
+    print(f"  Dry Run: {args.dry_run}")
+    print(f"  Workers: {args.workers}")
+
+    client = create_dynamodb_client(args.region)
+    counts, conflicts = run_backfill(client, args.table, args.workers, max(args.batch_size, args.workers), args.dry_run)
+
+    print_info("Backfill summary:")
+    for outcome, count in counts.items():
+        print(f"  {outcome}: {count}")
+
+    if conflicts:
+        # 같은 닉네임을 가진 사용자가 이미 여러 명 존재 (기존 GSI 조회 방식의 경쟁 조건으로 생긴 중복)
+        print_error(f"{len(conflicts)} user(s) share a username with another user:")
+        for user_id, username in conflicts:
+            print(f"  {username} (user_id={user_id})")
+        sys.exit(1)
+
+    print_success("Username claims are in place for all users")
+
+if __name__ == '__main__':
+    run_main(main)
@@ -6,38 +6,21 @@ Podman을 사용하여 이미지를 빌드하고 ECR에 푸시하는 스크립
 import os
 import subprocess
 import sys
-import boto3
 
-# 색상 출력
-class Colors:
-    RED = '\033[0;31m'
-    GREEN = '\033[0;32m'
-    YELLOW = '\033[1;33m'
-    NC = '\033[0m'  # No Color
+from common import DeployContext, print_success, print_error, print_info, project_root, run_command as _run, run_main
 
-def print_success(msg):
-    print(f"{Colors.GREEN}✅ {msg}{Colors.NC}")
-
-def print_error(msg):
-    print(f"{Colors.RED}❌ {msg}{Colors.NC}")
-
-def print_info(msg):
-    print(f"{Colors.YELLOW}📋 {msg}{Colors.NC}")
-
-def run_command(cmd, check=True):
-    """명령어 실행"""
-    try:
-        result = subprocess.run(cmd, shell=True, check=check, capture_output=True, text=True)
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
+def run_command(cmd):
+    """명령어 실행 (실패 시 종료)"""
+    success, stdout, stderr = _run(cmd)
+    if not success:
         print_error(f"Command failed: {cmd}")
-        print_error(e.stderr)
+        print_error(stderr)
         sys.exit(1)
+    return stdout
 
-def get_aws_account_id():
+def get_aws_account_id(ctx):
     """AWS 계정 ID 가져오기"""
-    sts = boto3.client('sts')
-    return sts.get_caller_identity()['Account']
+    return ctx.client('sts').get_caller_identity()['Account']
 
 def ecr_login(region, repository_uri):
     """ECR에 로그인 (Podman 사용)"""
@@ -49,11 +32,10 @@ def build_image(repo_name, tag):
     """Podman을 사용하여 이미지 빌드"""
     print_info("Building image with Podman...")
     # 프로젝트 루트 디렉토리로 이동하여 빌드
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
+    root = project_root()
     
     # Dockerfile이 있는지 확인 (Podman도 Dockerfile 사용 가능)
-    dockerfile_path = os.path.join(project_root, 'Dockerfile')
+    dockerfile_path = os.path.join(root, 'Dockerfile')
     if not os.path.exists(dockerfile_path):
         print_error(f"Dockerfile not found at {dockerfile_path}")
         sys.exit(1)
@@ -62,7 +44,7 @@ def build_image(repo_name, tag):
     cmd = f"podman build --platform linux/amd64 -t {repo_name}:{tag} ."
     # 프로젝트 루트에서 실행
     try:
-        result = subprocess.run(cmd, shell=True, cwd=project_root, check=True, capture_output=True, text=True)
+        result = subprocess.run(cmd, shell=True, cwd=root, check=True, capture_output=True, text=True)
         print_success("Image built successfully with Podman")
         if result.stdout:
             print_info(result.stdout)
@@ -85,19 +67,20 @@ def push_image(repository_uri, tag):
     cmd = f"podman push {repository_uri}:{tag}"
     run_command(cmd)
 
-def main():
-    """메인 함수"""
+def main(ctx=None):
+    """메인 함수 (빌드된 이미지 URI 반환)"""
     print("🚀 Building and pushing image with Podman...")
+    ctx = ctx or DeployContext()
     
     # 환경 변수 설정
-    aws_region = os.getenv('AWS_REGION', 'ap-northeast-2')
+    aws_region = ctx.region
     environment = os.getenv('ENVIRONMENT', 'prod')
     image_tag = os.getenv('IMAGE_TAG', 'latest')
     ecr_repo_name = f"authcore-{environment}"
     
     # AWS 계정 ID 가져오기
     try:
-        aws_account_id = get_aws_account_id()
+        aws_account_id = get_aws_account_id(ctx)
     except Exception as e:
         print_error(f"Failed to get AWS account ID: {e}")
         sys.exit(1)
@@ -125,10 +108,11 @@ def main():
     print_success("Image pushed successfully!")
     print_success(f"Image URI: {repository_uri}:{image_tag}")
     
-    # 이미지 URI를 파일에 저장 (프로젝트 루트에 저장)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    image_uri_file = os.path.join(project_root, '.image_uri')
+    image_uri = f"{repository_uri}:{image_tag}"
+    ctx.values['image_uri'] = image_uri
+    
+    # 이미지 URI를 파일에 저장 (별도 프로세스로 실행되는 deploy 단계용)
+    image_uri_file = os.path.join(project_root(), '.image_uri')
     
     try:
         with open(image_uri_file, 'w', encoding='utf-8') as f:
@@ -137,14 +121,8 @@ def main():
     except Exception as e:
         print_error(f"Failed to save image URI to file: {e}")
         # 파일 저장 실패해도 계속 진행 (환경 변수로 전달 가능)
+    
+    return image_uri
 
 if __name__ == '__main__':
-    try:
-        main()
-    except KeyboardInterrupt:
-        print("\n⚠️  Interrupted by user")
-        sys.exit(1)
-    except Exception as e:
-        print_error(f"Error: {e}")
-        sys.exit(1)
-
+    run_main(main)
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+메트릭 기반 카나리 배포 (자동 승격/롤백)
+
+1. 현재 stable Deployment(authcore-api)를 복제해 새 이미지로 authcore-api-canary를 만든다.
+   canary Pod도 app=authcore-api 라벨을 가지므로 기존 Service가 Pod 수 비율만큼 트래픽을 보낸다.
+2. 분석 구간 동안 stable/canary Pod의 /metrics를 주기적으로 수집해 구간 시작 대비 증가분으로
+   p95/p99 지연과 5xx 비율을 계산하고 기준과 비교한다.
+3. 기준을 넘으면 즉시 롤백(canary 삭제), 구간 끝까지 통과하면 stable을 새 이미지로 갱신한 뒤 canary를 삭제한다.
+
+메트릭 소스:
+    - 기본: API 서버의 Pod 프록시(kubectl get --raw .../pods/<pod>:4000/proxy/metrics)
+    - CANARY_METRICS_SOURCE=<디렉토리>: <디렉토리>/stable.prom, canary.prom 파일 (로컬 테스트용).
+      <track>.start.prom이 있으면 구간 시작 값으로 사용한다.
+"""
+
+import json
+import math
+import os
+import re
+import tempfile
+import time
+
+from common import print_error, print_info, print_step
+
+STABLE_NAME = 'authcore-api'
+CANARY_NAME = 'authcore-api-canary'
+CONTAINER_NAME = 'authcore-api'
+APP_LABEL = 'app=authcore-api'
+METRICS_PORT = 4000
+
+DURATION_METRIC = 'authcore_http_request_duration_seconds'
+REQUESTS_METRIC = 'authcore_http_requests_total'
+
+# track → Pod 라벨 셀렉터 (stable Pod에는 track 라벨이 없을 수 있음)
+SELECTORS = {
+    'stable': f"{APP_LABEL},track!=canary",
+    'canary': f"{APP_LABEL},track=canary",
+}
+
+_SAMPLE_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)')
+_LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def load_thresholds():
+    """판정 기준 (환경 변수)"""
+    return {
+        # canary 지연이 stable의 ratio배 + tolerance를 넘으면 실패
+        'max_p95_ratio': float(os.getenv('CANARY_MAX_P95_RATIO', '1.2')),
+        'max_p99_ratio': float(os.getenv('CANARY_MAX_P99_RATIO', '1.3')),
+        'latency_tolerance_ms': float(os.getenv('CANARY_LATENCY_TOLERANCE_MS', '10')),
+        # canary 5xx 비율이 stable + 이 값을 넘으면 실패
+        'max_error_rate_increase': float(os.getenv('CANARY_MAX_ERROR_RATE_INCREASE', '0.01')),
+        # canary 요청이 이보다 적으면 판정 불가
+        'min_requests': int(os.getenv('CANARY_MIN_REQUESTS', '50')),
+    }
+
+
+def parse_prometheus(text):
+    """Prometheus text format → [(이름, 라벨 dict, 값)]"""
+    samples = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        match = _SAMPLE_RE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        try:
+            value = float(value)
+        except ValueError:
+            continue
+        samples.append((name, dict(_LABEL_RE.findall(labels or '')), value))
+    return samples
+
+
+class TrafficStats:
+    """한 track(stable/canary)의 요청 수, 5xx 수, 지연 히스토그램 (라우트 전체 합산)"""
+
+    def __init__(self, buckets=None, requests=0, errors=0):
+        self.buckets = dict(buckets or {})
+        self.requests = requests
+        self.errors = errors
+
+    @classmethod
+    def from_samples(cls, samples):
+        stats = cls()
+        for name, labels, value in samples:
+            if name == f"{DURATION_METRIC}_bucket":
+                le = math.inf if labels.get('le') == '+Inf' else float(labels.get('le', 'nan'))
+                stats.buckets[le] = stats.buckets.get(le, 0) + value
+            elif name == REQUESTS_METRIC:
+                stats.requests += value
+                if labels.get('status', '').startswith('5'):
+                    stats.errors += value
+        return stats
+
+    def merge(self, other):
+        """여러 Pod의 값 합산"""
+        buckets = dict(self.buckets)
+        for le, count in other.buckets.items():
+            buckets[le] = buckets.get(le, 0) + count
+        return TrafficStats(buckets, self.requests + other.requests, self.errors + other.errors)
+
+    def since(self, start):
+        """구간 시작 값 대비 증가분 (Pod 재시작으로 카운터가 줄면 0으로 처리)"""
+        buckets = {le: max(count - start.buckets.get(le, 0), 0) for le, count in self.buckets.items()}
+        return TrafficStats(
+            buckets,
+            max(self.requests - start.requests, 0),
+            max(self.errors - start.errors, 0)
+        )
+
+    @property
+    def error_rate(self):
+        return self.errors / self.requests if self.requests else 0.0
+
+    def quantile(self, q):
+        """히스토그램 분위수 (Prometheus histogram_quantile과 같은 선형 보간, 초 단위). 데이터 없으면 None"""
+        bounds = sorted(self.buckets)
+        if not bounds or self.buckets[bounds[-1]] == 0:
+            return None
+        total = self.buckets[bounds[-1]]
+        rank = q * total
+        previous_bound, previous_count = 0.0, 0.0
+        for bound in bounds:
+            count = self.buckets[bound]
+            if count >= rank:
+                if math.isinf(bound):
+                    # 마지막 유한 구간을 넘는 값은 그 상한으로 본다
+                    return previous_bound
+                if count == previous_count:
+                    return bound
+                return previous_bound + (bound - previous_bound) * (rank - previous_count) / (count - previous_count)
+            previous_bound, previous_count = bound, count
+        return previous_bound
+
+    def summary(self):
+        def ms(value):
+            return None if value is None else round(value * 1000, 1)
+
+        return {
+            'requests': int(self.requests),
+            'errors': int(self.errors),
+            'error_rate': round(self.error_rate, 4),
+            'p95_ms': ms(self.quantile(0.95)),
+            'p99_ms': ms(self.quantile(0.99)),
+        }
+
+
+class KubeMetricsSource:
+    """API 서버 Pod 프록시로 track별 모든 Pod의 /metrics 수집"""
+
+    def __init__(self, namespace, kubectl):
+        self.namespace = namespace
+        self.kubectl = kubectl
+
+    def scrape(self, track):
+        pods = self.kubectl(
+            f"get pods -n {self.namespace} -l '{SELECTORS[track]}' "
+            f"--field-selector=status.phase=Running -o jsonpath='{{.items[*].metadata.name}}'",
+            check=False
+        )
+        stats = TrafficStats()
+        for pod in (pods or '').split():
+            text = self.kubectl(
+                f"get --raw /api/v1/namespaces/{self.namespace}/pods/{pod}:{METRICS_PORT}/proxy/metrics",
+                check=False
+            )
+            if text is None:
+                print_info(f"Failed to scrape metrics from {pod}, skipping")
+                continue
+            stats = stats.merge(TrafficStats.from_samples(parse_prometheus(text)))
+        return stats
+
+    def start(self, track):
+        return self.scrape(track)
+
+
+class FileMetricsSource:
+    """디렉토리의 <track>.prom 파일을 메트릭으로 사용 (가짜 소스)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _read(self, filename):
+        path = os.path.join(self.directory, filename)
+        if not os.path.exists(path):
+            return TrafficStats()
+        with open(path, 'r', encoding='utf-8') as f:
+            return TrafficStats.from_samples(parse_prometheus(f.read()))
+
+    def scrape(self, track):
+        return self._read(f"{track}.prom")
+
+    def start(self, track):
+        return self._read(f"{track}.start.prom")
+
+
+def evaluate(stable, canary, thresholds):
+    """
+    stable/canary 구간 통계 비교
+
+    Returns:
+        (판정, 검사 목록) - 판정은 'pass' | 'fail' | 'inconclusive'
+    """
+    checks = []
+
+    def latency_check(name, q, ratio):
+        base, value = stable.quantile(q), canary.quantile(q)
+        if base is None or value is None:
+            return
+        limit = base * ratio + thresholds['latency_tolerance_ms'] / 1000
+        checks.append({
+            'name': name,
+            'stable_ms': round(base * 1000, 1),
+            'canary_ms': round(value * 1000, 1),
+            'limit_ms': round(limit * 1000, 1),
+            'passed': value <= limit,
+        })
+
+    latency_check('p95', 0.95, thresholds['max_p95_ratio'])
+    latency_check('p99', 0.99, thresholds['max_p99_ratio'])
+
+    error_limit = stable.error_rate + thresholds['max_error_rate_increase']
+    checks.append({
+        'name': 'error_rate',
+        'stable': round(stable.error_rate, 4),
+        'canary': round(canary.error_rate, 4),
+        'limit': round(error_limit, 4),
+        'passed': canary.error_rate <= error_limit,
+    })
+
+    # 요청이 적으면 몇 건의 느린/실패 요청만으로 판정이 흔들리므로 결론을 미룬다
+    if canary.requests < thresholds['min_requests']:
+        return 'inconclusive', checks
+    if any(not check['passed'] for check in checks):
+        return 'fail', checks
+    return 'pass', checks
+
+
+def build_canary_deployment(stable, image_uri, replicas):
+    """stable Deployment(JSON)를 복제해 canary Deployment 생성 (track=canary 라벨, 새 이미지)"""
+    metadata = stable['metadata']
+    spec = json.loads(json.dumps(stable['spec']))
+
+    spec['replicas'] = replicas
+    spec['selector'] = {'matchLabels': {**spec['selector'].get('matchLabels', {}), 'track': 'canary'}}
+    template_metadata = spec['template'].setdefault('metadata', {})
+    template_metadata['labels'] = {**template_metadata.get('labels', {}), 'track': 'canary'}
+
+    containers = spec['template']['spec']['containers']
+    container = next((c for c in containers if c.get('name') == CONTAINER_NAME), containers[0])
+    stable_image = container.get('image', '')
+    container['image'] = image_uri
+
+    return {
+        'apiVersion': 'apps/v1',
+        'kind': 'Deployment',
+        'metadata': {
+            'name': CANARY_NAME,
+            'namespace': metadata.get('namespace'),
+            'labels': {**metadata.get('labels', {}), 'track': 'canary'},
+            'annotations': {'authcore/canary-of': stable_image},
+        },
+        'spec': spec,
+    }
+
+
+def apply_json(kubectl, document):
+    """JSON 매니페스트 적용"""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+        json.dump(document, f)
+        temp_file = f.name
+    try:
+        return kubectl(f"apply -f {temp_file}", check=True) is not None
+    finally:
+        os.remove(temp_file)
+
+
+def delete_canary(kubectl, namespace):
+    kubectl(f"delete deployment {CANARY_NAME} -n {namespace} --ignore-not-found=true", check=False)
+
+
+def analyze(source, thresholds, window, interval, sleep=time.sleep):
+    """분석 구간 동안 주기적으로 판정 (실패 시 즉시 종료). (판정, 마지막 검사, stable/canary 요약) 반환"""
+    start = {track: source.start(track) for track in SELECTORS}
+    started_at = time.monotonic()
+    while True:
+        stable = source.scrape('stable').since(start['stable'])
+        canary = source.scrape('canary').since(start['canary'])
+        verdict, checks = evaluate(stable, canary, thresholds)
+        elapsed = time.monotonic() - started_at
+
+        failed = [check['name'] for check in checks if not check['passed']]
+        print_info(
+            f"Canary analysis {elapsed:.0f}/{window}s: canary {int(canary.requests)} req, "
+            f"stable {int(stable.requests)} req → {verdict}{' (' + ', '.join(failed) + ')' if failed else ''}"
+        )
+
+        if verdict == 'fail' or elapsed >= window:
+            return verdict, checks, {'stable': stable.summary(), 'canary': canary.summary()}
+        sleep(min(interval, max(window - elapsed, 0)))
+
+
+def run_canary(namespace, image_uri, kubectl, promote, source=None):
+    """
+    카나리 배포 실행
+
+    Args:
+        kubectl: kubectl(cmd, check) → stdout 또는 실패 시 None
+        promote: stable Deployment를 새 이미지로 갱신하는 함수 (실패 시 SystemExit)
+        source: 메트릭 소스 (기본: CANARY_METRICS_SOURCE 또는 Pod 프록시)
+
+    Returns:
+        리포트 dict (decision: promoted | rolled_back | skipped)
+    """
+    stable_json = kubectl(f"get deployment {STABLE_NAME} -n {namespace} -o json", check=False)
+    if not stable_json:
+        print_info("No stable deployment yet, skipping canary (regular rollout)")
+        return {'decision': 'skipped', 'reason': 'no stable deployment'}
+
+    stable = json.loads(stable_json)
+    replicas = int(os.getenv('CANARY_REPLICAS', '1'))
+    stable_replicas = stable['spec'].get('replicas', 1)
+    thresholds = load_thresholds()
+    window = int(os.getenv('CANARY_WINDOW_SECONDS', '300'))
+    interval = int(os.getenv('CANARY_INTERVAL_SECONDS', '30'))
+    if source is None:
+        directory = os.getenv('CANARY_METRICS_SOURCE', '')
+        source = FileMetricsSource(directory) if directory else KubeMetricsSource(namespace, kubectl)
+
+    report = {
+        'image': image_uri,
+        'stable_image': '',
+        'canary_replicas': replicas,
+        'stable_replicas': stable_replicas,
+        # Service는 Pod 단위로 분산하므로 Pod 수 비율이 곧 트래픽 비율
+        'traffic_weight': round(replicas / (replicas + stable_replicas), 3),
+        'window_seconds': window,
+        'thresholds': thresholds,
+    }
+
+    canary = build_canary_deployment(stable, image_uri, replicas)
+    report['stable_image'] = canary['metadata']['annotations']['authcore/canary-of']
+    print_step(f"Starting canary ({replicas} pod(s), ~{report['traffic_weight']:.0%} of traffic)")
+    if not apply_json(kubectl, canary):
+        delete_canary(kubectl, namespace)
+        return {**report, 'decision': 'rolled_back', 'reason': 'failed to create canary deployment'}
+
+    timeout = int(os.getenv('CANARY_ROLLOUT_TIMEOUT', '300'))
+    if kubectl(f"rollout status deployment/{CANARY_NAME} -n {namespace} --timeout={timeout}s", check=True) is None:
+        delete_canary(kubectl, namespace)
+        return {**report, 'decision': 'rolled_back', 'reason': 'canary pods did not become ready'}
+
+    verdict, checks, stats = analyze(source, thresholds, window, interval)
+    report.update({'verdict': verdict, 'checks': checks, **stats})
+
+    if verdict != 'pass':
+        delete_canary(kubectl, namespace)
+        reason = 'thresholds exceeded' if verdict == 'fail' else (
+            f"not enough canary traffic (< {thresholds['min_requests']} requests)"
+        )
+        return {**report, 'decision': 'rolled_back', 'reason': reason}
+
+    # stable을 먼저 갱신하고 canary를 내려야 용량이 줄지 않음
+    promote()
+    delete_canary(kubectl, namespace)
+    return {**report, 'decision': 'promoted', 'reason': 'all checks passed'}
+
+
+def write_canary_report(report, path):
+    """판정 리포트 저장 및 요약 출력"""
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+    except OSError as e:
+        print_error(f"Failed to write canary report: {e}")
+
+    if report['decision'] == 'skipped':
+        return
+    print_info(f"Canary result: {report['decision']} ({report['reason']}, report: {path})")
+    for track in ('stable', 'canary'):
+        if track in report:
+            s = report[track]
+            print(f"  {track:<7} {s['requests']:>7} req  5xx {s['error_rate']:.2%}  p95 {s['p95_ms']} ms  p99 {s['p99_ms']} ms")
+    for check in report.get('checks', []):
+        status = 'ok' if check['passed'] else 'FAILED'
+        if 'limit_ms' in check:
+            print(f"  {check['name']:<10} canary {check['canary_ms']} ms  limit {check['limit_ms']} ms  {status}")
+        else:
+            print(f"  {check['name']:<10} canary {check['canary']:.2%}  limit {check['limit']:.2%}  {status}")
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+부하 테스트/메트릭 결과로 리소스 요청·제한, 레플리카 수, 노드 타입을 계산하는 용량 계획 도구
+
+입력 (scripts/capacity-samples.example.json 참고):
+    - samples: 라우트별 부하 테스트 측정값 (RPS, Pod CPU 밀리코어, RSS MB, p99 ms)
+    - bcrypt_cost: 측정 당시 bcrypt cost (계획 cost와 다르면 로그인/가입 CPU 비용을 2^차이 배로 보정)
+    - dynamodb_p99_ms / dynamodb_calls: 라우트별 DynamoDB 호출로 생기는 지연 하한
+    - traffic: 라우트 비율(mix), 평시/피크 RPS
+    --metrics로 /metrics 스냅샷을 주면 authcore_http_requests_total에서 실제 라우트 비율을 계산한다.
+
+모델:
+    CPU(m)  = idle + Σ 라우트 RPS × 라우트 비용(m/rps)     (라우트별 최소제곱 직선)
+    RSS(MB) = base + 기울기 × RPS                          (전체 샘플 최소제곱 직선)
+    레플리카당 처리량 = min(CPU limit으로 감당 가능한 RPS, p99 목표를 지키는 최대 RPS)
+
+결과는 k8s/capacity-profile.json(배포 스크립트가 HPA/리소스로 적용)에 쓰고, 이전 프로파일과의 차이를 출력한다.
+
+사용 예:
+    python scripts/capacity_planner.py --input bench/capacity-samples.json --target-rps 150 --p99-ms 400
+    python scripts/capacity_planner.py --input samples.json --metrics prod.prom --dry-run
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+from common import print_success, print_error, print_info, print_step, project_root, run_main
+from canary import parse_prometheus, REQUESTS_METRIC
+from scaling import GENERATED_SOURCE
+
+# 비밀번호 해시를 계산하는 라우트 (bcrypt cost에 비례해 CPU 비용 증가)
+HASHING_ROUTES = {'/auth/login', '/auth/register'}
+
+# 노드 타입별 (vCPU 밀리코어, 메모리 MB)
+NODE_TYPES = {
+    't3.small': (2000, 2048),
+    't3.medium': (2000, 4096),
+    't3.large': (2000, 8192),
+    'c6i.large': (2000, 4096),
+    'c6i.xlarge': (4000, 8192),
+    'm6i.large': (2000, 8192),
+}
+
+# k3s 시스템 + OS 예약분 (docs/RESOURCE_REQUIREMENTS.md 기준)
+SYSTEM_RESERVED = {'cpu_millicores': 500, 'memory_mb': 950}
+
+RESOURCE_KEYS = ('cpu_request', 'cpu_limit', 'memory_request', 'memory_limit')
+
+
+def fit_line(points):
+    """최소제곱 직선 y = a + b·x. 점이 하나이거나 x가 모두 같으면 원점을 지나는 직선"""
+    if not points:
+        return 0.0, 0.0
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return 0.0, (mean_y / mean_x if mean_x else 0.0)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+    return mean_y - slope * mean_x, slope
+
+
+def round_up(value, step):
+    return int(math.ceil(value / step) * step)
+
+
+def route_mix_from_metrics(path):
+    """/metrics 스냅샷의 라우트별 요청 수 → 비율"""
+    with open(path, 'r', encoding='utf-8') as f:
+        samples = parse_prometheus(f.read())
+    counts = {}
+    for name, labels, value in samples:
+        if name == REQUESTS_METRIC and labels.get('route'):
+            counts[labels['route']] = counts.get(labels['route'], 0) + value
+    total = sum(counts.values())
+    return {route: count / total for route, count in counts.items()} if total else {}
+
+
+def fit_models(data, bcrypt_cost):
+    """라우트별 CPU 비용/지연 한계와 메모리 모델 추정"""
+    by_route = {}
+    for sample in data['samples']:
+        by_route.setdefault(sample['route'], []).append(sample)
+
+    measured_cost = data.get('bcrypt_cost')
+    hash_factor = 2 ** (bcrypt_cost - measured_cost) if bcrypt_cost and measured_cost else 1.0
+
+    routes = {}
+    intercepts = []
+    for route, samples in by_route.items():
+        idle, slope = fit_line([(s['rps'], s['cpu_millicores']) for s in samples])
+        intercepts.append(max(idle, 0.0))
+        factor = hash_factor if route in HASHING_ROUTES else 1.0
+        routes[route] = {
+            'cpu_millicores_per_rps': round(max(slope, 0.0) * factor, 3),
+            'samples': len(samples),
+            # p99가 측정된 샘플 (bcrypt 보정 시 처리 시간도 같은 비율로 늘어난다고 봄)
+            'latency': sorted((s['rps'], s['p99_ms'] * factor) for s in samples if 'p99_ms' in s),
+        }
+
+    rss_base, rss_slope = fit_line([(s['rps'], s['rss_mb']) for s in data['samples'] if 'rss_mb' in s])
+    return {
+        'idle_millicores': round(sorted(intercepts)[len(intercepts) // 2], 1) if intercepts else 0.0,
+        'routes': routes,
+        'rss_base_mb': round(max(rss_base, 0.0), 1),
+        'rss_mb_per_rps': round(max(rss_slope, 0.0), 3),
+        'bcrypt_factor': hash_factor,
+    }
+
+
+def max_rps_within_slo(latency, slo_ms):
+    """p99 목표를 지킨 최대 RPS (측정 범위 안에서 목표를 넘는 지점이 있으면 그 직전까지 보간)"""
+    if not latency:
+        return None
+    best = 0.0
+    previous = None
+    for rps, p99 in latency:
+        if p99 <= slo_ms:
+            best = rps
+        elif previous and previous[1] <= slo_ms:
+            # 두 측정점 사이에서 목표를 넘는 RPS를 선형 보간
+            best = previous[0] + (rps - previous[0]) * (slo_ms - previous[1]) / (p99 - previous[1])
+            break
+        else:
+            break
+        previous = (rps, p99)
+    else:
+        # 측정한 최대 RPS까지 목표 이내 → 지연은 CPU 한계보다 먼저 제약이 되지 않음
+        return math.inf
+    return best
+
+
+def plan(data, options):
+    """용량 계획 계산"""
+    models = fit_models(data, options.bcrypt_cost)
+    traffic = data.get('traffic', {})
+    mix = options.mix or traffic.get('mix') or {route: 1 / len(models['routes']) for route in models['routes']}
+    total = sum(mix.values())
+    mix = {route: share / total for route, share in mix.items() if route in models['routes']}
+    if not mix:
+        raise ValueError("Route mix does not match any measured route")
+
+    # 혼합 요청 1건의 CPU 비용 (밀리코어 / RPS)
+    cost_per_rps = sum(share * models['routes'][route]['cpu_millicores_per_rps'] for route, share in mix.items())
+    cpu_limit = options.cpu_limit
+    cpu_bound_rps = (cpu_limit - models['idle_millicores']) / cost_per_rps if cost_per_rps else math.inf
+
+    # 지연 한계: 라우트별 한계 RPS의 비율 가중 조화평균
+    dynamodb_p99 = float(data.get('dynamodb_p99_ms', 0))
+    calls = data.get('dynamodb_calls', {})
+    latency_floor = {route: dynamodb_p99 * calls.get(route, 1) for route in mix}
+    route_limits = {}
+    for route in mix:
+        limit = max_rps_within_slo(models['routes'][route]['latency'], options.p99_ms)
+        # DynamoDB 호출만으로 목표를 넘으면 레플리카를 늘려도 목표 달성 불가
+        if latency_floor[route] >= options.p99_ms:
+            limit = 0.0
+        route_limits[route] = limit
+    if any(limit == 0 for limit in route_limits.values()):
+        latency_bound_rps = 0.0
+    elif all(limit is None or math.isinf(limit) for limit in route_limits.values()):
+        latency_bound_rps = math.inf
+    else:
+        latency_bound_rps = 1 / sum(
+            share / route_limits[route] for route, share in mix.items()
+            if route_limits[route] is not None and not math.isinf(route_limits[route])
+        )
+
+    per_replica_rps = min(cpu_bound_rps, latency_bound_rps)
+    if per_replica_rps <= 0 or math.isinf(per_replica_rps):
+        raise ValueError("Cannot derive a per-replica throughput from the samples (check p99 target and CPU limit)")
+
+    utilization = options.utilization
+    target_rps = options.target_rps or float(traffic.get('peak_rps', 0))
+    baseline_rps = float(traffic.get('baseline_rps', 0))
+    replicas = max(options.min_replicas, math.ceil(target_rps / (per_replica_rps * utilization)))
+
+    # 리소스: request는 HPA 목표 사용률에서의 사용량, limit은 포화 지점
+    cpu_request = round_up(models['idle_millicores'] + cost_per_rps * per_replica_rps * utilization, 10)
+    rss_at_max = models['rss_base_mb'] + models['rss_mb_per_rps'] * per_replica_rps
+    memory_request = round_up(rss_at_max * 1.1, 16)
+    memory_limit = round_up(rss_at_max * 1.5, 16)
+
+    # 노드 적합성: 최대 레플리카 + 롤링 업데이트 중 추가 Pod 1개의 request 합
+    pods = replicas + 1
+    need_cpu = SYSTEM_RESERVED['cpu_millicores'] + pods * cpu_request
+    need_memory = SYSTEM_RESERVED['memory_mb'] + pods * memory_request
+    fits = {
+        name: cpu >= need_cpu and memory >= need_memory
+        for name, (cpu, memory) in NODE_TYPES.items()
+    }
+    recommended_node = next(
+        (name for name, _ in sorted(NODE_TYPES.items(), key=lambda item: (item[1][1], item[1][0])) if fits[name]),
+        None
+    )
+
+    return {
+        'inputs': {
+            'target_rps': target_rps,
+            'p99_ms': options.p99_ms,
+            'cpu_limit_millicores': cpu_limit,
+            'bcrypt_cost': options.bcrypt_cost or data.get('bcrypt_cost'),
+            'utilization': utilization,
+            'mix': {route: round(share, 3) for route, share in mix.items()},
+        },
+        'models': {
+            'idle_millicores': models['idle_millicores'],
+            'cpu_millicores_per_rps': {route: r['cpu_millicores_per_rps'] for route, r in models['routes'].items()},
+            'rss_base_mb': models['rss_base_mb'],
+            'rss_mb_per_rps': models['rss_mb_per_rps'],
+            'bcrypt_factor': models['bcrypt_factor'],
+            'dynamodb_latency_floor_ms': latency_floor,
+        },
+        'per_replica': {
+            'rps': round(per_replica_rps, 1),
+            'cpu_bound_rps': round(cpu_bound_rps, 1),
+            'latency_bound_rps': None if math.isinf(latency_bound_rps) else round(latency_bound_rps, 1),
+            'limited_by': 'cpu' if cpu_bound_rps <= latency_bound_rps else 'latency',
+            'cpu_millicores_per_rps': round(cost_per_rps, 3),
+        },
+        'resources': {
+            'cpu_request': f"{cpu_request}m",
+            'cpu_limit': f"{cpu_limit}m",
+            'memory_request': f"{memory_request}Mi",
+            'memory_limit': f"{memory_limit}Mi",
+        },
+        'replicas': replicas,
+        'baseline_rps': baseline_rps,
+        'node': {
+            'current': options.node_type,
+            'current_fits': fits.get(options.node_type, False),
+            'recommended': recommended_node,
+            'required_cpu_millicores': need_cpu,
+            'required_memory_mb': need_memory,
+        },
+    }
+
+
+def to_profile(result, previous, source):
+    """scaling.py가 읽는 용량 프로파일 (사람이 조정한 스케일링 정책 값은 유지)"""
+    profile = dict(previous or {})
+    profile.update({
+        'source': source,
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'per_replica_rps': result['per_replica']['rps'],
+        'cpu_millicores_per_rps': result['per_replica']['cpu_millicores_per_rps'],
+        'cpu_limit_millicores': result['inputs']['cpu_limit_millicores'],
+        'target_utilization': result['inputs']['utilization'],
+        'baseline_rps': result['baseline_rps'],
+        'peak_rps': result['inputs']['target_rps'],
+        'max_replicas_cap': max(result['replicas'], int(profile.get('max_replicas_cap', 0))),
+        'resources': result['resources'],
+    })
+    profile.setdefault('min_replicas_floor', 2)
+    return profile
+
+
+def print_changes(previous, profile):
+    """이전 프로파일 대비 변경점 (릴리스마다 용량 변화 추적)"""
+    if not previous:
+        return
+    keys = ('per_replica_rps', 'cpu_millicores_per_rps', 'peak_rps', 'max_replicas_cap')
+    changes = []
+    for key in keys:
+        before, after = previous.get(key), profile.get(key)
+        if before != after:
+            delta = ''
+            if isinstance(before, (int, float)) and isinstance(after, (int, float)) and before:
+                delta = f" ({(after - before) / before:+.0%})"
+            changes.append(f"  {key}: {before} → {after}{delta}")
+    for key in RESOURCE_KEYS:
+        before = (previous.get('resources') or {}).get(key)
+        after = profile['resources'][key]
+        if before != after:
+            changes.append(f"  {key}: {before} → {after}")
+    print_info("Changes since previous profile:" if changes else "No capacity changes since previous profile")
+    for line in changes:
+        print(line)
+
+
+def print_plan(result):
+    per_replica = result['per_replica']
+    resources = result['resources']
+    node = result['node']
+    print_step("Capacity plan")
+    print(f"  route mix:          {', '.join(f'{r} {s:.0%}' for r, s in result['inputs']['mix'].items())}")
+    print(f"  per-replica:        {per_replica['rps']} rps (limited by {per_replica['limited_by']}; "
+          f"cpu {per_replica['cpu_bound_rps']} rps, latency {per_replica['latency_bound_rps'] or '∞'} rps)")
+    print(f"  resources:          cpu {resources['cpu_request']}/{resources['cpu_limit']}, "
+          f"memory {resources['memory_request']}/{resources['memory_limit']} (request/limit)")
+    print(f"  replicas:           {result['replicas']} for {result['inputs']['target_rps']:g} rps "
+          f"at p99 ≤ {result['inputs']['p99_ms']:g} ms")
+    print(f"  node requirement:   {node['required_cpu_millicores']}m CPU, {node['required_memory_mb']} MB "
+          f"(incl. k3s/OS and one surge pod)")
+    if node['current_fits']:
+        print_success(f"{node['current']} fits")
+    else:
+        print_error(f"{node['current']} does not fit; smallest fitting type: {node['recommended'] or 'none (scale out nodes)'}")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='capacity_planner', description='AuthCore capacity planner')
+    parser.add_argument('--input', required=True, help="부하 테스트 결과 JSON")
+    parser.add_argument('--metrics', help="/metrics 스냅샷 (라우트 비율 계산)")
+    parser.add_argument('--target-rps', type=float, default=None, help="목표 RPS (기본: 입력의 traffic.peak_rps)")
+    parser.add_argument('--p99-ms', type=float, default=500, help="p99 지연 목표 (ms)")
+    parser.add_argument('--cpu-limit', type=int, default=200, help="Pod CPU limit (밀리코어)")
+    parser.add_argument('--bcrypt-cost', type=int, default=None, help="계획 bcrypt cost (기본: 측정 당시 값)")
+    parser.add_argument('--utilization', type=float, default=0.7, help="HPA 목표 사용률")
+    parser.add_argument('--min-replicas', type=int, default=2)
+    parser.add_argument('--node-type', default=os.getenv('NODE_INSTANCE_TYPE', 't3.small'), choices=sorted(NODE_TYPES))
+    parser.add_argument('--profile', default=os.path.join(project_root(), 'k8s', 'capacity-profile.json'))
+    parser.add_argument('--report', default=os.path.join(project_root(), '.capacity_plan.json'))
+    parser.add_argument('--dry-run', action='store_true', help="프로파일을 쓰지 않고 결과만 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """메인 함수"""
+    options = parse_args(sys.argv[1:] if argv is None else argv)
+    with open(options.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    options.mix = route_mix_from_metrics(options.metrics) if options.metrics else None
+
+    result = plan(data, options)
+    print_plan(result)
+
+    previous = None
+    if os.path.exists(options.profile):
+        with open(options.profile, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    profile = to_profile(result, previous, f"{GENERATED_SOURCE} ({os.path.basename(options.input)})")
+    print_changes(previous, profile)
+
+    with open(options.report, 'w', encoding='utf-8') as f:
+        json.dump({**result, 'profile': profile}, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    print_info(f"Plan written to {options.report}")
+
+    if options.dry_run:
+        print_info("Dry run, capacity profile not updated")
+        return
+    with open(options.profile, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    print_success(f"Capacity profile updated: {options.profile} (applied by the next deploy)")
+
+
+if __name__ == '__main__':
+    run_main(main)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+배포 스크립트 공통 유틸리티 (출력, 명령 실행, 공유 컨텍스트, 단계별 시간 측정)
+
+boto3 같은 무거운 모듈은 여기서 import하지 않는다. 실제로 AWS 클라이언트가 필요한 시점에
+DeployContext가 한 번만 import하고 세션/클라이언트를 캐시한다.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# 색상 출력
+class Colors:
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    YELLOW = '\033[1;33m'
+    BLUE = '\033[0;34m'
+    NC = '\033[0m'  # No Color
+
+def print_success(msg):
+    print(f"{Colors.GREEN}✅ {msg}{Colors.NC}")
+
+def print_error(msg):
+    print(f"{Colors.RED}❌ {msg}{Colors.NC}")
+
+def print_info(msg):
+    print(f"{Colors.YELLOW}📋 {msg}{Colors.NC}")
+
+def print_step(msg):
+    print(f"{Colors.BLUE}🚀 {msg}{Colors.NC}")
+
+def run_command(cmd, env=None, cwd=None, timeout=None):
+    """명령어 실행 (성공 여부, stdout, stderr 반환)"""
+    try:
+        result = subprocess.run(
+            cmd,
+            shell=True,
+            capture_output=True,
+            text=True,
+            env=env if env else os.environ,
+            cwd=cwd,
+            timeout=timeout
+        )
+        return result.returncode == 0, result.stdout.strip(), result.stderr.strip()
+    except subprocess.TimeoutExpired:
+        return False, '', f"timed out after {timeout}s: {cmd}"
+    except OSError as e:
+        return False, '', str(e)
+
+def kubectl_bin():
+    """kubectl 실행 파일 (KUBECTL로 테스트용 가짜 kubectl 지정 가능, KUBE_CONTEXT가 있으면 해당 컨텍스트 사용)"""
+    binary = os.getenv('KUBECTL', 'kubectl')
+    context = os.getenv('KUBE_CONTEXT', '')
+    return f"{binary} --context={context}" if context else binary
+
+def project_root():
+    """프로젝트 루트 디렉토리"""
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class PhaseTimer:
+    """단계별 소요 시간 기록"""
+
+    def __init__(self):
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        """with 블록 하나를 단계 하나로 측정 (예외/종료 시에도 기록)"""
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.phases.append({
+                'name': name,
+                'seconds': round(time.perf_counter() - started, 3),
+                'ok': ok
+            })
+
+    def print_report(self, title='Timing'):
+        """단계별 소요 시간 표 출력"""
+        if not self.phases:
+            return
+        width = max(len(p['name']) for p in self.phases)
+        print()
+        print_info(f"{title}:")
+        for p in self.phases:
+            status = 'ok' if p['ok'] else 'FAILED'
+            print(f"  {p['name']:<{width}}  {p['seconds']:>8.3f}s  {status}")
+        total = sum(p['seconds'] for p in self.phases)
+        print(f"  {'total':<{width}}  {total:>8.3f}s")
+
+
+class DeployContext:
+    """
+    한 프로세스 안에서 여러 단계(build → setup → deploy → gateway)가 공유하는 상태
+
+    - boto3는 처음 필요할 때 한 번만 import하고 세션/서비스별 클라이언트를 캐시한다
+    - values에는 앞 단계에서 확정된 값(image_uri, ec2_ip 등)을 담아 다음 단계가 다시 조회하지 않게 한다
+    - clients로 미리 만든(가짜) 클라이언트를 넘기면 boto3 없이도 실행된다
+    """
+
+    def __init__(self, region=None, clients=None):
+        self.region = region or os.getenv('AWS_REGION', 'ap-northeast-2')
+        self.values = {}
+        self.timer = PhaseTimer()
+        self._session = None
+        self._clients = dict(clients or {})
+        # boto3 세션은 스레드 안전하지 않으므로 클라이언트 생성은 직렬화 (생성된 클라이언트는 스레드 안전)
+        self._lock = threading.RLock()
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                with self.timer.phase('import boto3'):
+                    import boto3
+                    self._session = boto3.session.Session(region_name=self.region)
+            return self._session
+
+    def client(self, service):
+        """서비스별 boto3 클라이언트 (프로세스 내 재사용)"""
+        with self._lock:
+            if service not in self._clients:
+                session = self.session
+                with self.timer.phase(f"client {service}"):
+                    self._clients[service] = session.client(service)
+            return self._clients[service]
+
+
+def run_main(main):
+    """스크립트 단독 실행 진입점 (공통 예외 처리)"""
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted by user")
+        sys.exit(1)
+    except Exception as e:
+        print_error(f"Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
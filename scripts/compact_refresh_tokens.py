@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+RefreshTokens 테이블의 폐기·만료 토큰 정리 (유지보수 작업)
+
+서비스는 이제 회전·로그아웃·세션 상한 초과 시 토큰을 바로 삭제하지만, 이전 버전이 남긴
+is_revoked 항목과 TTL 삭제를 기다리는 만료 항목은 user-id-index에 남아 사용자별 조회와
+저장/인덱스 비용을 키운다. 병렬 Scan 세그먼트로 이런 항목을 찾아 BatchWriteItem으로 삭제하고,
+삭제한 항목 수와 회수한 바이트를 보고한다.
+
+- 이벤트 피드 파티션(user_id = __event_feed__#<구간>) 항목은 건너뛴다 (피드 이벤트는 is_revoked가 항상 true)
+- 읽기/쓰기 용량 예산(--read-capacity, --write-capacity)을 지키고, 세그먼트별 진행 상황을 체크포인트에
+  기록해 중단 후 같은 명령으로 이어서 실행한다
+- DRY_RUN=true(또는 --dry-run)이면 삭제하지 않고 대상만 집계한다
+
+사용 예:
+    python scripts/compact_refresh_tokens.py --dry-run
+    python scripts/compact_refresh_tokens.py --segments 8 --write-capacity 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from common import print_info, print_step, print_success, project_root, run_main
+from dynamo_bulk import (
+    BATCH_SIZE,
+    PROGRESS_INTERVAL_SECONDS,
+    CapacityLimiter,
+    Checkpoint,
+    consumed_units,
+    create_dynamodb_client,
+    item_size,
+    write_requests,
+)
+
+# src/config/constants.js의 EVENT_FEED와 동일해야 함
+EVENT_FEED_PARTITION = '__event_feed__'
+EVENT_FEED_ITEM_TYPE = 'feed_event'
+
+REPORT_PATH = os.path.join(project_root(), '.compaction_report.json')
+TOP_USERS = 10
+
+
+class CompactionStats:
+    """세그먼트 스레드가 함께 갱신하는 집계 (스레드 안전)"""
+
+    def __init__(self, read_limiter, write_limiter):
+        self.read_limiter = read_limiter
+        self.write_limiter = write_limiter
+        self.scanned = 0
+        self.deleted = Counter()
+        self.bytes = Counter()
+        self.users = Counter()
+        self.started = time.monotonic()
+        self._printed = self.started
+        self._lock = threading.Lock()
+
+    def add(self, scanned, candidates):
+        with self._lock:
+            self.scanned += scanned
+            for reason, item in candidates:
+                self.deleted[reason] += 1
+                self.bytes[reason] += item_size(item)
+                self.users[item['user_id']['S']] += 1
+            now = time.monotonic()
+            if now - self._printed < PROGRESS_INTERVAL_SECONDS:
+                return
+            self._printed = now
+        self.report()
+
+    def report(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        print(f"  scanned {self.scanned:,} ({self.scanned / elapsed:,.0f}/s), "
+              f"reclaimable {sum(self.deleted.values()):,} items / {sum(self.bytes.values()):,} bytes, "
+              f"{self.read_limiter.consumed:,.1f} RCU, {self.write_limiter.consumed:,.1f} WCU")
+
+    def merge(self, state):
+        """재개 시 체크포인트에 저장된 세그먼트 집계를 더함"""
+        with self._lock:
+            self.scanned += state['scanned']
+            self.deleted.update(state['deleted'])
+            self.bytes.update(state['bytes'])
+
+    def summary(self):
+        return {
+            'scanned': self.scanned,
+            'deleted': dict(self.deleted),
+            'bytes_reclaimed': dict(self.bytes),
+            'total_deleted': sum(self.deleted.values()),
+            'total_bytes_reclaimed': sum(self.bytes.values()),
+            # 이번 실행에서 항목이 가장 많이 쌓여 있던 사용자 (재개 이전 세그먼트 제외)
+            'top_users': self.users.most_common(TOP_USERS),
+            'read_capacity_units': round(self.read_limiter.consumed, 1),
+            'write_capacity_units': round(self.write_limiter.consumed, 1),
+            'seconds': round(time.monotonic() - self.started, 1),
+        }
+
+
+def classify(item, now_seconds):
+    """정리 대상이면 사유(revoked | expired), 아니면 None"""
+    if item.get('user_id', {}).get('S', '').startswith(EVENT_FEED_PARTITION):
+        return None
+    if item.get('item_type', {}).get('S') == EVENT_FEED_ITEM_TYPE:
+        return None
+    if item.get('is_revoked', {}).get('BOOL'):
+        return 'revoked'
+    expires_at = item.get('expires_at', {}).get('N')
+    if expires_at is not None and int(float(expires_at)) <= now_seconds:
+        return 'expired'
+    return None
+
+
+def compact_segment(client, table, segment, total_segments, page_size, dry_run,
+                    read_limiter, write_limiter, checkpoint, stats, max_retries):
+    """
+    Scan 세그먼트 하나 정리
+
+    페이지 안의 대상을 모두 삭제한 뒤에 LastEvaluatedKey와 세그먼트 집계를 체크포인트에 기록하므로,
+    중단되면 마지막으로 끝난 페이지 다음부터 다시 Scan한다 (이미 지운 항목은 다시 나오지 않음).
+    """
+    key = f"compact:{table}:{segment}/{total_segments}"
+    state = checkpoint.get(key) or {
+        'last_key': None, 'scanned': 0, 'deleted': {}, 'bytes': {}, 'done': False,
+    }
+    if state['scanned']:
+        stats.merge(state)
+    if state['done']:
+        return
+
+    while True:
+        request = {
+            'TableName': table,
+            'Segment': segment,
+            'TotalSegments': total_segments,
+            'Limit': page_size,
+            'ReturnConsumedCapacity': 'TOTAL',
+        }
+        if state['last_key']:
+            request['ExclusiveStartKey'] = state['last_key']
+        read_limiter.acquire(1)
+        response = client.scan(**request)
+        read_limiter.settle(1, consumed_units(response, 1))
+
+        now_seconds = int(time.time())
+        items = response.get('Items', [])
+        candidates = [(reason, item) for item in items for reason in [classify(item, now_seconds)] if reason]
+
+        if not dry_run:
+            for offset in range(0, len(candidates), BATCH_SIZE):
+                requests = [
+                    {'DeleteRequest': {'Key': {'token_id': item['token_id']}}}
+                    for _, item in candidates[offset:offset + BATCH_SIZE]
+                ]
+                write_requests(client, table, requests, write_limiter, max_retries)
+
+        deleted = Counter(state['deleted'])
+        reclaimed = Counter(state['bytes'])
+        for reason, item in candidates:
+            deleted[reason] += 1
+            reclaimed[reason] += item_size(item)
+        state = {
+            'last_key': response.get('LastEvaluatedKey'),
+            'scanned': state['scanned'] + len(items),
+            'deleted': dict(deleted),
+            'bytes': dict(reclaimed),
+            'done': 'LastEvaluatedKey' not in response,
+        }
+        # 삭제한 항목은 다시 Scan되지 않으므로 집계가 빠지지 않도록 페이지마다 저장 (dry run은 재개 대상 아님)
+        if not dry_run:
+            checkpoint.set(key, state, force=True)
+        stats.add(len(items), candidates)
+        if state['done']:
+            return
+
+
+def print_summary(summary, dry_run):
+    print_info("Compaction summary:" + (" (dry run, nothing deleted)" if dry_run else ""))
+    print(f"  Scanned items: {summary['scanned']:,}")
+    for reason in ('revoked', 'expired'):
+        print(f"  {reason:<8} {summary['deleted'].get(reason, 0):>10,} items  "
+              f"{summary['bytes_reclaimed'].get(reason, 0):>14,} bytes")
+    print(f"  {'total':<8} {summary['total_deleted']:>10,} items  {summary['total_bytes_reclaimed']:>14,} bytes")
+    print(f"  Capacity consumed: {summary['read_capacity_units']:,} RCU, {summary['write_capacity_units']:,} WCU")
+    if summary['top_users']:
+        print("  Users with the most reclaimable items:")
+        for user_id, count in summary['top_users']:
+            print(f"    {user_id}  {count:,}")
+
+
+def parse_args(argv):
+    dry_run_default = os.getenv('DRY_RUN', 'false').lower() == 'true'
+    parser = argparse.ArgumentParser(prog='compact_refresh_tokens', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--table', default=os.getenv('REFRESH_TOKENS_TABLE', 'AuthCore_RefreshTokens'))
+    parser.add_argument('--region', default=os.getenv('AWS_REGION', 'ap-northeast-2'))
+    parser.add_argument('--endpoint-url', default=os.getenv('DYNAMODB_ENDPOINT', ''))
+    parser.add_argument('--segments', type=int, default=int(os.getenv('COMPACTION_SEGMENTS', '4')),
+                        help="병렬 Scan 세그먼트 수")
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--read-capacity', type=float, default=float(os.getenv('COMPACTION_READ_CAPACITY', '0')),
+                        help="초당 최대 읽기 용량 단위 (0 = 제한 없음)")
+    parser.add_argument('--write-capacity', type=float, default=float(os.getenv('COMPACTION_WRITE_CAPACITY', '0')),
+                        help="초당 최대 쓰기 용량 단위 (0 = 제한 없음)")
+    parser.add_argument('--max-retries', type=int, default=8, help="UnprocessedItems 재시도 횟수")
+    parser.add_argument('--checkpoint', default=os.path.join(project_root(), '.dynamo_bulk_checkpoint.json'))
+    parser.add_argument('--restart', action='store_true', help="이 테이블의 체크포인트를 무시하고 처음부터")
+    parser.add_argument('--dry-run', action='store_true', default=dry_run_default)
+    parser.add_argument('--report', default=REPORT_PATH, help="요약 JSON 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """메인 함수"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    print_step(f"Compacting revoked and expired refresh tokens in {args.table}...")
+    print_info("Configuration:")
+    print(f"  Endpoint: {args.endpoint_url or f'AWS ({args.region})'}")
+    print(f"  Segments: {args.segments}")
+    print(f"  Capacity budget: {args.read_capacity or 'unlimited'} RCU/s, {args.write_capacity or 'unlimited'} WCU/s")
+    print(f"  Dry Run: {args.dry_run}")
+
+    client = create_dynamodb_client(args.region, args.endpoint_url, args.segments)
+    # dry run은 진행 상황을 읽지도 남기지도 않음 (실제 실행이 dry run 결과부터 이어가지 않도록)
+    restart = (f"compact:{args.table}:",) if args.restart else ()
+    checkpoint = Checkpoint(None if args.dry_run else args.checkpoint, restart=restart)
+    read_limiter = CapacityLimiter(args.read_capacity)
+    write_limiter = CapacityLimiter(args.write_capacity)
+    stats = CompactionStats(read_limiter, write_limiter)
+
+    with ThreadPoolExecutor(max_workers=args.segments) as executor:
+        futures = [
+            executor.submit(
+                compact_segment, client, args.table, segment, args.segments, args.page_size, args.dry_run,
+                read_limiter, write_limiter, checkpoint, stats, args.max_retries,
+            )
+            for segment in range(args.segments)
+        ]
+        for future in futures:
+            future.result()
+
+    summary = stats.summary()
+    print_summary(summary, args.dry_run)
+    with open(args.report, 'w') as f:
+        json.dump({
+            'table': args.table,
+            'dry_run': args.dry_run,
+            'finished_at': datetime.now(timezone.utc).isoformat(),
+            **summary,
+        }, f, indent=2)
+
+    if not args.dry_run:
+        # 다음 실행은 처음부터 다시 Scan
+        checkpoint.discard(f"compact:{args.table}:{segment}/{args.segments}" for segment in range(args.segments))
+    print_success(f"Report written to {os.path.relpath(args.report)}")
+
+
+if __name__ == '__main__':
+    run_main(main)
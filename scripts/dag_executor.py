@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+의존성 그래프(DAG)로 정의한 단계를 스레드 풀에서 병렬 실행하는 실행기
+
+- 의존 단계가 모두 성공한 단계부터 바로 실행된다
+- 한 단계가 실패하면 아직 시작하지 않은 단계는 모두 취소되고, 실행 중인 단계만 끝까지 기다린다
+- 실행이 끝나면 단계별 대기/실행 시간과 임계 경로(critical path)를 담은 리포트를 만든다
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# 단계 상태
+PENDING = 'pending'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class DagError(Exception):
+    """DAG 실행 실패 (실패한 단계 이름과 원인 포함)"""
+
+    def __init__(self, failed):
+        self.failed = failed
+        names = ', '.join(f"{name} ({error})" for name, error in failed.items())
+        super().__init__(f"Step(s) failed: {names}")
+
+
+class DagExecutor:
+    """
+    사용 예:
+        dag = DagExecutor(max_workers=4)
+        dag.add('namespace', create_namespace, deps=['cluster'])
+        results = dag.run()
+
+    각 단계 함수는 의존 단계들의 결과를 담은 dict 하나를 인자로 받는다.
+    listener를 주면 단계 상태가 바뀔 때마다 listener(name, status)가 호출된다
+    ('running'은 작업 스레드에서 호출되므로 listener는 스레드 안전해야 함).
+    """
+
+    def __init__(self, max_workers=4, listener=None):
+        self.max_workers = max_workers
+        self.listener = listener
+        self.steps = {}
+        self.order = []
+        self.records = {}
+        self.started_at = None
+        self.finished_at = None
+
+    def add(self, name, fn, deps=()):
+        """단계 추가 (의존 단계는 먼저 추가되어 있어야 함 → 순환 불가)"""
+        if name in self.steps:
+            raise ValueError(f"Duplicate step: {name}")
+        for dep in deps:
+            if dep not in self.steps:
+                raise ValueError(f"Unknown dependency '{dep}' for step '{name}'")
+        self.steps[name] = {'fn': fn, 'deps': list(deps)}
+        self.order.append(name)
+        return self
+
+    def _notify(self, name, status):
+        if self.listener:
+            self.listener(name, status)
+
+    def _execute(self, name, inputs):
+        record = self.records[name]
+        record['started_at'] = time.perf_counter()
+        self._notify(name, RUNNING)
+        try:
+            return self.steps[name]['fn'](inputs)
+        finally:
+            record['finished_at'] = time.perf_counter()
+
+    def run(self):
+        """모든 단계 실행 (실패 시 DagError). 단계 이름 → 반환값 dict 반환"""
+        self.started_at = time.perf_counter()
+        self.records = {
+            name: {'status': PENDING, 'ready_at': None, 'started_at': None, 'finished_at': None, 'error': None}
+            for name in self.order
+        }
+        results = {}
+        failed = {}
+        running = {}
+
+        def ready_steps():
+            for name in self.order:
+                record = self.records[name]
+                if record['status'] != PENDING or record['ready_at'] is not None:
+                    continue
+                if all(self.records[dep]['status'] == SUCCEEDED for dep in self.steps[name]['deps']):
+                    yield name
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                if not failed:
+                    for name in list(ready_steps()):
+                        self.records[name]['ready_at'] = time.perf_counter()
+                        inputs = {dep: results[dep] for dep in self.steps[name]['deps']}
+                        running[pool.submit(self._execute, name, inputs)] = name
+
+                if not running:
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    record = self.records[name]
+                    try:
+                        value = future.result()
+                    except BaseException as e:  # sys.exit()도 단계 실패로 처리
+                        if isinstance(e, KeyboardInterrupt):
+                            raise
+                        record['status'] = FAILED
+                        record['error'] = _describe(e)
+                        failed[name] = record['error']
+                    else:
+                        record['status'] = SUCCEEDED
+                        results[name] = value
+                    self._notify(name, record['status'])
+
+        # 실패로 시작하지 못한 단계는 취소 처리
+        for name in self.order:
+            if self.records[name]['status'] == PENDING:
+                self.records[name]['status'] = CANCELLED
+                self._notify(name, CANCELLED)
+
+        self.finished_at = time.perf_counter()
+        if failed:
+            raise DagError(failed)
+        return results
+
+    def critical_path(self):
+        """가장 늦게 끝난 단계부터 가장 늦게 끝난 의존 단계를 거슬러 올라간 경로"""
+        finished = {
+            name: record['finished_at']
+            for name, record in self.records.items()
+            if record['finished_at'] is not None
+        }
+        if not finished:
+            return []
+
+        path = [max(finished, key=finished.get)]
+        while True:
+            deps = [dep for dep in self.steps[path[-1]]['deps'] if dep in finished]
+            if not deps:
+                break
+            path.append(max(deps, key=finished.get))
+        return list(reversed(path))
+
+    def report(self):
+        """단계별 시간 리포트 (초 단위, 실행 시작 기준 상대 시각)"""
+        def offset(value):
+            return None if value is None else round(value - self.started_at, 3)
+
+        steps = []
+        for name in self.order:
+            record = self.records.get(name, {})
+            started, finished, ready = record.get('started_at'), record.get('finished_at'), record.get('ready_at')
+            steps.append({
+                'name': name,
+                'deps': self.steps[name]['deps'],
+                'status': record.get('status', PENDING),
+                'ready_at': offset(ready),
+                'started_at': offset(started),
+                'finished_at': offset(finished),
+                # 의존 단계가 끝난 뒤 스레드를 기다린 시간
+                'wait_seconds': round(started - ready, 3) if started and ready else None,
+                'wall_seconds': round(finished - started, 3) if started and finished else None,
+                'error': record.get('error'),
+            })
+
+        total = round((self.finished_at or time.perf_counter()) - self.started_at, 3) if self.started_at else 0
+        critical = self.critical_path()
+        return {
+            'total_seconds': total,
+            'max_workers': self.max_workers,
+            'critical_path': critical,
+            'critical_path_seconds': round(
+                sum(s['wall_seconds'] or 0 for s in steps if s['name'] in critical), 3
+            ),
+            'steps': steps,
+        }
+
+    def write_report(self, path, extra=None):
+        """리포트를 JSON 파일로 저장"""
+        report = self.report()
+        if extra:
+            report.update(extra)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        return report
+
+
+def _describe(error):
+    if isinstance(error, SystemExit):
+        return f"exited with code {error.code}"
+    return f"{type(error).__name__}: {error}"
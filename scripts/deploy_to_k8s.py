@@ -1,53 +1,50 @@
 #!/usr/bin/env python3
 """
 Kubernetes에 애플리케이션을 배포하는 스크립트
+
+사용 예:
+    python scripts/deploy_to_k8s.py
+    python scripts/deploy_to_k8s.py --strategy canary --max-workers 8
 """
 
+import argparse
+import base64
 import os
 import re
 import subprocess
 import sys
 import json
-import boto3
+import tempfile
+import time
 from pathlib import Path
 
-# 색상 출력
-class Colors:
-    RED = '\033[0;31m'
-    GREEN = '\033[0;32m'
-    YELLOW = '\033[1;33m'
-    NC = '\033[0m'
-
-def print_success(msg):
-    print(f"{Colors.GREEN}✅ {msg}{Colors.NC}")
-
-def print_error(msg):
-    print(f"{Colors.RED}❌ {msg}{Colors.NC}")
-
-def print_info(msg):
-    print(f"{Colors.YELLOW}📋 {msg}{Colors.NC}")
+from common import DeployContext, print_success, print_error, print_info, kubectl_bin, project_root, run_main
+from dag_executor import DagExecutor, DagError
+from canary import parse_prometheus, run_canary, write_canary_report
+from pod_logs import collect_for_failure, write_report
+import scaling
 
 def run_kubectl(cmd, check=True):
-    """kubectl 명령어 실행"""
+    """kubectl 명령어 실행 (실패 시 None, check=True면 에러 출력)"""
     kubeconfig = os.path.expanduser(os.getenv('KUBECONFIG', '~/.kube/config'))
     env = os.environ.copy()
     env['KUBECONFIG'] = kubeconfig
     
-    try:
-        result = subprocess.run(
-            f"kubectl {cmd}",
-            shell=True,
-            check=check,
-            capture_output=True,
-            text=True,
-            env=env
-        )
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        print_error(f"kubectl command failed: {cmd}")
-        if e.stderr:
-            print_error(e.stderr)
+    result = subprocess.run(
+        f"{kubectl_bin()} {cmd}",
+        shell=True,
+        capture_output=True,
+        text=True,
+        env=env
+    )
+    if result.returncode != 0:
+        # check=False여도 None을 반환해야 호출부의 실패 판정(result is None)이 동작함
+        if check:
+            print_error(f"kubectl command failed: {cmd}")
+            if result.stderr:
+                print_error(result.stderr.strip())
         return None
+    return result.stdout.strip()
 
 def run_kubectl_with_output(cmd, check=True):
     """kubectl 명령어 실행 (성공/실패 여부와 출력 반환)"""
@@ -57,7 +54,7 @@ def run_kubectl_with_output(cmd, check=True):
     
     try:
         result = subprocess.run(
-            f"kubectl {cmd}",
+            f"{kubectl_bin()} {cmd}",
             shell=True,
             check=check,
             capture_output=True,
@@ -71,7 +68,7 @@ def run_kubectl_with_output(cmd, check=True):
 def check_kubectl():
     """kubectl 설치 확인"""
     try:
-        subprocess.run("kubectl version --client", shell=True, check=True, capture_output=True)
+        subprocess.run(f"{kubectl_bin()} version --client", shell=True, check=True, capture_output=True)
         return True
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
@@ -95,7 +92,6 @@ kind: Namespace
 metadata:
   name: {namespace}
 """
-        import tempfile
         with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
             f.write(namespace_yaml)
             temp_file = f.name
@@ -114,27 +110,21 @@ metadata:
     else:
         print_info(f"Namespace '{namespace}' already exists")
 
-def create_ecr_secret(namespace, aws_region, ecr_repository_url):
-    """ECR 인증을 위한 imagePullSecret 생성"""
-    print_info("Creating ECR imagePullSecret...")
-    
-    # ECR 로그인 토큰 가져오기
+def get_ecr_docker_config(ecr_client, ecr_repository_url):
+    """ECR 로그인 토큰으로 imagePullSecret용 Docker config 생성 (실패 시 None)"""
+    print_info("Getting ECR authorization token...")
     try:
-        import boto3
-        ecr_client = boto3.client('ecr', region_name=aws_region)
         token_response = ecr_client.get_authorization_token()
         token = token_response['authorizationData'][0]['authorizationToken']
         
         # Base64 디코딩하여 username:password 분리
-        import base64
         decoded = base64.b64decode(token).decode('utf-8')
         username, password = decoded.split(':')
         
         # ECR 레지스트리 URL 추출
         registry = ecr_repository_url.split('/')[0]
         
-        # Docker config JSON 생성
-        docker_config = {
+        return {
             "auths": {
                 registry: {
                     "username": username,
@@ -143,8 +133,15 @@ def create_ecr_secret(namespace, aws_region, ecr_repository_url):
                 }
             }
         }
-        
-        import json
+    except Exception as e:
+        print_error(f"Failed to get ECR authorization token: {e}")
+        return None
+
+def create_ecr_secret(namespace, docker_config):
+    """ECR 인증을 위한 imagePullSecret 생성"""
+    print_info("Creating ECR imagePullSecret...")
+    
+    try:
         docker_config_json = json.dumps(docker_config)
         
         # Kubernetes Secret 생성
@@ -155,7 +152,6 @@ def create_ecr_secret(namespace, aws_region, ecr_repository_url):
         )
         
         # base64 인코딩
-        import base64
         docker_config_b64 = base64.b64encode(docker_config_json.encode('utf-8')).decode('utf-8')
         
         # Secret YAML 생성
@@ -169,7 +165,6 @@ data:
   .dockerconfigjson: {docker_config_b64}
 """
         
-        import tempfile
         with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
             f.write(secret_yaml)
             temp_file = f.name
@@ -190,48 +185,247 @@ data:
         print_error(f"Failed to create ECR secret: {e}")
         return False
 
-def create_secrets(namespace, jwt_secret):
-    """Secret 생성"""
-    print_info("Creating secrets...")
-    # 기존 Secret 삭제 후 재생성 (업데이트를 위해)
-    run_kubectl(f"delete secret authcore-secrets -n {namespace} --ignore-not-found=true", check=False)
+# 재시작 없이 반영되는 ConfigMap 키 (src/config/runtimeConfig.js의 TUNABLES와 같아야 함).
+# 배포 환경에 설정된 것만 덮어쓰고, 설정되지 않은 키는 클러스터의 현재 값을 유지 (지우려면 --unset)
+RUNTIME_TUNABLES = (
+    'RATE_LIMIT_MAX', 'MAX_SESSIONS_PER_USER', 'PASSWORD_HASH_COST', 'LOG_LEVEL',
+    'ADMISSION_LAG_EXPENSIVE_MS', 'ADMISSION_LAG_CHEAP_MS',
+    'ADMISSION_MAX_INFLIGHT_EXPENSIVE', 'ADMISSION_MAX_INFLIGHT_CHEAP',
+)
+# 마지막 JWT 키 교체 시각 (Unix timestamp). 이전 키는 refresh token 수명(7일)이 지나면 제거
+JWT_ROTATED_AT_ANNOTATION = 'authcore/jwt-rotated-at'
+JWT_PREVIOUS_RETENTION_SECONDS = 7 * 24 * 3600
+METRICS_PORT = 4000
+
+def unset_keys_from_env():
+    """RUNTIME_CONFIG_UNSET(쉼표 구분)에 지정한 키 (ConfigMap/Secret에서 명시적으로 지울 키)"""
+    return [key.strip() for key in os.getenv('RUNTIME_CONFIG_UNSET', '').split(',') if key.strip()]
+
+def merge_object_data(existing, provided, unset, kind):
+    """
+    현재 값에 이번에 지정한 키만 덮어쓰고 unset 키를 지운 결과
+
+    배포나 config 실행에서 한 값만 바꿔도 나머지 키가 사라지지 않도록 한다.
+    같은 키를 지정하면서 지우라고 하면 어느 쪽이 의도인지 알 수 없으므로 종료한다.
+    """
+    conflicts = sorted(set(provided) & set(unset))
+    if conflicts:
+        print_error(f"Keys both set and unset for {kind}: {', '.join(conflicts)}")
+        sys.exit(1)
+    merged = {**(existing or {}), **provided}
+    removed = sorted(key for key in unset if key in merged)
+    for key in removed:
+        del merged[key]
+    if removed:
+        print_info(f"Removing from {kind}: {', '.join(removed)}")
+    return merged
+
+def put_document(document):
+    """
+    Python에서 생성한 매니페스트(dict)로 객체 전체 교체 (없으면 생성)
+
+    삭제 후 재생성과 달리 객체가 없는 순간이 없어 마운트한 Pod가 계속 마지막 값을 보고,
+    apply와 달리 빠진 키도 지워진다 (JWT_SECRET_PREVIOUS 제거).
+    """
+    kind = f"{document['kind']}/{document['metadata']['name']}"
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+        json.dump(document, f)
+        temp_file = f.name
     
-    # JWT_SECRET에 특수문자가 있을 수 있으므로 이스케이프 처리
-    escaped_secret = str(jwt_secret).replace('"', '\\"').replace("'", "\\'").replace('$', '\\$')
-    result = run_kubectl(
-        f"create secret generic authcore-secrets "
-        f"--from-literal=JWT_SECRET=\"{escaped_secret}\" "
-        f"--namespace={namespace}",
+    try:
+        # check=False면 종료 코드와 무관하게 성공으로 반환되므로 실패를 받으려면 check=True
+        success, stdout, stderr = run_kubectl_with_output(f"replace -f {temp_file}")
+        if not success and 'NotFound' in (stderr or ''):
+            success, stdout, stderr = run_kubectl_with_output(f"create -f {temp_file}")
+        if not success:
+            print_error(f"Failed to update {kind}: {stderr}")
+            sys.exit(1)
+        print_success(f"Updated {kind}")
+    finally:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+
+def get_object_data(namespace, kind, name):
+    """ConfigMap/Secret의 현재 data와 어노테이션 (없으면 (None, {}), Secret 값은 디코딩)"""
+    result = run_kubectl(f"get {kind} {name} -n {namespace} -o json", check=False)
+    if not result:
+        return None, {}
+    document = json.loads(result)
+    data = document.get('data') or {}
+    if kind == 'secret':
+        data = {key: base64.b64decode(value).decode('utf-8') for key, value in data.items()}
+    return data, document['metadata'].get('annotations') or {}
+
+def scrape_config_generations(namespace):
+    """실행 중인 Pod별 런타임 설정 세대 (authcore_runtime_config_generation, 메트릭이 없으면 None)"""
+    pods = run_kubectl(
+        f"get pods -n {namespace} -l app=authcore-api --field-selector=status.phase=Running "
+        f"-o jsonpath='{{.items[*].metadata.name}}'",
         check=False
     )
-    if result is None:
-        print_error("Failed to create secret")
-        sys.exit(1)
-    print_success("Secret created successfully")
-
-def create_configmap(namespace, config):
-    """ConfigMap 생성"""
-    print_info("Creating ConfigMap...")
-    # 기존 ConfigMap 삭제 후 재생성 (업데이트를 위해)
-    run_kubectl(f"delete configmap authcore-config -n {namespace} --ignore-not-found=true", check=False)
-    
-    cmd = f"create configmap authcore-config --namespace={namespace}"
-    for key, value in config.items():
-        # 값에 특수문자가 있을 수 있으므로 이스케이프 처리
-        escaped_value = str(value).replace('"', '\\"').replace("'", "\\'").replace('$', '\\$')
-        cmd += f" --from-literal={key}=\"{escaped_value}\""
-    result = run_kubectl(cmd, check=False)
-    if result is None:
-        print_error("Failed to create ConfigMap")
+    generations = {}
+    for pod in (pods or '').split():
+        text = run_kubectl(
+            f"get --raw /api/v1/namespaces/{namespace}/pods/{pod}:{METRICS_PORT}/proxy/metrics",
+            check=False
+        )
+        values = [value for name, _, value in parse_prometheus(text or '') if name == 'authcore_runtime_config_generation']
+        generations[pod] = int(values[0]) if values else None
+    return generations
+
+def wait_for_runtime_config(namespace, before, timeout=None):
+    """
+    before(scrape_config_generations 결과)의 모든 Pod가 새 설정 세대를 적용할 때까지 대기
+
+    kubelet은 동기화 주기(기본 약 1분)마다 마운트된 파일을 갱신한다. 그 사이 새로 뜬 Pod는 처음부터
+    새 값을 읽으므로 확인하지 않고, 런타임 설정을 지원하지 않는 이전 이미지 Pod는 건너뛴다.
+    """
+    timeout = timeout or int(os.getenv('RUNTIME_CONFIG_WAIT_TIMEOUT', '180'))
+    legacy = sorted(pod for pod, generation in before.items() if generation is None)
+    if legacy:
+        print_info(f"Pods without runtime config support (picked up on next rollout): {', '.join(legacy)}")
+    
+    print_info(f"Waiting for pods to load the new runtime config (up to {timeout}s)...")
+    deadline = time.monotonic() + timeout
+    while True:
+        current = scrape_config_generations(namespace)
+        pending = sorted(
+            pod for pod, generation in current.items()
+            if before.get(pod) is not None and (generation is None or generation <= before[pod])
+        )
+        if not pending:
+            print_success("All pods are running the new runtime config")
+            return True
+        if time.monotonic() >= deadline:
+            print_error(f"Pods still on the previous runtime config after {timeout}s: {', '.join(pending)}")
+            return False
+        time.sleep(5)
+
+def render_secret(namespace, data, rotated_at):
+    """authcore-secrets 매니페스트"""
+    metadata = {'name': 'authcore-secrets', 'namespace': namespace}
+    if rotated_at:
+        metadata['annotations'] = {JWT_ROTATED_AT_ANNOTATION: str(rotated_at)}
+    return {
+        'apiVersion': 'v1',
+        'kind': 'Secret',
+        'metadata': metadata,
+        'type': 'Opaque',
+        'data': {
+            key: base64.b64encode(value.encode('utf-8')).decode('ascii')
+            for key, value in data.items() if value
+        },
+    }
+
+def create_secrets(namespace, jwt_secret, unset=()):
+    """
+    Secret 갱신 (값이 같으면 건너뜀, 바뀌었으면 True)
+
+    ADMIN_TOKEN처럼 이번 실행 환경에 없는 키는 현재 값을 유지하고, unset에 지정한 키만 지운다.
+
+    JWT_SECRET이 바뀌면 두 단계로 교체한다. 먼저 새 키를 검증 전용(JWT_SECRET_PREVIOUS)으로 넣고
+    모든 Pod가 반영할 때까지 기다린 뒤 서명 키로 바꾸고, 다시 모든 Pod가 반영할 때까지 기다린다.
+    먼저 갱신된 Pod가 새 키로 서명한 토큰을 아직 갱신되지 않은 Pod도 검증할 수 있어야 하기 때문이다.
+    이전 키는 이후 배포에서 refresh token 수명이 지난 뒤 제거한다.
+    """
+    print_info("Updating secrets...")
+    existing, annotations = get_object_data(namespace, 'secret', 'authcore-secrets')
+    existing = existing or {}
+    if 'JWT_SECRET' in unset:
+        print_error("JWT_SECRET cannot be unset")
         sys.exit(1)
-    print_success("ConfigMap created successfully")
+    provided = {}
+    # 관리 엔드포인트(/admin/*) 토큰: 설정된 경우에만 교체 (없으면 현재 값 유지, 지우려면 --unset ADMIN_TOKEN)
+    admin_token = os.getenv('ADMIN_TOKEN')
+    if admin_token:
+        provided['ADMIN_TOKEN'] = admin_token
+    # JWT 키는 아래 교체 절차가 관리
+    kept = {key: value for key, value in existing.items() if key not in ('JWT_SECRET', 'JWT_SECRET_PREVIOUS')}
+    data = merge_object_data(kept, provided, unset, 'Secret')
+    data['JWT_SECRET'] = str(jwt_secret)
+    
+    rotated_at = annotations.get(JWT_ROTATED_AT_ANNOTATION)
+    current_key = existing.get('JWT_SECRET')
+    previous_key = existing.get('JWT_SECRET_PREVIOUS')
+    if current_key and current_key != data['JWT_SECRET']:
+        print_info("JWT secret changed, rotating in two phases...")
+        before = scrape_config_generations(namespace)
+        # 1단계: 기존 키로 계속 서명하고 새 키는 검증만
+        put_document(render_secret(
+            namespace, {**data, 'JWT_SECRET': current_key, 'JWT_SECRET_PREVIOUS': data['JWT_SECRET']}, rotated_at
+        ))
+        if not wait_for_runtime_config(namespace, before):
+            # 두 키 모두 검증하는 안전한 상태로 남으므로 같은 명령을 다시 실행하면 이어서 교체
+            print_error("JWT rotation stopped before switching the signing key; rerun to finish")
+            sys.exit(1)
+        # 2단계: 새 키로 서명, 기존 키로 발급된 토큰은 계속 검증
+        before = scrape_config_generations(namespace)
+        put_document(render_secret(namespace, {**data, 'JWT_SECRET_PREVIOUS': current_key}, int(time.time())))
+        if not wait_for_runtime_config(namespace, before):
+            print_error("Some pods have not switched to the new JWT signing key yet")
+            sys.exit(1)
+        return True
+    elif previous_key and (not rotated_at or time.time() - int(rotated_at) < JWT_PREVIOUS_RETENTION_SECONDS):
+        data['JWT_SECRET_PREVIOUS'] = previous_key
+    elif previous_key:
+        print_info("Dropping JWT_SECRET_PREVIOUS (older than the refresh token lifetime)")
+    
+    if data == existing:
+        print_success("Secret unchanged")
+        return False
+    put_document(render_secret(namespace, data, rotated_at))
+    return True
+
+def create_configmap(namespace, config, unset=()):
+    """
+    ConfigMap 갱신 (값이 같으면 건너뜀, 바뀌었으면 True)
+
+    config에 있는 키만 덮어쓰고 나머지는 현재 값을 유지하며, unset에 지정한 키만 지운다.
+    """
+    print_info("Updating ConfigMap...")
+    existing, _ = get_object_data(namespace, 'configmap', 'authcore-config')
+    data = merge_object_data(existing, {key: str(value) for key, value in config.items()}, unset, 'ConfigMap')
+    if data == existing:
+        print_success("ConfigMap unchanged")
+        return False
+    
+    # 런타임 설정이 아닌 키(테이블 이름, 리전 등)는 Pod가 기동할 때만 읽음
+    restart_keys = sorted(
+        key for key in set(data) | set(existing or {})
+        if key not in RUNTIME_TUNABLES and data.get(key) != (existing or {}).get(key)
+    )
+    if existing is not None and restart_keys:
+        print_info(f"Changed keys read only at startup (applied on next rollout): {', '.join(restart_keys)}")
+    put_document({
+        'apiVersion': 'v1',
+        'kind': 'ConfigMap',
+        'metadata': {'name': 'authcore-config', 'namespace': namespace},
+        'data': data,
+    })
+    return True
+
+def build_configmap(aws_region, environment):
+    """authcore-config 내용 (기동 시 읽는 값 + 배포 환경에 설정된 런타임 설정)"""
+    users_table = os.getenv('USERS_TABLE', 'AuthCore_Users')
+    tokens_table = os.getenv('REFRESH_TOKENS_TABLE', 'AuthCore_RefreshTokens')
+    config = {
+        'AWS_REGION': aws_region,
+        'NODE_ENV': environment,
+        'USERS_TABLE': users_table,
+        'REFRESH_TOKENS_TABLE': tokens_table,
+        'USERS_TABLE_NAME': users_table,  # 하위 호환성
+        'REFRESH_TOKENS_TABLE_NAME': tokens_table  # 하위 호환성
+    }
+    for key in RUNTIME_TUNABLES:
+        if os.getenv(key):
+            config[key] = os.getenv(key)
+    return config
 
 def load_image_uri():
     """이미지 URI 로드"""
-    # 프로젝트 루트 디렉토리 찾기
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
-    image_uri_file = project_root / '.image_uri'
+    image_uri_file = Path(project_root()) / '.image_uri'
     
     if image_uri_file.exists():
         try:
@@ -310,6 +504,34 @@ def apply_manifest(file_path, env_vars=None):
             sys.exit(1)
         print_success(f"Manifest applied: {os.path.basename(file_path)}")
 
+def apply_document(document):
+    """Python에서 생성한 매니페스트(dict) 적용"""
+    kind = f"{document['kind']}/{document['metadata']['name']}"
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+        json.dump(document, f)
+        temp_file = f.name
+    
+    try:
+        print_info(f"Applying {kind}")
+        success, stdout, stderr = run_kubectl_with_output(f"apply -f {temp_file}")
+        if not success:
+            print_error(f"Failed to apply {kind}: {stderr}")
+            sys.exit(1)
+        print_success(f"Applied {kind}")
+    finally:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+
+def get_current_replicas(namespace, deployment_name):
+    """현재 Deployment의 replicas (없으면 None)"""
+    result = run_kubectl(
+        f"get deployment {deployment_name} -n {namespace} -o jsonpath='{{.spec.replicas}}'",
+        check=False
+    )
+    return int(result) if result and result.isdigit() else None
+
 def wait_for_deployment(namespace, deployment_name, timeout=300):
     """배포 완료 대기"""
     print_info(f"Waiting for deployment '{deployment_name}' to be ready...")
@@ -324,21 +546,17 @@ def wait_for_deployment(namespace, deployment_name, timeout=300):
         print_info("Checking pod status...")
         # deployment의 label selector 사용 (app=authcore-api)
         run_kubectl(f"get pods -n {namespace} -l app=authcore-api", check=False)
-        # Pod 로그 확인
-        print_info("Checking pod logs (last 20 lines)...")
-        pods_result = run_kubectl(
-            f"get pods -n {namespace} -l app=authcore-api -o jsonpath='{{.items[0].metadata.name}}'",
-            check=False
-        )
-        if pods_result:
-            run_kubectl(f"logs -n {namespace} {pods_result} --tail=20", check=False)
+        # 모든 Pod 로그를 동시에 수집 (재시작한 컨테이너는 이전 로그 포함) + 라우트별 지연 요약
+        print_info("Collecting logs from all pods...")
+        report = collect_for_failure(namespace, selector='app=authcore-api')
+        if report is not None:
+            write_report(report, os.path.join(project_root(), '.pod_logs_report.json'))
         sys.exit(1)
     print_success(f"Deployment '{deployment_name}' is ready")
 
-def get_jwt_secret_from_secrets_manager(secret_arn: str, region: str = 'ap-northeast-2') -> str:
+def get_jwt_secret_from_secrets_manager(client, secret_arn: str) -> str:
     """Secrets Manager에서 JWT Secret 가져오기"""
     try:
-        client = boto3.client('secretsmanager', region_name=region)
         response = client.get_secret_value(SecretId=secret_arn)
         secret_string = response['SecretString']
         
@@ -364,126 +582,236 @@ def get_jwt_secret_from_secrets_manager(secret_arn: str, region: str = 'ap-north
         print_info(f"Failed to get JWT secret from Secrets Manager: {e}")
         return None
 
-def main():
-    """메인 함수"""
-    print("🚀 Deploying to Kubernetes...")
-    
-    kubeconfig = os.path.expanduser(os.getenv('KUBECONFIG', '~/.kube/config'))
-    namespace = os.getenv('NAMESPACE', 'authcore')
-    environment = os.getenv('ENVIRONMENT', 'prod')
-    aws_region = os.getenv('AWS_REGION', 'ap-northeast-2')
-    
-    users_table = os.getenv('USERS_TABLE', 'AuthCore_Users')
-    tokens_table = os.getenv('REFRESH_TOKENS_TABLE', 'AuthCore_RefreshTokens')
-    
+def resolve_jwt_secret(ctx, environment):
+    """JWT Secret 결정 (환경 변수 → Secrets Manager → 기본값)"""
     jwt_secret = os.getenv('JWT_SECRET')
-    if not jwt_secret:
-        secrets_arn = os.getenv('SECRETS_MANAGER_ARN', '')
-        if not secrets_arn:
-            # AWS CLI로 Secrets Manager ARN 조회
-            try:
-                sm = boto3.client('secretsmanager', region_name=aws_region)
-                resp = sm.describe_secret(SecretId=f'authcore/jwt-secret-{environment}')
-                secrets_arn = resp.get('ARN', '')
-            except Exception:
-                pass
-        if secrets_arn:
-            print_info("Getting JWT secret from Secrets Manager...")
-            jwt_secret = get_jwt_secret_from_secrets_manager(secrets_arn, aws_region)
-        if not jwt_secret:
-            jwt_secret = 'your-super-secret-jwt-key-change-this-in-production'
-            print_info("Using default JWT secret. Set JWT_SECRET env or configure Secrets Manager.")
-    
-    # kubectl 확인
-    if not check_kubectl():
-        print_error("kubectl is not installed")
-        sys.exit(1)
+    if jwt_secret:
+        return jwt_secret
     
-    # kubeconfig 확인
-    if not os.path.exists(kubeconfig):
-        print_error(f"kubeconfig not found at {kubeconfig}")
-        print_info("Copy kubeconfig from EC2:")
-        print("   scp ubuntu@<EC2_IP>:/home/ubuntu/.kube/config ~/.kube/config")
-        print_info("Or run: python scripts/setup_k8s.py")
-        sys.exit(1)
+    secrets_arn = os.getenv('SECRETS_MANAGER_ARN', '')
+    if not secrets_arn:
+        # Secrets Manager ARN 조회
+        try:
+            sm = ctx.client('secretsmanager')
+            resp = sm.describe_secret(SecretId=f'authcore/jwt-secret-{environment}')
+            secrets_arn = resp.get('ARN', '')
+        except Exception:
+            pass
+    if secrets_arn:
+        print_info("Getting JWT secret from Secrets Manager...")
+        jwt_secret = get_jwt_secret_from_secrets_manager(ctx.client('secretsmanager'), secrets_arn)
+    if not jwt_secret:
+        jwt_secret = 'your-super-secret-jwt-key-change-this-in-production'
+        print_info("Using default JWT secret. Set JWT_SECRET env or configure Secrets Manager.")
+    return jwt_secret
+
+def build_deploy_dag(ctx, config):
+    """
+    배포 단계를 의존성 그래프로 구성
+
+    AWS 조회(JWT Secret, ECR 토큰), 이미지 URI 확인, kubectl/클러스터 확인은 서로 독립적으로 실행되고,
+    네임스페이스가 생기면 Secret/ConfigMap/ECR Secret/Service가 동시에 적용된다.
+    """
+    namespace = config['namespace']
+    manifests_dir = Path(project_root()) / 'k8s'
+    dag = DagExecutor(max_workers=config['max_workers'])
+    
+    def check_kubectl_step(_):
+        if not check_kubectl():
+            print_error("kubectl is not installed")
+            sys.exit(1)
     
-    # KUBECONFIG 환경 변수 설정
-    os.environ['KUBECONFIG'] = kubeconfig
+    def check_kubeconfig_step(_):
+        if not os.path.exists(config['kubeconfig']):
+            print_error(f"kubeconfig not found at {config['kubeconfig']}")
+            print_info("Copy kubeconfig from EC2:")
+            print("   scp ubuntu@<EC2_IP>:/home/ubuntu/.kube/config ~/.kube/config")
+            print_info("Or run: python scripts/authcore.py setup")
+            sys.exit(1)
     
-    # 클러스터 연결 확인
-    print_info("Checking cluster connection...")
-    if not check_cluster_connection():
-        print_error("Cannot connect to Kubernetes cluster")
-        sys.exit(1)
+    def check_cluster_step(_):
+        print_info("Checking cluster connection...")
+        if not check_cluster_connection():
+            print_error("Cannot connect to Kubernetes cluster")
+            sys.exit(1)
+        print_success("Connected to cluster")
+        run_kubectl("get nodes")
+    
+    def ecr_token_step(_):
+        if not config['ecr_repo_url']:
+            print_info("ECR_REPOSITORY_URI not set. imagePullSecret may be missing.")
+            return None
+        return get_ecr_docker_config(ctx.client('ecr'), config['ecr_repo_url'])
+    
+    def image_uri_step(_):
+        # 같은 프로세스에서 build 단계를 거쳤으면 그 결과 사용
+        image_uri = ctx.values.get('image_uri') or load_image_uri()
+        if not image_uri:
+            print_error("Image URI not found")
+            print_info("Set IMAGE_URI environment variable or run build_and_push.py first")
+            sys.exit(1)
+        print_info(f"Using image: {image_uri}")
+        return image_uri
+    
+    def scaling_step(_):
+        # 용량 프로파일이 없으면 오토스케일링 없이 레플리카 1개 (기존 동작)
+        profile = scaling.load_profile()
+        resources = scaling.container_resources(profile)
+        if not profile:
+            print_info("No capacity profile, deploying a single replica without autoscaling")
+            return {'bounds': None, 'replicas': 1, 'resources': resources}
+        bounds = scaling.compute_bounds(profile)
+        replicas = scaling.initial_replicas(bounds, get_current_replicas(namespace, 'authcore-api'))
+        ctx.values['scaling'] = bounds
+        return {'bounds': bounds, 'replicas': replicas, 'resources': resources}
+    
+    def autoscaling_step(results):
+        bounds = results['scaling']['bounds']
+        if not bounds:
+            return
+        apply_document(scaling.render_hpa(namespace, bounds))
+        apply_document(scaling.render_pdb(namespace))
+    
+    def ecr_secret_step(results):
+        if results['ecr_token']:
+            create_ecr_secret(namespace, results['ecr_token'])
+    
+    def deployment_step(results):
+        deployment_file = manifests_dir / 'deployment.yaml'
+        if not deployment_file.exists():
+            print_error(f"Deployment file not found: {deployment_file}")
+            sys.exit(1)
+        apply_deployment = lambda: apply_manifest(str(deployment_file), {
+            'IMAGE_URI': results['image_uri'],
+            'REPLICAS': results['scaling']['replicas'],
+            **results['scaling']['resources'],
+        })
+        
+        if config['strategy'] == 'canary':
+            report = run_canary(namespace, results['image_uri'], run_kubectl, promote=apply_deployment)
+            write_canary_report(report, config['canary_report'])
+            if report['decision'] == 'rolled_back':
+                print_error(f"Canary rolled back: {report['reason']}")
+                sys.exit(1)
+            if report['decision'] == 'promoted':
+                return
+        
+        print_info("Deploying application...")
+        apply_deployment()
     
-    print_success("Connected to cluster")
-    run_kubectl("get nodes")
+    def service_step(_):
+        service_file = manifests_dir / 'service.yaml'
+        if not service_file.exists():
+            print_error(f"Service file not found: {service_file}")
+            sys.exit(1)
+        print_info("Deploying service...")
+        apply_manifest(str(service_file))
     
-    # 네임스페이스 생성
-    create_namespace(namespace)
+    def rollout_step(_):
+        # 리소스 생성 확인
+        print_info("Verifying resources...")
+        success, stdout, stderr = run_kubectl_with_output(f"get all -n {namespace}")
+        if not success:
+            print_error(f"Failed to verify resources: {stderr}")
+        else:
+            print_info("Resources in namespace:")
+            print(stdout)
+        
+        # 배포 상태 확인
+        wait_for_deployment(namespace, 'authcore-api')
+    
+    dag.add('jwt_secret', lambda _: resolve_jwt_secret(ctx, config['environment']))
+    dag.add('ecr_token', ecr_token_step)
+    dag.add('image_uri', image_uri_step)
+    dag.add('kubectl', check_kubectl_step)
+    dag.add('kubeconfig', check_kubeconfig_step)
+    dag.add('cluster', check_cluster_step, deps=['kubectl', 'kubeconfig'])
+    dag.add('namespace', lambda _: create_namespace(namespace), deps=['cluster'])
+    unset = config.get('unset', ())
+    dag.add('secrets', lambda r: create_secrets(namespace, r['jwt_secret'], unset), deps=['namespace', 'jwt_secret'])
+    dag.add('configmap', lambda _: create_configmap(namespace, config['configmap'], unset), deps=['namespace'])
+    dag.add('ecr_secret', ecr_secret_step, deps=['namespace', 'ecr_token'])
+    dag.add('service', service_step, deps=['namespace'])
+    # 카나리 Pod는 Service를 통해 트래픽을 받으므로 Service가 먼저 적용되어야 함
+    dag.add('scaling', scaling_step, deps=['cluster'])
+    dag.add('autoscaling', autoscaling_step, deps=['namespace', 'scaling'])
+    deployment_deps = ['secrets', 'configmap', 'ecr_secret', 'image_uri', 'scaling']
+    if config['strategy'] == 'canary':
+        deployment_deps.append('service')
+    dag.add('deployment', deployment_step, deps=deployment_deps)
+    dag.add('rollout', rollout_step, deps=['deployment', 'service', 'autoscaling'])
+    return dag
+
+def write_timing_report(dag, path):
+    """단계별 시간 리포트 저장 및 요약 출력 (커밋 간 배포 시간 회귀 추적용)"""
+    try:
+        report = dag.write_report(path, extra={
+            'commit': os.getenv('GITHUB_SHA', ''),
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        })
+    except OSError as e:
+        print_error(f"Failed to write timing report: {e}")
+        return
+    
+    print_info(f"Deploy timing ({report['total_seconds']}s total, report: {path}):")
+    for step in report['steps']:
+        wall = f"{step['wall_seconds']:.3f}s" if step['wall_seconds'] is not None else '-'
+        wait = f"{step['wait_seconds']:.3f}s" if step['wait_seconds'] is not None else '-'
+        print(f"  {step['name']:<12} {step['status']:<10} wall {wall:>9}  wait {wait:>9}")
+    print(f"  critical path: {' → '.join(report['critical_path'])} ({report['critical_path_seconds']}s)")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='deploy_to_k8s', description='Deploy AuthCore to Kubernetes')
+    parser.add_argument('--namespace', default=os.getenv('NAMESPACE', 'authcore'))
+    parser.add_argument('--environment', default=os.getenv('ENVIRONMENT', 'prod'))
+    # rolling: Deployment 전체 교체, canary: 메트릭 비교 후 자동 승격/롤백 (canary.py)
+    parser.add_argument('--strategy', choices=['rolling', 'canary'],
+                        default=os.getenv('DEPLOY_STRATEGY', 'rolling').lower())
+    parser.add_argument('--max-workers', type=int, default=int(os.getenv('DEPLOY_MAX_WORKERS', '4')),
+                        help="동시에 실행할 배포 단계 수")
+    parser.add_argument('--timing-report',
+                        default=os.getenv('DEPLOY_TIMING_REPORT', os.path.join(project_root(), '.deploy_timing.json')))
+    parser.add_argument('--unset', action='append', metavar='KEY', default=unset_keys_from_env(),
+                        help="ConfigMap/Secret에서 지울 키 (반복 가능, 환경 변수 RUNTIME_CONFIG_UNSET)")
+    return parser.parse_args(argv)
+
+def main(ctx=None, argv=None):
+    """메인 함수 (authcore.py에서 호출되면 옵션은 환경 변수로만 받음)"""
+    if argv is None:
+        argv = [] if ctx is not None else sys.argv[1:]
+    args = parse_args(argv)
+    print("🚀 Deploying to Kubernetes...")
+    ctx = ctx or DeployContext()
     
-    ecr_repo_url = os.getenv('ECR_REPOSITORY_URI', '')
-    if ecr_repo_url:
-        create_ecr_secret(namespace, aws_region, ecr_repo_url)
-    else:
-        print_info("ECR_REPOSITORY_URI not set. imagePullSecret may be missing.")
+    kubeconfig = os.path.expanduser(ctx.values.get('kubeconfig') or os.getenv('KUBECONFIG', '~/.kube/config'))
+    namespace = args.namespace
+    environment = args.environment
+    aws_region = ctx.region
     
-    # Secret 생성
-    create_secrets(namespace, jwt_secret)
+    # KUBECONFIG 환경 변수 설정 (모든 kubectl 호출에 적용)
+    os.environ['KUBECONFIG'] = kubeconfig
     
-    # ConfigMap 생성
-    configmap_data = {
-        'AWS_REGION': aws_region,
-        'NODE_ENV': environment,
-        'USERS_TABLE': users_table,
-        'REFRESH_TOKENS_TABLE': tokens_table,
-        'USERS_TABLE_NAME': users_table,  # 하위 호환성
-        'REFRESH_TOKENS_TABLE_NAME': tokens_table  # 하위 호환성
+    config = {
+        'kubeconfig': kubeconfig,
+        'namespace': namespace,
+        'environment': environment,
+        'ecr_repo_url': os.getenv('ECR_REPOSITORY_URI', ''),
+        'max_workers': args.max_workers,
+        'strategy': args.strategy,
+        'canary_report': os.getenv('CANARY_REPORT', os.path.join(project_root(), '.canary_report.json')),
+        'configmap': build_configmap(aws_region, environment),
+        'unset': args.unset,
     }
-    create_configmap(namespace, configmap_data)
-    
-    # 이미지 URI 확인
-    image_uri = load_image_uri()
-    if not image_uri:
-        print_error("Image URI not found")
-        print_info("Set IMAGE_URI environment variable or run build_and_push.py first")
-        sys.exit(1)
-    
-    print_info(f"Using image: {image_uri}")
-    
-    # 프로젝트 루트 디렉토리 찾기
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
-    
-    # Deployment 배포
-    deployment_file = project_root / 'k8s' / 'deployment.yaml'
-    if not deployment_file.exists():
-        print_error(f"Deployment file not found: {deployment_file}")
-        sys.exit(1)
-    
-    print_info("Deploying application...")
-    apply_manifest(str(deployment_file), {'IMAGE_URI': image_uri})
     
-    # Service 배포
-    service_file = project_root / 'k8s' / 'service.yaml'
-    if not service_file.exists():
-        print_error(f"Service file not found: {service_file}")
+    dag = build_deploy_dag(ctx, config)
+    report_path = args.timing_report
+    try:
+        dag.run()
+    except DagError as e:
+        print_error(f"Deployment failed: {e}")
         sys.exit(1)
-    
-    print_info("Deploying service...")
-    apply_manifest(str(service_file))
-    
-    # 리소스 생성 확인
-    print_info("Verifying resources...")
-    success, stdout, stderr = run_kubectl_with_output(f"get all -n {namespace}")
-    if not success:
-        print_error(f"Failed to verify resources: {stderr}")
-    else:
-        print_info("Resources in namespace:")
-        print(stdout)
-    
-    # 배포 상태 확인
-    wait_for_deployment(namespace, 'authcore-api')
+    finally:
+        write_timing_report(dag, report_path)
     
     # 배포 정보 출력
     print_success("Deployment completed!")
@@ -491,6 +819,18 @@ def main():
     run_kubectl(f"get pods -n {namespace}")
     run_kubectl(f"get svc -n {namespace}")
     
+    # 실제 적용된 스케일링 범위
+    bounds = ctx.values.get('scaling')
+    if bounds:
+        print_info(f"Autoscaling: {scaling.describe_bounds(bounds)}")
+        hpa = run_kubectl(
+            f"get hpa authcore-api -n {namespace} "
+            f"-o jsonpath='{{.status.currentReplicas}}/{{.status.desiredReplicas}}'",
+            check=False
+        )
+        if hpa:
+            print(f"  current/desired replicas: {hpa}")
+    
     # LoadBalancer URL 확인
     print_info("LoadBalancer URL:")
     result = run_kubectl(
@@ -507,19 +847,13 @@ def main():
     update_apigateway = os.getenv('UPDATE_API_GATEWAY', 'false').lower() == 'true'
     if update_apigateway:
         print_info("\n📋 Updating API Gateway backend...")
-        script_dir = Path(__file__).parent
-        update_script = script_dir / 'update_apigateway_backend.py'
-        if update_script.exists():
-            try:
-                subprocess.run(
-                    ['python3', str(update_script)],
-                    check=False,
-                    cwd=script_dir.parent
-                )
-            except Exception as e:
-                print_error(f"Failed to update API Gateway: {e}")
-        else:
-            print_info("API Gateway update script not found, skipping...")
+        # 같은 프로세스에서 실행 (boto3 세션/클라이언트와 확정된 값 재사용)
+        import update_apigateway_backend
+        try:
+            update_apigateway_backend.main(ctx)
+        except SystemExit:
+            # 게이트웨이 갱신 실패는 배포 실패로 보지 않음
+            print_error("Failed to update API Gateway")
     else:
         print_info("\n💡 To update API Gateway backend, run:")
         print_info("   python scripts/update_apigateway_backend.py")
@@ -527,14 +861,4 @@ def main():
     print_success("Deployment successful!")
 
 if __name__ == '__main__':
-    try:
-        main()
-    except KeyboardInterrupt:
-        print("\n⚠️  Interrupted by user")
-        sys.exit(1)
-    except Exception as e:
-        print_error(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-
+    run_main(main)
@@ -0,0 +1,712 @@
+#!/usr/bin/env python3
+"""
+Users / RefreshTokens 테이블 대량 내보내기·가져오기·합성 데이터 생성 도구
+
+- export: 병렬 Scan 세그먼트를 세그먼트별 gzip NDJSON(DynamoDB JSON, 한 줄에 {"Item": ...})으로 저장
+- import: NDJSON을 25개씩 BatchWriteItem으로 작업자 풀에서 쓰기 (UnprocessedItems 재시도)
+- generate: 미리 계산한 bcrypt 해시로 합성 사용자(+ 닉네임 점유 항목)를 import 가능한 형식으로 생성
+
+export/import는 --capacity(초당 용량 단위) 예산을 지키고 진행 상황을 체크포인트에 기록해
+중단 후 같은 명령을 다시 실행하면 이어서 진행한다 (generate는 완성된 샤드 파일을 건너뜀).
+DYNAMODB_ENDPOINT(또는 --endpoint-url)로 DynamoDB Local 등 호환 엔드포인트를 사용할 수 있다.
+
+generate/import는 운영 테이블에 잘못 쓰지 않도록 --table을 반드시 받고, 이름이 test/load로 시작하지 않으면
+--allow-production 없이는 거부한다. 합성 사용자 비밀번호는 LOADTEST_PASSWORD 환경 변수로만 받는다.
+
+사용 예:
+    python scripts/dynamo_bulk.py export --out .dynamo_export
+    python scripts/dynamo_bulk.py import .dynamo_export/AuthCore_Users --table AuthCore_Users_Staging --allow-production
+    LOADTEST_PASSWORD=... python scripts/dynamo_bulk.py generate --count 2000000 --table load_AuthCore_Users
+    python scripts/dynamo_bulk.py import .dynamo_seed/load_AuthCore_Users --table load_AuthCore_Users --capacity 2000
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+
+from common import print_error, print_info, print_step, print_success, project_root, run_main
+
+# BatchWriteItem 한 번에 쓸 수 있는 최대 항목 수
+BATCH_SIZE = 25
+# 쓰기 용량 단위 1개가 처리하는 항목 크기
+WRITE_UNIT_BYTES = 1024
+# --allow-production 없이 generate/import할 수 있는 테이블 이름 접두사 (대소문자 무시)
+SAFE_TABLE_PREFIXES = ('test', 'load')
+# UnprocessedItems 재시도 백오프 (full jitter)
+BACKOFF_BASE_SECONDS = 0.05
+BACKOFF_CAP_SECONDS = 5.0
+# 체크포인트 파일을 다시 쓰는 최소 간격
+CHECKPOINT_INTERVAL_SECONDS = 1.0
+PROGRESS_INTERVAL_SECONDS = 5.0
+MANIFEST = 'manifest.json'
+DATA_SUFFIXES = ('.ndjson.gz', '.ndjson', '.json.gz')
+
+# src/config/constants.js의 USERNAME_CLAIM과 동일해야 함
+USERNAME_CLAIM_PREFIX = 'USERNAME#'
+USERNAME_CLAIM_ITEM_TYPE = 'username_claim'
+
+
+def default_tables():
+    """deploy_to_k8s.py가 서비스에 넘기는 것과 같은 테이블 이름"""
+    return [
+        os.getenv('USERS_TABLE', 'AuthCore_Users'),
+        os.getenv('REFRESH_TOKENS_TABLE', 'AuthCore_RefreshTokens'),
+    ]
+
+
+def check_target_table(table, allow_production):
+    """generate/import 대상 테이블 확인 (test/load 접두사가 아니면 --allow-production 필요, 아니면 종료)"""
+    if table.lower().startswith(SAFE_TABLE_PREFIXES) or allow_production:
+        return
+    print_error(
+        f"Refusing to write to '{table}': table name does not start with {'/'.join(SAFE_TABLE_PREFIXES)} "
+        "(pass --allow-production to write to it anyway)"
+    )
+    sys.exit(1)
+
+
+def create_dynamodb_client(region, endpoint_url, workers):
+    """DynamoDB 클라이언트 (endpoint_url이 있으면 로컬 호환 엔드포인트, 작업자 수만큼 커넥션 풀)"""
+    import boto3
+    from botocore.config import Config
+
+    config = Config(
+        max_pool_connections=workers + 4,
+        # 스로틀링은 SDK가 속도를 낮춰 재시도하고, 부분 실패(UnprocessedItems)는 이 도구가 재시도
+        retries={'max_attempts': 10, 'mode': 'adaptive'},
+    )
+    return boto3.client('dynamodb', region_name=region, endpoint_url=endpoint_url or None, config=config)
+
+
+class CapacityLimiter:
+    """
+    초당 용량 단위 예산 (토큰 버킷, 스레드 안전)
+
+    요청 전에 예상 소비량을 acquire하고, 응답의 ConsumedCapacity로 settle해 차이를 보정한다.
+    실제 소비가 예상보다 크면 잔량이 음수(빚)가 되어 다음 요청들이 그만큼 기다린다.
+    """
+
+    def __init__(self, units_per_second):
+        self.rate = float(units_per_second or 0)
+        self.tokens = self.rate
+        self.updated = time.monotonic()
+        self.consumed = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, units):
+        """예산이 남을 때까지 대기 후 units만큼 차감 (rate가 0이면 제한 없음)"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens > 0:
+                    self.tokens -= units
+                    return
+                wait_seconds = -self.tokens / self.rate + 0.001
+            time.sleep(wait_seconds)
+
+    def settle(self, estimated, actual):
+        """실제 소비량 반영"""
+        with self._lock:
+            self.consumed += actual
+            if self.rate > 0:
+                self.tokens += estimated - actual
+
+
+def consumed_units(response, fallback):
+    """응답의 ConsumedCapacity 합계 (엔드포인트가 돌려주지 않으면 예상값)"""
+    capacity = response.get('ConsumedCapacity')
+    if not capacity:
+        return fallback
+    if isinstance(capacity, dict):
+        capacity = [capacity]
+    return sum(entry.get('CapacityUnits', 0) for entry in capacity)
+
+
+class Checkpoint:
+    """
+    재개용 진행 상황 (JSON 파일 하나에 작업별 키로 저장, 스레드 안전)
+
+    파일은 임시 파일에 쓴 뒤 교체하므로 중단되어도 이전 상태가 남는다. 같은 파일을 compact_refresh_tokens.py 등
+    다른 작업도 쓰므로, restart에는 처음부터 다시 할 작업의 키 접두사만 주고 나머지 키는 그대로 둔다.
+    """
+
+    def __init__(self, path, restart=()):
+        self.path = path
+        self.state = {}
+        self._saved_at = 0.0
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.state = {
+                    key: value for key, value in json.load(f).items()
+                    if not key.startswith(tuple(restart))
+                }
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self.state.get(key, default)
+
+    def set(self, key, value, force=False):
+        with self._lock:
+            self.state[key] = value
+            if force or time.monotonic() - self._saved_at >= CHECKPOINT_INTERVAL_SECONDS:
+                self._save()
+
+    def save(self):
+        with self._lock:
+            self._save()
+
+    def discard(self, keys):
+        """끝난 작업의 진행 상황 제거 (다음 실행은 처음부터)"""
+        with self._lock:
+            for key in keys:
+                self.state.pop(key, None)
+            self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self._saved_at = time.monotonic()
+
+
+class Progress:
+    """처리량 주기 출력 (스레드 안전)"""
+
+    def __init__(self, label, limiter):
+        self.label = label
+        self.limiter = limiter
+        self.items = 0
+        self.started = time.monotonic()
+        self._printed = self.started
+        self._lock = threading.Lock()
+
+    def add(self, items):
+        with self._lock:
+            self.items += items
+            now = time.monotonic()
+            if now - self._printed < PROGRESS_INTERVAL_SECONDS:
+                return
+            self._printed = now
+        self.report()
+
+    def report(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        print(f"  {self.label}: {self.items:,} items, {self.items / elapsed:,.0f} items/s, "
+              f"{self.limiter.consumed:,.1f} capacity units ({self.limiter.consumed / elapsed:,.1f}/s)")
+
+
+def write_manifest(directory, manifest):
+    with open(os.path.join(directory, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def read_manifest(directory):
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+# ---------------------------------------------------------------------------
+# export
+# ---------------------------------------------------------------------------
+
+def export_key(table, path):
+    """세그먼트 파일 하나의 체크포인트 키 (출력 디렉토리·세그먼트 수별로 구분)"""
+    return f"export:{table}:{os.path.abspath(path)}"
+
+
+def export_segment(client, table, segment, total_segments, path, page_size, limiter, checkpoint, progress):
+    """
+    Scan 세그먼트 하나를 gzip NDJSON으로 저장
+
+    페이지마다 독립된 gzip 멤버를 덧붙이고 (파일 끝 오프셋, LastEvaluatedKey)를 체크포인트에 기록한다.
+    재개할 때는 기록된 오프셋으로 잘라 중단 시점에 쓰다 만 멤버를 버리므로 중복이나 손상 없이 이어 쓴다.
+    키에 출력 파일 경로가 들어가므로 다른 --out이나 세그먼트 수로 실행하면 처음부터 새로 Scan한다.
+    """
+    key = export_key(table, path)
+    state = checkpoint.get(key) or {'offset': 0, 'last_key': None, 'items': 0, 'done': False}
+    if state['done']:
+        return state['items']
+
+    mode = 'r+b' if state['offset'] and os.path.exists(path) else 'wb'
+    with open(path, mode) as f:
+        f.truncate(state['offset'])
+        f.seek(state['offset'])
+        while True:
+            request = {
+                'TableName': table,
+                'Segment': segment,
+                'TotalSegments': total_segments,
+                'Limit': page_size,
+                'ReturnConsumedCapacity': 'TOTAL',
+            }
+            if state['last_key']:
+                request['ExclusiveStartKey'] = state['last_key']
+            # 최종 일관성 Scan은 4KB당 0.5 단위, 실제 크기는 응답으로 보정
+            limiter.acquire(1)
+            response = client.scan(**request)
+            limiter.settle(1, consumed_units(response, 1))
+
+            items = response.get('Items', [])
+            if items:
+                lines = ''.join(json.dumps({'Item': item}, separators=(',', ':')) + '\n' for item in items)
+                f.write(gzip.compress(lines.encode()))
+                f.flush()
+                os.fsync(f.fileno())
+            state = {
+                'offset': f.tell(),
+                'last_key': response.get('LastEvaluatedKey'),
+                'items': state['items'] + len(items),
+                'done': 'LastEvaluatedKey' not in response,
+            }
+            checkpoint.set(key, state, force=state['done'])
+            progress.add(len(items))
+            if state['done']:
+                return state['items']
+
+
+def export_table(client, table, out_dir, segments, page_size, limiter, checkpoint):
+    """테이블 하나를 세그먼트 수만큼 병렬 Scan으로 내보내기"""
+    table_dir = os.path.join(out_dir, table)
+    os.makedirs(table_dir, exist_ok=True)
+    key_schema = client.describe_table(TableName=table)['Table']['KeySchema']
+    progress = Progress(f"export {table}", limiter)
+
+    paths = [os.path.join(table_dir, f"segment-{segment:04d}-of-{segments:04d}.ndjson.gz") for segment in range(segments)]
+
+    print_step(f"Exporting {table} with {segments} parallel scan segments -> {table_dir}")
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        futures = [
+            executor.submit(
+                export_segment, client, table, segment, segments, path,
+                page_size, limiter, checkpoint, progress,
+            )
+            for segment, path in enumerate(paths)
+        ]
+        counts = [future.result() for future in futures]
+
+    write_manifest(table_dir, {
+        'table': table,
+        'key_schema': key_schema,
+        'segments': segments,
+        'items': sum(counts),
+        'exported_at': datetime.now(timezone.utc).isoformat(),
+    })
+    # 다음 실행은 처음부터 다시 Scan
+    checkpoint.discard(export_key(table, path) for path in paths)
+    progress.report()
+    print_success(f"Exported {sum(counts):,} items from {table}")
+
+
+# ---------------------------------------------------------------------------
+# import
+# ---------------------------------------------------------------------------
+
+def data_files(path):
+    """가져올 파일 목록 (디렉토리면 그 안의 데이터 파일, 이름순)"""
+    if os.path.isfile(path):
+        return [path]
+    return sorted(
+        os.path.join(path, name) for name in os.listdir(path)
+        if name.endswith(DATA_SUFFIXES)
+    )
+
+
+def read_items(path):
+    """NDJSON 한 줄씩 DynamoDB JSON 항목 ({"Item": ...} 또는 항목 자체)"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                yield record.get('Item', record)
+
+
+def attribute_value_size(value):
+    """DynamoDB JSON 값 하나의 저장 크기 (AWS 항목 크기 계산 규칙 근사)"""
+    kind, data = next(iter(value.items()))
+    if kind == 'S':
+        return len(data.encode())
+    if kind == 'N':
+        return len(data.lstrip('-').replace('.', '')) // 2 + 1
+    if kind == 'B':
+        return len(data)
+    if kind in ('BOOL', 'NULL'):
+        return 1
+    if kind == 'SS':
+        return sum(len(entry.encode()) for entry in data)
+    if kind == 'NS':
+        return sum(attribute_value_size({'N': entry}) for entry in data)
+    if kind == 'BS':
+        return sum(len(entry) for entry in data)
+    if kind == 'L':
+        return 3 + sum(1 + attribute_value_size(entry) for entry in data)
+    if kind == 'M':
+        return 3 + sum(1 + len(name.encode()) + attribute_value_size(entry) for name, entry in data.items())
+    return 0
+
+
+def item_size(item):
+    """항목 저장 크기 (속성 이름 + 값, 바이트)"""
+    return sum(len(name.encode()) + attribute_value_size(value) for name, value in item.items())
+
+
+def estimate_write_units(requests):
+    """쓰기 용량 단위 추정 (Put은 1KB당 1단위, Delete는 1단위로 가정하고 응답으로 보정)"""
+    return sum(
+        max(1, -(-item_size(request['PutRequest']['Item']) // WRITE_UNIT_BYTES)) if 'PutRequest' in request else 1
+        for request in requests
+    )
+
+
+def write_requests(client, table, requests, limiter, max_retries):
+    """BatchWriteItem 한 번 (Put/Delete 요청 최대 25개, UnprocessedItems는 백오프 후 남은 요청만 다시 쓰기)"""
+    for attempt in range(max_retries + 1):
+        estimated = estimate_write_units(requests)
+        limiter.acquire(estimated)
+        response = client.batch_write_item(
+            RequestItems={table: requests},
+            ReturnConsumedCapacity='TOTAL',
+        )
+        limiter.settle(estimated, consumed_units(response, estimated))
+        requests = response.get('UnprocessedItems', {}).get(table, [])
+        if not requests:
+            return
+        time.sleep(random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)))
+    raise RuntimeError(f"{len(requests)} item(s) still unprocessed after {max_retries} retries")
+
+
+def write_batch(client, table, items, limiter, max_retries):
+    """항목 최대 25개 Put"""
+    write_requests(client, table, [{'PutRequest': {'Item': item}} for item in items], limiter, max_retries)
+
+
+class FileProgress:
+    """
+    파일 하나의 완료 배치 추적
+
+    배치는 작업자 풀에서 순서 없이 끝나므로, 앞에서부터 연속으로 끝난 배치 수(워터마크)만
+    체크포인트에 기록한다. 재개하면 워터마크 이후 배치를 다시 쓴다 (Put이므로 중복 쓰기는 안전).
+    """
+
+    def __init__(self, checkpoint, key):
+        self.checkpoint = checkpoint
+        self.key = key
+        self.watermark = checkpoint.get(key, 0)
+        self._completed = set()
+        self._lock = threading.Lock()
+
+    def complete(self, batch_index):
+        with self._lock:
+            self._completed.add(batch_index)
+            while self.watermark in self._completed:
+                self._completed.remove(self.watermark)
+                self.watermark += 1
+            watermark = self.watermark
+        self.checkpoint.set(self.key, watermark)
+
+
+def import_key(table, path):
+    """파일 하나의 가져오기 체크포인트 키"""
+    return f"import:{table}:{os.path.abspath(path)}"
+
+
+def import_files(client, table, files, workers, limiter, checkpoint, max_retries):
+    """
+    파일들의 항목을 작업자 풀로 BatchWriteItem (진행 중 배치는 작업자 수의 2배로 제한)
+
+    모든 파일을 끝내면 진행 상황을 지우므로, 같은 파일을 다시 가져오면 (예: 비운 테이블에 재적재) 처음부터 쓴다.
+    """
+    progress = Progress(f"import {table}", limiter)
+    print_step(f"Importing {len(files)} file(s) into {table} with {workers} workers")
+
+    pending = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        def submit(items, tracker, batch_index):
+            while len(pending) >= workers * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    future.result()
+
+            def run():
+                write_batch(client, table, items, limiter, max_retries)
+                tracker.complete(batch_index)
+                progress.add(len(items))
+
+            pending.add(executor.submit(run))
+
+        for path in files:
+            tracker = FileProgress(checkpoint, import_key(table, path))
+            skip = tracker.watermark * BATCH_SIZE
+            if skip:
+                print_info(f"Resuming {os.path.basename(path)} after {skip:,} items")
+            batch, batch_index = [], tracker.watermark
+            for line_number, item in enumerate(read_items(path)):
+                if line_number < skip:
+                    continue
+                batch.append(item)
+                if len(batch) == BATCH_SIZE:
+                    submit(batch, tracker, batch_index)
+                    batch, batch_index = [], batch_index + 1
+            if batch:
+                submit(batch, tracker, batch_index)
+
+        for future in pending:
+            future.result()
+    checkpoint.discard(import_key(table, path) for path in files)
+    progress.report()
+    print_success(f"Imported {progress.items:,} items into {table}")
+
+
+def resolve_import_table(path, table):
+    """--table 대상 테이블 (export/generate가 남긴 manifest의 테이블과 다르면 안내)"""
+    directory = path if os.path.isdir(path) else os.path.dirname(path)
+    manifest = read_manifest(directory)
+    if manifest and manifest.get('table') != table:
+        print_info(f"{path} was written for table {manifest.get('table')}, importing into {table}")
+    return table
+
+
+# ---------------------------------------------------------------------------
+# generate
+# ---------------------------------------------------------------------------
+
+def precompute_hashes(passwords, cost):
+    """
+    비밀번호 목록의 bcrypt 해시를 한 번씩만 계산 (사용자 수와 무관)
+
+    서비스와 같은 bcryptjs(node)를 우선 사용하고, 없으면 파이썬 bcrypt 패키지를 사용한다.
+    """
+    script = (
+        "const bcrypt = require('bcryptjs');"
+        "const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));"
+        "console.log(JSON.stringify(input.passwords.map((p) => bcrypt.hashSync(p, input.cost))));"
+    )
+    try:
+        result = subprocess.run(
+            ['node', '-e', script],
+            input=json.dumps({'passwords': passwords, 'cost': cost}),
+            capture_output=True, text=True, cwd=project_root(), timeout=600,
+        )
+        if result.returncode == 0:
+            return json.loads(result.stdout)
+    except OSError:
+        pass
+
+    try:
+        import bcrypt
+    except ImportError:
+        raise RuntimeError("Password hashing needs node with bcryptjs (npm ci) or the python bcrypt package")
+    return [bcrypt.hashpw(password.encode(), bcrypt.gensalt(cost)).decode() for password in passwords]
+
+
+def iso_timestamp(moment):
+    """서비스(new Date().toISOString())와 같은 형식: 밀리초, Z"""
+    return moment.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def synthetic_user(rng, index, prefix, password_hash, now):
+    """합성 사용자 항목과 닉네임 점유 항목 (registerUser가 쓰는 것과 같은 모양)"""
+    user_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+    username = f"{prefix}{index}"
+    created_at = now - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+    last_login_at = created_at + (now - created_at) * rng.random()
+    user = {
+        'user_id': {'S': user_id},
+        'username': {'S': username},
+        'password_hash': {'S': password_hash},
+        'created_at': {'S': iso_timestamp(created_at)},
+        'last_login_at': {'S': iso_timestamp(last_login_at)},
+        'is_active': {'BOOL': True},
+    }
+    claim = {
+        'user_id': {'S': f"{USERNAME_CLAIM_PREFIX}{username}"},
+        'item_type': {'S': USERNAME_CLAIM_ITEM_TYPE},
+        'owner_user_id': {'S': user_id},
+        'claimed_at': {'S': iso_timestamp(created_at)},
+    }
+    return user, claim
+
+
+def generate_shard(path, start, end, prefix, hashes, seed):
+    """사용자 [start, end)를 파일 하나로 생성 (프로세스 풀에서 실행, 시드가 같으면 같은 결과)"""
+    rng = random.Random(f"{seed}:{start}")
+    now = datetime.now(timezone.utc)
+    with gzip.open(f"{path}.tmp", 'wt', compresslevel=1) as f:
+        for index in range(start, end):
+            for item in synthetic_user(rng, index, prefix, hashes[index % len(hashes)], now):
+                f.write(json.dumps({'Item': item}, separators=(',', ':')) + '\n')
+    os.replace(f"{path}.tmp", path)
+    return end - start
+
+
+def generate_users(table, out_dir, count, shards, prefix, password, password_pool, cost, seed, workers):
+    """합성 사용자 count명을 shards개 파일로 생성 (이미 만들어진 샤드는 건너뜀)"""
+    if len(f"{prefix}{count - 1}") > 20:
+        raise ValueError("Generated usernames would exceed 20 characters; use a shorter --prefix")
+    table_dir = os.path.join(out_dir, table)
+    os.makedirs(table_dir, exist_ok=True)
+
+    passwords = [password] if password_pool <= 1 else [f"{password}-{i}" for i in range(password_pool)]
+    print_step(f"Hashing {len(passwords)} password(s) at bcrypt cost {cost}")
+    hashes = precompute_hashes(passwords, cost)
+
+    print_step(f"Generating {count:,} users into {shards} shard(s) -> {table_dir}")
+    bounds = [(count * shard // shards, count * (shard + 1) // shards) for shard in range(shards)]
+    started = time.monotonic()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for shard, (start, end) in enumerate(bounds):
+            path = os.path.join(table_dir, f"users-{shard:04d}-of-{shards:04d}.ndjson.gz")
+            if os.path.exists(path):
+                continue
+            futures.append(executor.submit(generate_shard, path, start, end, prefix, hashes, seed))
+        generated = sum(future.result() for future in futures)
+
+    write_manifest(table_dir, {
+        'table': table,
+        'generated': {
+            'users': count,
+            'prefix': prefix,
+            'password_pool': len(passwords),
+            'hash_cost': cost,
+            'seed': seed,
+        },
+        'items': count * 2,
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+    })
+    elapsed = time.monotonic() - started
+    print_success(f"Generated {generated:,} users ({generated * 2:,} items) in {elapsed:.1f}s")
+    # 비밀번호는 로그에 남기지 않음
+    if password_pool <= 1:
+        print_info(f"Login: {prefix}<n> / $LOADTEST_PASSWORD")
+    else:
+        print_info(f"Login: {prefix}<n> / $LOADTEST_PASSWORD-<n % {password_pool}>")
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def parse_args(argv):
+    tables = default_tables()
+    workers = int(os.getenv('BULK_WORKERS', '8'))
+    parser = argparse.ArgumentParser(prog='dynamo_bulk', description='AuthCore DynamoDB bulk export/import')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    # export/import 공통 옵션
+    shared = argparse.ArgumentParser(add_help=False)
+    shared.add_argument('--region', default=os.getenv('AWS_REGION', 'ap-northeast-2'))
+    shared.add_argument('--endpoint-url', default=os.getenv('DYNAMODB_ENDPOINT', ''),
+                        help="DynamoDB 호환 로컬 엔드포인트 (예: http://localhost:8000)")
+    shared.add_argument('--workers', type=int, default=workers, help="동시 요청 수")
+    shared.add_argument('--capacity', type=float, default=float(os.getenv('BULK_CAPACITY_UNITS', '0')),
+                        help="초당 소비할 최대 용량 단위 (0 = 제한 없음)")
+    shared.add_argument('--checkpoint', default=os.path.join(project_root(), '.dynamo_bulk_checkpoint.json'),
+                        help="재개용 체크포인트 파일")
+    shared.add_argument('--restart', action='store_true',
+                        help="이번 대상 테이블의 체크포인트를 무시하고 처음부터 (다른 작업의 진행 상황은 유지)")
+
+    # generate/import 대상 테이블 (운영 테이블 보호)
+    target = argparse.ArgumentParser(add_help=False)
+    target.add_argument('--table', required=True,
+                        help=f"대상 테이블 (이름이 {'/'.join(SAFE_TABLE_PREFIXES)}로 시작해야 함)")
+    target.add_argument('--allow-production', action='store_true',
+                        help="test/load 접두사가 없는 테이블에도 쓰기 허용")
+
+    export = commands.add_parser('export', parents=[shared], help="병렬 Scan으로 테이블을 gzip NDJSON으로 내보내기")
+    export.add_argument('--table', action='append', help=f"테이블 (반복 가능, 기본: {' '.join(tables)})")
+    export.add_argument('--out', default='.dynamo_export')
+    export.add_argument('--segments', type=int, default=8, help="병렬 Scan 세그먼트 수")
+    export.add_argument('--page-size', type=int, default=1000)
+
+    load = commands.add_parser('import', parents=[shared, target], help="NDJSON을 BatchWriteItem으로 가져오기")
+    load.add_argument('paths', nargs='+', help="데이터 파일 또는 export/generate 테이블 디렉토리")
+    load.add_argument('--max-retries', type=int, default=8, help="UnprocessedItems 재시도 횟수")
+
+    generate = commands.add_parser('generate', parents=[target], help="합성 사용자 데이터 생성 (import로 적재)")
+    generate.add_argument('--count', type=int, required=True)
+    generate.add_argument('--workers', type=int, default=workers, help="생성 프로세스 수")
+    generate.add_argument('--out', default='.dynamo_seed')
+    generate.add_argument('--shards', type=int, default=None, help="파일 수 (기본: 50만 명당 1개, 최소 workers)")
+    generate.add_argument('--prefix', default='load_')
+    generate.add_argument('--password-pool', type=int, default=1, help="서로 다른 비밀번호 수")
+    generate.add_argument('--hash-cost', type=int, default=int(os.getenv('PASSWORD_HASH_COST', '10')),
+                          help="bcrypt cost (서비스 cost와 다르면 로그인 시 재해시가 발생)")
+    generate.add_argument('--seed', default='authcore')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """메인 함수"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.command in ('generate', 'import'):
+        check_target_table(args.table, args.allow_production)
+
+    if args.command == 'generate':
+        # 명령줄 인자는 프로세스 목록/셸 기록에 남으므로 환경 변수로만 받음
+        password = os.getenv('LOADTEST_PASSWORD')
+        if not password:
+            print_error("LOADTEST_PASSWORD is required for generate")
+            sys.exit(1)
+        shards = args.shards or max(args.workers, -(-args.count // 500_000))
+        generate_users(
+            args.table, args.out, args.count, shards, args.prefix, password,
+            args.password_pool, args.hash_cost, args.seed, args.workers,
+        )
+        return
+
+    print_info("Configuration:")
+    print(f"  Endpoint: {args.endpoint_url or f'AWS ({args.region})'}")
+    print(f"  Workers: {args.workers}")
+    print(f"  Capacity budget: {args.capacity or 'unlimited'} units/s")
+    print(f"  Checkpoint: {args.checkpoint}")
+
+    tables = (args.table or default_tables()) if args.command == 'export' else [args.table]
+    restart = tuple(f"{args.command}:{table}:" for table in tables) if args.restart else ()
+    checkpoint = Checkpoint(args.checkpoint, restart=restart)
+    limiter = CapacityLimiter(args.capacity)
+
+    if args.command == 'export':
+        client = create_dynamodb_client(args.region, args.endpoint_url, args.segments)
+        for table in tables:
+            export_table(client, table, args.out, args.segments, args.page_size, limiter, checkpoint)
+        return
+
+    client = create_dynamodb_client(args.region, args.endpoint_url, args.workers)
+    for path in args.paths:
+        table = resolve_import_table(path, args.table)
+        files = data_files(path)
+        if not files:
+            print_error(f"No data files in {path}")
+            sys.exit(1)
+        import_files(client, table, files, args.workers, limiter, checkpoint, args.max_retries)
+
+
+if __name__ == '__main__':
+    run_main(main)
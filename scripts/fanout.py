@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+여러 배포 대상(클러스터/리전)에 동시에 배포하는 fan-out 실행기
+
+대상 목록(JSON)의 각 항목은 kubeconfig/컨텍스트, 네임스페이스, 리전, API Gateway ID를 가진다.
+대상마다 authcore.py를 별도 프로세스로 실행하므로 환경 변수(KUBECONFIG, AWS_REGION 등)가
+서로 섞이지 않는다. kubeconfig도 대상 이름별 임시 디렉토리에 복사해 각 자식 프로세스에 따로 넘기므로,
+여러 대상이 같은 ~/.kube/config를 가리켜도 setup 단계의 kubeconfig 갱신이 서로를 덮어쓰지 않는다. 대상은 wave 순서대로 배포되고(같은 wave는 최대 max_parallel개 동시 실행),
+한 대상이라도 실패하면 아직 시작하지 않은 대상과 이후 wave는 모두 취소된다.
+
+대상 파일 예 (scripts/deploy-targets.example.json):
+    {
+      "max_parallel": 3,
+      "targets": [
+        {"name": "staging", "wave": 0, "kubeconfig": "~/.kube/staging", "namespace": "authcore"},
+        {"name": "apne2", "wave": 1, "context": "prod-apne2", "region": "ap-northeast-2", "api_gateway_id": "abc123"}
+      ]
+    }
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from common import print_success, print_error, print_info, print_step, project_root
+from dag_executor import DagExecutor, DagError, RUNNING, SUCCEEDED, FAILED, CANCELLED
+
+# 대상 항목 키 → 자식 프로세스 환경 변수
+TARGET_ENV = {
+    'kubeconfig': 'KUBECONFIG',
+    'context': 'KUBE_CONTEXT',
+    'namespace': 'NAMESPACE',
+    'region': 'AWS_REGION',
+    'api_gateway_id': 'API_GATEWAY_ID',
+    'ec2_ip': 'EC2_IP',
+}
+
+
+def load_targets(path):
+    """대상 파일 로드 및 검증. (대상 목록, 파일에 지정된 max_parallel) 반환"""
+    with open(os.path.expanduser(path), 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    targets = data.get('targets', []) if isinstance(data, dict) else data
+    max_parallel = data.get('max_parallel') if isinstance(data, dict) else None
+    if not targets:
+        raise ValueError(f"No deploy targets in {path}")
+
+    names = set()
+    for target in targets:
+        name = target.get('name')
+        if not name:
+            raise ValueError(f"Deploy target without name in {path}")
+        if name in names:
+            raise ValueError(f"Duplicate deploy target: {name}")
+        names.add(name)
+        target['wave'] = int(target.get('wave', 0))
+        unknown = set(target) - set(TARGET_ENV) - {'name', 'wave', 'env'}
+        if unknown:
+            raise ValueError(f"Unknown keys for target '{name}': {', '.join(sorted(unknown))}")
+    return targets, max_parallel
+
+
+def isolate_kubeconfig(target, kube_dir):
+    """
+    대상 전용 kubeconfig 경로 (kube_dir/<대상 이름>/config)
+
+    대상의 kubeconfig(없으면 상위 KUBECONFIG 또는 ~/.kube/config)를 복사해 두고 자식 프로세스에는 복사본만 넘긴다.
+    원본이 없으면 빈 경로를 넘기고 setup 단계가 SSH로 가져와 그 자리에 쓴다.
+    """
+    source = target.get('kubeconfig') or os.getenv('KUBECONFIG') or '~/.kube/config'
+    # KUBECONFIG가 여러 파일 목록이면 첫 번째 파일 기준
+    source = os.path.expanduser(source.split(os.pathsep)[0])
+    directory = Path(kube_dir) / target['name']
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / 'config'
+    if os.path.isfile(source):
+        shutil.copyfile(source, path)
+        os.chmod(path, 0o600)
+    return str(path)
+
+
+def target_env(target, values, timing_path, kubeconfig=None):
+    """대상별 자식 프로세스 환경 (대상에 없는 API Gateway ID는 비워서 상위 값이 새지 않게 함)"""
+    env = os.environ.copy()
+    # 자식 프로세스가 다시 fan-out하지 않도록
+    env.pop('DEPLOY_TARGETS', None)
+    env['API_GATEWAY_ID'] = ''
+    env['KUBE_CONTEXT'] = ''
+    for key, env_name in TARGET_ENV.items():
+        if target.get(key):
+            env[env_name] = str(target[key])
+    if kubeconfig:
+        env['KUBECONFIG'] = kubeconfig
+    if target.get('ec2_ip'):
+        env['EC2_PUBLIC_IP'] = str(target['ec2_ip'])
+    # 상위 프로세스에서 build를 거쳤으면 모든 대상이 같은 이미지를 배포
+    if values.get('image_uri'):
+        env['IMAGE_URI'] = values['image_uri']
+    env['DEPLOY_TIMING_REPORT'] = str(timing_path)
+    env['PYTHONUNBUFFERED'] = '1'
+    env.update({key: str(value) for key, value in target.get('env', {}).items()})
+    return env
+
+
+def tail(path, lines=20):
+    """로그 파일 마지막 몇 줄"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return ''.join(deque(f, maxlen=lines))
+    except OSError:
+        return ''
+
+
+class FanoutProgress:
+    """대상 상태가 바뀔 때마다 한 줄 요약 출력 (여러 스레드에서 호출됨)"""
+
+    def __init__(self, names):
+        self.states = {name: 'pending' for name in names}
+        self.started_at = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, name, status):
+        with self._lock:
+            self.states[name] = status
+            print(f"[fanout {time.perf_counter() - self.started_at:6.1f}s] {name}: {status:<9} | {self.summary()}", flush=True)
+
+    def summary(self):
+        def of(status):
+            return [name for name, state in self.states.items() if state == status]
+
+        running, failed = of(RUNNING), of(FAILED)
+        parts = [f"done {len(of(SUCCEEDED))}/{len(self.states)}"]
+        parts.append(f"running: {', '.join(running) if running else '-'}")
+        if failed:
+            parts.append(f"failed: {', '.join(failed)}")
+        cancelled = of(CANCELLED)
+        if cancelled:
+            parts.append(f"cancelled: {len(cancelled)}")
+        return ', '.join(parts)
+
+
+def load_timing(path):
+    """대상의 배포 단계 리포트 (deploy 단계를 실행하지 않았으면 빈 dict)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def run_target(target, commands, env, log_path, timeout):
+    """대상 하나에 authcore.py 단계 실행 (실패 시 RuntimeError)"""
+    # 이전 실행의 리포트가 이번 결과로 보이지 않도록
+    if os.path.exists(env['DEPLOY_TIMING_REPORT']):
+        os.remove(env['DEPLOY_TIMING_REPORT'])
+    cmd = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'authcore.py'), *commands]
+    with open(log_path, 'w', encoding='utf-8') as log:
+        try:
+            result = subprocess.run(
+                cmd,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                env=env,
+                cwd=project_root(),
+                timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"timed out after {timeout}s (log: {log_path})")
+    if result.returncode != 0:
+        raise RuntimeError(f"exit code {result.returncode} (log: {log_path})")
+
+
+def run_fanout(targets, commands, max_parallel, values=None):
+    """
+    모든 대상에 commands(setup/deploy/gateway) 실행
+
+    wave는 의존성으로 표현한다: wave N의 각 대상은 wave N-1의 모든 대상에 의존하므로
+    앞 wave가 전부 성공해야 시작되고, 실패하면 DagExecutor가 남은 대상을 취소한다.
+    성공 여부(bool)를 반환하고 통합 리포트를 FANOUT_REPORT(기본 .deploy_fanout.json)에 저장한다.
+    """
+    values = values or {}
+    log_dir = Path(os.path.expanduser(os.getenv('FANOUT_LOG_DIR', os.path.join(project_root(), '.deploy_targets'))))
+    log_dir.mkdir(parents=True, exist_ok=True)
+    timeout = int(os.getenv('FANOUT_TARGET_TIMEOUT', '1800'))
+    report_path = os.getenv('FANOUT_REPORT', os.path.join(project_root(), '.deploy_fanout.json'))
+
+    by_name = {target['name']: target for target in targets}
+    waves = sorted({target['wave'] for target in targets})
+    print_step(
+        f"Fan-out {' '.join(commands)} to {len(targets)} target(s) in {len(waves)} wave(s), "
+        f"max {max_parallel} in parallel"
+    )
+
+    # 대상별 kubeconfig 복사본 (cluster-admin 자격 증명이므로 실행이 끝나면 삭제)
+    kube_dir = tempfile.mkdtemp(prefix='authcore-fanout-kube-')
+    progress = FanoutProgress(list(by_name))
+    dag = DagExecutor(max_workers=max_parallel, listener=progress)
+    paths = {}
+    previous = []
+    for wave in waves:
+        names = [target['name'] for target in targets if target['wave'] == wave]
+        for name in names:
+            paths[name] = (log_dir / f"{name}.log", log_dir / f"{name}.timing.json")
+            kubeconfig = isolate_kubeconfig(by_name[name], kube_dir)
+            env = target_env(by_name[name], values, paths[name][1], kubeconfig)
+            dag.add(
+                name,
+                lambda _, t=by_name[name], e=env: run_target(t, commands, e, paths[t['name']][0], timeout),
+                deps=previous
+            )
+        previous = names
+
+    ok = True
+    try:
+        dag.run()
+    except DagError as e:
+        ok = False
+        print_error(f"Fan-out halted: {e}")
+        for name in e.failed:
+            print_info(f"Last lines of {name} ({paths[name][0]}):")
+            print(tail(paths[name][0]), end='')
+    finally:
+        shutil.rmtree(kube_dir, ignore_errors=True)
+        write_fanout_report(dag, report_path, commands, by_name, paths)
+
+    if ok:
+        print_success(f"All {len(targets)} target(s) deployed")
+    return ok
+
+
+def write_fanout_report(dag, path, commands, targets, paths):
+    """대상별 상태/시간과 각 대상의 배포 단계 리포트를 하나로 묶어 저장하고 요약 출력"""
+    report = dag.report()
+    steps = {step['name']: step for step in report['steps']}
+    summary = []
+    for name, target in targets.items():
+        timing = load_timing(paths[name][1]) if steps[name]['status'] != CANCELLED else {}
+        summary.append({
+            'name': name,
+            'wave': target['wave'],
+            'context': target.get('context', ''),
+            'namespace': target.get('namespace', ''),
+            'region': target.get('region', ''),
+            'status': steps[name]['status'],
+            'wall_seconds': steps[name]['wall_seconds'],
+            'error': steps[name]['error'],
+            'log': str(paths[name][0]),
+            'deploy_total_seconds': timing.get('total_seconds'),
+            'deploy_critical_path': timing.get('critical_path'),
+        })
+
+    try:
+        dag.write_report(path, extra={
+            'commands': commands,
+            'commit': os.getenv('GITHUB_SHA', ''),
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'targets': summary,
+        })
+    except OSError as e:
+        print_error(f"Failed to write fan-out report: {e}")
+
+    print_info(f"Fan-out result ({report['total_seconds']}s total, report: {path}):")
+    for item in summary:
+        wall = f"{item['wall_seconds']:.1f}s" if item['wall_seconds'] is not None else '-'
+        deploy = f"{item['deploy_total_seconds']:.1f}s" if item['deploy_total_seconds'] is not None else '-'
+        print(
+            f"  wave {item['wave']}  {item['name']:<14} {item['status']:<10} wall {wall:>8}  "
+            f"deploy {deploy:>8}  {item['region'] or '-'}"
+        )
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+authcore-api Pod 로그(pino JSON)를 동시에 스트리밍하며 라우트별 지연/에러율을 계산하는 도구
+
+Fastify 로거는 요청마다 두 줄을 남긴다.
+    {"reqId":"req-1","req":{"method":"POST","url":"/auth/login"},"msg":"incoming request",...}
+    {"reqId":"req-1","res":{"statusCode":200},"responseTime":12.3,"msg":"request completed",...}
+두 줄을 reqId(Pod별)로 짝지어 라우트별 p50/p95/p99, 5xx/4xx 비율, 가장 느린 요청 샘플을 계산한다.
+메모리는 고정 크기 히스토그램, 짝을 기다리는 요청 수 상한, 샘플 수 상한으로 제한된다.
+
+사용 예:
+    python scripts/pod_logs.py --since 15m                 # 최근 15분 요약
+    python scripts/pod_logs.py --follow --interval 10      # 실시간 (최근 60초 롤링 통계 출력)
+    python scripts/pod_logs.py --files a.log b.log         # 저장된 로그 파일 분석
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+import queue
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+from common import print_success, print_error, print_info, print_step, kubectl_bin, project_root, run_main
+
+# 히스토그램 구간: 0.1ms부터 10%씩 증가 (약 120개 구간으로 60초까지, 상대 오차 5% 이내)
+_BUCKET_BASE_MS = 0.1
+_BUCKET_FACTOR = 1.1
+_BUCKET_COUNT = 140
+
+# 경로 파라미터로 보이는 세그먼트 (라우트별 시리즈가 무한히 늘지 않도록 정규화)
+_ID_SEGMENT_RE = re.compile(r'^(\d+|[0-9a-fA-F-]{16,})$')
+
+# max_routes를 넘은 라우트를 합쳐 집계하는 이름
+OTHER_ROUTE = 'other'
+
+_EOF = object()
+
+
+class LatencyHistogram:
+    """로그 스케일 고정 구간 히스토그램 (ms)"""
+
+    def __init__(self):
+        self.counts = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.max = 0.0
+
+    @staticmethod
+    def _index(ms):
+        if ms <= _BUCKET_BASE_MS:
+            return 0
+        return min(int(math.log(ms / _BUCKET_BASE_MS, _BUCKET_FACTOR)) + 1, _BUCKET_COUNT - 1)
+
+    def add(self, ms):
+        self.counts[self._index(ms)] += 1
+        self.count += 1
+        self.max = max(self.max, ms)
+
+    def merge(self, other):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q):
+        """분위수 (구간 상한값, 최댓값을 넘지 않음). 데이터 없으면 None"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(_BUCKET_BASE_MS * (_BUCKET_FACTOR ** i), self.max)
+        return self.max
+
+
+class RouteStats:
+    """라우트 하나의 요청 수/에러 수/지연 분포/가장 느린 요청"""
+
+    def __init__(self, samples):
+        self.histogram = LatencyHistogram()
+        self.server_errors = 0
+        self.client_errors = 0
+        self.samples = samples
+        self.slowest = []  # (ms, 순번, 요청 정보) min-heap
+
+    def add(self, ms, status, info, sequence):
+        self.histogram.add(ms)
+        if status >= 500:
+            self.server_errors += 1
+        elif status >= 400:
+            self.client_errors += 1
+        entry = (ms, sequence, info)
+        if len(self.slowest) < self.samples:
+            heapq.heappush(self.slowest, entry)
+        elif ms > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def merge(self, other):
+        self.histogram.merge(other.histogram)
+        self.server_errors += other.server_errors
+        self.client_errors += other.client_errors
+        for entry in other.slowest:
+            if len(self.slowest) < self.samples:
+                heapq.heappush(self.slowest, entry)
+            elif entry[0] > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def summary(self):
+        count = self.histogram.count
+
+        def ms(value):
+            return None if value is None else round(value, 1)
+
+        return {
+            'requests': count,
+            'p50_ms': ms(self.histogram.quantile(0.5)),
+            'p95_ms': ms(self.histogram.quantile(0.95)),
+            'p99_ms': ms(self.histogram.quantile(0.99)),
+            'max_ms': ms(self.histogram.max) if count else None,
+            'error_rate': round(self.server_errors / count, 4) if count else 0.0,
+            'client_error_rate': round(self.client_errors / count, 4) if count else 0.0,
+            'slowest': [info for _, _, info in sorted(self.slowest, key=lambda e: e[0], reverse=True)],
+        }
+
+
+def normalize_route(method, url):
+    """쿼리스트링 제거, ID처럼 보이는 세그먼트는 :id로 치환"""
+    path = (url or '').split('?', 1)[0] or '/'
+    segments = [':id' if _ID_SEGMENT_RE.match(s) else s for s in path.split('/')]
+    return f"{method} {'/'.join(segments)}"
+
+
+class LogAnalyzer:
+    """
+    pino 로그 줄을 하나씩 받아 라우트별 통계를 누적
+
+    - 전체 통계: 시작부터 지금까지
+    - 롤링 통계: 로그 시각 기준 최근 window_seconds (slot_seconds 단위 슬롯을 밀어내며 유지)
+
+    라우트는 max_routes개까지만 따로 집계하고, 이후 처음 보는 라우트는 OTHER_ROUTE 하나로 합친다
+    (스캐너가 임의 경로를 두드려도 --follow 중 메모리가 늘지 않도록).
+    """
+
+    def __init__(self, window_seconds=60, slot_seconds=10, max_pending=10000, samples=5,
+                 since_ms=None, until_ms=None, max_routes=200):
+        self.samples = samples
+        self.max_pending = max_pending
+        self.max_routes = max_routes
+        self.overflow = 0
+        self.slot_ms = slot_seconds * 1000
+        self.slots = deque(maxlen=max(window_seconds // slot_seconds, 1))
+        self.total = {}
+        self.pending = OrderedDict()  # (pod, reqId) → (route, url, 시각)
+        self.since_ms = since_ms
+        self.until_ms = until_ms
+        self.lines = 0
+        self.unparsed = 0
+        self.unmatched = 0
+        self.evicted = 0
+        self.first_ms = None
+        self.last_ms = None
+        self._sequence = 0
+
+    def feed(self, pod, line):
+        self.lines += 1
+        line = line.strip()
+        if not line.startswith('{'):
+            self.unparsed += 1
+            return
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            self.unparsed += 1
+            return
+
+        at = entry.get('time')
+        if not isinstance(at, (int, float)):
+            return
+        if (self.since_ms and at < self.since_ms) or (self.until_ms and at > self.until_ms):
+            return
+
+        req_id = entry.get('reqId')
+        if req_id is None:
+            return
+        key = (pod, req_id)
+
+        if 'req' in entry and 'responseTime' not in entry:
+            req = entry['req'] or {}
+            self.pending[key] = (normalize_route(req.get('method', '?'), req.get('url')), req.get('url'), at)
+            if len(self.pending) > self.max_pending:
+                # 완료 줄이 오지 않는 요청이 쌓이지 않도록 가장 오래된 것부터 버림
+                self.pending.popitem(last=False)
+                self.evicted += 1
+            return
+
+        if 'responseTime' in entry:
+            started = self.pending.pop(key, None)
+            if started is None:
+                self.unmatched += 1
+                route, url = 'unknown', None
+            else:
+                route, url, _ = started
+            status = int((entry.get('res') or {}).get('statusCode', 0))
+            self._record(route, float(entry['responseTime']), status, at, {
+                'pod': pod,
+                'req_id': req_id,
+                'url': url,
+                'status': status,
+                'response_ms': round(float(entry['responseTime']), 1),
+                'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(at / 1000)),
+            })
+
+    def _record(self, route, ms, status, at, info):
+        if route not in self.total and len(self.total) >= self.max_routes:
+            route = OTHER_ROUTE
+            self.overflow += 1
+        self._sequence += 1
+        self.first_ms = at if self.first_ms is None else min(self.first_ms, at)
+        self.last_ms = at if self.last_ms is None else max(self.last_ms, at)
+
+        self.total.setdefault(route, RouteStats(self.samples)).add(ms, status, info, self._sequence)
+
+        slot_start = at - at % self.slot_ms
+        if not self.slots or self.slots[-1][0] < slot_start:
+            self.slots.append((slot_start, {}))
+        # 약간 늦게 도착한 줄은 가장 가까운 슬롯에 기록
+        slot = next((s for start, s in reversed(self.slots) if start <= slot_start), self.slots[0][1])
+        slot.setdefault(route, RouteStats(self.samples)).add(ms, status, info, self._sequence)
+
+    def rolling(self):
+        """최근 구간 라우트별 통계"""
+        if not self.slots:
+            return {}
+        horizon = self.slots[-1][0] - (self.slots.maxlen - 1) * self.slot_ms
+        merged = {}
+        for start, routes in self.slots:
+            if start < horizon:
+                continue
+            for route, stats in routes.items():
+                merged.setdefault(route, RouteStats(self.samples)).merge(stats)
+        return merged
+
+    def report(self):
+        return {
+            'lines': self.lines,
+            'unparsed_lines': self.unparsed,
+            'unmatched_completions': self.unmatched,
+            'evicted_pending': self.evicted,
+            'other_route_requests': self.overflow,
+            'from': _iso(self.first_ms),
+            'to': _iso(self.last_ms),
+            'routes': {route: stats.summary() for route, stats in sorted(self.total.items())},
+        }
+
+
+def _iso(ms):
+    return None if ms is None else time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(ms / 1000))
+
+
+def parse_duration(value):
+    """'90s', '15m', '2h' → 초"""
+    match = re.fullmatch(r'(\d+)([smh]?)', value.strip())
+    if not match:
+        raise ValueError(f"Invalid duration: {value}")
+    return int(match.group(1)) * {'': 1, 's': 1, 'm': 60, 'h': 3600}[match.group(2)]
+
+
+def list_pods(namespace, selector, env):
+    """셀렉터에 맞는 Pod 이름 목록"""
+    result = subprocess.run(
+        f"{kubectl_bin()} get pods -n {namespace} -l {selector} -o jsonpath='{{.items[*].metadata.name}}'",
+        shell=True, capture_output=True, text=True, env=env
+    )
+    return result.stdout.split() if result.returncode == 0 else []
+
+
+def _pump(name, stream, lines, on_close=None):
+    """한 소스의 줄을 공유 큐로 전달 (큐가 차면 대기 → 메모리 상한)"""
+    try:
+        for line in stream:
+            lines.put((name, line))
+    finally:
+        if on_close:
+            on_close()
+        lines.put((name, _EOF))
+
+
+def start_pod_streams(namespace, pods, env, lines, since=None, tail=None, follow=False, previous=False):
+    """Pod별 kubectl logs 프로세스를 띄우고 읽기 스레드 시작. 프로세스 목록 반환"""
+    processes = []
+    for pod in pods:
+        cmd = [*kubectl_bin().split(), 'logs', '-n', namespace, pod]
+        if follow:
+            cmd.append('-f')
+        if since:
+            cmd.append(f"--since={since}s")
+        if tail is not None:
+            cmd.append(f"--tail={tail}")
+        if previous:
+            cmd.append('--previous')
+        process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, env=env, bufsize=1
+        )
+        processes.append(process)
+        threading.Thread(
+            target=_pump, args=(pod, process.stdout, lines, process.wait), daemon=True
+        ).start()
+    return processes
+
+
+def start_file_streams(paths, lines):
+    """저장된 로그 파일을 소스로 사용 (파일 이름이 Pod 이름 역할)"""
+    for path in paths:
+        handle = open(path, 'r', encoding='utf-8', errors='replace')
+        threading.Thread(
+            target=_pump, args=(os.path.basename(path), handle, lines, handle.close), daemon=True
+        ).start()
+    return len(paths)
+
+
+def consume(analyzer, lines, sources, interval=None, duration=None, on_line=None):
+    """모든 소스가 끝나거나 duration이 지날 때까지 줄을 분석 (interval마다 롤링 통계 출력)"""
+    remaining = sources
+    started = time.monotonic()
+    next_print = started + interval if interval else None
+    while remaining:
+        now = time.monotonic()
+        if duration and now - started >= duration:
+            break
+        timeout = 0.5
+        if next_print:
+            timeout = max(min(timeout, next_print - now), 0.01)
+        try:
+            name, line = lines.get(timeout=timeout)
+        except queue.Empty:
+            line = None
+        if line is _EOF:
+            remaining -= 1
+        elif line is not None:
+            analyzer.feed(name, line)
+            if on_line:
+                on_line(name, line)
+        if next_print and time.monotonic() >= next_print:
+            print_table(analyzer.rolling(), f"Last {analyzer.slots.maxlen * analyzer.slot_ms // 1000}s")
+            next_print += interval
+
+
+def print_table(routes, title):
+    """라우트별 요약 표"""
+    print_info(f"{title}:")
+    if not routes:
+        print("  (no completed requests)")
+        return
+    print(f"  {'route':<32} {'req':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'5xx':>7} {'4xx':>7}")
+    for route, stats in sorted(routes.items(), key=lambda item: -item[1].histogram.count):
+        s = stats.summary()
+        cells = [f"{s[k]:.1f}" if s[k] is not None else '-' for k in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms')]
+        print(
+            f"  {route:<32} {s['requests']:>7} {cells[0]:>8} {cells[1]:>8} {cells[2]:>8} {cells[3]:>8} "
+            f"{s['error_rate']:>7.1%} {s['client_error_rate']:>7.1%}"
+        )
+
+
+def print_slowest(report, limit=5):
+    """전체에서 가장 느린 요청"""
+    samples = [s for stats in report['routes'].values() for s in stats['slowest']]
+    samples.sort(key=lambda s: s['response_ms'], reverse=True)
+    if not samples:
+        return
+    print_info("Slowest requests:")
+    for s in samples[:limit]:
+        print(f"  {s['response_ms']:>9.1f} ms  {s['status']}  {s['url']}  ({s['pod']} {s['req_id']} {s['time']})")
+
+
+def write_report(report, path):
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print_info(f"Report written to {path}")
+    except OSError as e:
+        print_error(f"Failed to write log report: {e}")
+
+
+def collect_for_failure(namespace, selector='app=authcore-api', tail=200, show=20):
+    """
+    롤아웃 실패 진단: 모든 Pod(재시작했으면 이전 컨테이너 포함)의 최근 로그를 동시에 가져와
+    Pod별 마지막 줄과 라우트별 지연/에러 요약을 출력
+    """
+    env = os.environ.copy()
+    env['KUBECONFIG'] = os.path.expanduser(os.getenv('KUBECONFIG', '~/.kube/config'))
+    pods = list_pods(namespace, selector, env)
+    if not pods:
+        print_error(f"No pods found for {selector}")
+        return None
+
+    lines = queue.Queue(maxsize=10000)
+    recent = {pod: deque(maxlen=show) for pod in pods}
+    analyzer = LogAnalyzer()
+    processes = start_pod_streams(namespace, pods, env, lines, tail=tail)
+    processes += start_pod_streams(namespace, pods, env, lines, tail=show, previous=True)
+    consume(analyzer, lines, len(processes), duration=60, on_line=lambda pod, line: recent[pod].append(line))
+
+    for pod in pods:
+        print_info(f"Last {len(recent[pod])} log lines of {pod}:")
+        for line in recent[pod]:
+            print(f"  {line.rstrip()}")
+    report = analyzer.report()
+    if report['routes']:
+        print_table(analyzer.total, "Request latency in fetched logs")
+        print_slowest(report, limit=3)
+    return report
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='pod_logs', description='Stream and analyze authcore-api pod logs')
+    parser.add_argument('--namespace', default=os.getenv('NAMESPACE', 'authcore'))
+    parser.add_argument('--selector', default='app=authcore-api')
+    parser.add_argument('--since', default='10m', help="분석 시작 (예: 90s, 15m, 2h)")
+    parser.add_argument('--until', default=None, help="분석 끝 (지금부터 이만큼 이전까지, 예: 5m)")
+    parser.add_argument('--follow', action='store_true', help="실시간 스트리밍 (Ctrl+C 또는 --duration으로 종료)")
+    parser.add_argument('--duration', type=int, default=None, help="스트리밍 시간(초)")
+    parser.add_argument('--interval', type=int, default=10, help="--follow 시 롤링 통계 출력 주기(초)")
+    parser.add_argument('--window', type=int, default=60, help="롤링 통계 구간(초)")
+    parser.add_argument('--samples', type=int, default=5, help="라우트별 느린 요청 샘플 수")
+    parser.add_argument('--max-routes', type=int, default=200,
+                        help=f"따로 집계할 최대 라우트 수 (넘으면 '{OTHER_ROUTE}'로 합침)")
+    parser.add_argument('--files', nargs='+', help="Pod 대신 저장된 로그 파일 분석")
+    parser.add_argument('--report', default=os.path.join(project_root(), '.pod_logs_report.json'))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """메인 함수"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    now_ms = time.time() * 1000
+    since = parse_duration(args.since) if args.since else None
+    until_ms = now_ms - parse_duration(args.until) * 1000 if args.until else None
+
+    analyzer = LogAnalyzer(
+        window_seconds=args.window,
+        samples=args.samples,
+        max_routes=args.max_routes,
+        # 파일은 기록 시각이 과거이므로 시간 필터는 --until만 적용
+        since_ms=None if args.files else (now_ms - since * 1000 if since else None),
+        until_ms=until_ms,
+    )
+    lines = queue.Queue(maxsize=10000)
+    processes = []
+
+    if args.files:
+        print_step(f"Analyzing {len(args.files)} log file(s)")
+        sources = start_file_streams(args.files, lines)
+    else:
+        env = os.environ.copy()
+        env['KUBECONFIG'] = os.path.expanduser(os.getenv('KUBECONFIG', '~/.kube/config'))
+        pods = list_pods(args.namespace, args.selector, env)
+        if not pods:
+            print_error(f"No pods found for {args.selector} in {args.namespace}")
+            sys.exit(1)
+        print_step(f"{'Streaming' if args.follow else 'Reading'} logs from {len(pods)} pod(s): {', '.join(pods)}")
+        processes = start_pod_streams(args.namespace, pods, env, lines, since=since, follow=args.follow)
+        sources = len(processes)
+
+    try:
+        consume(analyzer, lines, sources, interval=args.interval if args.follow else None, duration=args.duration)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+
+    report = analyzer.report()
+    print_table(analyzer.total, f"Per-route latency ({report['from']} → {report['to']})")
+    print_slowest(report)
+    if report['unmatched_completions'] or report['evicted_pending']:
+        print_info(
+            f"{report['unmatched_completions']} completion line(s) without a matching request, "
+            f"{report['evicted_pending']} request(s) evicted before completing"
+        )
+    write_report(report, args.report)
+    print_success(f"Analyzed {report['lines']} line(s)")
+
+
+if __name__ == '__main__':
+    run_main(main)
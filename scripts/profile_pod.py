@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+실행 중인 authcore-api Pod에서 CPU 프로파일/힙 스냅샷을 받아 로컬에서 분석
+
+1. Pod 선택 (--pod 또는 kubectl top 기준 CPU/메모리 사용량이 가장 높은 Pod)
+2. kubectl port-forward
+3. /admin/profile/cpu 또는 /admin/profile/heap 호출 (x-admin-token: ADMIN_TOKEN)
+4. .profiles/ 에 저장 후 분석
+   - CPU: collapsed stack(flamegraph.pl/speedscope 입력) + self/total 시간 상위 함수
+     (flamegraph.pl이 PATH 또는 FLAMEGRAPH에 있으면 SVG도 생성)
+   - 힙: dominator tree로 계산한 retained size 상위 객체와 생성자별 합계
+
+사용 예:
+    ADMIN_TOKEN=... python scripts/profile_pod.py cpu --seconds 20
+    python scripts/profile_pod.py heap --pod authcore-api-7d9f-abcde
+    python scripts/profile_pod.py analyze .profiles/authcore-api-xxx-cpu.cpuprofile
+"""
+
+import argparse
+import base64
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+from common import print_success, print_error, print_info, print_step, kubectl_bin, project_root, run_main
+
+SELECTOR = 'app=authcore-api'
+CONTAINER_PORT = 4000
+
+
+def kube_env():
+    env = os.environ.copy()
+    env['KUBECONFIG'] = os.path.expanduser(os.getenv('KUBECONFIG', '~/.kube/config'))
+    return env
+
+
+def kubectl(args, env):
+    """kubectl 실행 (실패 시 None)"""
+    result = subprocess.run(f"{kubectl_bin()} {args}", shell=True, capture_output=True, text=True, env=env)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def _quantity(value):
+    """kubectl top 값(250m, 96Mi) → 비교용 숫자"""
+    match = re.fullmatch(r'(\d+)([a-zA-Z]*)', value)
+    if not match:
+        return 0
+    scale = {'m': 1, '': 1000, 'Ki': 1, 'Mi': 1024, 'Gi': 1024 ** 2}.get(match.group(2), 1)
+    return int(match.group(1)) * scale
+
+
+def select_pod(namespace, kind, env):
+    """가장 바쁜 Pod 선택 (metrics-server가 없으면 첫 번째 Running Pod)"""
+    top = kubectl(f"top pods -n {namespace} -l {SELECTOR} --no-headers", env)
+    if top:
+        rows = [line.split() for line in top.splitlines() if len(line.split()) >= 3]
+        if rows:
+            column = 1 if kind == 'cpu' else 2
+            name, cpu, memory = max(rows, key=lambda row: _quantity(row[column]))[:3]
+            print_info(f"Selected {name} (cpu {cpu}, memory {memory})")
+            return name
+    names = kubectl(
+        f"get pods -n {namespace} -l {SELECTOR} --field-selector=status.phase=Running "
+        f"-o jsonpath='{{.items[*].metadata.name}}'",
+        env,
+    )
+    return names.split()[0] if names else None
+
+
+def resolve_admin_token(namespace, env):
+    """ADMIN_TOKEN 환경 변수 → authcore-secrets Secret"""
+    token = os.getenv('ADMIN_TOKEN')
+    if token:
+        return token
+    encoded = kubectl(
+        f"get secret authcore-secrets -n {namespace} -o jsonpath='{{.data.ADMIN_TOKEN}}'", env
+    )
+    return base64.b64decode(encoded).decode() if encoded else None
+
+
+class PortForward:
+    """kubectl port-forward (임의의 로컬 포트) 컨텍스트"""
+
+    def __init__(self, namespace, pod, env, timeout=15):
+        self.args = [*kubectl_bin().split(), 'port-forward', '-n', namespace, f"pod/{pod}", f":{CONTAINER_PORT}"]
+        self.env = env
+        self.timeout = timeout
+        self.process = None
+        self.port = None
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            self.args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, env=self.env
+        )
+        deadline = time.monotonic() + self.timeout
+        # "Forwarding from 127.0.0.1:43561 -> 4000"
+        while time.monotonic() < deadline:
+            line = self.process.stdout.readline()
+            if not line:
+                break
+            match = re.search(r'127\.0\.0\.1:(\d+)', line)
+            if match:
+                self.port = int(match.group(1))
+                return self
+        self.__exit__(None, None, None)
+        raise RuntimeError("kubectl port-forward did not become ready")
+
+    def __exit__(self, *exc):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def download(url, token, path, timeout):
+    """관리 엔드포인트 호출 후 응답을 파일로 저장 (스트리밍)"""
+    request = urllib.request.Request(url, data=b'', method='POST', headers={'x-admin-token': token})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response, open(path, 'wb') as f:
+            shutil.copyfileobj(response, f, length=1024 * 1024)
+    except urllib.error.HTTPError as e:
+        if os.path.exists(path):
+            os.remove(path)
+        reasons = {401: "invalid ADMIN_TOKEN", 404: "ADMIN_TOKEN is not configured on the pod",
+                   409: "another capture is in progress",
+                   503: "not enough memory headroom for a heap snapshot (pick a pod with lower memory usage)"}
+        raise RuntimeError(f"HTTP {e.code}: {reasons.get(e.code, e.reason)}") from e
+    return os.path.getsize(path)
+
+
+def capture(kind, args):
+    """Pod 선택 → port-forward → 캡처 → 저장. 저장된 파일 경로 반환"""
+    env = kube_env()
+    pod = args.pod or select_pod(args.namespace, kind, env)
+    if not pod:
+        raise RuntimeError(f"No running pod found for {SELECTOR} in {args.namespace}")
+    token = resolve_admin_token(args.namespace, env)
+    if not token:
+        raise RuntimeError("ADMIN_TOKEN is not set and not found in secret authcore-secrets")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    if kind == 'cpu':
+        path = os.path.join(args.output_dir, f"{pod}-{stamp}.cpuprofile")
+        endpoint, timeout = f"/admin/profile/cpu?seconds={args.seconds}", args.seconds + 60
+        print_step(f"Capturing {args.seconds}s CPU profile from {pod}")
+    else:
+        path = os.path.join(args.output_dir, f"{pod}-{stamp}.heapsnapshot")
+        endpoint, timeout = "/admin/profile/heap", 300
+        print_step(f"Capturing heap snapshot from {pod} (the pod pauses while it is written)")
+
+    with PortForward(args.namespace, pod, env) as forward:
+        size = download(f"http://127.0.0.1:{forward.port}{endpoint}", token, path, timeout)
+    print_success(f"Saved {path} ({size / 1024 / 1024:.1f} MiB)")
+    return path
+
+
+# ---------------------------------------------------------------------------
+# CPU 프로파일 분석
+# ---------------------------------------------------------------------------
+
+def _frame_label(call_frame):
+    name = call_frame.get('functionName') or '(anonymous)'
+    url = call_frame.get('url') or ''
+    if url:
+        # 프로젝트 경로는 짧게, node_modules는 패키지 이름까지만
+        url = re.sub(r'^.*/node_modules/', '', re.sub(r'^file://', '', url))
+        url = re.sub(r'^.*/(src/)', r'\1', url)
+        return f"{name} {url}:{call_frame.get('lineNumber', 0) + 1}"
+    return name
+
+
+def analyze_cpu_profile(profile):
+    """
+    V8 .cpuprofile → collapsed stack과 함수별 시간
+
+    샘플 간격(timeDeltas)을 가중치로 써서 샘플링 간격이 흔들려도 시간이 정확하도록 한다.
+    """
+    nodes = {node['id']: node for node in profile['nodes']}
+    parent = {}
+    for node in profile['nodes']:
+        for child in node.get('children', []):
+            parent[child] = node['id']
+
+    weight_us = defaultdict(int)
+    deltas = profile.get('timeDeltas') or [0] * len(profile['samples'])
+    # timeDeltas[i]는 i번째 샘플 직전까지의 간격 → 다음 샘플의 간격을 i번째 샘플의 시간으로 사용
+    for i, node_id in enumerate(profile['samples']):
+        weight_us[node_id] += deltas[i + 1] if i + 1 < len(deltas) else 0
+
+    stacks = {}
+
+    def stack_of(node_id):
+        if node_id not in stacks:
+            frames = []
+            current = node_id
+            while current is not None:
+                label = _frame_label(nodes[current]['callFrame'])
+                if label != '(root)':
+                    frames.append(label.replace(';', ':'))
+                current = parent.get(current)
+            stacks[node_id] = list(reversed(frames))
+        return stacks[node_id]
+
+    collapsed = defaultdict(int)
+    self_us = defaultdict(int)
+    total_us = defaultdict(int)
+    for node_id, us in weight_us.items():
+        if not us:
+            continue
+        frames = stack_of(node_id) or ['(root)']
+        collapsed[';'.join(frames)] += us
+        self_us[frames[-1]] += us
+        # 재귀 호출이 total을 중복 집계하지 않도록 스택의 고유 함수만 더함
+        for frame in set(frames):
+            total_us[frame] += us
+
+    return {
+        'duration_ms': (profile['endTime'] - profile['startTime']) / 1000,
+        'samples': len(profile['samples']),
+        'collapsed': dict(collapsed),
+        'self_us': dict(self_us),
+        'total_us': dict(total_us),
+    }
+
+
+def report_cpu(path, top):
+    with open(path, 'r', encoding='utf-8') as f:
+        result = analyze_cpu_profile(json.load(f))
+
+    collapsed_path = re.sub(r'\.cpuprofile$', '', path) + '.collapsed'
+    with open(collapsed_path, 'w', encoding='utf-8') as f:
+        for stack, us in sorted(result['collapsed'].items()):
+            f.write(f"{stack} {us}\n")
+    print_info(f"Collapsed stacks written to {collapsed_path}")
+
+    flamegraph = os.getenv('FLAMEGRAPH') or shutil.which('flamegraph.pl')
+    if flamegraph:
+        svg_path = collapsed_path[:-len('.collapsed')] + '.svg'
+        with open(svg_path, 'w', encoding='utf-8') as out:
+            subprocess.run([flamegraph, '--countname', 'us', collapsed_path], stdout=out, check=False)
+        print_info(f"Flamegraph written to {svg_path}")
+    else:
+        print_info("flamegraph.pl not found; open the .cpuprofile in Chrome DevTools or the .collapsed file in speedscope")
+
+    busy_us = sum(us for frame, us in result['self_us'].items() if frame not in ('(idle)', '(program)'))
+    wall_us = result['duration_ms'] * 1000
+    print_info(
+        f"{result['samples']} samples over {result['duration_ms'] / 1000:.1f}s, "
+        f"JS busy {busy_us / wall_us:.0%} of wall time" if wall_us else f"{result['samples']} samples"
+    )
+    for title, table in (('Top self time', result['self_us']), ('Top total time', result['total_us'])):
+        print_info(f"{title}:")
+        for frame, us in sorted(table.items(), key=lambda item: -item[1])[:top]:
+            share = us / wall_us if wall_us else 0
+            print(f"  {us / 1000:>9.1f} ms {share:>6.1%}  {frame}")
+
+
+# ---------------------------------------------------------------------------
+# 힙 스냅샷 분석
+# ---------------------------------------------------------------------------
+
+def load_heap_snapshot(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def analyze_heap_snapshot(snapshot):
+    """
+    .heapsnapshot → 객체별 retained size (dominator tree)
+
+    Cooper-Harvey-Kennedy 반복 알고리즘. weak 엣지는 객체를 붙잡지 않으므로 제외한다.
+    """
+    meta = snapshot['snapshot']['meta']
+    node_fields = meta['node_fields']
+    edge_fields = meta['edge_fields']
+    node_types = meta['node_types'][0]
+    edge_types = meta['edge_types'][0]
+    strings = snapshot['strings']
+    nodes = snapshot['nodes']
+    edges = snapshot['edges']
+
+    nf, ef = len(node_fields), len(edge_fields)
+    f_type, f_name, f_size, f_edges = (node_fields.index(k) for k in ('type', 'name', 'self_size', 'edge_count'))
+    e_type, e_to = (edge_fields.index(k) for k in ('type', 'to_node'))
+    weak = edge_types.index('weak') if 'weak' in edge_types else -1
+    count = len(nodes) // nf
+
+    # 노드별 자식 목록 (노드 번호)
+    children = [None] * count
+    edge_index = 0
+    for n in range(count):
+        out = []
+        for _ in range(nodes[n * nf + f_edges]):
+            if edges[edge_index + e_type] != weak:
+                out.append(edges[edge_index + e_to] // nf)
+            edge_index += ef
+        children[n] = out
+
+    # 루트(0)에서 반복 DFS로 후위 순서 계산
+    order = [-1] * count
+    postorder = []
+    visited = bytearray(count)
+    stack = [(0, 0)]
+    visited[0] = 1
+    while stack:
+        n, i = stack[-1]
+        if i < len(children[n]):
+            stack[-1] = (n, i + 1)
+            child = children[n][i]
+            if not visited[child]:
+                visited[child] = 1
+                stack.append((child, 0))
+        else:
+            stack.pop()
+            order[n] = len(postorder)
+            postorder.append(n)
+
+    predecessors = defaultdict(list)
+    for n in postorder:
+        for child in children[n]:
+            predecessors[child].append(n)
+
+    idom = [-1] * count
+    idom[0] = 0
+
+    def intersect(a, b):
+        while a != b:
+            while order[a] < order[b]:
+                a = idom[a]
+            while order[b] < order[a]:
+                b = idom[b]
+        return a
+
+    changed = True
+    while changed:
+        changed = False
+        for n in reversed(postorder[:-1]):
+            new_idom = -1
+            for p in predecessors[n]:
+                if idom[p] == -1:
+                    continue
+                new_idom = p if new_idom == -1 else intersect(p, new_idom)
+            if new_idom != idom[n]:
+                idom[n] = new_idom
+                changed = True
+
+    retained = [nodes[n * nf + f_size] if visited[n] else 0 for n in range(count)]
+    for n in postorder[:-1]:
+        retained[idom[n]] += retained[n]
+
+    def describe(n):
+        kind = node_types[nodes[n * nf + f_type]]
+        name = strings[nodes[n * nf + f_name]] or '(anonymous)'
+        return f"{name} ({kind})" if kind not in ('object', 'closure') else name
+
+    # 생성자(이름)별 개수/self size
+    by_name = defaultdict(lambda: [0, 0])
+    for n in postorder:
+        entry = by_name[describe(n)]
+        entry[0] += 1
+        entry[1] += nodes[n * nf + f_size]
+
+    def retainer_path(n, depth=4):
+        names = []
+        current = idom[n]
+        while current > 0 and len(names) < depth:
+            names.append(describe(current))
+            current = idom[current]
+        return names
+
+    return {
+        'total_size': retained[0],
+        'node_count': count,
+        'retained': retained,
+        'describe': describe,
+        'retainer_path': retainer_path,
+        'by_name': by_name,
+        'reachable': postorder[:-1],
+    }
+
+
+def report_heap(path, top):
+    result = analyze_heap_snapshot(load_heap_snapshot(path))
+    total = result['total_size'] or 1
+    retained = result['retained']
+    print_info(f"{result['node_count']} nodes, reachable heap {total / 1024 / 1024:.1f} MiB")
+
+    # 시스템 루트/합성 노드는 모든 것을 붙잡으므로 제외
+    candidates = [
+        n for n in result['reachable']
+        if not result['describe'](n).endswith('(synthetic)') and not result['describe'](n).endswith('(hidden)')
+    ]
+    print_info("Top retainers (retained size):")
+    for n in sorted(candidates, key=lambda n: -retained[n])[:top]:
+        path_names = ' ← '.join(result['retainer_path'](n)) or '(root)'
+        print(f"  {retained[n] / 1024:>10.1f} KiB {retained[n] / total:>6.1%}  {result['describe'](n)[:60]}  ← {path_names[:80]}")
+
+    print_info("Top constructors (self size):")
+    for name, (instances, size) in sorted(result['by_name'].items(), key=lambda item: -item[1][1])[:top]:
+        print(f"  {size / 1024:>10.1f} KiB {instances:>8} objects  {name[:70]}")
+
+
+def analyze(path, top):
+    if path.endswith('.cpuprofile'):
+        report_cpu(path, top)
+    elif path.endswith('.heapsnapshot'):
+        report_heap(path, top)
+    else:
+        raise RuntimeError(f"Unknown profile type: {path} (expected .cpuprofile or .heapsnapshot)")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='profile_pod', description='Capture and analyze authcore-api profiles')
+    parser.add_argument('kind', choices=['cpu', 'heap', 'analyze'])
+    parser.add_argument('file', nargs='?', help="analyze: .cpuprofile 또는 .heapsnapshot 파일")
+    parser.add_argument('--namespace', default=os.getenv('NAMESPACE', 'authcore'))
+    parser.add_argument('--pod', default=None, help="대상 Pod (기본: 사용량이 가장 높은 Pod)")
+    parser.add_argument('--seconds', type=int, default=10, help="CPU 프로파일 측정 시간")
+    parser.add_argument('--top', type=int, default=15, help="출력할 상위 항목 수")
+    parser.add_argument('--output-dir', default=os.path.join(project_root(), '.profiles'))
+    parser.add_argument('--no-analyze', action='store_true', help="다운로드만 하고 분석하지 않음")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """메인 함수"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    try:
+        if args.kind == 'analyze':
+            if not args.file:
+                raise RuntimeError("analyze requires a profile file")
+            path = args.file
+        else:
+            path = capture(args.kind, args)
+            if args.no_analyze:
+                return
+        analyze(path, args.top)
+    except RuntimeError as e:
+        print_error(str(e))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    run_main(main)
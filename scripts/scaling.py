@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+용량 프로파일(k8s/capacity-profile.json) → HPA/PodDisruptionBudget 매니페스트
+
+프로파일에는 벤치마크로 측정한 레플리카당 처리량(목표 p99 이내 RPS)과 RPS당 CPU 사용량,
+평시/피크 트래픽이 들어 있다. 이 값으로 최소/최대 레플리카와 CPU 목표치를 계산한다.
+
+    목표 RPS/레플리카 = per_replica_rps × target_utilization
+    최소 레플리카     = max(min_replicas_floor, ceil(baseline_rps / 목표 RPS))
+    최대 레플리카     = min(max_replicas_cap, ceil(peak_rps / 목표 RPS))
+    CPU 목표(Pod 평균) = 목표 RPS × cpu_millicores_per_rps (컨테이너 limit의 90% 이내)
+
+CPU 목표는 request 대비 비율(Utilization)이 아니라 절대값(AverageValue)으로 준다.
+request(50m)가 limit(200m)보다 훨씬 작아서 비율로 주면 의미가 왜곡되기 때문이다.
+
+배포에는 capacity_planner.py가 측정 결과로 생성한 프로파일만 적용한다. 손으로 쓴 추정치는
+CAPACITY_PROFILE_ALLOW_MANUAL=true로 명시적으로 허용한 경우에만 적용한다.
+"""
+
+import json
+import math
+import os
+
+from common import print_info, project_root
+
+DEPLOYMENT_NAME = 'authcore-api'
+EVENT_LOOP_LAG_METRIC = 'authcore_event_loop_lag_seconds'
+
+DEFAULT_PROFILE = os.path.join('k8s', 'capacity-profile.json')
+
+# capacity_planner.py가 생성한 프로파일의 source 접두사
+GENERATED_SOURCE = 'capacity_planner.py'
+
+# 프로파일에 resources가 없을 때의 컨테이너 리소스 (기존 deployment.yaml 값)
+DEFAULT_RESOURCES = {
+    'cpu_request': '50m',
+    'cpu_limit': '200m',
+    'memory_request': '64Mi',
+    'memory_limit': '128Mi',
+}
+
+
+def is_generated(profile):
+    """capacity_planner.py가 측정 결과로 생성한 프로파일인지 (생성 시각과 리소스까지 기록되어 있어야 함)"""
+    return (
+        str(profile.get('source', '')).startswith(GENERATED_SOURCE)
+        and bool(profile.get('generated_at'))
+        and bool(profile.get('resources'))
+    )
+
+
+def load_profile(path=None):
+    """
+    용량 프로파일 로드 (없으면 None → 오토스케일링 없이 레플리카 1개)
+
+    capacity_planner.py가 생성하지 않은 프로파일은 CAPACITY_PROFILE_ALLOW_MANUAL=true가 아니면 무시한다.
+    """
+    path = path or os.getenv('CAPACITY_PROFILE', os.path.join(project_root(), DEFAULT_PROFILE))
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        profile = json.load(f)
+    if not is_generated(profile) and os.getenv('CAPACITY_PROFILE_ALLOW_MANUAL', 'false').lower() != 'true':
+        print_info(
+            f"Ignoring capacity profile {path}: not generated by capacity_planner.py "
+            "(regenerate it from load test results or set CAPACITY_PROFILE_ALLOW_MANUAL=true)"
+        )
+        return None
+    return profile
+
+
+def compute_bounds(profile):
+    """프로파일로 스케일링 범위 계산"""
+    per_replica_rps = float(profile['per_replica_rps'])
+    utilization = float(profile.get('target_utilization', 0.7))
+    target_rps = per_replica_rps * utilization
+    if target_rps <= 0:
+        raise ValueError("per_replica_rps × target_utilization must be positive")
+
+    floor = int(profile.get('min_replicas_floor', 2))
+    cap = int(profile.get('max_replicas_cap', 6))
+    min_replicas = max(floor, math.ceil(float(profile.get('baseline_rps', 0)) / target_rps))
+    needed_at_peak = math.ceil(float(profile.get('peak_rps', 0)) / target_rps)
+    max_replicas = max(min_replicas, min(cap, needed_at_peak))
+
+    cpu_limit = float(profile.get('cpu_limit_millicores', 200))
+    cpu_target = min(target_rps * float(profile['cpu_millicores_per_rps']), cpu_limit * 0.9)
+
+    return {
+        'min_replicas': min_replicas,
+        'max_replicas': max_replicas,
+        'cpu_target_millicores': int(round(cpu_target)),
+        'target_rps_per_replica': round(target_rps, 1),
+        # 최대 레플리카에서 목표 사용률로 감당 가능한 RPS
+        'capacity_rps': round(max_replicas * target_rps, 1),
+        'peak_rps': float(profile.get('peak_rps', 0)),
+        # 피크를 처리하려면 cap보다 많은 레플리카가 필요한 경우
+        'capped': needed_at_peak > cap,
+        'event_loop_lag_target_ms': profile.get('event_loop_lag_target_ms'),
+        'custom_metrics': bool(profile.get('custom_metrics', False)),
+        'scale_down_stabilization_seconds': int(profile.get('scale_down_stabilization_seconds', 300)),
+    }
+
+
+def container_resources(profile):
+    """deployment.yaml에 치환할 리소스 요청/제한 (capacity_planner.py가 프로파일에 기록)"""
+    resources = dict(DEFAULT_RESOURCES)
+    resources.update((profile or {}).get('resources', {}))
+    return {key.upper(): value for key, value in resources.items()}
+
+
+def initial_replicas(bounds, current):
+    """배포 매니페스트의 replicas (HPA가 조정한 현재 값을 유지해 배포 때마다 1개로 줄지 않도록)"""
+    if current is None:
+        return bounds['min_replicas']
+    return min(max(current, bounds['min_replicas']), bounds['max_replicas'])
+
+
+def render_hpa(namespace, bounds):
+    """HorizontalPodAutoscaler (autoscaling/v2): CPU + 선택적으로 이벤트 루프 지연(custom metric)"""
+    metrics = [{
+        'type': 'Resource',
+        'resource': {
+            'name': 'cpu',
+            'target': {'type': 'AverageValue', 'averageValue': f"{bounds['cpu_target_millicores']}m"},
+        },
+    }]
+    # Pods 메트릭은 prometheus-adapter 같은 custom metrics API가 있어야 동작
+    if bounds['custom_metrics'] and bounds['event_loop_lag_target_ms']:
+        metrics.append({
+            'type': 'Pods',
+            'pods': {
+                'metric': {'name': EVENT_LOOP_LAG_METRIC},
+                # 초 단위 메트릭 → 밀리 단위 quantity (50m = 0.05초)
+                'target': {'type': 'AverageValue', 'averageValue': f"{int(bounds['event_loop_lag_target_ms'])}m"},
+            },
+        })
+
+    return {
+        'apiVersion': 'autoscaling/v2',
+        'kind': 'HorizontalPodAutoscaler',
+        'metadata': {'name': DEPLOYMENT_NAME, 'namespace': namespace, 'labels': {'app': DEPLOYMENT_NAME}},
+        'spec': {
+            'scaleTargetRef': {'apiVersion': 'apps/v1', 'kind': 'Deployment', 'name': DEPLOYMENT_NAME},
+            'minReplicas': bounds['min_replicas'],
+            'maxReplicas': bounds['max_replicas'],
+            'metrics': metrics,
+            'behavior': {
+                # 로그인 폭주에는 바로 늘리고, 줄일 때는 천천히 (bcrypt 보정/워밍업 비용)
+                'scaleUp': {
+                    'stabilizationWindowSeconds': 0,
+                    'policies': [{'type': 'Percent', 'value': 100, 'periodSeconds': 15}],
+                },
+                'scaleDown': {
+                    'stabilizationWindowSeconds': bounds['scale_down_stabilization_seconds'],
+                    'policies': [{'type': 'Pods', 'value': 1, 'periodSeconds': 60}],
+                },
+            },
+        },
+    }
+
+
+def render_pdb(namespace):
+    """PodDisruptionBudget (노드 드레인 시 한 번에 한 Pod만 내림)"""
+    return {
+        'apiVersion': 'policy/v1',
+        'kind': 'PodDisruptionBudget',
+        'metadata': {'name': DEPLOYMENT_NAME, 'namespace': namespace, 'labels': {'app': DEPLOYMENT_NAME}},
+        'spec': {
+            'maxUnavailable': 1,
+            'selector': {'matchLabels': {'app': DEPLOYMENT_NAME}},
+        },
+    }
+
+
+def describe_bounds(bounds):
+    """배포 요약에 출력할 한 줄"""
+    line = (
+        f"replicas {bounds['min_replicas']}–{bounds['max_replicas']}, "
+        f"CPU target {bounds['cpu_target_millicores']}m/pod (~{bounds['target_rps_per_replica']} rps/pod), "
+        f"capacity ~{bounds['capacity_rps']} rps vs peak {bounds['peak_rps']:g} rps"
+    )
+    if bounds['custom_metrics'] and bounds['event_loop_lag_target_ms']:
+        line += f", event-loop lag target {bounds['event_loop_lag_target_ms']}ms"
+    if bounds['capped']:
+        line += " (max_replicas_cap limits peak capacity)"
+    return line
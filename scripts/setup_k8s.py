@@ -1,73 +1,184 @@
 #!/usr/bin/env python3
 """
 EC2에서 kubeconfig를 복사하여 로컬 Kubernetes 접근 설정
+
+가져온 kubeconfig는 노드 IP별로 캐시하고(메타데이터에 서버 CA 지문 기록), 다음 실행 때
+API 서버에 /readyz 한 번만 호출해 유효하면 SSH 없이 재사용한다. 노드가 재생성되어
+CA가 바뀌면 TLS 검증이 실패하므로 자동으로 다시 가져온다.
 """
 
+import base64
+import hashlib
+import json
 import os
-import subprocess
+import re
 import sys
 import tempfile
-from pathlib import Path
-
-# 색상 출력
-class Colors:
-    RED = '\033[0;31m'
-    GREEN = '\033[0;32m'
-    YELLOW = '\033[1;33m'
-    NC = '\033[0m'
-
-def print_success(msg):
-    print(f"{Colors.GREEN}✅ {msg}{Colors.NC}")
+import time
 
-def print_error(msg):
-    print(f"{Colors.RED}❌ {msg}{Colors.NC}")
-
-def print_info(msg):
-    print(f"{Colors.YELLOW}📋 {msg}{Colors.NC}")
-
-def run_command(cmd, check=True, env=None):
-    """명령어 실행"""
-    try:
-        result = subprocess.run(
-            cmd, 
-            shell=True, 
-            check=check, 
-            capture_output=True, 
-            text=True,
-            env=env if env else os.environ
-        )
-        return result.returncode == 0, result.stdout.strip(), result.stderr.strip()
-    except subprocess.CalledProcessError as e:
-        return False, e.stdout if hasattr(e, 'stdout') else '', e.stderr if hasattr(e, 'stderr') else ''
+from common import DeployContext, print_success, print_error, print_info, run_command, kubectl_bin, run_main
 
 def check_kubectl():
     """kubectl 설치 확인"""
-    success, _, _ = run_command("kubectl version --client", check=False)
+    success, _, _ = run_command(f"{kubectl_bin()} version --client")
     return success
 
-def _rewrite_kubeconfig_server(kubeconfig_path: str, server_ip: str, port: int = 6443):
+def _rewrite_kubeconfig_server(content: str, server_ip: str, port: int = 6443) -> str:
     """kubeconfig의 server 주소를 지정 IP로 변경 (EC2에서 복사한 k3s 설정은 127.0.0.1이라 CI에서 접근 불가)"""
-    import re
-    with open(kubeconfig_path, 'r', encoding='utf-8') as f:
-        content = f.read()
     # server: https://127.0.0.1:6443 또는 https://10.x.x.x:6443 등 → https://<server_ip>:6443
     new_server = f"https://{server_ip}:{port}"
-    content = re.sub(r'server:\s*https://[^:\s]+:\d+', f'server: {new_server}', content)
-    with open(kubeconfig_path, 'w', encoding='utf-8') as f:
-        f.write(content)
     print_info(f"Kubeconfig server set to {new_server}")
+    return re.sub(r'server:\s*https://[^:\s]+:\d+', f'server: {new_server}', content)
+
+def ca_fingerprint(content: str) -> str:
+    """kubeconfig에 포함된 서버 CA 인증서의 SHA-256 지문 (없으면 빈 문자열)"""
+    match = re.search(r'certificate-authority-data:\s*(\S+)', content)
+    if not match:
+        return ''
+    try:
+        return hashlib.sha256(base64.b64decode(match.group(1))).hexdigest()
+    except ValueError:
+        return ''
+
+def points_to(kubeconfig_path: str, server_ip: str) -> bool:
+    """kubeconfig가 해당 노드를 가리키는지 확인"""
+    try:
+        with open(kubeconfig_path, 'r', encoding='utf-8') as f:
+            return f"https://{server_ip}:" in f.read()
+    except OSError:
+        return False
+
+def is_kubeconfig_valid(kubeconfig_path: str) -> bool:
+    """API 서버에 가벼운 요청 한 번으로 kubeconfig 유효성 확인 (CA 불일치/만료/접속 불가 시 False)"""
+    env = os.environ.copy()
+    env['KUBECONFIG'] = kubeconfig_path
+    timeout = int(os.getenv('KUBE_VALIDATE_TIMEOUT', '5'))
+    success, _, _ = run_command(
+        f"{kubectl_bin()} get --raw /readyz --request-timeout={timeout}s",
+        env=env,
+        timeout=timeout + 5
+    )
+    return success
+
+def write_file_atomic(path: str, content: str):
+    """권한 600으로 임시 파일에 쓴 뒤 교체 (중간 상태의 kubeconfig가 보이지 않도록)"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.kubeconfig-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.chmod(temp_path, 0o600)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+class KubeconfigCache:
+    """노드 IP별 kubeconfig 캐시 (<ip>.kubeconfig + 지문/시각 메타데이터)"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
 
+    def _paths(self, server_ip: str):
+        base = os.path.join(self.cache_dir, server_ip)
+        return f"{base}.kubeconfig", f"{base}.json"
+
+    def load(self, server_ip: str):
+        """캐시된 (kubeconfig 경로, 메타데이터) 반환 (없으면 (None, None))"""
+        config_path, meta_path = self._paths(server_ip)
+        if not os.path.exists(config_path):
+            return None, None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        return config_path, meta
+
+    def store(self, server_ip: str, content: str):
+        """kubeconfig 저장 후 메타데이터 반환"""
+        config_path, meta_path = self._paths(server_ip)
+        meta = {
+            'server_ip': server_ip,
+            'ca_fingerprint': ca_fingerprint(content),
+            'fetched_at': int(time.time()),
+        }
+        write_file_atomic(config_path, content)
+        write_file_atomic(meta_path, json.dumps(meta, indent=2) + '\n')
+        return meta
+
+def ssh_options(ssh_key_path: str) -> str:
+    """SSH 공통 옵션 (연결 재사용 + 타임아웃). 같은 노드에 대한 이후 ssh/scp 호출은 마스터 연결을 재사용"""
+    connect_timeout = int(os.getenv('SSH_CONNECT_TIMEOUT', '10'))
+    control_dir = os.path.expanduser(os.getenv('SSH_CONTROL_DIR', '~/.ssh/controlmasters'))
+    os.makedirs(control_dir, mode=0o700, exist_ok=True)
+    return ' '.join([
+        f"-i {ssh_key_path}",
+        "-o BatchMode=yes",
+        "-o StrictHostKeyChecking=accept-new",
+        f"-o ConnectTimeout={connect_timeout}",
+        "-o ServerAliveInterval=5",
+        "-o ServerAliveCountMax=3",
+        "-o ControlMaster=auto",
+        f"-o ControlPath={control_dir}/%r@%h:%p",
+        f"-o ControlPersist={os.getenv('SSH_CONTROL_PERSIST', '120')}",
+    ])
+
+def fetch_kubeconfig(ec2_ip: str, ssh_key_path: str) -> str:
+    """SSH로 노드의 kubeconfig 내용 가져오기 (실패 시 종료)"""
+    print_info("Copying kubeconfig from EC2...")
+    timeout = int(os.getenv('SSH_COMMAND_TIMEOUT', '30'))
+    success, output, error = run_command(
+        f"ssh {ssh_options(ssh_key_path)} ubuntu@{ec2_ip} cat /home/ubuntu/.kube/config",
+        timeout=timeout
+    )
+    if not success or not output:
+        print_error(f"Failed to copy kubeconfig: {error or 'empty kubeconfig'}")
+        sys.exit(1)
+    return output + '\n'
+
+def resolve_ssh_key(ssh_key: str):
+    """SSH 키 경로 결정 (키 내용이 넘어오면 임시 파일로 저장). (경로, 임시 파일 여부) 반환"""
+    # SSH 키가 파일 경로가 아닌 경우 (예: GitHub Actions에서 경로 전달 시 파일 있음, 키 내용 전달 시 BEGIN으로 시작)
+    if ssh_key.startswith('-----BEGIN'):
+        # 키 내용이 env로 직접 전달된 경우
+        temp_ssh_key = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.pem')
+        temp_ssh_key.write(ssh_key)
+        temp_ssh_key.close()
+        os.chmod(temp_ssh_key.name, 0o600)
+        print_info("SSH key saved to temporary file")
+        return temp_ssh_key.name, True
+    
+    # 경로인 경우 ~ 확장 (CI에서 SSH_KEY=~/.ssh/id_rsa 로 넘길 때 필요)
+    ssh_key_expanded = os.path.expanduser(ssh_key)
+    if os.path.exists(ssh_key_expanded):
+        return ssh_key_expanded, False
+    
+    # 파일 경로였는데 없음 → CI가 아닐 때만 입력 요청
+    if os.isatty(0):
+        print_info(f"SSH key not found at {ssh_key_expanded}")
+        ssh_key = input("Enter SSH key path: ").strip()
+        ssh_key_path = os.path.expanduser(ssh_key) if ssh_key else ""
+        if not ssh_key_path or not os.path.exists(ssh_key_path):
+            print_error(f"SSH key not found: {ssh_key_path or ssh_key}")
+            sys.exit(1)
+        return ssh_key_path, False
+    
+    print_error(f"SSH key not found at {ssh_key_expanded} (CI: ensure Setup SSH key step wrote to this path)")
+    sys.exit(1)
 
 def verify_cluster(kubeconfig_path):
     """클러스터 연결 확인"""
     env = os.environ.copy()
-    env['KUBECONFIG'] = os.path.expanduser(kubeconfig_path) if isinstance(kubeconfig_path, str) else kubeconfig_path
+    env['KUBECONFIG'] = kubeconfig_path
     
-    success, output, err = run_command("kubectl cluster-info", check=False, env=env)
+    success, output, err = run_command(f"{kubectl_bin()} cluster-info --request-timeout=10s", env=env, timeout=20)
     if success:
         print_success("Successfully connected to cluster!")
         # 환경 변수 전달하여 노드 확인
-        success_nodes, output_nodes, _ = run_command("kubectl get nodes", check=False, env=env)
+        success_nodes, output_nodes, _ = run_command(f"{kubectl_bin()} get nodes --request-timeout=10s", env=env, timeout=20)
         if success_nodes:
             print_info(output_nodes)
         return True
@@ -75,14 +186,29 @@ def verify_cluster(kubeconfig_path):
         print_error(err)
     return False
 
-def main():
-    """메인 함수"""
+def finish(ctx, ec2_ip, kubeconfig_path, source):
+    """설정 결과를 컨텍스트에 기록"""
+    ctx.values['ec2_ip'] = ec2_ip
+    ctx.values['kubeconfig'] = kubeconfig_path
+    ctx.values['kube_validated'] = ec2_ip
+    
+    print_success(f"Kubernetes setup completed! (kubeconfig: {source})")
+    print_info(f"kubeconfig location: {kubeconfig_path}")
+    print_info("To use kubectl, set:")
+    print(f"   export KUBECONFIG={kubeconfig_path}")
+    return kubeconfig_path
+
+def main(ctx=None):
+    """메인 함수 (kubeconfig 경로 반환)"""
     print("🚀 Setting up Kubernetes access...")
+    ctx = ctx or DeployContext()
     
     # 환경 변수 설정
-    ec2_ip = os.getenv('EC2_IP', '')
+    ec2_ip = os.getenv('EC2_IP') or os.getenv('EC2_PUBLIC_IP', '')
     ssh_key = os.getenv('SSH_KEY', os.path.expanduser('~/.ssh/id_rsa'))
     kubeconfig_path = os.path.expanduser(os.getenv('KUBECONFIG', '~/.kube/config'))
+    use_cache = os.getenv('KUBECONFIG_CACHE', 'true').lower() != 'false'
+    cache = KubeconfigCache(os.path.expanduser(os.getenv('KUBECONFIG_CACHE_DIR', '~/.cache/authcore/kubeconfig')))
     
     # EC2 IP 확인
     if not ec2_ip:
@@ -98,70 +224,41 @@ def main():
         print_error("EC2 IP is required")
         sys.exit(1)
     
-    # SSH 키 처리 (파일 경로 또는 키 내용)
-    ssh_key_path = ssh_key
-    temp_ssh_key = None
+    # 1. 같은 프로세스에서 이미 검증된 클라이언트가 있으면 건너뜀
+    if ctx.values.get('kube_validated') == ec2_ip and ctx.values.get('kubeconfig'):
+        print_info("Kubernetes access already validated in this run, skipping setup")
+        return ctx.values['kubeconfig']
     
-    # 경로인 경우 ~ 확장 (CI에서 SSH_KEY=~/.ssh/id_rsa 로 넘길 때 필요)
-    ssh_key_expanded = os.path.expanduser(ssh_key) if isinstance(ssh_key, str) and not ssh_key.startswith('-----BEGIN') else ssh_key
+    if use_cache:
+        # 2. 현재 kubeconfig가 이미 이 노드를 가리키고 유효하면 그대로 사용
+        if points_to(kubeconfig_path, ec2_ip) and is_kubeconfig_valid(kubeconfig_path):
+            return finish(ctx, ec2_ip, kubeconfig_path, 'existing')
+        
+        # 3. 노드 IP별 캐시가 유효하면 복사해서 사용
+        cached_path, meta = cache.load(ec2_ip)
+        if cached_path and is_kubeconfig_valid(cached_path):
+            with open(cached_path, 'r', encoding='utf-8') as f:
+                write_file_atomic(kubeconfig_path, f.read())
+            fingerprint = (meta or {}).get('ca_fingerprint', '')[:16]
+            return finish(ctx, ec2_ip, kubeconfig_path, f"cache, CA {fingerprint}")
+        if cached_path:
+            print_info("Cached kubeconfig is stale (node rebuilt or unreachable), fetching again...")
     
-    # SSH 키가 파일 경로가 아닌 경우 (예: GitHub Actions에서 경로 전달 시 파일 있음, 키 내용 전달 시 BEGIN으로 시작)
-    if ssh_key.startswith('-----BEGIN'):
-        # 키 내용이 env로 직접 전달된 경우
-        temp_ssh_key = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.pem')
-        temp_ssh_key.write(ssh_key)
-        temp_ssh_key.close()
-        ssh_key_path = temp_ssh_key.name
-        os.chmod(ssh_key_path, 0o600)
-        print_info("SSH key saved to temporary file")
-    elif os.path.exists(ssh_key_expanded):
-        ssh_key_path = ssh_key_expanded
-    else:
-        # 파일 경로였는데 없음 → CI가 아닐 때만 입력 요청
-        if os.isatty(0):
-            print_info(f"SSH key not found at {ssh_key_expanded}")
-            ssh_key = input("Enter SSH key path: ").strip()
-            ssh_key_path = os.path.expanduser(ssh_key) if ssh_key else ""
-            if not ssh_key_path or not os.path.exists(ssh_key_path):
-                print_error(f"SSH key not found: {ssh_key_path or ssh_key}")
-                sys.exit(1)
-        else:
-            print_error(f"SSH key not found at {ssh_key_expanded} (CI: ensure Setup SSH key step wrote to this path)")
-            sys.exit(1)
-    
-    # kubeconfig 디렉토리 생성
-    kubeconfig_dir = Path(kubeconfig_path).parent
-    kubeconfig_dir.mkdir(parents=True, exist_ok=True)
-    
-    # EC2에서 kubeconfig 복사
-    print_info("Copying kubeconfig from EC2...")
-    scp_cmd = f"scp -o StrictHostKeyChecking=no -i {ssh_key_path} ubuntu@{ec2_ip}:/home/ubuntu/.kube/config {kubeconfig_path}"
-    success, output, error = run_command(scp_cmd)
-    
-    if not success:
-        # 임시 SSH 키 파일 정리
-        if temp_ssh_key and os.path.exists(temp_ssh_key.name):
+    # 4. SSH로 새로 가져오기
+    ssh_key_path, is_temp_key = resolve_ssh_key(ssh_key)
+    try:
+        content = fetch_kubeconfig(ec2_ip, ssh_key_path)
+    finally:
+        # 임시 SSH 키 파일 정리 (마스터 연결은 이미 인증되어 있으므로 재사용에 영향 없음)
+        if is_temp_key and os.path.exists(ssh_key_path):
             try:
-                os.unlink(temp_ssh_key.name)
-            except Exception:
-                pass
-        print_error(f"Failed to copy kubeconfig: {error}")
-        if output:
-            print_error(f"Output: {output}")
-        sys.exit(1)
-    
-    # 임시 SSH 키 파일 정리 (성공한 경우)
-    if temp_ssh_key and os.path.exists(temp_ssh_key.name):
-        try:
-            os.unlink(temp_ssh_key.name)
-        except Exception as e:
-            print_error(f"Failed to remove temp SSH key file: {e}")
-    
-    # kubeconfig 권한 설정
-    os.chmod(kubeconfig_path, 0o600)
+                os.unlink(ssh_key_path)
+            except Exception as e:
+                print_error(f"Failed to remove temp SSH key file: {e}")
     
     # kubeconfig server를 EC2 퍼블릭 IP로 변경 (k3s 기본은 127.0.0.1 → CI 러너에서 접근 불가)
-    _rewrite_kubeconfig_server(kubeconfig_path, ec2_ip)
+    content = _rewrite_kubeconfig_server(content, ec2_ip)
+    write_file_atomic(kubeconfig_path, content)
     
     # 클러스터 연결 확인
     print_info("Verifying cluster connection...")
@@ -169,20 +266,14 @@ def main():
         print_error("Failed to connect to cluster")
         sys.exit(1)
     
-    print_success("Kubernetes setup completed!")
-    print_info(f"kubeconfig location: {kubeconfig_path}")
-    print_info("To use kubectl, set:")
-    print(f"   export KUBECONFIG={kubeconfig_path}")
+    source = 'ssh'
+    if use_cache:
+        _, previous = cache.load(ec2_ip)
+        meta = cache.store(ec2_ip, content)
+        if previous and previous.get('ca_fingerprint') not in ('', None, meta['ca_fingerprint']):
+            print_info("Cluster CA changed since last fetch (node was rebuilt)")
+        source = f"ssh, cached with CA {meta['ca_fingerprint'][:16]}"
+    return finish(ctx, ec2_ip, kubeconfig_path, source)
 
 if __name__ == '__main__':
-    try:
-        main()
-    except KeyboardInterrupt:
-        print("\n⚠️  Interrupted by user")
-        sys.exit(1)
-    except Exception as e:
-        print_error(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-
+    run_main(main)
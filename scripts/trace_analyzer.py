@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+요청 트레이스(src/utils/tracing.js가 기록한 스팬 JSON Lines) 분석 도구
+
+스팬을 traceId로 묶어 요청마다 임계 경로(critical path)를 계산하고, 라우트별로 어느 단계
+(스키마 검증, DynamoDB 호출, bcrypt, JWT 서명 등)가 응답 시간을 차지하는지 집계한다.
+겹치지 않고 차례로 실행된 DynamoDB 왕복 중 사이에 다른 작업이 거의 없는 것은 병렬화 후보로 표시한다
+(데이터 의존 여부는 스팬만으로 알 수 없으므로 코드에서 확인 필요).
+
+스팬 수집:
+    - Pod 안 파일(TRACING_EXPORT=file:/tmp/authcore-traces.jsonl, 기본값): --from-pods로 가져옴
+    - 소켓(TRACING_EXPORT=tcp:<호스트>:<포트> 또는 unix:<경로>): collect 서브커맨드로 받아 파일에 기록
+
+사용 예:
+    python scripts/trace_analyzer.py analyze traces.jsonl
+    python scripts/trace_analyzer.py analyze --from-pods --route /auth/login
+    python scripts/trace_analyzer.py collect --listen tcp:0.0.0.0:4318 --output traces.jsonl
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import subprocess
+import sys
+import threading
+from collections import Counter, defaultdict
+
+from common import kubectl_bin, print_error, print_info, print_step, print_success, project_root, run_main
+
+REPORT_PATH = os.path.join(project_root(), '.trace_report.json')
+POD_TRACE_FILE = '/tmp/authcore-traces.jsonl'
+TOP_STEPS = 12
+TOP_CHAINS = 5
+
+
+def percentile(values, q):
+    """정렬된 목록의 분위수 (nearest rank)"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(q * len(values))) - 1))
+    return values[index]
+
+
+def read_span_lines(lines, traces, stats):
+    """JSON Lines를 traceId별 스팬 목록에 추가 (깨진 줄은 건너뜀)"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            span = json.loads(line)
+            span['end'] = span['start'] + span['durationMs']
+            traces[span['traceId']].append(span)
+            stats['spans'] += 1
+        except (ValueError, KeyError, TypeError):
+            stats['malformed'] += 1
+
+
+def load_from_files(paths, traces, stats):
+    for path in paths:
+        if path == '-':
+            read_span_lines(sys.stdin, traces, stats)
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            read_span_lines(f, traces, stats)
+
+
+def load_from_pods(namespace, path, traces, stats):
+    """실행 중인 authcore-api Pod마다 스팬 파일 내용을 가져옴"""
+    result = subprocess.run(
+        [kubectl_bin(), 'get', 'pods', '-n', namespace, '-l', 'app=authcore-api',
+         '--field-selector=status.phase=Running', '-o', 'jsonpath={.items[*].metadata.name}'],
+        capture_output=True, text=True,
+    )
+    pods = result.stdout.split() if result.returncode == 0 else []
+    if not pods:
+        print_error(f"No running authcore-api pods in namespace {namespace}")
+        sys.exit(1)
+    for pod in pods:
+        output = subprocess.run(
+            [kubectl_bin(), 'exec', '-n', namespace, pod, '--', 'cat', path],
+            capture_output=True, text=True,
+        )
+        if output.returncode != 0:
+            print_info(f"No spans from {pod}: {output.stderr.strip()}")
+            continue
+        read_span_lines(output.stdout.splitlines(), traces, stats)
+        print_info(f"Read spans from {pod}")
+
+
+def find_root(spans):
+    """상위 스팬이 트레이스 안에 없는 server 스팬 (요청 전체)"""
+    ids = {span['spanId'] for span in spans}
+    roots = [span for span in spans if span.get('parentId') not in ids]
+    servers = [span for span in roots if span.get('kind') == 'server']
+    candidates = servers or roots
+    return max(candidates, key=lambda span: span['durationMs']) if candidates else None
+
+
+def critical_path(span, children, cursor_end, out):
+    """
+    span 아래 임계 경로의 이름별 시간(ms)을 out에 더함
+
+    가장 늦게 끝난 자식부터 거꾸로 따라가며, 자식이 실행되지 않은 구간은 부모 자신의 시간으로 계산한다.
+    동시에 실행된 자식은 먼저 끝난 쪽이 겹친 구간만큼 잘려 경로에서 빠진다.
+    """
+    cursor = min(span['end'], cursor_end)
+    own = 0.0
+    for child in sorted(children.get(span['spanId'], []), key=lambda c: c['end'], reverse=True):
+        if child['start'] >= cursor:
+            continue
+        child_end = min(child['end'], cursor)
+        own += cursor - child_end
+        critical_path(child, children, child_end, out)
+        cursor = max(child['start'], span['start'])
+    own += max(cursor - span['start'], 0.0)
+    out[span['name']] += own
+
+
+def serial_chains(spans, max_gap_ms):
+    """
+    겹치지 않고 차례로 실행된 DynamoDB 왕복 묶음
+
+    시작 순서로 정렬한 client 스팬 중 앞 호출이 끝난 뒤 max_gap_ms 안에 다음 호출이 시작된 것을 잇는다.
+    사이에 bcrypt처럼 긴 작업이 있으면 앞 결과를 쓰는 것으로 보고 끊는다.
+    """
+    calls = sorted((span for span in spans if span.get('kind') == 'client'), key=lambda span: span['start'])
+    chains = []
+    current = []
+    for call in calls:
+        if current and (call['start'] < current[-1]['end'] or call['start'] - current[-1]['end'] > max_gap_ms):
+            if len(current) > 1:
+                chains.append(current)
+            current = []
+        current.append(call)
+    if len(current) > 1:
+        chains.append(current)
+    return chains
+
+
+def call_label(span):
+    table = (span.get('attributes') or {}).get('index') or (span.get('attributes') or {}).get('table')
+    return f"{span['name']}({table})" if table else span['name']
+
+
+class RouteStats:
+    """라우트 하나의 요청 시간, 임계 경로 구성, 직렬 왕복 묶음"""
+
+    def __init__(self):
+        self.durations = []
+        self.path_ms = Counter()
+        self.path_traces = Counter()
+        self.chains = defaultdict(lambda: {'count': 0, 'total_ms': 0.0, 'saving_ms': 0.0})
+
+    def add(self, root, spans, max_gap_ms):
+        children = defaultdict(list)
+        for span in spans:
+            if span is not root:
+                children[span.get('parentId')].append(span)
+        path = Counter()
+        critical_path(root, children, root['end'], path)
+
+        self.durations.append(root['durationMs'])
+        self.path_ms.update(path)
+        self.path_traces.update(name for name, ms in path.items() if ms > 0)
+        for chain in serial_chains(spans, max_gap_ms):
+            entry = self.chains[' → '.join(call_label(call) for call in chain)]
+            durations = [call['durationMs'] for call in chain]
+            entry['count'] += 1
+            entry['total_ms'] += sum(durations)
+            # 모두 동시에 보냈다면 가장 긴 호출만큼만 걸림
+            entry['saving_ms'] += sum(durations) - max(durations)
+
+    def summary(self):
+        count = len(self.durations)
+        durations = sorted(self.durations)
+        mean = sum(durations) / count
+        steps = [
+            {
+                'name': name,
+                'mean_ms': round(ms / count, 3),
+                'share': round(ms / sum(durations), 4),
+                'on_path_ratio': round(self.path_traces[name] / count, 3),
+            }
+            for name, ms in self.path_ms.most_common()
+        ]
+        chains = [
+            {
+                'calls': calls,
+                'ratio': round(entry['count'] / count, 3),
+                'mean_ms': round(entry['total_ms'] / entry['count'], 3),
+                'mean_saving_ms': round(entry['saving_ms'] / entry['count'], 3),
+            }
+            for calls, entry in sorted(self.chains.items(), key=lambda item: -item[1]['saving_ms'])
+        ]
+        return {
+            'traces': count,
+            'mean_ms': round(mean, 3),
+            'p50_ms': round(percentile(durations, 0.5), 3),
+            'p95_ms': round(percentile(durations, 0.95), 3),
+            'p99_ms': round(percentile(durations, 0.99), 3),
+            'critical_path': steps,
+            'serial_round_trips': chains,
+        }
+
+
+def analyze(traces, route_filter, max_gap_ms):
+    """traceId별 스팬 → 라우트별 요약"""
+    routes = defaultdict(RouteStats)
+    skipped = 0
+    for spans in traces.values():
+        root = find_root(spans)
+        if root is None or root.get('kind') != 'server':
+            # 루트 스팬이 아직 기록되지 않은 진행 중 요청 또는 요청 밖 작업
+            skipped += 1
+            continue
+        route = root['name']
+        if route_filter and route_filter not in route:
+            continue
+        routes[route].add(root, spans, max_gap_ms)
+    return {route: stats.summary() for route, stats in sorted(routes.items())}, skipped
+
+
+def print_report(report):
+    for route, summary in report.items():
+        print_step(f"{route}  ({summary['traces']:,} traces, mean {summary['mean_ms']:.1f}ms, "
+                   f"p50 {summary['p50_ms']:.1f}ms, p95 {summary['p95_ms']:.1f}ms, p99 {summary['p99_ms']:.1f}ms)")
+        print("  Critical path breakdown (mean per request):")
+        for step in summary['critical_path'][:TOP_STEPS]:
+            bar = '█' * max(1, int(step['share'] * 40)) if step['share'] > 0 else ''
+            print(f"    {step['name']:<36} {step['mean_ms']:>9.2f}ms {step['share']:>6.1%}  {bar}")
+        chains = [chain for chain in summary['serial_round_trips'] if chain['mean_saving_ms'] > 0]
+        if chains:
+            print("  Serial DynamoDB round trips (parallelization candidates, check data dependencies):")
+            for chain in chains[:TOP_CHAINS]:
+                print(f"    {chain['calls']}")
+                print(f"      in {chain['ratio']:.0%} of requests, {chain['mean_ms']:.2f}ms total, "
+                      f"~{chain['mean_saving_ms']:.2f}ms saved if issued together")
+        print()
+
+
+class _SpanHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            with self.server.lock:
+                self.server.output.write(line.decode('utf-8', errors='replace'))
+                self.server.output.flush()
+
+
+class _TcpCollector(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _UnixCollector(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def collect(listen, output_path):
+    """TRACING_EXPORT=tcp:/unix: 대상에서 오는 스팬을 파일에 추가 (Ctrl+C로 종료)"""
+    scheme, _, address = listen.partition(':')
+    if scheme == 'tcp':
+        host, _, port = address.rpartition(':')
+        server = _TcpCollector((host or '0.0.0.0', int(port)), _SpanHandler)
+    elif scheme == 'unix':
+        if os.path.exists(address):
+            os.remove(address)
+        server = _UnixCollector(address, _SpanHandler)
+    else:
+        print_error(f"Unsupported listen address: {listen} (use tcp:<host>:<port> or unix:<path>)")
+        sys.exit(1)
+
+    with open(output_path, 'a', encoding='utf-8') as output:
+        server.output = output
+        server.lock = threading.Lock()
+        print_success(f"Collecting spans on {listen} into {output_path} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='trace_analyzer', description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    analyze_parser = subparsers.add_parser('analyze', help="라우트별 임계 경로/직렬 왕복 분석")
+    analyze_parser.add_argument('files', nargs='*', help="스팬 JSON Lines 파일 (- = stdin)")
+    analyze_parser.add_argument('--from-pods', action='store_true', help="실행 중인 Pod의 스팬 파일을 가져와 분석")
+    analyze_parser.add_argument('--namespace', default=os.getenv('NAMESPACE', 'authcore'))
+    analyze_parser.add_argument('--pod-path', default=POD_TRACE_FILE)
+    analyze_parser.add_argument('--route', default='', help="이 문자열이 들어간 라우트만 (예: /auth/login)")
+    analyze_parser.add_argument('--max-gap-ms', type=float, default=2.0,
+                                help="직렬 왕복 사이 허용 간격 (이보다 길면 앞 결과를 쓰는 작업으로 봄)")
+    analyze_parser.add_argument('--report', default=REPORT_PATH, help="요약 JSON 경로")
+
+    collect_parser = subparsers.add_parser('collect', help="소켓으로 받은 스팬을 파일에 기록")
+    collect_parser.add_argument('--listen', default=os.getenv('TRACE_COLLECT_LISTEN', 'tcp:127.0.0.1:4318'))
+    collect_parser.add_argument('--output', default=os.path.join(project_root(), 'traces.jsonl'))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """메인 함수"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == 'collect':
+        collect(args.listen, args.output)
+        return
+
+    if not args.files and not args.from_pods:
+        print_error("Give span files or --from-pods")
+        sys.exit(1)
+    traces = defaultdict(list)
+    stats = Counter()
+    load_from_files(args.files, traces, stats)
+    if args.from_pods:
+        load_from_pods(args.namespace, args.pod_path, traces, stats)
+
+    report, skipped = analyze(traces, args.route, args.max_gap_ms)
+    print_info(f"{stats['spans']:,} spans in {len(traces):,} traces"
+               f" ({stats['malformed']} malformed lines, {skipped} traces without a request span)")
+    if not report:
+        print_error("No complete request traces found")
+        sys.exit(1)
+    print_report(report)
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump({'spans': stats['spans'], 'routes': report}, f, indent=2, ensure_ascii=False)
+    print_success(f"Report written to {os.path.relpath(args.report)}")
+
+
+if __name__ == '__main__':
+    run_main(main)
@@ -3,34 +3,30 @@
 Kubernetes LoadBalancer URL을 가져와서 API Gateway Integration을 업데이트하는 스크립트
 """
 
+import json
 import os
 import sys
-import boto3
 import subprocess
-import json
 import time
 
-# 색상 출력
-class Colors:
-    RED = '\033[0;31m'
-    GREEN = '\033[0;32m'
-    YELLOW = '\033[1;33m'
-    BLUE = '\033[0;34m'
-    NC = '\033[0m'
-
-def print_success(msg):
-    print(f"{Colors.GREEN}✅ {msg}{Colors.NC}")
-
-def print_error(msg):
-    print(f"{Colors.RED}❌ {msg}{Colors.NC}")
+from common import DeployContext, print_success, print_error, print_info, print_step, kubectl_bin, project_root, run_main
 
-def print_info(msg):
-    print(f"{Colors.YELLOW}📋 {msg}{Colors.NC}")
+# 마지막 Integration 변경 기록 (verify_slo.py가 지연 회귀 시 이전 URI로 되돌릴 때 사용)
+GATEWAY_STATE_PATH = os.getenv('GATEWAY_STATE_FILE', os.path.join(project_root(), '.apigateway_backend.json'))
 
-def print_step(msg):
-    print(f"{Colors.BLUE}🚀 {msg}{Colors.NC}")
+def write_gateway_state(api_id: str, integration_id: str, previous_uri: str, current_uri: str):
+    """Integration 변경 전후 URI 기록"""
+    state = {
+        'api_id': api_id,
+        'integration_id': integration_id,
+        'previous_uri': previous_uri,
+        'current_uri': current_uri,
+        'updated_at': int(time.time()),
+    }
+    with open(GATEWAY_STATE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
 
-def get_k8s_backend_url(namespace: str = 'authcore', service_name: str = 'authcore-api', timeout: int = 300) -> str:
+def get_k8s_backend_url(namespace: str = 'authcore', service_name: str = 'authcore-api', timeout: int = 300, ec2_ip: str = '') -> str:
     """Kubernetes 백엔드 URL 가져오기 (LoadBalancer 또는 NodePort)"""
     print_step(f"Getting backend URL from Kubernetes...")
     
@@ -41,7 +37,7 @@ def get_k8s_backend_url(namespace: str = 'authcore', service_name: str = 'authco
     while True:
         try:
             # 먼저 hostname 확인
-            hostname_cmd = f"kubectl get svc {service_name} -n {namespace} -o jsonpath='{{.status.loadBalancer.ingress[0].hostname}}'"
+            hostname_cmd = f"{kubectl_bin()} get svc {service_name} -n {namespace} -o jsonpath='{{.status.loadBalancer.ingress[0].hostname}}'"
             hostname_result = subprocess.run(
                 hostname_cmd,
                 shell=True,
@@ -51,7 +47,7 @@ def get_k8s_backend_url(namespace: str = 'authcore', service_name: str = 'authco
             )
             
             # IP 확인 (k3s는 IP를 반환할 수 있음)
-            ip_cmd = f"kubectl get svc {service_name} -n {namespace} -o jsonpath='{{.status.loadBalancer.ingress[0].ip}}'"
+            ip_cmd = f"{kubectl_bin()} get svc {service_name} -n {namespace} -o jsonpath='{{.status.loadBalancer.ingress[0].ip}}'"
             ip_result = subprocess.run(
                 ip_cmd,
                 shell=True,
@@ -92,7 +88,7 @@ def get_k8s_backend_url(namespace: str = 'authcore', service_name: str = 'authco
     print_info("LoadBalancer not available or pending, using NodePort or LoadBalancer port...")
     
     # Service 타입 확인
-    service_type_cmd = f"kubectl get svc {service_name} -n {namespace} -o jsonpath='{{.spec.type}}'"
+    service_type_cmd = f"{kubectl_bin()} get svc {service_name} -n {namespace} -o jsonpath='{{.spec.type}}'"
     result = subprocess.run(
         service_type_cmd,
         shell=True,
@@ -103,7 +99,7 @@ def get_k8s_backend_url(namespace: str = 'authcore', service_name: str = 'authco
     service_type = result.stdout.strip()
     
     # NodePort 가져오기 (LoadBalancer도 NodePort를 사용함)
-    nodeport_cmd = f"kubectl get svc {service_name} -n {namespace} -o jsonpath='{{.spec.ports[0].nodePort}}'"
+    nodeport_cmd = f"{kubectl_bin()} get svc {service_name} -n {namespace} -o jsonpath='{{.spec.ports[0].nodePort}}'"
     result = subprocess.run(
         nodeport_cmd,
         shell=True,
@@ -116,7 +112,7 @@ def get_k8s_backend_url(namespace: str = 'authcore', service_name: str = 'authco
     # NodePort가 없으면 LoadBalancer의 port 확인 (k3s는 port 80을 사용할 수 있음)
     if not nodeport or nodeport == 'None':
         # LoadBalancer의 port 확인
-        port_cmd = f"kubectl get svc {service_name} -n {namespace} -o jsonpath='{{.spec.ports[0].port}}'"
+        port_cmd = f"{kubectl_bin()} get svc {service_name} -n {namespace} -o jsonpath='{{.spec.ports[0].port}}'"
         port_result = subprocess.run(
             port_cmd,
             shell=True,
@@ -129,7 +125,7 @@ def get_k8s_backend_url(namespace: str = 'authcore', service_name: str = 'authco
             nodeport = port  # LoadBalancer의 port 사용
     
     if nodeport and nodeport != 'None':
-        ec2_ip = os.getenv('EC2_PUBLIC_IP', '')
+        ec2_ip = ec2_ip or os.getenv('EC2_PUBLIC_IP', '')
         
         if ec2_ip:
             url = f"http://{ec2_ip}:{nodeport}"
@@ -144,12 +140,10 @@ def get_k8s_backend_url(namespace: str = 'authcore', service_name: str = 'authco
         print_error("NodePort or port not found")
         return ""
 
-def update_api_gateway_integration(api_id: str, integration_id: str, backend_url: str, region: str = 'ap-northeast-2'):
+def update_api_gateway_integration(api_id: str, integration_id: str, backend_url: str, client):
     """API Gateway Integration 업데이트 (변경된 경우에만)"""
     print_step(f"Checking API Gateway Integration...")
     
-    client = boto3.client('apigatewayv2', region_name=region)
-    
     try:
         # 기존 Integration 정보 가져오기
         integration = client.get_integration(
@@ -164,6 +158,7 @@ def update_api_gateway_integration(api_id: str, integration_id: str, backend_url
             print_info(f"Backend URL unchanged, skipping update")
             print_info(f"  Current URL: {current_uri}")
             print_info(f"  New URL: {backend_url}")
+            write_gateway_state(api_id, integration_id, current_uri, current_uri)
             return True
         
         # 백엔드 URL이 변경된 경우에만 업데이트
@@ -183,6 +178,7 @@ def update_api_gateway_integration(api_id: str, integration_id: str, backend_url
             }
         )
         
+        write_gateway_state(api_id, integration_id, current_uri, backend_url)
         print_success(f"API Gateway Integration updated successfully")
         print_info(f"  Integration ID: {integration_id}")
         print_info(f"  Backend URL: {backend_url}")
@@ -193,10 +189,8 @@ def update_api_gateway_integration(api_id: str, integration_id: str, backend_url
         print_error(f"Failed to update API Gateway Integration: {e}")
         return False
 
-def get_api_gateway_integration(api_id: str, region: str = 'ap-northeast-2'):
+def get_api_gateway_integration(api_id: str, client):
     """API Gateway Integration ID 가져오기"""
-    client = boto3.client('apigatewayv2', region_name=region)
-    
     try:
         integrations = client.get_integrations(ApiId=api_id)
         
@@ -211,10 +205,8 @@ def get_api_gateway_integration(api_id: str, region: str = 'ap-northeast-2'):
         print_error(f"Failed to get API Gateway Integrations: {e}")
         return None
 
-def create_api_gateway_integration(api_id: str, backend_url: str, region: str = 'ap-northeast-2'):
+def create_api_gateway_integration(api_id: str, backend_url: str, client):
     """API Gateway Integration 생성"""
-    client = boto3.client('apigatewayv2', region_name=region)
-    
     try:
         response = client.create_integration(
             ApiId=api_id,
@@ -236,10 +228,8 @@ def create_api_gateway_integration(api_id: str, backend_url: str, region: str =
         print_error(f"Failed to create API Gateway Integration: {e}")
         return None
 
-def create_api_gateway_routes(api_id: str, integration_id: str, region: str = 'ap-northeast-2'):
+def create_api_gateway_routes(api_id: str, integration_id: str, client):
     """API Gateway Routes 생성"""
-    client = boto3.client('apigatewayv2', region_name=region)
-    
     routes_to_create = [
         {'route_key': '$default', 'description': 'Default route - all paths'},
         {'route_key': 'ANY /auth/{proxy+}', 'description': 'Auth routes'},
@@ -276,14 +266,14 @@ def create_api_gateway_routes(api_id: str, integration_id: str, region: str = 'a
     
     return created_routes
 
-def main():
+def main(ctx=None):
     """메인 함수"""
     print("=" * 60)
     print("🔗 API Gateway Backend Update Script")
     print("=" * 60)
+    ctx = ctx or DeployContext()
     
     # 환경 변수 설정
-    aws_region = os.getenv('AWS_REGION', 'ap-northeast-2')
     namespace = os.getenv('NAMESPACE', 'authcore')
     service_name = os.getenv('SERVICE_NAME', 'authcore-api')
     
@@ -297,7 +287,7 @@ def main():
     
     # 2. Kubernetes 백엔드 URL 가져오기 (LoadBalancer 또는 NodePort)
     print_step("Step 2: Getting Kubernetes backend URL...")
-    loadbalancer_url = get_k8s_backend_url(namespace, service_name)
+    loadbalancer_url = get_k8s_backend_url(namespace, service_name, ec2_ip=ctx.values.get('ec2_ip', ''))
     
     if not loadbalancer_url:
         print_error("Failed to get LoadBalancer URL")
@@ -306,11 +296,12 @@ def main():
     
     # 3. API Gateway Integration 가져오기 또는 생성
     print_step("Step 3: Getting or creating API Gateway Integration...")
-    integration_id = get_api_gateway_integration(api_gateway_id, aws_region)
+    client = ctx.client('apigatewayv2')
+    integration_id = get_api_gateway_integration(api_gateway_id, client)
     
     if not integration_id:
         print_info("Integration not found, creating new one...")
-        integration_id = create_api_gateway_integration(api_gateway_id, loadbalancer_url, aws_region)
+        integration_id = create_api_gateway_integration(api_gateway_id, loadbalancer_url, client)
         if not integration_id:
             print_error("Failed to create API Gateway Integration")
             sys.exit(1)
@@ -318,13 +309,15 @@ def main():
         print_success(f"Integration ID: {integration_id}")
         # 4. API Gateway Integration 업데이트 (변경된 경우에만)
         print_step("Step 4: Checking and updating API Gateway Integration if needed...")
-        if not update_api_gateway_integration(api_gateway_id, integration_id, loadbalancer_url, aws_region):
+        if not update_api_gateway_integration(api_gateway_id, integration_id, loadbalancer_url, client):
             print_error("Failed to update API Gateway Integration")
             sys.exit(1)
     
     # 5. API Gateway Routes 생성
     print_step("Step 5: Creating API Gateway Routes...")
-    create_api_gateway_routes(api_gateway_id, integration_id, aws_region)
+    create_api_gateway_routes(api_gateway_id, integration_id, client)
+    
+    ctx.values['backend_url'] = loadbalancer_url
     
     print_success("API Gateway backend configured successfully!")
     print_info(f"Backend URL: {loadbalancer_url}")
@@ -334,13 +327,4 @@ def main():
     print("=" * 60)
 
 if __name__ == '__main__':
-    try:
-        main()
-    except KeyboardInterrupt:
-        print("\n⚠️  Interrupted by user")
-        sys.exit(1)
-    except Exception as e:
-        print_error(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    run_main(main)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+실행 중인 Pod에 런타임 설정과 비밀 값 반영 (Pod 재시작 없음)
+
+authcore-config ConfigMap과 authcore-secrets Secret만 갱신한다. Pod는 두 객체를 볼륨으로 마운트해
+파일이 바뀌면 다시 읽으므로(src/config/runtimeConfig.js), 이미지 배포나 rollout restart 없이
+요청 한도, 세션 상한, bcrypt cost, 로그 레벨을 바꾸고 JWT 서명 키를 교체할 수 있다.
+갱신 후 모든 Pod의 /metrics에서 새 설정 세대가 적용된 것을 확인할 때까지 기다린다.
+
+bcrypt cost는 Pod마다 보정하면 CPU 경합에 따라 레플리카별로 값이 달라지므로, --calibrate-hash-cost로
+실행 중인 Pod 하나에서 한 번 측정해 PASSWORD_HASH_COST로 모든 Pod에 같은 값을 배포한다.
+측정값이 현재 값보다 낮으면 부하로 인한 측정 오차일 수 있어 적용하지 않는다 (낮추려면 PASSWORD_HASH_COST를 직접 지정).
+
+환경 변수로 지정한 키만 바꾸고 나머지 런타임 설정과 ADMIN_TOKEN은 현재 값을 유지한다.
+키를 지워 기본값으로 되돌리려면 --unset(또는 RUNTIME_CONFIG_UNSET)으로 명시한다.
+
+사용 예:
+    RATE_LIMIT_MAX=200 python scripts/authcore.py config
+    JWT_SECRET=<새 키> python scripts/update_runtime_config.py
+    python scripts/update_runtime_config.py --calibrate-hash-cost
+    python scripts/update_runtime_config.py --unset RATE_LIMIT_MAX --unset ADMIN_TOKEN
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from common import DeployContext, print_error, print_info, print_success, run_main
+from deploy_to_k8s import (
+    build_configmap,
+    check_cluster_connection,
+    create_configmap,
+    create_secrets,
+    get_object_data,
+    resolve_jwt_secret,
+    run_kubectl,
+    scrape_config_generations,
+    unset_keys_from_env,
+    wait_for_runtime_config,
+)
+
+
+def calibrate_hash_cost(namespace):
+    """실행 중인 Pod 하나에서 bcrypt cost 보정 (Pod CPU 제한 기준, 실패하면 None)"""
+    pods = run_kubectl(
+        f"get pods -n {namespace} -l app=authcore-api --field-selector=status.phase=Running "
+        f"-o jsonpath='{{.items[*].metadata.name}}'",
+        check=False
+    )
+    if not pods:
+        print_error("No running authcore-api pod to calibrate on")
+        return None
+    pod = pods.split()[0]
+    print_info(f"Calibrating bcrypt cost on {pod}...")
+    output = run_kubectl(f"exec -n {namespace} {pod} -- node src/services/passwordHasher.js")
+    if output is None:
+        return None
+    # 로그 줄 뒤에 JSON 결과가 출력됨
+    result = json.loads(output[output.index('{'):])
+    print_info(f"Measured {result['measuredMs']}ms per hash at cost {result['cost']} (target {result['targetMs']}ms)")
+    return result['cost']
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='update_runtime_config', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calibrate-hash-cost', action='store_true',
+                        default=os.getenv('CALIBRATE_HASH_COST', 'false').lower() == 'true',
+                        help="실행 중인 Pod에서 bcrypt cost를 측정해 PASSWORD_HASH_COST로 배포")
+    parser.add_argument('--unset', action='append', metavar='KEY', default=unset_keys_from_env(),
+                        help="ConfigMap/Secret에서 지울 키 (반복 가능, 환경 변수 RUNTIME_CONFIG_UNSET)")
+    return parser.parse_args(argv)
+
+
+def main(ctx=None, argv=None):
+    """메인 함수 (authcore.py에서 호출되면 옵션은 환경 변수로만 받음)"""
+    if argv is None:
+        argv = [] if ctx is not None else sys.argv[1:]
+    args = parse_args(argv)
+    print("🔧 Updating runtime config...")
+    ctx = ctx or DeployContext()
+
+    kubeconfig = os.path.expanduser(ctx.values.get('kubeconfig') or os.getenv('KUBECONFIG', '~/.kube/config'))
+    namespace = os.getenv('NAMESPACE', 'authcore')
+    environment = os.getenv('ENVIRONMENT', 'prod')
+    os.environ['KUBECONFIG'] = kubeconfig
+
+    if not check_cluster_connection():
+        print_error("Cannot connect to Kubernetes cluster")
+        sys.exit(1)
+
+    if args.calibrate_hash_cost and not os.getenv('PASSWORD_HASH_COST'):
+        cost = calibrate_hash_cost(namespace)
+        if cost is None:
+            sys.exit(1)
+        current, _ = get_object_data(namespace, 'configmap', 'authcore-config')
+        current_cost = int((current or {}).get('PASSWORD_HASH_COST') or 0)
+        if cost < current_cost:
+            print_info(f"Keeping PASSWORD_HASH_COST={current_cost} (measured {cost} is lower)")
+        else:
+            os.environ['PASSWORD_HASH_COST'] = str(cost)
+
+    jwt_secret = resolve_jwt_secret(ctx, environment)
+    before = scrape_config_generations(namespace)
+    configmap_changed = create_configmap(namespace, build_configmap(ctx.region, environment), args.unset)
+    # JWT 키 교체는 create_secrets 안에서 단계마다 모든 Pod가 반영할 때까지 기다림
+    secrets_changed = create_secrets(namespace, jwt_secret, args.unset)
+
+    if not (configmap_changed or secrets_changed):
+        print_success("Runtime config already up to date, nothing to reload")
+        return
+    if not wait_for_runtime_config(namespace, before):
+        sys.exit(1)
+    print_success("Runtime config updated without restarting pods")
+
+
+if __name__ == '__main__':
+    run_main(main)
@@ -0,0 +1,628 @@
+#!/usr/bin/env python3
+"""
+배포 후 API Gateway → Service → Pod 전체 경로의 지연 SLO 검증
+
+합성 테스트 계정으로 짧은 부하(health, login, me, refresh)를 API Gateway URL과 백엔드 URL(Integration이 가리키는
+NodePort/LoadBalancer 주소)에 같은 시간 동안 번갈아 보내고, 경로·요청 종류별 p50/p95/p99와 에러율을 저장된 기준과
+비교한다. 두 경로를 함께 재므로 게이트웨이 경로만 느려진 경우(잘못된 integration_uri)와 릴리스 자체가 느려진 경우를
+구분할 수 있다. 기준을 넘으면 실패 코드로 종료하고, 요청하면 Integration을 직전 URI로 되돌린다.
+
+기준(baseline):
+    - 클러스터의 authcore-slo-baseline ConfigMap (CI 실행 간 유지). --baseline-file로 로컬 파일 사용 가능
+    - 기준이 없으면 이번 측정을 기준으로 저장하고 통과. --update-baseline이면 판정과 무관하게 이번 측정으로 교체
+
+부하:
+    - 요청은 정해진 간격으로 예약하고, 지연은 예약 시각부터 잰다 (앞 요청이 밀리면 대기 시간도 포함)
+    - 작업자마다 로그인 세션 하나를 쓰고 끝나면 로그아웃한다. 작업자 수 x 2가 MAX_SESSIONS_PER_USER를 넘지 않게 할 것
+    - --rate는 모든 대상이 나눠 쓰는 전체 예산이다. 두 경로 모두 SNAT 뒤 같은 IP로 보이므로 IP별 요청 한도
+      (RATE_LIMIT_MAX, 분당 100)를 함께 소비한다. 기본값(전체 1.2 rps = 분당 72, 로그아웃 포함 약 81)은 한도 아래
+
+로컬 테스트:
+    python scripts/verify_slo.py standin --port 18080 &
+    python scripts/verify_slo.py standin --port 18081 --delay-ms 30 &
+    SLO_TEST_PASSWORD=pw1234 python scripts/verify_slo.py --backend-url http://127.0.0.1:18080 \\
+        --gateway-url http://127.0.0.1:18081 --baseline-file /tmp/slo-baseline.json
+
+사용 예:
+    SLO_TEST_PASSWORD=... python scripts/authcore.py verify
+    python scripts/verify_slo.py --revert-on-fail --duration 60
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from common import DeployContext, print_error, print_info, print_step, print_success, project_root, run_main
+
+REPORT_PATH = os.path.join(project_root(), '.slo_report.json')
+BASELINE_CONFIGMAP = 'authcore-slo-baseline'
+BASELINE_KEY = 'baseline.json'
+
+# 작업자 한 명이 반복하는 요청 순서 (토큰 검증 위주, 로그인은 bcrypt 비용 때문에 드물게)
+SCENARIO_CYCLE = ['health', 'me', 'refresh', 'me', 'health', 'me', 'login', 'me']
+OPERATIONS = ('health', 'login', 'me', 'refresh')
+QUANTILES = (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))
+REQUEST_TIMEOUT_SECONDS = 10
+# 서버의 IP별 요청 한도 (분당). 측정 요청이 429로 바뀌어 에러율·지연을 왜곡하지 않도록 전체 속도를 이 아래로 유지
+RATE_LIMIT_PER_MINUTE = int(os.getenv('RATE_LIMIT_MAX', '100'))
+
+
+def load_thresholds():
+    """판정 기준 (환경 변수)"""
+    return {
+        # 기준 대비 ratio배 + tolerance를 넘으면 실패 (CI 러너 네트워크 잡음을 tolerance로 흡수)
+        'max_p50_ratio': float(os.getenv('SLO_MAX_P50_RATIO', '1.3')),
+        'max_p95_ratio': float(os.getenv('SLO_MAX_P95_RATIO', '1.5')),
+        'max_p99_ratio': float(os.getenv('SLO_MAX_P99_RATIO', '2.0')),
+        'latency_tolerance_ms': float(os.getenv('SLO_LATENCY_TOLERANCE_MS', '20')),
+        # 에러율이 기준 + 이 값을 넘으면 실패
+        'max_error_rate_increase': float(os.getenv('SLO_MAX_ERROR_RATE_INCREASE', '0.01')),
+        # 요청 종류별 표본이 이보다 적으면 분위수 비교 생략 (에러율은 비교)
+        'min_samples': int(os.getenv('SLO_MIN_SAMPLES', '10')),
+    }
+
+
+def percentile(sorted_values, q):
+    """nearest rank 분위수"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class ApiClient:
+    """대상 하나에 대한 keep-alive HTTP 연결 (작업자마다 하나, 스레드 간 공유하지 않음)"""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip('/')
+        self.connection = None
+
+    def _connect(self):
+        connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=REQUEST_TIMEOUT_SECONDS)
+
+    def request(self, method, path, body=None, token=None):
+        """(상태 코드, JSON 본문) 반환. 연결 오류는 상태 코드 0"""
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        if token:
+            headers['Authorization'] = f"Bearer {token}"
+        payload = json.dumps(body) if body is not None else None
+
+        # 서버가 keep-alive 연결을 닫았으면 한 번 다시 연결
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = self._connect()
+            try:
+                self.connection.request(method, self.prefix + path, body=payload, headers=headers)
+                response = self.connection.getresponse()
+                raw = response.read()
+                try:
+                    data = json.loads(raw) if raw else {}
+                except ValueError:
+                    data = {}
+                return response.status, data
+            except (http.client.HTTPException, OSError):
+                self.close()
+                if attempt == 1:
+                    return 0, {}
+        return 0, {}
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class Recorder:
+    """대상·요청 종류별 지연(ms)과 실패 수 (여러 작업자 스레드에서 기록)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def add(self, target, operation, latency_ms, ok):
+        with self.lock:
+            entry = self.samples.setdefault((target, operation), {'latencies': [], 'errors': 0})
+            entry['latencies'].append(latency_ms)
+            if not ok:
+                entry['errors'] += 1
+
+    def summary(self):
+        """{대상: {요청 종류 | all: {count, error_rate, p50_ms, p95_ms, p99_ms}}}"""
+        grouped = {}
+        with self.lock:
+            for (target, operation), entry in self.samples.items():
+                grouped.setdefault(target, {})[operation] = entry
+        result = {}
+        for target, operations in grouped.items():
+            merged = {
+                'latencies': [ms for entry in operations.values() for ms in entry['latencies']],
+                'errors': sum(entry['errors'] for entry in operations.values()),
+            }
+            result[target] = {
+                name: summarize(entry)
+                for name, entry in sorted({**operations, 'all': merged}.items())
+            }
+        return result
+
+
+def summarize(entry):
+    latencies = sorted(entry['latencies'])
+    stats = {
+        'count': len(latencies),
+        'error_rate': round(entry['errors'] / len(latencies), 4) if latencies else 0.0,
+    }
+    for name, q in QUANTILES:
+        value = percentile(latencies, q)
+        stats[f"{name}_ms"] = round(value, 2) if value is not None else None
+    return stats
+
+
+class Session:
+    """작업자 한 명의 로그인 세션 (refresh마다 토큰 교체)"""
+
+    def __init__(self, client, username, password):
+        self.client = client
+        self.username = username
+        self.password = password
+        self.access_token = None
+        self.refresh_token = None
+        self.stale_refresh_token = None
+
+    def login(self):
+        status, data = self.client.request(
+            'POST', '/auth/login', {'username': self.username, 'password': self.password}
+        )
+        if status != 200:
+            return status
+        self.stale_refresh_token = self.refresh_token
+        tokens = data.get('data', {}).get('tokens', {})
+        self.access_token = tokens.get('accessToken')
+        self.refresh_token = tokens.get('refreshToken')
+        return status
+
+    def logout_stale(self):
+        """다시 로그인하기 전 세션 로그아웃 (세션 상한에 걸려 다른 작업자의 세션이 폐기되지 않도록, 측정 밖에서 호출)"""
+        if self.stale_refresh_token:
+            self.client.request('POST', '/auth/logout', {'refreshToken': self.stale_refresh_token}, token=self.access_token)
+            self.stale_refresh_token = None
+
+    def run(self, operation):
+        """요청 하나 실행 → 상태 코드"""
+        if operation == 'health':
+            return self.client.request('GET', '/health')[0]
+        if operation == 'login':
+            return self.login()
+        if operation == 'me':
+            return self.client.request('GET', '/auth/me', token=self.access_token)[0]
+        status, data = self.client.request('POST', '/auth/refresh', {'refreshToken': self.refresh_token})
+        if status == 200:
+            tokens = data.get('data', {})
+            self.access_token = tokens.get('accessToken', self.access_token)
+            self.refresh_token = tokens.get('refreshToken', self.refresh_token)
+        return status
+
+    def logout(self):
+        if self.refresh_token:
+            self.client.request('POST', '/auth/logout', {'refreshToken': self.refresh_token}, token=self.access_token)
+
+
+def ensure_test_account(base_url, username, password):
+    """합성 테스트 계정이 없으면 생성 (이미 있으면 그대로 사용)"""
+    client = ApiClient(base_url)
+    try:
+        status, _ = client.request('POST', '/auth/login', {'username': username, 'password': password})
+        if status == 200:
+            return True
+        status, data = client.request('POST', '/auth/register', {'username': username, 'password': password})
+        if status == 201:
+            print_info(f"Created synthetic test account '{username}'")
+            return True
+        print_error(f"Cannot log in or register test account '{username}' ({status}: {data.get('message', '')})")
+        return False
+    finally:
+        client.close()
+
+
+def run_worker(target, base_url, credentials, interval, deadline, offset, recorder):
+    """작업자 하나: 예약 간격마다 시나리오 순서대로 요청하고 예약 시각부터 응답까지의 지연 기록"""
+    client = ApiClient(base_url)
+    session = Session(client, *credentials) if credentials else None
+    operations = SCENARIO_CYCLE if session else ['health']
+
+    try:
+        if session:
+            started = time.perf_counter()
+            status = session.login()
+            recorder.add(target, 'login', (time.perf_counter() - started) * 1000, status == 200)
+            if status != 200:
+                return
+
+        scheduled = time.perf_counter() + offset
+        step = 0
+        while scheduled < deadline:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            operation = operations[step % len(operations)]
+            status = session.run(operation) if session else client.request('GET', '/health')[0]
+            recorder.add(target, operation, (time.perf_counter() - scheduled) * 1000, 200 <= status < 300)
+            if session:
+                session.logout_stale()
+            step += 1
+            scheduled += interval
+    finally:
+        if session:
+            session.logout()
+        client.close()
+
+
+def run_load(targets, credentials, rate, duration, workers):
+    """모든 대상에 동시에 부하 (같은 시간대의 백엔드 상태를 비교하도록, rate는 대상들이 나눠 쓰는 전체 초당 요청 수)"""
+    recorder = Recorder()
+    interval = workers * len(targets) / rate
+    deadline = time.perf_counter() + duration
+    threads = []
+    for target, base_url in targets.items():
+        for index in range(workers):
+            # 작업자끼리 같은 순간에 몰리지 않도록 시작 시각을 나눔
+            offset = interval * index / workers + random.uniform(0, interval / workers / 2)
+            thread = threading.Thread(
+                target=run_worker,
+                args=(target, base_url, credentials, interval, deadline, offset, recorder),
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+    for thread in threads:
+        thread.join(duration + REQUEST_TIMEOUT_SECONDS * 3)
+    return recorder.summary()
+
+
+def evaluate(results, baseline, thresholds):
+    """
+    측정 결과를 기준과 비교
+
+    Returns:
+        검사 목록 (대상·요청 종류·지표별 passed)
+    """
+    checks = []
+    for target, operations in results.items():
+        for operation, stats in operations.items():
+            base = (baseline.get(target) or {}).get(operation)
+            if not base:
+                continue
+            if stats['count'] >= thresholds['min_samples']:
+                for name, _ in QUANTILES:
+                    value, reference = stats[f"{name}_ms"], base.get(f"{name}_ms")
+                    if value is None or reference is None:
+                        continue
+                    limit = reference * thresholds[f"max_{name}_ratio"] + thresholds['latency_tolerance_ms']
+                    checks.append({
+                        'target': target, 'operation': operation, 'metric': name,
+                        'baseline': reference, 'value': value, 'limit': round(limit, 2),
+                        'passed': value <= limit,
+                    })
+            error_limit = base.get('error_rate', 0.0) + thresholds['max_error_rate_increase']
+            checks.append({
+                'target': target, 'operation': operation, 'metric': 'error_rate',
+                'baseline': base.get('error_rate', 0.0), 'value': stats['error_rate'], 'limit': round(error_limit, 4),
+                'passed': stats['error_rate'] <= error_limit,
+            })
+    return checks
+
+
+def print_results(results, checks):
+    failed = {(c['target'], c['operation']) for c in checks if not c['passed']}
+    for target, operations in results.items():
+        print_step(f"{target}")
+        print(f"  {'request':<10} {'count':>6} {'errors':>7} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for operation, stats in operations.items():
+            marker = '  ✗' if (target, operation) in failed else ''
+            cells = ' '.join(
+                f"{stats[f'{name}_ms']:>7.1f}ms" if stats[f'{name}_ms'] is not None else f"{'-':>9}"
+                for name, _ in QUANTILES
+            )
+            print(f"  {operation:<10} {stats['count']:>6} {stats['error_rate']:>7.1%} {cells}{marker}")
+
+    # 게이트웨이가 더하는 지연 (백엔드 경로 대비 p50 차이)
+    gateway, backend = results.get('gateway', {}).get('all'), results.get('backend', {}).get('all')
+    if gateway and backend and gateway['p50_ms'] is not None and backend['p50_ms'] is not None:
+        print_info(f"Gateway overhead: {gateway['p50_ms'] - backend['p50_ms']:+.1f}ms at p50")
+
+    for check in checks:
+        if not check['passed']:
+            print_error(
+                f"{check['target']} {check['operation']} {check['metric']}: {check['value']} "
+                f"(baseline {check['baseline']}, limit {check['limit']})"
+            )
+
+
+def load_baseline(args):
+    """저장된 기준 (없으면 None)"""
+    if args.baseline_file:
+        if not os.path.exists(args.baseline_file):
+            return None
+        with open(args.baseline_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    from deploy_to_k8s import get_object_data
+    data, _ = get_object_data(args.namespace, 'configmap', BASELINE_CONFIGMAP)
+    return json.loads(data[BASELINE_KEY]) if data and data.get(BASELINE_KEY) else None
+
+
+def save_baseline(args, results):
+    baseline = {'updated_at': int(time.time()), 'targets': results}
+    if args.baseline_file:
+        with open(args.baseline_file, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+        print_success(f"Baseline saved to {args.baseline_file}")
+        return
+    from deploy_to_k8s import put_document
+    put_document({
+        'apiVersion': 'v1',
+        'kind': 'ConfigMap',
+        'metadata': {'name': BASELINE_CONFIGMAP, 'namespace': args.namespace},
+        'data': {BASELINE_KEY: json.dumps(baseline, indent=2)},
+    })
+
+
+def read_gateway_state():
+    """update_apigateway_backend.py가 기록한 마지막 Integration 변경 (없으면 {})"""
+    from update_apigateway_backend import GATEWAY_STATE_PATH
+    if not os.path.exists(GATEWAY_STATE_PATH):
+        return {}
+    with open(GATEWAY_STATE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def resolve_targets(args, ctx):
+    """측정 대상 URL (gateway: API Gateway 엔드포인트, backend: Integration이 가리키는 주소)"""
+    targets = {}
+    gateway_url = args.gateway_url
+    backend_url = args.backend_url or ctx.values.get('backend_url', '')
+    api_id = os.getenv('API_GATEWAY_ID', '')
+
+    if api_id and not (gateway_url and backend_url):
+        client = ctx.client('apigatewayv2')
+        gateway_url = gateway_url or client.get_api(ApiId=api_id)['ApiEndpoint']
+        if not backend_url:
+            state = read_gateway_state()
+            integration_id = state.get('integration_id')
+            if not integration_id:
+                from update_apigateway_backend import get_api_gateway_integration
+                integration_id = get_api_gateway_integration(api_id, client)
+            if integration_id:
+                backend_url = client.get_integration(ApiId=api_id, IntegrationId=integration_id)['IntegrationUri']
+
+    if gateway_url:
+        targets['gateway'] = gateway_url.rstrip('/')
+    if backend_url:
+        targets['backend'] = backend_url.rstrip('/')
+    return targets
+
+
+def revert_integration(ctx):
+    """Integration을 직전 URI로 되돌림 (이번 배포에서 바뀐 경우에만)"""
+    state = read_gateway_state()
+    previous, current = state.get('previous_uri'), state.get('current_uri')
+    if not previous or previous == current:
+        print_info("Integration URI was not changed by this deployment, nothing to revert")
+        return False
+
+    from update_apigateway_backend import update_api_gateway_integration, write_gateway_state
+    print_step(f"Reverting API Gateway Integration to {previous}...")
+    if not update_api_gateway_integration(state['api_id'], state['integration_id'], previous, ctx.client('apigatewayv2')):
+        return False
+    # 다시 실행해도 실패한 URI로 되돌아가지 않도록 되돌릴 대상 없음으로 기록
+    write_gateway_state(state['api_id'], state['integration_id'], previous, previous)
+    return True
+
+
+class _StandinHandler(BaseHTTPRequestHandler):
+    """AuthCore API 흉내 (health, register, login, me, refresh, logout). 지연·에러를 주입할 수 있음"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _issue(self, username):
+        state = self.server.state
+        tokens = {'accessToken': secrets.token_hex(16), 'refreshToken': secrets.token_hex(16)}
+        state['access'][tokens['accessToken']] = username
+        state['refresh'][tokens['refreshToken']] = username
+        return tokens
+
+    def _handle(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else {}
+        options, state = self.server.options, self.server.state
+        time.sleep(max(options.delay_ms + random.uniform(-options.jitter_ms, options.jitter_ms), 0) / 1000)
+        if random.random() < options.error_rate:
+            return self._reply(500, {'success': False, 'message': 'injected error'})
+
+        token = (self.headers.get('Authorization') or '')[len('Bearer '):]
+        with self.server.lock:
+            if (method, self.path) == ('GET', '/health'):
+                return self._reply(200, {'status': 'ok', 'service': 'authcore'})
+            if (method, self.path) == ('POST', '/auth/register'):
+                if body.get('username') in state['users']:
+                    return self._reply(400, {'success': False, 'message': '이미 사용 중인 닉네임입니다.'})
+                state['users'][body.get('username')] = body.get('password')
+                return self._reply(201, {'success': True, 'data': {'tokens': self._issue(body.get('username'))}})
+            if (method, self.path) == ('POST', '/auth/login'):
+                if state['users'].get(body.get('username')) != body.get('password') or not body.get('password'):
+                    return self._reply(401, {'success': False, 'message': '비밀번호가 일치하지 않습니다.'})
+                return self._reply(200, {'success': True, 'data': {'tokens': self._issue(body.get('username'))}})
+            if (method, self.path) == ('GET', '/auth/me'):
+                if token not in state['access']:
+                    return self._reply(401, {'success': False, 'message': '유효하지 않은 토큰입니다.'})
+                return self._reply(200, {'success': True, 'data': {'user': {'username': state['access'][token]}}})
+            if (method, self.path) == ('POST', '/auth/refresh'):
+                username = state['refresh'].pop(body.get('refreshToken'), None)
+                if username is None:
+                    return self._reply(401, {'success': False, 'message': '유효하지 않은 토큰입니다.'})
+                return self._reply(200, {'success': True, 'data': self._issue(username)})
+            if (method, self.path) == ('POST', '/auth/logout'):
+                state['refresh'].pop(body.get('refreshToken'), None)
+                return self._reply(200, {'success': True})
+        return self._reply(404, {'success': False, 'message': '요청한 리소스를 찾을 수 없습니다.'})
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+
+def run_standin(options):
+    """로컬 테스트용 가짜 API 서버 (Ctrl+C로 종료)"""
+    server = ThreadingHTTPServer(('127.0.0.1', options.port), _StandinHandler)
+    server.daemon_threads = True
+    server.options = options
+    server.lock = threading.Lock()
+    server.state = {'users': {}, 'access': {}, 'refresh': {}}
+    print_success(
+        f"Stand-in API on http://127.0.0.1:{options.port} "
+        f"(delay {options.delay_ms}±{options.jitter_ms}ms, error rate {options.error_rate:.1%})"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def parse_args(argv):
+    if argv and argv[0] == 'standin':
+        parser = argparse.ArgumentParser(prog='verify_slo standin', description="로컬 테스트용 가짜 AuthCore API")
+        parser.add_argument('--port', type=int, default=18080)
+        parser.add_argument('--delay-ms', type=float, default=2.0, help="요청마다 더할 지연")
+        parser.add_argument('--jitter-ms', type=float, default=1.0)
+        parser.add_argument('--error-rate', type=float, default=0.0, help="500으로 응답할 비율")
+        args = parser.parse_args(argv[1:])
+        args.command = 'standin'
+        return args
+
+    parser = argparse.ArgumentParser(prog='verify_slo', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--gateway-url', default=os.getenv('GATEWAY_URL', ''),
+                        help="API Gateway URL (기본: API_GATEWAY_ID의 ApiEndpoint)")
+    parser.add_argument('--backend-url', default=os.getenv('BACKEND_URL', ''),
+                        help="직접 호출할 백엔드 URL (기본: 현재 Integration URI)")
+    parser.add_argument('--username', default=os.getenv('SLO_TEST_USERNAME', 'slo_probe'))
+    parser.add_argument('--rate', type=float, default=float(os.getenv('SLO_RATE', '1.2')),
+                        help="모든 대상을 합친 초당 요청 수 (대상끼리 나눠 씀)")
+    parser.add_argument('--duration', type=float, default=float(os.getenv('SLO_DURATION', '60')), help="측정 시간 (초)")
+    parser.add_argument('--workers', type=int, default=int(os.getenv('SLO_WORKERS', '2')), help="대상별 동시 작업자 수")
+    parser.add_argument('--namespace', default=os.getenv('NAMESPACE', 'authcore'))
+    parser.add_argument('--baseline-file', default=os.getenv('SLO_BASELINE_FILE', ''),
+                        help="기준 파일 (기본: 클러스터의 authcore-slo-baseline ConfigMap)")
+    parser.add_argument('--update-baseline', action='store_true', help="판정과 무관하게 이번 측정을 기준으로 저장")
+    parser.add_argument('--revert-on-fail', action='store_true',
+                        default=os.getenv('SLO_REVERT_INTEGRATION', 'false') == 'true',
+                        help="실패 시 API Gateway Integration을 직전 URI로 되돌림")
+    parser.add_argument('--report', default=REPORT_PATH)
+    args = parser.parse_args(argv)
+    args.command = 'verify'
+    return args
+
+
+def main(ctx=None, argv=None):
+    """메인 함수 (authcore.py에서 호출되면 옵션은 환경 변수로만 받음)"""
+    if argv is None:
+        argv = [] if ctx is not None else sys.argv[1:]
+    args = parse_args(argv)
+    if args.command == 'standin':
+        run_standin(args)
+        return
+
+    print("⏱️  Verifying end-to-end latency SLO...")
+    ctx = ctx or DeployContext()
+    targets = resolve_targets(args, ctx)
+    if not targets:
+        print_error("No target URL (set API_GATEWAY_ID, GATEWAY_URL or BACKEND_URL)")
+        sys.exit(1)
+
+    password = os.getenv('SLO_TEST_PASSWORD', '')
+    credentials = None
+    if password:
+        # 보통 같은 백엔드지만 대상마다 확인 (로컬 대역 서버는 계정을 따로 가짐)
+        if not all(ensure_test_account(url, args.username, password) for url in targets.values()):
+            sys.exit(1)
+        credentials = (args.username, password)
+    else:
+        print_info("SLO_TEST_PASSWORD not set, measuring /health only")
+
+    for target, url in targets.items():
+        print_info(f"{target}: {url}")
+    if args.rate * 60 > RATE_LIMIT_PER_MINUTE:
+        print_error(
+            f"--rate {args.rate:g} req/s ({args.rate * 60:g}/min across all targets) exceeds the per-IP limit "
+            f"of {RATE_LIMIT_PER_MINUTE}/min; requests will be rate limited and counted as errors"
+        )
+    print_info(
+        f"{args.rate:g} req/s in total ({args.rate / len(targets):g} per target) for {args.duration:g}s "
+        f"({args.workers} workers per target)"
+    )
+    results = run_load(targets, credentials, args.rate, args.duration, args.workers)
+
+    thresholds = load_thresholds()
+    baseline = load_baseline(args)
+    checks = evaluate(results, (baseline or {}).get('targets', {}), thresholds) if baseline else []
+    print_results(results, checks)
+
+    failed = [check for check in checks if not check['passed']]
+    verdict = 'fail' if failed else 'pass'
+    if baseline is None:
+        print_info("No baseline yet, storing this run as the baseline")
+    if baseline is None or args.update_baseline:
+        save_baseline(args, results)
+
+    reverted = False
+    if failed and args.revert_on_fail and 'gateway' in targets:
+        reverted = revert_integration(ctx)
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump({
+            'verdict': verdict,
+            'targets': targets,
+            'results': results,
+            'checks': checks,
+            'thresholds': thresholds,
+            'baseline_updated_at': (baseline or {}).get('updated_at'),
+            'integration_reverted': reverted,
+        }, f, indent=2, ensure_ascii=False)
+
+    if failed:
+        # 요청 종류별 분위수는 표본이 적어 흔들리므로 전체(all) 기준으로 원인 추정
+        backend_failed = any(check['target'] == 'backend' and check['operation'] == 'all' for check in failed)
+        cause = "release (backend path also regressed)" if backend_failed else "gateway path only (check integration URI)"
+        print_error(f"SLO check failed: {len(failed)} check(s) over limit, likely cause: {cause}")
+        sys.exit(1)
+    print_success(f"SLO check passed ({len(checks)} checks)")
+
+
+if __name__ == '__main__':
+    run_main(main)
@@ -15,6 +15,7 @@ const USER_VALIDATION = {
 // JWT 설정
 const JWT_CONFIG = {
   ACCESS_EXPIRES_IN: "15m",
+  ACCESS_EXPIRES_IN_SECONDS: 15 * 60,
   REFRESH_EXPIRES_IN: "7d"
 };
 
@@ -24,6 +25,192 @@ const TABLES = {
   REFRESH_TOKENS: process.env.REFRESH_TOKENS_TABLE || process.env.REFRESH_TOKENS_TABLE_NAME || "AuthCore_RefreshTokens"
 };
 
+// 레플리카 간 이벤트 피드 (RefreshTokens 테이블의 시간 구간별 파티션을 user-id-index로 폴링)
+const EVENT_FEED = {
+  // 파티션 키는 "<PARTITION>#<구간 번호>" (구간 번호 = 발행 시각 / BUCKET_MS)
+  PARTITION: "__event_feed__",
+  ITEM_TYPE: "feed_event",
+  BUCKET_MS: 60000,
+  POLL_INTERVAL_MS: Number(process.env.EVENT_FEED_POLL_MS) || 5000,
+  // GSI 전파 지연으로 늦게 보이는 이벤트를 놓치지 않도록 이전 폴링 구간과 겹쳐 조회
+  OVERLAP_MS: 15000,
+  // 기동 시 이만큼 이전 구간부터 읽음 (access token 수명과 최대 로그인 잠금 시간 이상이어야 함)
+  LOOKBACK_MS: Number(process.env.EVENT_FEED_LOOKBACK_MS) || 15 * 60 * 1000
+};
+
+// Stateless access token 모드 (요청마다 DynamoDB 조회 없이 JWT 클레임 + 폐기 목록으로 인증)
+const STATELESS_AUTH = {
+  ENABLED: process.env.AUTH_STATELESS_MODE === "true",
+  // 마지막 피드 동기화가 이보다 오래되면 DynamoDB 조회 방식으로 되돌아감
+  MAX_STALENESS_MS: Number(process.env.AUTH_STATELESS_MAX_STALENESS_MS) || 30000
+};
+
+// 비밀번호 해시 비용 (bcrypt cost). 기동 시 실제 CPU에서 측정해 목표 시간에 맞춰 조정 가능
+const PASSWORD_HASH = {
+  DEFAULT_COST: Number(process.env.PASSWORD_HASH_COST) || 10,
+  MIN_COST: Number(process.env.PASSWORD_HASH_MIN_COST) || 10,
+  MAX_COST: Number(process.env.PASSWORD_HASH_MAX_COST) || 14,
+  TARGET_MS: Number(process.env.PASSWORD_HASH_TARGET_MS) || 250,
+  CALIBRATE_ON_STARTUP: process.env.PASSWORD_HASH_CALIBRATE === "true"
+};
+
+// refresh token 세션 관리 (사용자별 활성 세션 상한, 폐기·회전된 토큰 정리 방식)
+const SESSIONS = {
+  // 새 토큰 발급 시 이 수를 넘는 가장 오래된 활성 세션부터 폐기
+  MAX_ACTIVE_PER_USER: Number(process.env.MAX_SESSIONS_PER_USER) || 10,
+  // "delete": 폐기·회전 즉시 삭제, "ttl": is_revoked로 표시하고 REVOKED_TTL_SECONDS 뒤 TTL이 삭제
+  REVOKED_MODE: process.env.REVOKED_TOKEN_MODE === "ttl" ? "ttl" : "delete",
+  REVOKED_TTL_SECONDS: Number(process.env.REVOKED_TOKEN_TTL_SECONDS) || 3600,
+  // BatchWriteItem UnprocessedItems 재시도 횟수
+  BATCH_WRITE_MAX_ATTEMPTS: 5
+};
+
+// 닉네임 점유 항목 (Users 테이블에 user_id = "USERNAME#<닉네임>" 으로 저장, 조건부 쓰기로 중복 방지)
+const USERNAME_CLAIM = {
+  KEY_PREFIX: "USERNAME#",
+  ITEM_TYPE: "username_claim"
+};
+
+// last_login_at write-behind 버퍼 설정 (로그인 응답 경로에서 DynamoDB 쓰기 제거)
+const LOGIN_WRITE_BEHIND = {
+  ENABLED: process.env.LOGIN_WRITE_BEHIND !== "false",
+  FLUSH_INTERVAL_MS: Number(process.env.LOGIN_WRITE_BEHIND_FLUSH_MS) || 5000,
+  MAX_PENDING: Number(process.env.LOGIN_WRITE_BEHIND_MAX_PENDING) || 10000,
+  FLUSH_CONCURRENCY: Number(process.env.LOGIN_WRITE_BEHIND_CONCURRENCY) || 10
+};
+
+// 배치 토큰 검사 (/auth/introspect)
+const INTROSPECTION = {
+  MAX_TOKENS: Number(process.env.INTROSPECTION_MAX_TOKENS) || 100,
+  // BatchGetItem 한 번에 조회 가능한 최대 키 수
+  BATCH_GET_SIZE: 100,
+  MAX_BATCH_GET_RETRIES: 3,
+  // 게이트웨이 캐시 힌트 상한 (폐기가 이 시간 안에 반영되도록)
+  MAX_CACHE_TTL_SECONDS: Number(process.env.INTROSPECTION_MAX_CACHE_TTL_SECONDS) || 30,
+  // x-introspection-key 헤더가 일치해야 호출 가능 (미설정 시 엔드포인트 비활성화)
+  API_KEY: process.env.INTROSPECTION_API_KEY || ""
+};
+
+// 온디맨드 CPU 프로파일/힙 스냅샷 (/admin/profile). ADMIN_TOKEN이 없으면 엔드포인트 비활성화
+const PROFILING = {
+  ADMIN_TOKEN: process.env.ADMIN_TOKEN || "",
+  DEFAULT_CPU_SECONDS: 10,
+  MAX_CPU_SECONDS: Number(process.env.PROFILING_MAX_CPU_SECONDS) || 60,
+  // V8 샘플링 간격 (µs). 짧을수록 정밀하지만 측정 중 오버헤드 증가
+  SAMPLING_INTERVAL_US: Number(process.env.PROFILING_SAMPLING_INTERVAL_US) || 1000,
+  // 힙 스냅샷 기록에 추가로 필요한 메모리 (사용 중인 힙의 배수). 현재 RSS + 이 값이 컨테이너 메모리 한도를 넘으면 거부
+  HEAP_SNAPSHOT_MEMORY_FACTOR: Number(process.env.PROFILING_HEAP_SNAPSHOT_MEMORY_FACTOR) || 2
+};
+
+// DynamoDB 접근 계층 (요청별 시간 예산, 지터 재시도 + 재시도 예산, 선택적 헤지 읽기)
+const DYNAMO_ACCESS = {
+  ENABLED: process.env.DYNAMO_ACCESS_LAYER !== "false",
+  // 명령별 [시도당 제한, 전체 예산] (ms). 읽기는 짧게 끊고 다시 시도해 느린 응답 하나가 p99를 정하지 않도록
+  // 시도당 제한은 새 연결(TLS 핸드셰이크 포함)의 첫 요청도 끊지 않을 만큼 둠. 평소 꼬리 지연은 헤지 읽기가 맡음
+  TIMEOUTS_MS: {
+    GetCommand: [250, 600],
+    QueryCommand: [300, 800],
+    BatchGetCommand: [250, 600],
+    PutCommand: [250, 600],
+    UpdateCommand: [250, 600],
+    DeleteCommand: [250, 600],
+    BatchWriteCommand: [250, 600],
+    TransactWriteCommand: [800, 2000],
+    default: [500, 1500],
+    ...JSON.parse(process.env.DYNAMO_TIMEOUTS_MS || "{}")
+  },
+  MAX_ATTEMPTS: Number(process.env.DYNAMO_MAX_ATTEMPTS) || 3,
+  BACKOFF_BASE_MS: 20,
+  BACKOFF_CAP_MS: 200,
+  // 처리량 초과(throttling)일 때 백오프 배수
+  THROTTLE_BACKOFF_MULTIPLIER: 4,
+  // 재시도 예산: 요청마다 RATIO만큼 적립, 재시도/헤지마다 1 차감 (장애 시 재시도 폭주 방지)
+  RETRY_BUDGET_RATIO: Number(process.env.DYNAMO_RETRY_BUDGET_RATIO) || 0.1,
+  RETRY_BUDGET_INITIAL: 10,
+  RETRY_BUDGET_MAX: 100,
+  // 헤지 읽기: 같은 종류 요청의 최근 지연 분위수만큼 기다려도 응답이 없으면 한 번 더 요청
+  HEDGE_ENABLED: process.env.DYNAMO_HEDGE_READS === "true",
+  HEDGE_PERCENTILE: Number(process.env.DYNAMO_HEDGE_PERCENTILE) || 0.95,
+  // 헤지할 명령 (단건 키 읽기만. Query/Scan은 읽기 용량을 여러 배로 쓰고 페이지가 커서 복제 비용이 큼)
+  HEDGE_COMMANDS: (process.env.DYNAMO_HEDGE_COMMANDS || "GetCommand").split(",").map((name) => name.trim()).filter(Boolean),
+  HEDGE_MIN_DELAY_MS: Number(process.env.DYNAMO_HEDGE_MIN_DELAY_MS) || 5,
+  HEDGE_MIN_SAMPLES: 50,
+  LATENCY_WINDOW: 256
+};
+
+// 요청 트레이싱 (샘플링한 요청의 스팬을 로컬 파일/소켓에 JSON Lines로 기록, scripts/trace_analyzer.py로 분석)
+const TRACING = {
+  ENABLED: process.env.TRACING_ENABLED === "true",
+  // 추적할 요청 비율 (상위 샘플링 결정을 신뢰하지 않으면 모든 요청에 적용)
+  SAMPLE_RATE: Number(process.env.TRACING_SAMPLE_RATE) || 0.01,
+  // 상위 trace context의 sampled 플래그를 따를지 여부. 헤더는 클라이언트가 임의로 보낼 수 있으므로
+  // 앞단(API Gateway 등)이 클라이언트 헤더를 덮어쓰는 배포에서만 켠다 (꺼져 있으면 trace id만 이어받음)
+  TRUST_UPSTREAM_SAMPLING: process.env.TRACING_TRUST_UPSTREAM_SAMPLING === "true",
+  // file:<경로> | unix:<소켓 경로> | tcp:<호스트>:<포트>
+  EXPORT_TARGET: process.env.TRACING_EXPORT || "file:/tmp/authcore-traces.jsonl",
+  FLUSH_INTERVAL_MS: Number(process.env.TRACING_FLUSH_MS) || 1000,
+  // 내보내기가 밀리면 이보다 많은 스팬은 버림 (요청 경로가 기다리지 않도록)
+  MAX_BUFFERED_SPANS: 10000
+};
+
+// 요청 한도 (클라이언트별). MAX는 런타임 설정(RATE_LIMIT_MAX 파일)으로 재시작 없이 변경 가능
+const RATE_LIMIT = {
+  MAX: Number(process.env.RATE_LIMIT_MAX) || 100,
+  TIME_WINDOW: "1 minute",
+  // 프록시/로드밸런서 뒤에서 X-Forwarded-For로 클라이언트 IP 판별 ("true" 또는 신뢰할 홉 수). 요청 한도와 로그인 제한에 사용
+  TRUST_PROXY: process.env.TRUST_PROXY === "true" ? true : Number(process.env.TRUST_PROXY) || false
+};
+
+// 로그인 실패 제한 (닉네임/클라이언트 IP별 실패 횟수를 메모리에 보관, 잠금 중인 시도는 DynamoDB 조회·bcrypt 전에 거부)
+const LOGIN_THROTTLE = {
+  ENABLED: process.env.LOGIN_THROTTLE !== "false",
+  // 잠금 없이 허용하는 연속 실패 횟수 (IP는 NAT 뒤 여러 사용자가 공유할 수 있어 더 크게)
+  FREE_FAILURES_PER_USERNAME: Number(process.env.LOGIN_THROTTLE_USERNAME_FAILURES) || 5,
+  FREE_FAILURES_PER_IP: Number(process.env.LOGIN_THROTTLE_IP_FAILURES) || 20,
+  // IP별 제한 사용 여부. TRUST_PROXY가 없으면 request.ip가 프록시(API Gateway, servicelb SNAT) 주소라
+  // 모든 사용자가 한 IP로 묶여 함께 잠기므로 기본적으로 끔 (LOGIN_THROTTLE_IP_SCOPE=true|false로 강제)
+  IP_SCOPE: process.env.LOGIN_THROTTLE_IP_SCOPE
+    ? process.env.LOGIN_THROTTLE_IP_SCOPE === "true"
+    : Boolean(RATE_LIMIT.TRUST_PROXY),
+  // 허용 횟수를 넘은 뒤 실패할 때마다 잠금 시간 2배 (BASE → MAX)
+  BASE_LOCKOUT_MS: Number(process.env.LOGIN_THROTTLE_BASE_LOCKOUT_MS) || 1000,
+  MAX_LOCKOUT_MS: Number(process.env.LOGIN_THROTTLE_MAX_LOCKOUT_MS) || 15 * 60 * 1000,
+  // 마지막 실패 후 이 시간이 지나면 실패 횟수를 잊음
+  FAILURE_WINDOW_MS: 15 * 60 * 1000,
+  // 추적하는 닉네임/IP 수 상한 (넘으면 가장 오래 사용하지 않은 항목부터 제거)
+  MAX_TRACKED_KEYS: Number(process.env.LOGIN_THROTTLE_MAX_KEYS) || 50000,
+  // 이벤트 피드로 다른 레플리카에 잠금 공유 (피드 폴링 간격보다 짧은 잠금은 공유해도 의미가 없어 제외)
+  SHARED: process.env.LOGIN_THROTTLE_SHARED === "true",
+  SHARE_MIN_LOCKOUT_MS: 10000
+};
+
+// 요청 수락 제어 (이벤트 루프 지연·처리 중 요청 수가 기준을 넘으면 비싼 라우트부터 503으로 거부).
+// 기준값은 런타임 설정(ADMISSION_* 파일)으로 재시작 없이 변경 가능
+const ADMISSION = {
+  ENABLED: process.env.ADMISSION_CONTROL !== "false",
+  // 이벤트 루프 지연(p99) 기준 (ms). bcrypt를 쓰는 라우트가 먼저 거부되도록 더 낮게
+  LAG_EXPENSIVE_MS: Number(process.env.ADMISSION_LAG_EXPENSIVE_MS) || 150,
+  LAG_CHEAP_MS: Number(process.env.ADMISSION_LAG_CHEAP_MS) || 500,
+  // 라우트 종류별 동시 처리 상한
+  MAX_INFLIGHT_EXPENSIVE: Number(process.env.ADMISSION_MAX_INFLIGHT_EXPENSIVE) || 8,
+  MAX_INFLIGHT_CHEAP: Number(process.env.ADMISSION_MAX_INFLIGHT_CHEAP) || 200,
+  // 지연 측정 구간 (짧을수록 과부하에 빨리 반응)
+  SAMPLE_INTERVAL_MS: 250,
+  RETRY_AFTER_SECONDS: Number(process.env.ADMISSION_RETRY_AFTER_SECONDS) || 1
+};
+
+// 런타임 설정 (ConfigMap/Secret을 볼륨으로 마운트한 디렉터리, 키마다 파일 하나). 비워 두면 환경 변수만 사용
+const RUNTIME_CONFIG = {
+  CONFIG_DIR: process.env.RUNTIME_CONFIG_DIR || "",
+  SECRETS_DIR: process.env.RUNTIME_SECRETS_DIR || "",
+  // 파일 감시(inotify)가 심볼릭 링크 교체를 놓치는 경우를 위한 주기적 확인
+  POLL_INTERVAL_MS: Number(process.env.RUNTIME_CONFIG_POLL_MS) || 10000,
+  // kubelet이 파일을 교체하는 동안 발생하는 여러 이벤트를 한 번의 재로딩으로 묶음
+  DEBOUNCE_MS: 200,
+  // production에서는 JWT_SECRET이 빈 설정을 적용하지 않음
+  REQUIRE_JWT_SECRET: process.env.NODE_ENV === "production"
+};
+
 // HTTP 상태 코드
 const HTTP_STATUS = {
   OK: 200,
@@ -32,8 +219,10 @@ const HTTP_STATUS = {
   UNAUTHORIZED: 401,
   FORBIDDEN: 403,
   NOT_FOUND: 404,
+  CONFLICT: 409,
   TOO_MANY_REQUESTS: 429,
-  INTERNAL_SERVER_ERROR: 500
+  INTERNAL_SERVER_ERROR: 500,
+  SERVICE_UNAVAILABLE: 503
 };
 
 // 에러 메시지
@@ -46,7 +235,9 @@ const ERROR_MESSAGES = {
   PASSWORD_MISMATCH: "비밀번호가 일치하지 않습니다.",
   INVALID_TOKEN: "유효하지 않은 토큰입니다.",
   TOKEN_EXPIRED: "토큰이 만료되었습니다.",
-  RATE_LIMIT_EXCEEDED: "요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요."
+  RATE_LIMIT_EXCEEDED: "요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요.",
+  LOGIN_LOCKED: "로그인 실패가 반복되어 잠시 로그인이 제한되었습니다. 잠시 후 다시 시도해주세요.",
+  SERVER_OVERLOADED: "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요."
 };
 
 // 성공 메시지
@@ -63,6 +254,20 @@ module.exports = {
   USER_VALIDATION,
   JWT_CONFIG,
   TABLES,
+  EVENT_FEED,
+  STATELESS_AUTH,
+  PASSWORD_HASH,
+  USERNAME_CLAIM,
+  SESSIONS,
+  LOGIN_WRITE_BEHIND,
+  INTROSPECTION,
+  PROFILING,
+  DYNAMO_ACCESS,
+  TRACING,
+  RATE_LIMIT,
+  LOGIN_THROTTLE,
+  ADMISSION,
+  RUNTIME_CONFIG,
   HTTP_STATUS,
   ERROR_MESSAGES,
   SUCCESS_MESSAGES
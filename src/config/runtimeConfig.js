@@ -0,0 +1,375 @@
+const fs = require("fs");
+const path = require("path");
+const crypto = require("crypto");
+const { RUNTIME_CONFIG, RATE_LIMIT, SESSIONS, PASSWORD_HASH, PROFILING, ADMISSION } = require("./constants");
+const { createCounter, createGauge } = require("../utils/metrics");
+
+// 로깅 설정
+const logger = {
+  info: (message) => console.log(`[RUNTIME_CONFIG] ${message}`),
+  error: (message) => console.error(`[RUNTIME_CONFIG] ${message}`),
+};
+
+const metrics = {
+  reloads: createCounter(
+    "authcore_runtime_config_reloads_total",
+    "Runtime config reloads from mounted files, by result (applied/rejected)"
+  ),
+  generation: createGauge(
+    "authcore_runtime_config_generation",
+    "Runtime config snapshots applied since the process started"
+  ),
+  appliedAt: createGauge(
+    "authcore_runtime_config_applied_timestamp_seconds",
+    "Unix time the current runtime config snapshot was applied"
+  ),
+};
+
+const LOG_LEVELS = ["fatal", "error", "warn", "info", "debug", "trace", "silent"];
+
+/**
+ * 범위가 있는 정수 파서
+ * @param {number} min - 최솟값
+ * @param {number} max - 최댓값
+ * @returns {Function} (raw) => number
+ */
+function integerBetween(min, max) {
+  return (raw) => {
+    const value = Number(raw);
+    if (!Number.isInteger(value) || value < min || value > max) {
+      throw new Error(`expected an integer between ${min} and ${max}, got "${raw}"`);
+    }
+    return value;
+  };
+}
+
+/**
+ * 로그 레벨 파서
+ * @param {string} raw - 파일 내용
+ * @returns {string}
+ */
+function logLevel(raw) {
+  const value = raw.trim().toLowerCase();
+  if (!LOG_LEVELS.includes(value)) {
+    throw new Error(`expected one of ${LOG_LEVELS.join("/")}, got "${raw}"`);
+  }
+  return value;
+}
+
+// 재시작 없이 바꿀 수 있는 설정 (설정 디렉터리의 파일 이름 → 파서, 파일이 없을 때 값).
+// 여기에 없는 키(테이블 이름, 리전 등)는 기동 시 환경 변수로만 읽으므로 바꾸려면 재시작해야 한다.
+const TUNABLES = {
+  RATE_LIMIT_MAX: { parse: integerBetween(1, 1000000), fallback: RATE_LIMIT.MAX },
+  MAX_SESSIONS_PER_USER: { parse: integerBetween(1, 1000), fallback: SESSIONS.MAX_ACTIVE_PER_USER },
+  // 파일이 없으면 기동 시 보정한 cost(또는 PASSWORD_HASH_COST 환경 변수) 유지
+  PASSWORD_HASH_COST: { parse: integerBetween(PASSWORD_HASH.MIN_COST, PASSWORD_HASH.MAX_COST), fallback: null },
+  LOG_LEVEL: { parse: logLevel, fallback: "info" },
+  ADMISSION_LAG_EXPENSIVE_MS: { parse: integerBetween(1, 60000), fallback: ADMISSION.LAG_EXPENSIVE_MS },
+  ADMISSION_LAG_CHEAP_MS: { parse: integerBetween(1, 60000), fallback: ADMISSION.LAG_CHEAP_MS },
+  ADMISSION_MAX_INFLIGHT_EXPENSIVE: { parse: integerBetween(1, 100000), fallback: ADMISSION.MAX_INFLIGHT_EXPENSIVE },
+  ADMISSION_MAX_INFLIGHT_CHEAP: { parse: integerBetween(1, 100000), fallback: ADMISSION.MAX_INFLIGHT_CHEAP },
+};
+
+// 비밀 값 (Secret 디렉터리의 파일 이름 → 파일이 없을 때 값)
+// JWT_SECRET_PREVIOUS: 키 교체 중에만 두는 검증 전용 키 (jwtKeys.js 참고)
+const SECRETS = {
+  JWT_SECRET: process.env.JWT_SECRET || "",
+  JWT_SECRET_PREVIOUS: process.env.JWT_SECRET_PREVIOUS || "",
+  ADMIN_TOKEN: PROFILING.ADMIN_TOKEN,
+};
+
+/**
+ * 비밀 값을 로그에 남길 수 있는 짧은 식별자로 변환
+ * @param {string} secret - 비밀 값
+ * @returns {string} sha256 앞 8자리 (값이 없으면 "none")
+ */
+function keyFingerprint(secret) {
+  return secret ? crypto.createHash("sha256").update(secret).digest("hex").slice(0, 8) : "none";
+}
+
+/**
+ * kubelet이 관리하는 ..data 심볼릭 링크 대상 (마운트된 볼륨이 아니면 null)
+ * @param {string} dir - 디렉터리
+ * @returns {string|null}
+ */
+function readDataLink(dir) {
+  try {
+    return fs.readlinkSync(path.join(dir, "..data"));
+  } catch (error) {
+    return null;
+  }
+}
+
+/**
+ * 디렉터리의 키별 파일 읽기
+ *
+ * ConfigMap/Secret 볼륨은 새 버전을 다른 디렉터리에 쓴 뒤 ..data 링크를 바꿔 한 번에 교체한다.
+ * 읽는 도중 링크가 바뀌면 두 버전이 섞일 수 있으므로 링크가 그대로일 때까지 다시 읽는다.
+ *
+ * @param {string} dir - 디렉터리 (비어 있거나 없으면 빈 객체)
+ * @returns {Object} 파일 이름 → 내용 (끝의 개행 제거)
+ */
+function readMountedFiles(dir) {
+  if (!dir) {
+    return {};
+  }
+
+  for (let attempt = 0; attempt < 3; attempt++) {
+    const link = readDataLink(dir);
+    let names;
+    try {
+      names = fs.readdirSync(dir);
+    } catch (error) {
+      if (error.code === "ENOENT") {
+        return {};
+      }
+      throw error;
+    }
+
+    const files = {};
+    for (const name of names) {
+      // ..data, ..2024_01_01_00_00_00.123 같은 kubelet 내부 항목
+      if (name.startsWith("..")) {
+        continue;
+      }
+      const filePath = path.join(dir, name);
+      if (fs.statSync(filePath).isFile()) {
+        files[name] = fs.readFileSync(filePath, "utf8").replace(/[\r\n]+$/, "");
+      }
+    }
+
+    if (readDataLink(dir) === link) {
+      return files;
+    }
+  }
+  throw new Error(`${dir} kept changing while it was being read`);
+}
+
+/**
+ * 읽은 파일로 설정 스냅샷 생성 (하나라도 잘못되면 전체를 거부)
+ * @param {Object} configFiles - 설정 파일 내용
+ * @param {Object} secretFiles - 비밀 파일 내용
+ * @param {boolean} requireJwtSecret - JWT_SECRET 필수 여부
+ * @returns {{values: Object, secrets: Object}}
+ */
+function buildSnapshot(configFiles, secretFiles, requireJwtSecret) {
+  const values = {};
+  const errors = [];
+
+  for (const [key, { parse, fallback }] of Object.entries(TUNABLES)) {
+    const raw = configFiles[key];
+    if (raw === undefined || raw.trim() === "") {
+      values[key] = fallback;
+      continue;
+    }
+    try {
+      values[key] = parse(raw);
+    } catch (error) {
+      errors.push(`${key}: ${error.message}`);
+    }
+  }
+
+  const secrets = {};
+  for (const [key, fallback] of Object.entries(SECRETS)) {
+    secrets[key] = secretFiles[key] || fallback;
+  }
+  if (requireJwtSecret && !secrets.JWT_SECRET) {
+    errors.push("JWT_SECRET is empty");
+  }
+
+  if (errors.length > 0) {
+    throw new Error(errors.join("; "));
+  }
+  return { values: Object.freeze(values), secrets: Object.freeze(secrets) };
+}
+
+/**
+ * 이전 스냅샷과 달라진 항목 설명 (비밀 값은 지문만)
+ * @param {Object|null} previous - 이전 스냅샷
+ * @param {Object} next - 새 스냅샷
+ * @returns {string[]}
+ */
+function describeChanges(previous, next) {
+  const changes = [];
+  for (const key of Object.keys(next.values)) {
+    if (!previous || previous.values[key] !== next.values[key]) {
+      changes.push(`${key}=${next.values[key]}`);
+    }
+  }
+  for (const key of Object.keys(next.secrets)) {
+    if (!previous || previous.secrets[key] !== next.secrets[key]) {
+      changes.push(`${key}@${keyFingerprint(next.secrets[key])}`);
+    }
+  }
+  return changes;
+}
+
+/**
+ * 마운트된 파일 기반 런타임 설정 생성
+ *
+ * 설정은 변경 불가능한 스냅샷으로 보관하고, 재로딩은 새 스냅샷을 끝까지 검증한 뒤 참조 하나만 바꿔
+ * 적용한다. 요청 처리 중인 코드는 스냅샷을 한 번 읽어 쓰면 두 버전이 섞인 값을 보지 않는다.
+ * 잘못된 파일은 거부하고 마지막으로 적용된 스냅샷을 유지한다.
+ *
+ * @param {Object} [options]
+ * @param {string} [options.configDir] - ConfigMap 마운트 디렉터리
+ * @param {string} [options.secretsDir] - Secret 마운트 디렉터리
+ * @param {number} [options.pollIntervalMs] - 주기적 확인 간격
+ * @param {number} [options.debounceMs] - 파일 이벤트 묶음 대기 시간
+ * @param {boolean} [options.requireJwtSecret] - JWT_SECRET이 빈 설정 거부
+ * @returns {Object} 런타임 설정
+ */
+function createRuntimeConfig({
+  configDir = RUNTIME_CONFIG.CONFIG_DIR,
+  secretsDir = RUNTIME_CONFIG.SECRETS_DIR,
+  pollIntervalMs = RUNTIME_CONFIG.POLL_INTERVAL_MS,
+  debounceMs = RUNTIME_CONFIG.DEBOUNCE_MS,
+  requireJwtSecret = RUNTIME_CONFIG.REQUIRE_JWT_SECRET,
+} = {}) {
+  let current = null;
+  let appliedSignature = null;
+  let rejectedSignature = null;
+  const listeners = new Set();
+
+  function readFiles() {
+    const configFiles = readMountedFiles(configDir);
+    const secretFiles = readMountedFiles(secretsDir);
+    const signature = crypto
+      .createHash("sha256")
+      .update(JSON.stringify([configFiles, secretFiles]))
+      .digest("hex");
+    return { configFiles, secretFiles, signature };
+  }
+
+  function apply(snapshot, signature) {
+    const previous = current;
+    current = Object.freeze({
+      ...snapshot,
+      generation: previous ? previous.generation + 1 : 1,
+      appliedAt: Date.now(),
+    });
+    appliedSignature = signature;
+    rejectedSignature = null;
+    metrics.generation.set(current.generation);
+    metrics.appliedAt.set(Math.floor(current.appliedAt / 1000));
+    return previous;
+  }
+
+  /**
+   * 현재 스냅샷 (처음 호출 시 파일을 읽음, 이때 잘못된 설정이면 예외)
+   * @returns {{values: Object, secrets: Object, generation: number, appliedAt: number}}
+   */
+  function get() {
+    if (!current) {
+      const { configFiles, secretFiles, signature } = readFiles();
+      apply(buildSnapshot(configFiles, secretFiles, requireJwtSecret), signature);
+      logger.info(`Loaded runtime config: ${describeChanges(null, current).join(", ")}`);
+    }
+    return current;
+  }
+
+  /**
+   * 파일을 다시 읽어 바뀌었으면 적용하고 구독자에게 알림
+   * @returns {boolean} 새 스냅샷을 적용했으면 true
+   */
+  function reload() {
+    const previousSnapshot = get();
+    let files;
+    try {
+      files = readFiles();
+    } catch (error) {
+      metrics.reloads.inc(1, { result: "rejected" });
+      logger.error(`Failed to read runtime config: ${error.message}`);
+      return false;
+    }
+    if (files.signature === appliedSignature || files.signature === rejectedSignature) {
+      return false;
+    }
+
+    let snapshot;
+    try {
+      snapshot = buildSnapshot(files.configFiles, files.secretFiles, requireJwtSecret);
+    } catch (error) {
+      // 같은 내용으로 매 주기마다 로그를 남기지 않도록 기억
+      rejectedSignature = files.signature;
+      metrics.reloads.inc(1, { result: "rejected" });
+      logger.error(`Rejected runtime config, keeping generation ${previousSnapshot.generation}: ${error.message}`);
+      return false;
+    }
+
+    apply(snapshot, files.signature);
+    metrics.reloads.inc(1, { result: "applied" });
+    const changes = describeChanges(previousSnapshot, current);
+    logger.info(`Applied runtime config generation ${current.generation}: ${changes.join(", ") || "no effective change"}`);
+
+    for (const listener of listeners) {
+      try {
+        listener(current, previousSnapshot);
+      } catch (error) {
+        logger.error(`Runtime config listener failed: ${error.message}`);
+      }
+    }
+    return true;
+  }
+
+  /**
+   * 설정 변경 구독
+   * @param {Function} listener - (next, previous) => void
+   * @returns {Function} 구독 해제 함수
+   */
+  function subscribe(listener) {
+    listeners.add(listener);
+    return () => listeners.delete(listener);
+  }
+
+  /**
+   * 마운트 디렉터리 감시 시작 (파일 이벤트 + 주기적 확인)
+   * @returns {Function} 감시 중지 함수
+   */
+  function watch() {
+    const dirs = [configDir, secretsDir].filter(Boolean);
+    if (dirs.length === 0) {
+      return () => {};
+    }
+
+    let debounceTimer = null;
+    const scheduleReload = () => {
+      clearTimeout(debounceTimer);
+      debounceTimer = setTimeout(reload, debounceMs);
+      debounceTimer.unref();
+    };
+
+    const watchers = [];
+    for (const dir of dirs) {
+      try {
+        const watcher = fs.watch(dir, scheduleReload);
+        watcher.on("error", (error) => logger.error(`Watch on ${dir} failed: ${error.message}`));
+        watchers.push(watcher);
+      } catch (error) {
+        logger.error(`Cannot watch ${dir} (${error.message}), relying on polling`);
+      }
+    }
+
+    const pollTimer = setInterval(reload, pollIntervalMs);
+    pollTimer.unref();
+    logger.info(`Watching ${dirs.join(", ")} (poll every ${pollIntervalMs}ms)`);
+
+    return () => {
+      clearTimeout(debounceTimer);
+      clearInterval(pollTimer);
+      watchers.forEach((watcher) => watcher.close());
+    };
+  }
+
+  return { get, reload, subscribe, watch };
+}
+
+// 서비스 전체가 공유하는 인스턴스
+const runtimeConfig = createRuntimeConfig();
+
+module.exports = {
+  runtimeConfig,
+  createRuntimeConfig,
+  keyFingerprint,
+  TUNABLES,
+};
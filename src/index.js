@@ -4,13 +4,44 @@ const jwt = require("@fastify/jwt");
 const rateLimit = require("@fastify/rate-limit");
 const routes = require("./routes");
 const { errorHandler, notFoundHandler } = require("./middleware/errorHandler");
+const { stopBackgroundTasks } = require("./services/authService");
+const { calibrateHashCost, setHashCostOverride } = require("./services/passwordHasher");
+const { getJwtKeys } = require("./services/jwtKeys");
+const { PASSWORD_HASH, RATE_LIMIT } = require("./config/constants");
+const { runtimeConfig } = require("./config/runtimeConfig");
+const { renderMetrics } = require("./utils/metrics");
+const { registerHttpMetrics } = require("./utils/httpMetrics");
+const { registerTracing } = require("./utils/tracing");
+const { registerAdmissionControl } = require("./middleware/admissionControl");
+const { startEventLoopLagMonitor } = require("./utils/eventLoopMetrics");
 
 require("dotenv").config();
 
-const isProduction = process.env.NODE_ENV === "production";
+/**
+ * 런타임 설정 중 값을 밀어 넣어야 하는 항목 적용 (나머지는 사용하는 곳에서 스냅샷을 직접 읽음)
+ * @param {Object} app - Fastify 인스턴스
+ * @param {Object} config - 런타임 설정 스냅샷
+ */
+function applyRuntimeTunables(app, { values }) {
+  app.log.level = values.LOG_LEVEL;
+  setHashCostOverride(values.PASSWORD_HASH_COST);
+}
 
 function createApp() {
-  const app = fastify({ logger: true });
+  // 마운트된 설정 파일 첫 로딩 (잘못된 값이 있거나 production에서 JWT_SECRET이 없으면 여기서 예외)
+  const config = runtimeConfig.get();
+
+  // trustProxy: 요청 한도와 로그인 실패 제한이 프록시가 아닌 실제 클라이언트 IP를 기준으로 하도록
+  const app = fastify({ logger: { level: config.values.LOG_LEVEL }, trustProxy: RATE_LIMIT.TRUST_PROXY });
+
+  // 요청 지연/상태 코드 메트릭 (라우트 등록 전에 훅을 걸어야 모든 라우트에 적용됨)
+  registerHttpMetrics(app);
+
+  // 과부하 시 비싼 라우트부터 503으로 거부 (프로브·메트릭은 항상 처리, HTTP 메트릭 훅 다음·트레이싱 훅보다 먼저 실행)
+  registerAdmissionControl(app);
+
+  // 샘플링한 요청의 스팬 기록 (TRACING_ENABLED=true일 때만, 라우트 등록 전에 훅을 걸어야 함)
+  registerTracing(app);
 
   // CORS 설정
   app.register(cors, {
@@ -19,10 +50,10 @@ function createApp() {
     credentials: true,
   });
 
-  // Rate Limiting 설정
+  // Rate Limiting 설정 (한도는 요청마다 현재 런타임 설정에서 읽음)
   app.register(rateLimit, {
-    max: 100,
-    timeWindow: "1 minute",
+    max: () => runtimeConfig.get().values.RATE_LIMIT_MAX,
+    timeWindow: RATE_LIMIT.TIME_WINDOW,
     errorResponseBuilder: function () {
       return {
         success: false,
@@ -31,18 +62,15 @@ function createApp() {
     },
   });
 
-  // JWT 플러그인 등록
-  const jwtSecret = process.env.JWT_SECRET;
-
-  if (!jwtSecret && isProduction) {
-    throw new Error("JWT_SECRET 환경 변수가 설정되어 있지 않습니다 (production).");
-  }
-
+  // JWT 플러그인 등록 (키 교체가 바로 반영되도록 authService와 같은 현재 서명 키 사용)
   app.register(jwt, {
-    // 로컬/테스트에서는 기본값 허용, 프로덕션에서는 위에서 강제
-    secret: jwtSecret || "dev-only-jwt-secret",
+    secret: (request, token, callback) => callback(null, getJwtKeys().current),
   });
 
+  // 로그 레벨, bcrypt cost 등은 설정이 바뀔 때마다 다시 적용
+  applyRuntimeTunables(app, config);
+  const unsubscribe = runtimeConfig.subscribe((next) => applyRuntimeTunables(app, next));
+
   // 에러 처리 등록
   app.setErrorHandler(errorHandler);
   app.setNotFoundHandler(notFoundHandler);
@@ -55,11 +83,27 @@ function createApp() {
     return { status: "ok", service: "authcore" };
   });
 
+  // 메트릭 엔드포인트 (Prometheus text format)
+  app.get("/metrics", async (request, reply) => {
+    return reply.type("text/plain; version=0.0.4").send(renderMetrics());
+  });
+
+  // 종료 시 버퍼에 남은 last_login_at 업데이트 반영, 피드 폴링 중단
+  app.addHook("onClose", async () => {
+    unsubscribe();
+    await stopBackgroundTasks();
+  });
+
   return app;
 }
 
 async function start() {
   try {
+    // 단일 인스턴스용 bcrypt cost 보정 (k8s는 update_runtime_config.py --calibrate-hash-cost로 클러스터 공통 값을 ConfigMap에 기록)
+    if (PASSWORD_HASH.CALIBRATE_ON_STARTUP) {
+      await calibrateHashCost();
+    }
+
     const app = createApp();
     const port = process.env.PORT || 4000;
     const host = process.env.HOST || "0.0.0.0";
@@ -67,6 +111,28 @@ async function start() {
     console.log("🚀 Starting Fastify server...");
     await app.listen({ port, host });
     console.log(`✅ Server listening on ${host}:${port}`);
+
+    // HPA custom metric (authcore_event_loop_lag_seconds)
+    const stopLagMonitor = startEventLoopLagMonitor();
+    app.addHook("onClose", async () => stopLagMonitor());
+
+    // ConfigMap/Secret 볼륨 변경을 재시작 없이 반영
+    const stopWatchingConfig = runtimeConfig.watch();
+    app.addHook("onClose", async () => stopWatchingConfig());
+
+    // Kubernetes 종료 신호 시 onClose 훅(버퍼 flush 등)을 실행한 뒤 종료
+    const shutdown = async (signal) => {
+      console.log(`🛑 Received ${signal}, shutting down...`);
+      try {
+        await app.close();
+        process.exit(0);
+      } catch (err) {
+        console.error("❌ Graceful shutdown failed:", err);
+        process.exit(1);
+      }
+    };
+    process.once("SIGTERM", shutdown);
+    process.once("SIGINT", shutdown);
   } catch (err) {
     console.error("❌ Server failed to start:", err);
     process.exit(1);
@@ -0,0 +1,233 @@
+const { monitorEventLoopDelay } = require("perf_hooks");
+const { ADMISSION, HTTP_STATUS, ERROR_MESSAGES } = require("../config/constants");
+const { runtimeConfig } = require("../config/runtimeConfig");
+const { createCounter, createGauge, createHistogram } = require("../utils/metrics");
+
+// 라우트 종류 (우선순위 순)
+const ROUTE_CLASSES = {
+  // 프로브/스크랩/운영 진단: 과부하에도 항상 처리 (거부하면 kubelet이 Pod를 재시작함)
+  EXEMPT: "exempt",
+  // 토큰 검증 등 가벼운 요청
+  CHEAP: "cheap",
+  // bcrypt를 쓰는 요청 (과부하 시 가장 먼저 거부)
+  EXPENSIVE: "expensive",
+};
+
+const EXEMPT_ROUTES = new Set(["/health", "/metrics"]);
+const EXPENSIVE_ROUTES = new Set(["/auth/login", "/auth/register", "/auth/password"]);
+
+// 수락 후 핸들러 직전까지 훅 처리 시간 구간 (초)
+const HOOK_LATENCY_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5];
+
+const metrics = {
+  shed: createCounter(
+    "authcore_admission_shed_total",
+    "Requests rejected with 503 by admission control, by route class and reason"
+  ),
+  inFlight: createGauge("authcore_admission_in_flight", "Admitted requests still being processed, by route class"),
+  lag: createGauge(
+    "authcore_admission_event_loop_lag_seconds",
+    "Event loop delay p99 over the last admission sampling interval"
+  ),
+  // 소켓 수신·본문 파싱 전 대기나 앞선 onRequest 훅 시간은 포함하지 않음 (도착부터의 지연이 아님)
+  hookLatency: createHistogram(
+    "authcore_admission_hook_latency_seconds",
+    "Time from the admission onRequest hook to preHandler (later hooks, body parsing, validation) for admitted requests, by route class",
+    HOOK_LATENCY_BUCKETS
+  ),
+};
+
+/**
+ * 라우트 패턴으로 종류 판별
+ * @param {string} route - 매칭된 라우트 패턴 (없으면 undefined)
+ * @returns {string} ROUTE_CLASSES 값
+ */
+function classifyRoute(route) {
+  if (EXEMPT_ROUTES.has(route) || (route && route.startsWith("/admin/"))) {
+    return ROUTE_CLASSES.EXEMPT;
+  }
+  return EXPENSIVE_ROUTES.has(route) ? ROUTE_CLASSES.EXPENSIVE : ROUTE_CLASSES.CHEAP;
+}
+
+/**
+ * 현재 런타임 설정의 라우트 종류별 기준값
+ * @returns {Object} { lagMs: {cheap, expensive}, maxInFlight: {cheap, expensive} }
+ */
+function limitsFromRuntimeConfig() {
+  const { values } = runtimeConfig.get();
+  return {
+    lagMs: {
+      [ROUTE_CLASSES.CHEAP]: values.ADMISSION_LAG_CHEAP_MS,
+      [ROUTE_CLASSES.EXPENSIVE]: values.ADMISSION_LAG_EXPENSIVE_MS,
+    },
+    maxInFlight: {
+      [ROUTE_CLASSES.CHEAP]: values.ADMISSION_MAX_INFLIGHT_CHEAP,
+      [ROUTE_CLASSES.EXPENSIVE]: values.ADMISSION_MAX_INFLIGHT_EXPENSIVE,
+    },
+  };
+}
+
+/**
+ * 짧은 구간마다 이벤트 루프 지연 p99 측정
+ *
+ * HPA용 startEventLoopLagMonitor는 5초 구간이라 과부하 판단에는 느리므로 별도 히스토그램을 쓴다.
+ *
+ * @param {Object} [options]
+ * @param {number} [options.intervalMs] - 측정 구간
+ * @param {number} [options.resolutionMs=10] - 샘플링 해상도
+ * @returns {{getLagMs: Function, stop: Function}}
+ */
+function createLagSampler({ intervalMs = ADMISSION.SAMPLE_INTERVAL_MS, resolutionMs = 10 } = {}) {
+  const histogram = monitorEventLoopDelay({ resolution: resolutionMs });
+  histogram.enable();
+  let lagMs = 0;
+
+  const timer = setInterval(() => {
+    // 히스토그램 값은 나노초, 측정 해상도만큼의 기본 지연은 뺌
+    lagMs = histogram.count > 0 ? Math.max(histogram.percentile(99) / 1e6 - resolutionMs, 0) : 0;
+    metrics.lag.set(lagMs / 1000);
+    histogram.reset();
+  }, intervalMs);
+  timer.unref();
+
+  return {
+    getLagMs: () => lagMs,
+    stop: () => {
+      clearInterval(timer);
+      histogram.disable();
+    },
+  };
+}
+
+/**
+ * 요청 수락 제어기 생성
+ *
+ * 라우트 종류별 처리 중 요청 수를 세고, 이벤트 루프 지연이나 처리 중 요청 수가 종류별 기준을 넘으면 거부한다.
+ * 비싼 라우트의 기준이 더 낮으므로 과부하가 시작되면 로그인·회원가입이 먼저 거부되고 토큰 검증은 계속 처리된다.
+ *
+ * @param {Object} options - 옵션
+ * @param {Function} options.getLagMs - 현재 이벤트 루프 지연 (ms)
+ * @param {Function} [options.getLimits] - 종류별 기준값 (기본: 런타임 설정)
+ * @returns {Object} 수락 제어기
+ */
+function createAdmissionController({ getLagMs, getLimits = limitsFromRuntimeConfig } = {}) {
+  if (!getLagMs) {
+    throw new Error("getLagMs is required for admission control");
+  }
+
+  const inFlight = {
+    [ROUTE_CLASSES.CHEAP]: 0,
+    [ROUTE_CLASSES.EXPENSIVE]: 0,
+  };
+
+  /**
+   * 요청 수락 시도 (수락하면 처리 중 요청 수 증가)
+   * @param {string} routeClass - ROUTE_CLASSES 값
+   * @returns {string|null} 거부 사유 ("event_loop_lag" | "in_flight"), 수락이면 null
+   */
+  function admit(routeClass) {
+    if (routeClass === ROUTE_CLASSES.EXEMPT) {
+      return null;
+    }
+
+    const limits = getLimits();
+    if (getLagMs() >= limits.lagMs[routeClass]) {
+      return "event_loop_lag";
+    }
+    if (inFlight[routeClass] >= limits.maxInFlight[routeClass]) {
+      return "in_flight";
+    }
+
+    inFlight[routeClass] += 1;
+    metrics.inFlight.set(inFlight[routeClass], { class: routeClass });
+    return null;
+  }
+
+  /**
+   * 수락한 요청 처리 완료
+   * @param {string} routeClass - ROUTE_CLASSES 값
+   */
+  function release(routeClass) {
+    if (routeClass === ROUTE_CLASSES.EXEMPT) {
+      return;
+    }
+    inFlight[routeClass] = Math.max(inFlight[routeClass] - 1, 0);
+    metrics.inFlight.set(inFlight[routeClass], { class: routeClass });
+  }
+
+  return {
+    admit,
+    release,
+    getInFlight: (routeClass) => inFlight[routeClass],
+  };
+}
+
+/**
+ * 요청 수락 제어 훅 등록 (ADMISSION.ENABLED일 때만)
+ *
+ * Fastify는 onRequest 훅을 등록 순서대로 실행한다. 거부된 요청이 일을 덜 하도록 트레이싱 등 다른 훅보다 먼저
+ * 등록하지만, HTTP 메트릭(시작 시각 기록)의 훅이 그보다 앞서 실행된다.
+ * @param {Object} app - Fastify 인스턴스
+ * @param {Object} [controller] - 수락 제어기 (테스트용, 기본: 이벤트 루프 지연 측정기 사용)
+ */
+function registerAdmissionControl(app, controller = null) {
+  if (!ADMISSION.ENABLED && !controller) {
+    return;
+  }
+
+  let sampler = null;
+  if (!controller) {
+    sampler = createLagSampler();
+    controller = createAdmissionController({ getLagMs: sampler.getLagMs });
+  }
+
+  app.addHook("onRequest", async (request, reply) => {
+    const routeClass = classifyRoute(request.routeOptions?.url);
+    const reason = controller.admit(routeClass);
+    if (reason) {
+      metrics.shed.inc(1, { class: routeClass, reason });
+      reply
+        .status(HTTP_STATUS.SERVICE_UNAVAILABLE)
+        .header("Retry-After", ADMISSION.RETRY_AFTER_SECONDS)
+        .send({
+          success: false,
+          message: ERROR_MESSAGES.SERVER_OVERLOADED,
+        });
+      return reply;
+    }
+
+    request.admissionClass = routeClass;
+    request.admittedAt = process.hrtime.bigint();
+  });
+
+  app.addHook("preHandler", async (request) => {
+    if (request.admittedAt !== undefined && request.admissionClass !== ROUTE_CLASSES.EXEMPT) {
+      const seconds = Number(process.hrtime.bigint() - request.admittedAt) / 1e9;
+      metrics.hookLatency.observe(seconds, { class: request.admissionClass });
+    }
+  });
+
+  // 응답 완료 또는 클라이언트 연결 끊김 중 먼저 일어난 쪽에서 한 번만 반환
+  const release = async (request) => {
+    if (request.admissionClass !== undefined) {
+      controller.release(request.admissionClass);
+      request.admissionClass = undefined;
+    }
+  };
+  app.addHook("onResponse", release);
+  app.addHook("onRequestAbort", release);
+
+  app.addHook("onClose", async () => {
+    if (sampler) {
+      sampler.stop();
+    }
+  });
+}
+
+module.exports = {
+  ROUTE_CLASSES,
+  classifyRoute,
+  createLagSampler,
+  createAdmissionController,
+  registerAdmissionControl,
+};
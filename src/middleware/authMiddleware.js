@@ -1,5 +1,13 @@
-const { verifyAccessToken, getUserById } = require("../services/authService");
-const { createDynamoDBClient } = require("../services/dynamoClient");
+const {
+  verifyAccessToken,
+  getUserById,
+  isAccessTokenRevoked,
+  isStatelessAuthActive,
+} = require("../services/authService");
+const crypto = require("crypto");
+const { PROJECTIONS } = require("../services/dynamoAccess");
+const { INTROSPECTION } = require("../config/constants");
+const { runtimeConfig } = require("../config/runtimeConfig");
 
 /**
  * JWT 토큰 인증 미들웨어
@@ -31,10 +39,29 @@ async function authenticateToken(request, reply) {
 
     // 토큰 검증
     const decoded = verifyAccessToken(token);
+
+    // 로그아웃/비활성화로 폐기된 토큰 거부 (stateless 모드에서만 목록이 존재)
+    if (isAccessTokenRevoked(decoded)) {
+      return reply.status(401).send({
+        success: false,
+        message: "유효하지 않은 토큰입니다.",
+      });
+    }
+
+    // stateless 모드: 서명된 클레임을 신뢰하고 DynamoDB 조회 생략
+    if (isStatelessAuthActive()) {
+      request.user = {
+        userId: decoded.userId,
+        username: decoded.username,
+        is_active: true,
+        tokenId: decoded.jti,
+        tokenExpiresAt: decoded.exp,
+      };
+      return;
+    }
     
-    // 사용자 정보 조회
-    const dynamoDBClient = createDynamoDBClient();
-    const user = await getUserById(decoded.userId, dynamoDBClient);
+    // 사용자 정보 조회 (공유 클라이언트, 인증에 필요한 속성만)
+    const user = await getUserById(decoded.userId, undefined, PROJECTIONS.AUTH_USER);
     
     if (!user) {
       return reply.status(401).send({
@@ -55,6 +82,8 @@ async function authenticateToken(request, reply) {
       userId: user.user_id,
       username: user.username,
       is_active: user.is_active,
+      tokenId: decoded.jti,
+      tokenExpiresAt: decoded.exp,
     };
 
   } catch (error) {
@@ -90,7 +119,7 @@ async function optionalAuthenticate(request, reply) {
 
     // 토큰 검증 시도
     const decoded = verifyAccessToken(token);
-    const user = await getUserById(decoded.userId);
+    const user = await getUserById(decoded.userId, undefined, PROJECTIONS.AUTH_USER);
     
     if (user && user.is_active) {
       request.user = {
@@ -163,9 +192,63 @@ async function requireOwnership(request, reply) {
   }
 }
 
+/**
+ * 토큰 검사 API 키 확인 미들웨어 (INTROSPECTION_API_KEY 미설정 시 엔드포인트가 없는 것처럼 404)
+ * @param {Object} request - Fastify request 객체
+ * @param {Object} reply - Fastify reply 객체
+ * @returns {Promise<void>}
+ */
+async function requireIntrospectionKey(request, reply) {
+  if (!INTROSPECTION.API_KEY) {
+    return reply.status(404).send({
+      success: false,
+      message: "요청한 리소스를 찾을 수 없습니다.",
+    });
+  }
+
+  const expected = Buffer.from(INTROSPECTION.API_KEY);
+  const provided = Buffer.from(String(request.headers["x-introspection-key"] || ""));
+
+  if (provided.length !== expected.length || !crypto.timingSafeEqual(provided, expected)) {
+    return reply.status(401).send({
+      success: false,
+      message: "유효하지 않은 API 키입니다.",
+    });
+  }
+}
+
+/**
+ * 운영용 관리 엔드포인트 토큰 확인 미들웨어 (ADMIN_TOKEN 미설정 시 엔드포인트가 없는 것처럼 404)
+ * @param {Object} request - Fastify request 객체
+ * @param {Object} reply - Fastify reply 객체
+ * @returns {Promise<void>}
+ */
+async function requireAdminToken(request, reply) {
+  // Secret 파일이 바뀌면 재시작 없이 새 토큰 적용
+  const { ADMIN_TOKEN: adminToken } = runtimeConfig.get().secrets;
+  if (!adminToken) {
+    return reply.status(404).send({
+      success: false,
+      message: "요청한 리소스를 찾을 수 없습니다.",
+    });
+  }
+
+  const expected = Buffer.from(adminToken);
+  const provided = Buffer.from(String(request.headers["x-admin-token"] || ""));
+
+  if (provided.length !== expected.length || !crypto.timingSafeEqual(provided, expected)) {
+    return reply.status(401).send({
+      success: false,
+      message: "유효하지 않은 관리자 토큰입니다.",
+    });
+  }
+}
+
 module.exports = {
   authenticateToken,
   optionalAuthenticate,
   requireAdmin,
   requireOwnership,
+  requireIntrospectionKey,
+  requireAdminToken,
 };
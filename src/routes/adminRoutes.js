@@ -0,0 +1,127 @@
+const fs = require("fs");
+const { captureCpuProfile, captureHeapSnapshot, clampSeconds } = require("../services/profiler");
+const { deactivateUser } = require("../services/authService");
+const { requireAdminToken } = require("../middleware/authMiddleware");
+const { HTTP_STATUS, ERROR_MESSAGES } = require("../config/constants");
+
+/**
+ * 캡처 실패 응답 (이미 진행 중이면 409, 힙 스냅샷을 기록할 메모리 여유가 없으면 503)
+ * @param {Object} reply - Fastify reply 객체
+ * @param {Error} error
+ */
+function sendCaptureError(reply, error) {
+  if (error.code === "CAPTURE_IN_PROGRESS") {
+    return reply.status(HTTP_STATUS.CONFLICT).send({
+      success: false,
+      message: "다른 프로파일 캡처가 진행 중입니다.",
+    });
+  }
+
+  if (error.code === "INSUFFICIENT_MEMORY") {
+    return reply.status(HTTP_STATUS.SERVICE_UNAVAILABLE).send({
+      success: false,
+      message: "힙 스냅샷을 기록할 메모리 여유가 부족합니다.",
+      memory: {
+        rssBytes: error.headroom.rss,
+        heapUsedBytes: error.headroom.heapUsed,
+        requiredBytes: error.headroom.required,
+        limitBytes: error.headroom.limit,
+      },
+    });
+  }
+
+  console.error("Profile capture error:", error.message);
+  return reply.status(HTTP_STATUS.INTERNAL_SERVER_ERROR).send({
+    success: false,
+    message: "프로파일 캡처 중 오류가 발생했습니다.",
+  });
+}
+
+/**
+ * 운영 진단·계정 관리용 관리 라우트 등록 (ADMIN_TOKEN 필요, scripts/profile_pod.py가 호출)
+ * @param {Object} fastify - Fastify 인스턴스
+ * @param {Object} options - 옵션
+ */
+async function adminRoutes(fastify, options) {
+  fastify.addHook("preHandler", requireAdminToken);
+
+  // CPU 프로파일 (요청이 측정 시간만큼 대기한 뒤 .cpuprofile JSON 반환)
+  fastify.post("/profile/cpu", {
+    schema: {
+      querystring: {
+        type: "object",
+        properties: {
+          seconds: { type: "number", minimum: 1 },
+        },
+      },
+    },
+  }, async (request, reply) => {
+    try {
+      const profile = await captureCpuProfile({ seconds: clampSeconds(request.query.seconds) });
+
+      return reply
+        .header("content-disposition", `attachment; filename="authcore-${process.pid}.cpuprofile"`)
+        .type("application/json")
+        .send(JSON.stringify(profile));
+    } catch (error) {
+      return sendCaptureError(reply, error);
+    }
+  });
+
+  // 힙 스냅샷 (파일로 기록 후 스트리밍, 전송이 끝나면 삭제)
+  // 기록 중 힙의 약 2배 메모리를 추가로 쓰므로 컨테이너 메모리 한도(128Mi)에 가까우면 OOMKilled 위험이 있음.
+  // RSS + 힙 × PROFILING.HEAP_SNAPSHOT_MEMORY_FACTOR가 cgroup 한도를 넘으면 기록하지 않고 503 반환
+  fastify.post("/profile/heap", async (request, reply) => {
+    let file;
+    try {
+      file = await captureHeapSnapshot();
+    } catch (error) {
+      return sendCaptureError(reply, error);
+    }
+
+    const stream = fs.createReadStream(file);
+    stream.on("close", () => fs.unlink(file, () => {}));
+
+    return reply
+      .header("content-disposition", `attachment; filename="authcore-${process.pid}.heapsnapshot"`)
+      .type("application/octet-stream")
+      .send(stream);
+  });
+
+  // 계정 비활성화 (refresh token 무효화 + stateless 모드에서 발급된 access token 폐기 전파)
+  fastify.post("/users/:userId/deactivate", {
+    schema: {
+      params: {
+        type: "object",
+        required: ["userId"],
+        properties: {
+          userId: { type: "string", minLength: 1 },
+        },
+      },
+    },
+  }, async (request, reply) => {
+    try {
+      await deactivateUser(request.params.userId);
+
+      return reply.status(HTTP_STATUS.OK).send({
+        success: true,
+        message: "계정이 비활성화되었습니다.",
+      });
+    } catch (error) {
+      if (error.name === "ConditionalCheckFailedException") {
+        return reply.status(HTTP_STATUS.NOT_FOUND).send({
+          success: false,
+          message: ERROR_MESSAGES.USER_NOT_FOUND,
+        });
+      }
+
+      console.error("Deactivate user error:", error.message);
+      return reply.status(HTTP_STATUS.INTERNAL_SERVER_ERROR).send({
+        success: false,
+        message: "계정 비활성화 중 오류가 발생했습니다.",
+      });
+    }
+  });
+}
+
+module.exports = adminRoutes;
@@ -1,16 +1,21 @@
 const {
   registerUser,
   loginUser,
+  checkLoginAttempt,
+  recordLoginResult,
   getUserById,
   updateUsername,
   updatePassword,
   generateTokenPair,
   verifyAndRefreshToken,
   revokeAllUserTokens,
+  revokeAccessToken,
+  introspectTokens,
 } = require("../services/authService");
-const { authenticateToken } = require("../middleware/authMiddleware");
-const { HTTP_STATUS, ERROR_MESSAGES, SUCCESS_MESSAGES } = require("../config/constants");
+const { authenticateToken, requireIntrospectionKey } = require("../middleware/authMiddleware");
+const { HTTP_STATUS, ERROR_MESSAGES, SUCCESS_MESSAGES, INTROSPECTION } = require("../config/constants");
 const { createErrorResponse, createSuccessResponse } = require("../utils/validation");
+const { PROJECTIONS } = require("../services/dynamoAccess");
 
 /**
  * 인증 라우트 등록
@@ -143,11 +148,24 @@ async function authRoutes(fastify, options) {
       },
     },
   }, async (request, reply) => {
-    try {
-      const { username, password } = request.body;
+    const { username, password } = request.body;
+
+    // 실패가 반복된 닉네임/IP는 사용자 조회와 bcrypt 비교 없이 거부
+    const lockout = checkLoginAttempt(username, request.ip);
+    if (lockout) {
+      return reply
+        .status(HTTP_STATUS.TOO_MANY_REQUESTS)
+        .header("Retry-After", Math.ceil(lockout.retryAfterMs / 1000))
+        .send({
+          success: false,
+          message: ERROR_MESSAGES.LOGIN_LOCKED,
+        });
+    }
 
+    try {
       // 사용자 로그인
       const user = await loginUser(username, password);
+      recordLoginResult(username, request.ip);
 
       // 토큰 생성
       const tokens = await generateTokenPair(user.user_id, user.username);
@@ -160,6 +178,8 @@ async function authRoutes(fastify, options) {
         },
       });
     } catch (error) {
+      // 인증 실패(code=INVALID_CREDENTIALS)만 실패 횟수에 집계
+      recordLoginResult(username, request.ip, error);
       console.error("Login error:", error.message);
       
       return reply.status(401).send({
@@ -200,6 +220,9 @@ async function authRoutes(fastify, options) {
       // 모든 refresh token 무효화
       await revokeAllUserTokens(userId);
 
+      // 현재 access token 폐기 (stateless 모드에서 만료 전까지 쓰이지 않도록)
+      await revokeAccessToken(request.user.tokenId, request.user.tokenExpiresAt);
+
       return reply.status(200).send({
         success: true,
         message: "로그아웃되었습니다.",
@@ -241,7 +264,7 @@ async function authRoutes(fastify, options) {
   }, async (request, reply) => {
     try {
       const userId = request.user.userId;
-      const user = await getUserById(userId);
+      const user = await getUserById(userId, undefined, PROJECTIONS.PROFILE_USER);
 
       if (!user) {
         return reply.status(404).send({
@@ -267,6 +290,73 @@ async function authRoutes(fastify, options) {
     }
   });
 
+  // 배치 토큰 검사 (게이트웨이/다운스트림 서비스가 여러 access token을 한 번에 확인)
+  if (!INTROSPECTION.API_KEY) {
+    console.warn("⚠️  INTROSPECTION_API_KEY is not set, /auth/introspect is disabled (404)");
+  }
+  fastify.post("/introspect", {
+    preHandler: [requireIntrospectionKey],
+    schema: {
+      body: {
+        type: "object",
+        required: ["tokens"],
+        properties: {
+          tokens: {
+            type: "array",
+            minItems: 1,
+            maxItems: INTROSPECTION.MAX_TOKENS,
+            items: { type: "string" },
+          },
+        },
+      },
+      response: {
+        200: {
+          type: "object",
+          properties: {
+            success: { type: "boolean" },
+            data: {
+              type: "object",
+              properties: {
+                results: {
+                  type: "array",
+                  items: {
+                    type: "object",
+                    properties: {
+                      active: { type: "boolean" },
+                      reason: { type: "string" },
+                      user_id: { type: "string" },
+                      username: { type: "string" },
+                      token_id: { type: "string" },
+                      issued_at: { type: "number" },
+                      expires_at: { type: "number" },
+                      cache_ttl_seconds: { type: "number" },
+                    },
+                  },
+                },
+              },
+            },
+          },
+        },
+      },
+    },
+  }, async (request, reply) => {
+    try {
+      const results = await introspectTokens(request.body.tokens);
+
+      return reply.status(200).send({
+        success: true,
+        data: { results },
+      });
+    } catch (error) {
+      console.error("Token introspection error:", error.message);
+
+      return reply.status(500).send({
+        success: false,
+        message: "토큰 검사 중 오류가 발생했습니다.",
+      });
+    }
+  });
+
   // 토큰 갱신
   fastify.post("/refresh", {
     schema: {
@@ -1,8 +1,12 @@
 const authRoutes = require("./authRoutes");
+const adminRoutes = require("./adminRoutes");
 
 async function routes(fastify, options) {
   // 인증 라우트 등록
   fastify.register(authRoutes, { prefix: "/auth" });
+
+  // 운영 진단·계정 관리 라우트 등록 (ADMIN_TOKEN 미설정 시 404)
+  fastify.register(adminRoutes, { prefix: "/admin" });
 }
 
 module.exports = routes;
@@ -3,18 +3,37 @@ const {
   GetCommand,
   UpdateCommand,
   QueryCommand,
+  TransactWriteCommand,
+  BatchGetCommand,
 } = require("@aws-sdk/lib-dynamodb");
-const bcrypt = require("bcryptjs");
 const { v4: uuidv4 } = require("uuid");
-const jwt = require("jsonwebtoken");
-const { TABLES, JWT_CONFIG, ERROR_MESSAGES } = require("../config/constants");
+const {
+  TABLES,
+  JWT_CONFIG,
+  ERROR_MESSAGES,
+  LOGIN_WRITE_BEHIND,
+  STATELESS_AUTH,
+  INTROSPECTION,
+  DYNAMO_ACCESS,
+  LOGIN_THROTTLE,
+} = require("../config/constants");
 const { createDynamoDBClient } = require("./dynamoClient");
-const { validateUsername, validatePassword, sanitizeUser } = require("../utils/validation");
-
-// 환경 변수 설정
+const { createDynamoAccess, projection, PROJECTIONS } = require("./dynamoAccess");
+const { createLoginWriteBehind } = require("./loginWriteBehind");
+const { retireRefreshToken, retireAllUserTokens, enforceSessionCapSafely } = require("./refreshTokenStore");
+const { hashPassword, verifyPassword, needsRehash, recordRehash } = require("./passwordHasher");
+const { signToken, verifyToken } = require("./jwtKeys");
+const { createEventFeed } = require("./eventFeed");
+const { createTokenRevocation } = require("./tokenRevocation");
+const { createLoginThrottle } = require("./loginThrottle");
 const {
-  JWT_SECRET = "your-super-secret-jwt-key-change-this-in-production",
-} = process.env;
+  buildUsernameClaimPut,
+  buildUsernameClaimDelete,
+  isTransactionConditionFailure,
+} = require("./usernameClaims");
+const { validateUsername, validatePassword, sanitizeUser } = require("../utils/validation");
+const { createCounter } = require("../utils/metrics");
+const { traceFunctions, traceDynamoClient } = require("../utils/tracing");
 
 // 로깅 설정
 const logger = {
@@ -22,6 +41,11 @@ const logger = {
   error: (message) => console.error(`[AUTH_SERVICE] ${message}`),
 };
 
+const introspectedTokens = createCounter(
+  "authcore_introspection_tokens_total",
+  "Tokens checked by /auth/introspect, by result"
+);
+
 // 기본 DynamoDB 클라이언트 인스턴스 (테스트에서는 모킹됨)
 let dynamoDB = null;
 
@@ -29,7 +53,12 @@ let dynamoDB = null;
 function initializeDynamoDB() {
   if (process.env.NODE_ENV !== 'test') {
     try {
-      dynamoDB = createDynamoDBClient();
+      // 접근 계층이 재시도/시간 예산을 관리하므로 SDK 자체 재시도는 끔
+      dynamoDB = traceDynamoClient(
+        DYNAMO_ACCESS.ENABLED
+          ? createDynamoAccess(createDynamoDBClient({ maxAttempts: 1 }))
+          : createDynamoDBClient()
+      );
       logger.info('DynamoDB client initialized successfully');
     } catch (error) {
       logger.error(`Failed to initialize DynamoDB client: ${error.message}`);
@@ -38,8 +67,91 @@ function initializeDynamoDB() {
   }
 }
 
+// last_login_at write-behind 버퍼 (기본 클라이언트가 있을 때만 사용)
+let loginWriteBehind = null;
+
+// write-behind 버퍼 초기화 함수
+function initializeLoginWriteBehind() {
+  if (!dynamoDB || !LOGIN_WRITE_BEHIND.ENABLED) {
+    return;
+  }
+
+  loginWriteBehind = createLoginWriteBehind({ dynamoDBClient: dynamoDB });
+  loginWriteBehind.start();
+  logger.info('Login write-behind buffer started');
+}
+
+// 레플리카 간 이벤트 피드와 access token 폐기 목록 (stateless 모드에서만 사용)
+let eventFeed = null;
+let tokenRevocation = null;
+
+// 레플리카 간 이벤트 피드 초기화 함수 (stateless 모드 또는 로그인 잠금 공유에 필요)
+function initializeEventFeed() {
+  if (!dynamoDB || !(STATELESS_AUTH.ENABLED || LOGIN_THROTTLE.SHARED)) {
+    return;
+  }
+
+  eventFeed = createEventFeed({ dynamoDBClient: dynamoDB });
+}
+
+// stateless 인증 초기화 함수
+function initializeStatelessAuth() {
+  if (!eventFeed || !STATELESS_AUTH.ENABLED) {
+    return;
+  }
+
+  tokenRevocation = createTokenRevocation({ feed: eventFeed });
+  tokenRevocation.start().catch((error) => {
+    logger.error(`Failed to start token revocation sync: ${error.message}`);
+  });
+  logger.info('Stateless access token mode enabled');
+}
+
+// 로그인 실패 제한 (DynamoDB 없이도 레플리카 로컬로 동작, 피드가 있으면 잠금 공유)
+let loginThrottle = null;
+
+// 로그인 실패 제한 초기화 함수
+function initializeLoginThrottle() {
+  if (!LOGIN_THROTTLE.ENABLED) {
+    return;
+  }
+
+  const sharedFeed = LOGIN_THROTTLE.SHARED ? eventFeed : null;
+  loginThrottle = createLoginThrottle({ feed: sharedFeed });
+  if (!LOGIN_THROTTLE.IP_SCOPE) {
+    logger.info('Login throttle IP scope disabled (set TRUST_PROXY to key on client IPs behind a proxy)');
+  }
+  // stateless 모드가 아니면 피드 폴링을 여기서 시작 (start는 중복 호출해도 한 번만 시작)
+  if (sharedFeed && !tokenRevocation) {
+    sharedFeed.start().catch((error) => {
+      logger.error(`Failed to start event feed for login lockouts: ${error.message}`);
+    });
+  }
+}
+
 // 초기화 실행
 initializeDynamoDB();
+initializeLoginWriteBehind();
+initializeEventFeed();
+initializeStatelessAuth();
+initializeLoginThrottle();
+
+/**
+ * 백그라운드 작업 종료 (남은 last_login_at 업데이트 반영, 피드 폴링 중단)
+ * @returns {Promise<void>}
+ */
+async function stopBackgroundTasks() {
+  if (tokenRevocation) {
+    tokenRevocation.stop();
+  } else if (eventFeed) {
+    eventFeed.stop();
+  }
+
+  if (loginWriteBehind) {
+    const flushed = await loginWriteBehind.stop();
+    logger.info(`Login write-behind buffer stopped (flushed ${flushed} pending update(s))`);
+  }
+}
 
 /**
  * 사용자 회원가입
@@ -61,15 +173,8 @@ async function registerUser(username, password, dynamoDBClient = dynamoDB) {
       throw new Error(passwordValidation.error);
     }
 
-    // 닉네임 중복 검사
-    const existingUser = await getUserByUsername(username, dynamoDBClient);
-    if (existingUser) {
-      throw new Error(ERROR_MESSAGES.USERNAME_DUPLICATE);
-    }
-
-    // 비밀번호 해싱
-    const saltRounds = 10;
-    const passwordHash = await bcrypt.hash(password, saltRounds);
+    // 비밀번호 해싱 (보정된 cost 사용)
+    const passwordHash = await hashPassword(password);
 
     // 사용자 데이터 생성
     const userId = uuidv4();
@@ -84,14 +189,28 @@ async function registerUser(username, password, dynamoDBClient = dynamoDB) {
       is_active: true,
     };
 
-    // DynamoDB에 저장
-    await dynamoDBClient.send(
-      new PutCommand({
-        TableName: TABLES.USERS,
-        Item: userData,
-        ConditionExpression: "attribute_not_exists(user_id)", // 중복 방지
-      })
-    );
+    // 사용자 레코드와 닉네임 점유 항목을 한 트랜잭션으로 저장 (닉네임 중복은 조건식으로 거부)
+    try {
+      await dynamoDBClient.send(
+        new TransactWriteCommand({
+          TransactItems: [
+            {
+              Put: {
+                TableName: TABLES.USERS,
+                Item: userData,
+                ConditionExpression: "attribute_not_exists(user_id)", // 중복 방지
+              },
+            },
+            buildUsernameClaimPut(username, userId, now),
+          ],
+        })
+      );
+    } catch (error) {
+      if (isTransactionConditionFailure(error, 1)) {
+        throw new Error(ERROR_MESSAGES.USERNAME_DUPLICATE);
+      }
+      throw error;
+    }
 
     logger.info(`User registered: ${username}`);
     
@@ -103,43 +222,97 @@ async function registerUser(username, password, dynamoDBClient = dynamoDB) {
   }
 }
 
+/**
+ * 로그인 인증 실패 에러 (code=INVALID_CREDENTIALS, DynamoDB 오류와 달리 로그인 실패 제한에 집계)
+ * @param {string} message - 에러 메시지
+ * @returns {Error}
+ */
+function credentialError(message) {
+  const error = new Error(message);
+  error.code = "INVALID_CREDENTIALS";
+  return error;
+}
+
+/**
+ * 로그인 시도 허용 여부 확인 (잠금 중이면 DynamoDB 조회·비밀번호 검증 없이 거부)
+ * @param {string} username - 사용자 닉네임
+ * @param {string} ip - 클라이언트 IP
+ * @returns {{scope: string, retryAfterMs: number}|null} 잠금 정보 (허용이면 null)
+ */
+function checkLoginAttempt(username, ip) {
+  return loginThrottle ? loginThrottle.check(username, ip) : null;
+}
+
+/**
+ * 로그인 결과를 실패 제한기에 기록 (인증 실패만 집계, 서버 오류는 무시)
+ * @param {string} username - 사용자 닉네임
+ * @param {string} ip - 클라이언트 IP
+ * @param {Error|null} error - loginUser가 던진 에러 (성공이면 null)
+ */
+function recordLoginResult(username, ip, error = null) {
+  if (!loginThrottle) {
+    return;
+  }
+  if (!error) {
+    loginThrottle.recordSuccess(username);
+  } else if (error.code === "INVALID_CREDENTIALS") {
+    loginThrottle.recordFailure(username, ip);
+  }
+}
+
 /**
  * 사용자 로그인
  * @param {string} username - 사용자 닉네임
  * @param {string} password - 비밀번호
  * @param {Object} dynamoDBClient - DynamoDB 클라이언트 (테스트용)
+ * @param {Object|null} lastLoginRecorder - last_login_at write-behind 버퍼 (없으면 즉시 업데이트).
+ *   기본 버퍼는 모듈의 DynamoDB 클라이언트로 쓰므로, 다른 클라이언트를 넘기면 기본값은 null(그 클라이언트로 즉시 업데이트)
  * @returns {Promise<Object>} 사용자 정보
  */
-async function loginUser(username, password, dynamoDBClient = dynamoDB) {
+async function loginUser(
+  username,
+  password,
+  dynamoDBClient = dynamoDB,
+  lastLoginRecorder = dynamoDBClient === dynamoDB ? loginWriteBehind : null
+) {
   try {
     // 사용자 조회
-    const user = await getUserByUsername(username, dynamoDBClient);
+    const user = await getUserByUsername(username, dynamoDBClient, PROJECTIONS.LOGIN_USER);
     if (!user) {
-      throw new Error("존재하지 않는 사용자입니다.");
+      throw credentialError("존재하지 않는 사용자입니다.");
     }
 
     if (!user.is_active) {
-      throw new Error("비활성화된 계정입니다.");
+      throw credentialError("비활성화된 계정입니다.");
     }
 
     // 비밀번호 검증
-    const isValidPassword = await bcrypt.compare(password, user.password_hash);
+    const isValidPassword = await verifyPassword(password, user.password_hash);
     if (!isValidPassword) {
-      throw new Error("비밀번호가 일치하지 않습니다.");
+      throw credentialError("비밀번호가 일치하지 않습니다.");
+    }
+
+    // 저장된 해시의 cost가 현재 보정값과 다르면 응답 이후 재해시
+    if (needsRehash(user.password_hash)) {
+      rehashPasswordInBackground(user, password, dynamoDBClient);
     }
 
-    // 마지막 로그인 시간 업데이트
+    // 마지막 로그인 시간 업데이트 (write-behind 버퍼가 있으면 응답 경로에서 제외)
     const now = new Date().toISOString();
-    await dynamoDBClient.send(
-      new UpdateCommand({
-        TableName: TABLES.USERS,
-        Key: { user_id: user.user_id },
-        UpdateExpression: "SET last_login_at = :login_time",
-        ExpressionAttributeValues: {
-          ":login_time": now,
-        },
-      })
-    );
+    if (lastLoginRecorder) {
+      lastLoginRecorder.record(user.user_id, now);
+    } else {
+      await dynamoDBClient.send(
+        new UpdateCommand({
+          TableName: TABLES.USERS,
+          Key: { user_id: user.user_id },
+          UpdateExpression: "SET last_login_at = :login_time",
+          ExpressionAttributeValues: {
+            ":login_time": now,
+          },
+        })
+      );
+    }
 
     logger.info(`User logged in: ${username}`);
     
@@ -152,19 +325,50 @@ async function loginUser(username, password, dynamoDBClient = dynamoDB) {
   }
 }
 
+/**
+ * 로그인 성공 직후 비밀번호를 현재 cost로 재해시하여 저장 (응답을 기다리게 하지 않음)
+ * 그 사이 비밀번호가 바뀌었으면 조건식으로 건너뛴다.
+ * @param {Object} user - 로그인한 사용자 (password_hash 포함)
+ * @param {string} password - 검증된 평문 비밀번호
+ * @param {Object} dynamoDBClient - DynamoDB 클라이언트
+ */
+function rehashPasswordInBackground(user, password, dynamoDBClient) {
+  (async () => {
+    const newPasswordHash = await hashPassword(password);
+    await dynamoDBClient.send(
+      new UpdateCommand({
+        TableName: TABLES.USERS,
+        Key: { user_id: user.user_id },
+        UpdateExpression: "SET password_hash = :new_password_hash",
+        ConditionExpression: "password_hash = :current_password_hash",
+        ExpressionAttributeValues: {
+          ":new_password_hash": newPasswordHash,
+          ":current_password_hash": user.password_hash,
+        },
+      })
+    );
+    recordRehash(user.password_hash);
+    logger.info(`Password re-hashed with current cost for user: ${user.user_id}`);
+  })().catch((error) => {
+    logger.error(`Failed to re-hash password for user ${user.user_id}: ${error.message}`);
+  });
+}
+
 /**
  * 닉네임으로 사용자 조회
  * @param {string} username - 사용자 닉네임
  * @param {Object} dynamoDBClient - DynamoDB 클라이언트 (테스트용)
+ * @param {string[]|null} attributes - 읽을 속성 (없으면 전체 항목)
  * @returns {Promise<Object|null>} 사용자 정보
  */
-async function getUserByUsername(username, dynamoDBClient = dynamoDB) {
+async function getUserByUsername(username, dynamoDBClient = dynamoDB, attributes = null) {
   try {
     const result = await dynamoDBClient.send(
       new QueryCommand({
         TableName: TABLES.USERS,
         IndexName: "username-index",
         KeyConditionExpression: "username = :username",
+        ...(attributes ? projection(attributes) : {}),
         ExpressionAttributeValues: {
           ":username": username,
         },
@@ -182,14 +386,16 @@ async function getUserByUsername(username, dynamoDBClient = dynamoDB) {
  * 사용자 ID로 사용자 조회
  * @param {string} userId - 사용자 ID
  * @param {Object} dynamoDBClient - DynamoDB 클라이언트 (테스트용)
+ * @param {string[]|null} attributes - 읽을 속성 (없으면 전체 항목, 호출 지점별 PROJECTIONS 사용)
  * @returns {Promise<Object|null>} 사용자 정보
  */
-async function getUserById(userId, dynamoDBClient = dynamoDB) {
+async function getUserById(userId, dynamoDBClient = dynamoDB, attributes = null) {
   try {
     const result = await dynamoDBClient.send(
       new GetCommand({
         TableName: TABLES.USERS,
         Key: { user_id: userId },
+        ...(attributes ? projection(attributes) : {}),
       })
     );
 
@@ -200,6 +406,54 @@ async function getUserById(userId, dynamoDBClient = dynamoDB) {
   }
 }
 
+/**
+ * 여러 사용자를 BatchGetItem으로 한 번에 조회 (인증에 필요한 속성만)
+ * @param {string[]} userIds - 사용자 ID 목록 (중복 없음)
+ * @param {Object} dynamoDBClient - DynamoDB 클라이언트 (테스트용)
+ * @returns {Promise<Map<string, Object>>} 사용자 ID → 사용자 정보 (없는 사용자는 포함되지 않음)
+ */
+async function getUsersByIds(userIds, dynamoDBClient = dynamoDB) {
+  const users = new Map();
+
+  try {
+    for (let offset = 0; offset < userIds.length; offset += INTROSPECTION.BATCH_GET_SIZE) {
+      let requestItems = {
+        [TABLES.USERS]: {
+          Keys: userIds.slice(offset, offset + INTROSPECTION.BATCH_GET_SIZE).map((userId) => ({ user_id: userId })),
+          ProjectionExpression: "user_id, #username, is_active",
+          ExpressionAttributeNames: { "#username": "username" },
+        },
+      };
+
+      for (let attempt = 0; requestItems; attempt++) {
+        const result = await dynamoDBClient.send(
+          new BatchGetCommand({ RequestItems: requestItems })
+        );
+
+        for (const item of (result.Responses && result.Responses[TABLES.USERS]) || []) {
+          users.set(item.user_id, item);
+        }
+
+        const unprocessed = result.UnprocessedKeys && result.UnprocessedKeys[TABLES.USERS];
+        if (!unprocessed || unprocessed.Keys.length === 0) {
+          requestItems = null;
+        } else if (attempt >= INTROSPECTION.MAX_BATCH_GET_RETRIES) {
+          throw new Error(`${unprocessed.Keys.length} user key(s) left unprocessed after retries`);
+        } else {
+          // 처리량 초과로 남은 키는 지수 백오프 후 재요청
+          await new Promise((resolve) => setTimeout(resolve, 50 * 2 ** attempt));
+          requestItems = { [TABLES.USERS]: unprocessed };
+        }
+      }
+    }
+
+    return users;
+  } catch (error) {
+    logger.error(`Failed to batch get users: ${error.message}`);
+    throw error;
+  }
+}
+
 /**
  * 닉네임 변경
  * @param {string} userId - 사용자 ID
@@ -222,37 +476,48 @@ async function updateUsername(userId, newUsername, password, dynamoDBClient = dy
     }
 
     // 비밀번호 검증
-    const isValidPassword = await bcrypt.compare(password, user.password_hash);
+    const isValidPassword = await verifyPassword(password, user.password_hash);
     if (!isValidPassword) {
       throw new Error("비밀번호가 일치하지 않습니다.");
     }
 
-    // 새 닉네임 중복 검사
-    const existingUser = await getUserByUsername(newUsername, dynamoDBClient);
-    if (existingUser && existingUser.user_id !== userId) {
-      throw new Error("이미 사용 중인 닉네임입니다.");
-    }
-
-    // 닉네임 업데이트
+    // 닉네임 업데이트 (새 닉네임 점유 + 기존 점유 해제 + 사용자 갱신을 한 트랜잭션으로 처리)
     const now = new Date().toISOString();
-    await dynamoDBClient.send(
-      new UpdateCommand({
+    const userUpdate = {
+      Update: {
         TableName: TABLES.USERS,
         Key: { user_id: userId },
         UpdateExpression: "SET username = :new_username, username_changed_at = :changed_time",
+        ConditionExpression: "attribute_exists(user_id) AND username = :current_username",
         ExpressionAttributeValues: {
           ":new_username": newUsername,
           ":changed_time": now,
+          ":current_username": user.username,
         },
-      })
-    );
+      },
+    };
+    const transactItems = newUsername === user.username
+      ? [userUpdate]
+      : [
+          buildUsernameClaimPut(newUsername, userId, now),
+          buildUsernameClaimDelete(user.username, userId),
+          userUpdate,
+        ];
+
+    try {
+      await dynamoDBClient.send(new TransactWriteCommand({ TransactItems: transactItems }));
+    } catch (error) {
+      if (transactItems.length > 1 && isTransactionConditionFailure(error, 0)) {
+        throw new Error(ERROR_MESSAGES.USERNAME_DUPLICATE);
+      }
+      throw error;
+    }
 
     logger.info(`Username updated for user: ${userId}`);
     
-    // 업데이트된 사용자 정보 반환
-    const updatedUser = await getUserById(userId, dynamoDBClient);
-    const { password_hash, ...userWithoutPassword } = updatedUser;
-    return userWithoutPassword;
+    // 업데이트된 사용자 정보 반환 (트랜잭션이 성공했으므로 재조회 없이 구성)
+    const { password_hash, ...userWithoutPassword } = user;
+    return { ...userWithoutPassword, username: newUsername, username_changed_at: now };
   } catch (error) {
     logger.error(`Failed to update username: ${error.message}`);
     throw error;
@@ -281,14 +546,13 @@ async function updatePassword(userId, currentPassword, newPassword, dynamoDBClie
     }
 
     // 현재 비밀번호 검증
-    const isValidPassword = await bcrypt.compare(currentPassword, user.password_hash);
+    const isValidPassword = await verifyPassword(currentPassword, user.password_hash);
     if (!isValidPassword) {
       throw new Error("현재 비밀번호가 일치하지 않습니다.");
     }
 
-    // 새 비밀번호 해싱
-    const saltRounds = 10;
-    const newPasswordHash = await bcrypt.hash(newPassword, saltRounds);
+    // 새 비밀번호 해싱 (보정된 cost 사용)
+    const newPasswordHash = await hashPassword(newPassword);
 
     // 비밀번호 업데이트
     await dynamoDBClient.send(
@@ -326,9 +590,11 @@ function generateAccessToken(userId, username) {
       userId,
       username,
       type: "access",
+      // 로그아웃 시 개별 토큰 폐기를 위한 ID
+      jti: uuidv4(),
     };
 
-    const token = jwt.sign(payload, JWT_SECRET, {
+    const token = signToken(payload, {
       expiresIn: JWT_CONFIG.ACCESS_EXPIRES_IN,
     });
 
@@ -349,9 +615,8 @@ function generateAccessToken(userId, username) {
 async function generateRefreshToken(userId, dynamoDBClient = dynamoDB) {
   try {
     const tokenId = uuidv4();
-    const token = jwt.sign(
+    const token = signToken(
       { tokenId, userId, type: "refresh" },
-      JWT_SECRET,
       { expiresIn: JWT_CONFIG.REFRESH_EXPIRES_IN }
     );
 
@@ -365,20 +630,23 @@ async function generateRefreshToken(userId, dynamoDBClient = dynamoDB) {
     const expiresAt = new Date();
     expiresAt.setDate(expiresAt.getDate() + 7); // 7일 후
 
-    // DynamoDB에 저장
-    await dynamoDBClient.send(
-      new PutCommand({
-        TableName: TABLES.REFRESH_TOKENS,
-        Item: {
-          token_id: tokenId,
-          user_id: userId,
-          token_hash: tokenHash,
-          expires_at: Math.floor(expiresAt.getTime() / 1000), // TTL용 Unix timestamp
-          created_at: new Date().toISOString(),
-          is_revoked: false,
-        },
-      })
-    );
+    // DynamoDB에 저장 (사용자별 세션 상한 정리는 저장과 동시에 진행)
+    await Promise.all([
+      dynamoDBClient.send(
+        new PutCommand({
+          TableName: TABLES.REFRESH_TOKENS,
+          Item: {
+            token_id: tokenId,
+            user_id: userId,
+            token_hash: tokenHash,
+            expires_at: Math.floor(expiresAt.getTime() / 1000), // TTL용 Unix timestamp
+            created_at: new Date().toISOString(),
+            is_revoked: false,
+          },
+        })
+      ),
+      enforceSessionCapSafely(userId, dynamoDBClient),
+    ]);
 
     logger.info(`Refresh token generated for user: ${userId}`);
     return token;
@@ -417,7 +685,7 @@ async function generateTokenPair(userId, username, dynamoDBClient = dynamoDB) {
  */
 function verifyAccessToken(token) {
   try {
-    const decoded = jwt.verify(token, JWT_SECRET);
+    const decoded = verifyToken(token);
     
     if (decoded.type !== "access") {
       throw new Error("Invalid token type");
@@ -430,6 +698,80 @@ function verifyAccessToken(token) {
   }
 }
 
+/**
+ * Access Token 디코딩 (배치 검사용, 실패해도 로그를 남기지 않음)
+ * @param {string} token - Access Token
+ * @returns {Object|null} 디코딩된 토큰 페이로드 (유효하지 않으면 null)
+ */
+function decodeAccessToken(token) {
+  try {
+    const decoded = verifyToken(token);
+    return decoded.type === "access" ? decoded : null;
+  } catch (error) {
+    return null;
+  }
+}
+
+/**
+ * 여러 Access Token을 한 번에 검사 (게이트웨이/다운스트림 서비스용)
+ *
+ * 서명 검증과 폐기 확인을 먼저 하고, 살아남은 토큰의 사용자만 중복 없이 BatchGetItem 한 번으로 조회한다.
+ * stateless 모드가 활성 상태면 미들웨어와 같이 사용자 조회를 생략한다.
+ *
+ * @param {string[]} tokens - Access Token 목록
+ * @param {Object} dynamoDBClient - DynamoDB 클라이언트 (테스트용)
+ * @returns {Promise<Object[]>} 토큰 순서대로의 검사 결과
+ */
+async function introspectTokens(tokens, dynamoDBClient = dynamoDB) {
+  const nowSeconds = Math.floor(Date.now() / 1000);
+  const decodedByToken = new Map();
+  for (const token of tokens) {
+    if (!decodedByToken.has(token)) {
+      const decoded = decodeAccessToken(token);
+      decodedByToken.set(token, decoded && !isAccessTokenRevoked(decoded) ? decoded : null);
+    }
+  }
+
+  const stateless = isStatelessAuthActive();
+  const userIds = stateless
+    ? []
+    : [...new Set([...decodedByToken.values()].filter(Boolean).map((decoded) => decoded.userId))];
+  const users = userIds.length > 0 ? await getUsersByIds(userIds, dynamoDBClient) : new Map();
+
+  return tokens.map((token) => {
+    const decoded = decodedByToken.get(token);
+    let result;
+
+    if (!decoded) {
+      result = { active: false, reason: "invalid_token" };
+    } else {
+      const user = stateless
+        ? { user_id: decoded.userId, username: decoded.username, is_active: true }
+        : users.get(decoded.userId);
+
+      if (!user) {
+        result = { active: false, reason: "user_not_found" };
+      } else if (!user.is_active) {
+        result = { active: false, reason: "user_inactive" };
+      } else {
+        result = {
+          active: true,
+          user_id: user.user_id,
+          username: user.username,
+          token_id: decoded.jti,
+          issued_at: decoded.iat,
+          expires_at: decoded.exp,
+          // 게이트웨이는 이 시간 동안 결과를 캐시할 수 있음 (토큰 만료와 폐기 반영 상한 중 짧은 쪽)
+          cache_ttl_seconds: Math.max(0, Math.min(decoded.exp - nowSeconds, INTROSPECTION.MAX_CACHE_TTL_SECONDS)),
+        };
+      }
+    }
+
+    introspectedTokens.inc(1, { result: result.active ? "active" : result.reason });
+    return result;
+  });
+}
+
 /**
  * Refresh Token 검증 및 갱신
  * @param {string} token - Refresh Token
@@ -439,7 +781,7 @@ function verifyAccessToken(token) {
 async function verifyAndRefreshToken(token, dynamoDBClient = dynamoDB) {
   try {
     // 토큰 디코딩
-    const decoded = jwt.verify(token, JWT_SECRET);
+    const decoded = verifyToken(token);
     
     if (decoded.type !== "refresh") {
       throw new Error("Invalid token type");
@@ -450,6 +792,7 @@ async function verifyAndRefreshToken(token, dynamoDBClient = dynamoDB) {
       new GetCommand({
         TableName: TABLES.REFRESH_TOKENS,
         Key: { token_id: decoded.tokenId },
+        ...projection(PROJECTIONS.REFRESH_TOKEN),
       })
     );
 
@@ -471,15 +814,25 @@ async function verifyAndRefreshToken(token, dynamoDBClient = dynamoDB) {
       throw new Error("Invalid refresh token");
     }
 
-    // 기존 refresh token 무효화
-    await revokeRefreshToken(decoded.tokenId, dynamoDBClient);
+    // 기존 refresh token 폐기 (같은 토큰으로 동시에 갱신하면 하나만 성공)
+    const rotated = await retireRefreshToken(decoded.tokenId, dynamoDBClient, {
+      requireActive: true,
+      reason: "rotated",
+    });
+    if (!rotated) {
+      throw new Error("Refresh token has been revoked");
+    }
 
     // 사용자 정보 조회
-    const user = await getUserById(decoded.userId, dynamoDBClient);
+    const user = await getUserById(decoded.userId, dynamoDBClient, PROJECTIONS.AUTH_USER);
     if (!user) {
       throw new Error("User not found");
     }
 
+    if (!user.is_active) {
+      throw new Error("User is inactive");
+    }
+
     // 새 토큰 쌍 생성
     const newTokens = await generateTokenPair(decoded.userId, user.username, dynamoDBClient);
     
@@ -499,16 +852,7 @@ async function verifyAndRefreshToken(token, dynamoDBClient = dynamoDB) {
  */
 async function revokeRefreshToken(tokenId, dynamoDBClient = dynamoDB) {
   try {
-    await dynamoDBClient.send(
-      new UpdateCommand({
-        TableName: TABLES.REFRESH_TOKENS,
-        Key: { token_id: tokenId },
-        UpdateExpression: "SET is_revoked = :revoked",
-        ExpressionAttributeValues: {
-          ":revoked": true,
-        },
-      })
-    );
+    await retireRefreshToken(tokenId, dynamoDBClient, { reason: "revoked" });
 
     logger.info(`Refresh token revoked: ${tokenId}`);
   } catch (error) {
@@ -525,53 +869,121 @@ async function revokeRefreshToken(tokenId, dynamoDBClient = dynamoDB) {
  */
 async function revokeAllUserTokens(userId, dynamoDBClient = dynamoDB) {
   try {
-    const result = await dynamoDBClient.send(
-      new QueryCommand({
-        TableName: TABLES.REFRESH_TOKENS,
-        IndexName: "user-id-index",
-        KeyConditionExpression: "user_id = :userId",
-        FilterExpression: "is_revoked = :notRevoked",
+    const revoked = await retireAllUserTokens(userId, dynamoDBClient);
+
+    if (revoked > 0) {
+      logger.info(`Revoked ${revoked} active token(s) for user: ${userId}`);
+    } else {
+      logger.info(`No active tokens to revoke for user: ${userId}`);
+    }
+  } catch (error) {
+    logger.error(`Failed to revoke all user tokens: ${error.message}`);
+    throw error;
+  }
+}
+
+/**
+ * stateless 인증 사용 가능 여부 (모드가 켜져 있고 폐기 목록이 최신 상태일 때만)
+ * @returns {boolean}
+ */
+function isStatelessAuthActive() {
+  return Boolean(tokenRevocation && tokenRevocation.isFresh());
+}
+
+/**
+ * access token 폐기 여부 확인 (stateless 모드가 아니면 항상 false)
+ * @param {Object} decoded - 검증된 access token 페이로드
+ * @returns {boolean}
+ */
+function isAccessTokenRevoked(decoded) {
+  return Boolean(tokenRevocation && tokenRevocation.isRevoked(decoded));
+}
+
+/**
+ * access token 폐기 (로그아웃). 모든 레플리카에 피드로 전파된다.
+ * @param {string} tokenId - access token jti
+ * @param {number} expiresAt - access token 만료 Unix timestamp (초)
+ * @returns {Promise<void>}
+ */
+async function revokeAccessToken(tokenId, expiresAt) {
+  if (!tokenRevocation || !tokenId) {
+    return;
+  }
+
+  try {
+    await tokenRevocation.revokeAccessToken(tokenId, expiresAt);
+    logger.info(`Access token revoked: ${tokenId}`);
+  } catch (error) {
+    logger.error(`Failed to revoke access token: ${error.message}`);
+    throw error;
+  }
+}
+
+/**
+ * 계정 비활성화 (refresh token 무효화 + 발급된 access token 폐기 전파)
+ * @param {string} userId - 사용자 ID
+ * @param {Object} dynamoDBClient - DynamoDB 클라이언트 (테스트용)
+ * @returns {Promise<void>}
+ */
+async function deactivateUser(userId, dynamoDBClient = dynamoDB) {
+  try {
+    await dynamoDBClient.send(
+      new UpdateCommand({
+        TableName: TABLES.USERS,
+        Key: { user_id: userId },
+        UpdateExpression: "SET is_active = :inactive",
+        ConditionExpression: "attribute_exists(user_id)",
         ExpressionAttributeValues: {
-          ":userId": userId,
-          ":notRevoked": false,
+          ":inactive": false,
         },
       })
     );
 
-    if (result.Items && result.Items.length > 0) {
-      const revokePromises = result.Items.map(item =>
-        revokeRefreshToken(item.token_id, dynamoDBClient)
-      );
-      await Promise.all(revokePromises);
-      logger.info(`Revoked ${result.Items.length} active token(s) for user: ${userId}`);
-    } else {
-      logger.info(`No active tokens to revoke for user: ${userId}`);
+    await revokeAllUserTokens(userId, dynamoDBClient);
+    if (tokenRevocation) {
+      await tokenRevocation.revokeUser(userId);
     }
+
+    logger.info(`User deactivated: ${userId}`);
   } catch (error) {
-    logger.error(`Failed to revoke all user tokens: ${error.message}`);
+    logger.error(`Failed to deactivate user: ${error.message}`);
     throw error;
   }
 }
 
+// 트레이싱: 샘플링된 요청에서 함수마다 스팬 기록 (그 외에는 원래 함수를 바로 호출)
 module.exports = {
-  // 사용자 관리
-  registerUser,
-  loginUser,
-  getUserByUsername,
-  getUserById,
-  updateUsername,
-  updatePassword,
-  
-  // 토큰 관리
-  generateAccessToken,
-  generateRefreshToken,
-  generateTokenPair,
-  verifyAccessToken,
-  verifyAndRefreshToken,
-  revokeRefreshToken,
-  revokeAllUserTokens,
+  ...traceFunctions("authService", {
+    // 사용자 관리
+    registerUser,
+    loginUser,
+    getUserByUsername,
+    getUserById,
+    getUsersByIds,
+    updateUsername,
+    updatePassword,
+    deactivateUser,
+
+    // 토큰 관리
+    generateAccessToken,
+    generateRefreshToken,
+    generateTokenPair,
+    verifyAccessToken,
+    introspectTokens,
+    verifyAndRefreshToken,
+    revokeRefreshToken,
+    revokeAllUserTokens,
+    revokeAccessToken,
+    isAccessTokenRevoked,
+    isStatelessAuthActive,
+  }),
   
+  // 로그인 실패 제한 (요청마다 호출되는 메모리 조회라 스팬을 남기지 않음)
+  checkLoginAttempt,
+  recordLoginResult,
+
   // 유틸리티
   createDynamoDBClient,
+  stopBackgroundTasks,
   logger,
 };
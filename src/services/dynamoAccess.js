@@ -0,0 +1,326 @@
+const { randomUUID } = require("crypto");
+const { DYNAMO_ACCESS } = require("../config/constants");
+const { createCounter, createGauge, createHistogram } = require("../utils/metrics");
+
+// 로깅 설정
+const logger = {
+  info: (message) => console.log(`[DYNAMO_ACCESS] ${message}`),
+  error: (message) => console.error(`[DYNAMO_ACCESS] ${message}`),
+};
+
+const metrics = {
+  duration: createHistogram(
+    "authcore_dynamodb_request_duration_seconds",
+    "DynamoDB call latency including retries and hedges, by operation and table",
+    [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5]
+  ),
+  retries: createCounter("authcore_dynamodb_retries_total", "DynamoDB retries, by operation and reason"),
+  timeouts: createCounter("authcore_dynamodb_attempt_timeouts_total", "DynamoDB attempts aborted by the time budget"),
+  hedges: createCounter("authcore_dynamodb_hedged_requests_total", "Hedged duplicate reads, by result (sent/won)"),
+  budgetExhausted: createCounter(
+    "authcore_dynamodb_retry_budget_exhausted_total",
+    "Retries or hedges skipped because the retry budget was empty"
+  ),
+  budgetTokens: createGauge("authcore_dynamodb_retry_budget_tokens", "Remaining retry budget tokens"),
+  errors: createCounter("authcore_dynamodb_errors_total", "DynamoDB calls that failed after retries, by error"),
+};
+
+// 읽기 전용 명령 (시간 초과 후 재시도와 헤지가 안전)
+const READ_COMMANDS = new Set(["GetCommand", "QueryCommand", "BatchGetCommand", "ScanCommand"]);
+
+// 요청이 반영되지 않았음이 확실한 오류 (쓰기도 재시도 가능)
+const NOT_APPLIED_ERRORS = new Set([
+  "ProvisionedThroughputExceededException",
+  "ThrottlingException",
+  "RequestLimitExceeded",
+  "ServiceUnavailable",
+]);
+const THROTTLING_ERRORS = new Set(["ProvisionedThroughputExceededException", "ThrottlingException", "RequestLimitExceeded"]);
+
+// 반영 여부를 알 수 없는 오류 (멱등 요청만 재시도)
+const AMBIGUOUS_ERRORS = new Set(["TimeoutError", "InternalServerError", "ECONNRESET", "EPIPE", "ETIMEDOUT"]);
+
+/**
+ * 필요한 속성만 읽도록 ProjectionExpression 생성 (예약어 충돌을 피하려 모두 #이름으로 치환)
+ * @param {string[]} attributes - 읽을 속성
+ * @returns {{ProjectionExpression: string, ExpressionAttributeNames: Object}}
+ */
+function projection(attributes) {
+  const names = {};
+  const placeholders = attributes.map((attribute) => {
+    names[`#${attribute}`] = attribute;
+    return `#${attribute}`;
+  });
+  return { ProjectionExpression: placeholders.join(", "), ExpressionAttributeNames: names };
+}
+
+// 호출 지점별 프로젝션 (password_hash 등 불필요한 속성을 읽지 않음)
+const PROJECTIONS = {
+  // 인증 미들웨어: 활성 여부와 닉네임만
+  AUTH_USER: ["user_id", "username", "is_active"],
+  // /auth/me 응답
+  PROFILE_USER: ["user_id", "username", "level", "total_quizzes", "created_at", "last_login_at", "is_active"],
+  // 로그인: 응답(프로필)과 비밀번호 검증에 필요한 속성
+  LOGIN_USER: ["user_id", "username", "level", "total_quizzes", "created_at", "last_login_at", "is_active", "password_hash"],
+  // 토큰 갱신: 저장된 refresh token 검증
+  REFRESH_TOKEN: ["token_id", "user_id", "token_hash", "is_revoked"],
+};
+
+/**
+ * 명령의 메트릭/설정 키 (명령 종류 + 테이블)
+ * @param {Object} command
+ * @returns {{name: string, table: string, operation: string}}
+ */
+function describeCommand(command) {
+  const name = command.constructor.name;
+  const input = command.input || {};
+  let table = input.TableName;
+  if (!table && input.RequestItems) {
+    table = Object.keys(input.RequestItems).join(",");
+  }
+  if (!table && input.TransactItems) {
+    table = "transaction";
+  }
+  return { name, table: table || "unknown", operation: name.replace(/Command$/, "") };
+}
+
+/**
+ * 최근 성공 지연 시간의 고정 크기 창 (헤지 지연 계산)
+ */
+function createLatencyWindow(size) {
+  const samples = new Float64Array(size);
+  let count = 0;
+  let cached = null;
+  let cachedAt = 0;
+
+  return {
+    add(ms) {
+      samples[count % size] = ms;
+      count += 1;
+    },
+    size: () => Math.min(count, size),
+    // 정렬 비용을 줄이기 위해 새 샘플이 size/8개 쌓일 때마다 다시 계산
+    percentile(q) {
+      if (cached === null || count - cachedAt >= size / 8) {
+        const sorted = Array.from(samples.subarray(0, Math.min(count, size))).sort((a, b) => a - b);
+        cached = (p) => sorted[Math.min(Math.floor(p * sorted.length), sorted.length - 1)];
+        cachedAt = count;
+      }
+      return cached(q);
+    },
+  };
+}
+
+/**
+ * DynamoDB Document Client 래퍼 (send 인터페이스 동일)
+ *
+ * - 명령별 시간 예산: 시도마다 제한 시간을 두고 abortSignal로 끊으며, 전체 예산 안에서만 재시도
+ * - 재시도: full jitter 지수 백오프 (throttling이면 더 길게), 요청 수에 비례하는 재시도 예산 안에서만
+ * - 시간 초과/모호한 오류는 멱등 요청(읽기, 조건 없는 쓰기, ClientRequestToken이 있는 트랜잭션)만 재시도
+ * - 헤지 읽기(선택): HEDGE_COMMANDS(기본 GetCommand) 요청이 최근 지연 분위수보다 오래 걸리면
+ *   같은 요청을 한 번 더 보내 먼저 온 응답 사용
+ * @param {Object} client - DynamoDB Document Client
+ * @param {Object} [options] - DYNAMO_ACCESS 설정 덮어쓰기 (테스트/벤치마크용)
+ * @returns {{send: Function, raw: Object}}
+ */
+function createDynamoAccess(client, options = {}) {
+  const config = { ...DYNAMO_ACCESS, ...options, TIMEOUTS_MS: { ...DYNAMO_ACCESS.TIMEOUTS_MS, ...(options.TIMEOUTS_MS || {}) } };
+  const random = options.random || Math.random;
+  const hedgeCommands = new Set(config.HEDGE_COMMANDS.filter((name) => READ_COMMANDS.has(name)));
+  const latencies = new Map();
+  let budget = config.RETRY_BUDGET_INITIAL;
+  metrics.budgetTokens.set(budget);
+
+  function latencyWindow(key) {
+    if (!latencies.has(key)) {
+      latencies.set(key, createLatencyWindow(config.LATENCY_WINDOW));
+    }
+    return latencies.get(key);
+  }
+
+  function withdraw(labels) {
+    if (budget < 1) {
+      metrics.budgetExhausted.inc(1, labels);
+      return false;
+    }
+    budget -= 1;
+    metrics.budgetTokens.set(budget);
+    return true;
+  }
+
+  function isIdempotent(name, input) {
+    return READ_COMMANDS.has(name) || Boolean(input.ClientRequestToken) || !input.ConditionExpression;
+  }
+
+  function errorCode(error) {
+    return error.name || error.code || "Error";
+  }
+
+  function isRetryable(error, name, input) {
+    const code = errorCode(error);
+    if (NOT_APPLIED_ERRORS.has(code) || (error.$metadata && error.$metadata.httpStatusCode === 503)) {
+      return true;
+    }
+    // 트랜잭션 충돌로 취소된 경우 반영되지 않음
+    if (code === "TransactionCanceledException") {
+      return (error.CancellationReasons || []).some((reason) => reason.Code === "TransactionConflict") &&
+        !(error.CancellationReasons || []).some((reason) => reason.Code === "ConditionalCheckFailed");
+    }
+    return (AMBIGUOUS_ERRORS.has(code) || AMBIGUOUS_ERRORS.has(error.code)) && isIdempotent(name, input);
+  }
+
+  /**
+   * 한 번 시도 (제한 시간이 지나면 중단하고 TimeoutError)
+   * @returns {{promise: Promise, abort: Function}}
+   */
+  function attempt(command, timeoutMs, labels) {
+    const controller = new AbortController();
+    let timer;
+    const timeout = new Promise((resolve, reject) => {
+      timer = setTimeout(() => {
+        const error = new Error(`DynamoDB ${labels.operation} exceeded ${Math.round(timeoutMs)}ms`);
+        error.name = "TimeoutError";
+        metrics.timeouts.inc(1, labels);
+        // race가 중단 오류(AbortError)가 아닌 TimeoutError로 끝나도록 먼저 reject
+        reject(error);
+        controller.abort();
+      }, timeoutMs);
+    });
+    const promise = Promise.race([client.send(command, { abortSignal: controller.signal }), timeout])
+      .finally(() => clearTimeout(timer));
+    return { promise, abort: () => controller.abort() };
+  }
+
+  /**
+   * 헤지 읽기: 첫 요청이 delayMs 안에 끝나지 않으면 복제 요청을 보내고 먼저 성공한 응답 사용
+   */
+  function hedged(command, timeoutMs, delayMs, labels) {
+    return new Promise((resolve, reject) => {
+      const inFlight = [];
+      let settled = false;
+      let failures = 0;
+      let hedgeTimer = null;
+
+      const finish = (winner, result, error) => {
+        if (settled) {
+          return;
+        }
+        settled = true;
+        clearTimeout(hedgeTimer);
+        inFlight.filter((entry) => entry !== winner).forEach((entry) => entry.abort());
+        if (error) {
+          reject(error);
+        } else {
+          resolve(result);
+        }
+      };
+
+      const launch = (attemptCommand, isHedge) => {
+        const entry = attempt(attemptCommand, timeoutMs, labels);
+        inFlight.push(entry);
+        entry.promise.then(
+          (result) => {
+            if (isHedge && !settled) {
+              metrics.hedges.inc(1, { ...labels, result: "won" });
+            }
+            finish(entry, result);
+          },
+          (error) => {
+            failures += 1;
+            // 보낸 요청이 모두 실패하면 실패 (헤지 전이면 바로 실패해 일반 재시도로 넘어감)
+            if (failures === inFlight.length) {
+              finish(entry, null, error);
+            }
+          }
+        );
+      };
+
+      launch(command, false);
+      hedgeTimer = setTimeout(() => {
+        if (settled || !withdraw(labels)) {
+          return;
+        }
+        metrics.hedges.inc(1, { ...labels, result: "sent" });
+        launch(new command.constructor(command.input), true);
+      }, delayMs);
+    });
+  }
+
+  function hedgeDelay(name, key) {
+    if (!config.HEDGE_ENABLED || !hedgeCommands.has(name)) {
+      return null;
+    }
+    const window = latencyWindow(key);
+    if (window.size() < config.HEDGE_MIN_SAMPLES) {
+      return null;
+    }
+    return Math.max(window.percentile(config.HEDGE_PERCENTILE), config.HEDGE_MIN_DELAY_MS);
+  }
+
+  function backoff(attemptIndex, throttled) {
+    const base = config.BACKOFF_BASE_MS * (throttled ? config.THROTTLE_BACKOFF_MULTIPLIER : 1);
+    return random() * Math.min(config.BACKOFF_CAP_MS * (throttled ? config.THROTTLE_BACKOFF_MULTIPLIER : 1), base * 2 ** attemptIndex);
+  }
+
+  async function send(command) {
+    const { name, table, operation } = describeCommand(command);
+    const labels = { operation, table };
+    const key = `${name}:${table}`;
+    const [attemptTimeoutMs, budgetMs] = config.TIMEOUTS_MS[name] || config.TIMEOUTS_MS.default;
+    const startedAt = Date.now();
+    const deadline = startedAt + budgetMs;
+
+    // 트랜잭션 재시도가 중복 적용되지 않도록 멱등성 토큰 고정 (10분간 유효)
+    if (name === "TransactWriteCommand" && command.input && !command.input.ClientRequestToken) {
+      command.input.ClientRequestToken = randomUUID();
+    }
+
+    budget = Math.min(budget + config.RETRY_BUDGET_RATIO, config.RETRY_BUDGET_MAX);
+
+    for (let attemptIndex = 0; ; attemptIndex++) {
+      const remaining = deadline - Date.now();
+      const timeoutMs = Math.max(Math.min(attemptTimeoutMs, remaining), 1);
+      // 재시도 때는 새 명령 객체 사용 (SDK 미들웨어가 명령 인스턴스에 누적되지 않도록)
+      const attemptCommand = attemptIndex === 0 ? command : new command.constructor(command.input);
+      const attemptStartedAt = Date.now();
+
+      try {
+        const delayMs = hedgeDelay(name, key);
+        const result = delayMs !== null && delayMs < timeoutMs
+          ? await hedged(attemptCommand, timeoutMs, delayMs, labels)
+          : await attempt(attemptCommand, timeoutMs, labels).promise;
+
+        latencyWindow(key).add(Date.now() - attemptStartedAt);
+        metrics.duration.observe((Date.now() - startedAt) / 1000, labels);
+        return result;
+      } catch (error) {
+        const code = errorCode(error);
+        const delay = backoff(attemptIndex, THROTTLING_ERRORS.has(code));
+        const canRetry = attemptIndex + 1 < config.MAX_ATTEMPTS &&
+          isRetryable(error, name, command.input || {}) &&
+          Date.now() + delay < deadline &&
+          withdraw(labels);
+
+        if (!canRetry) {
+          metrics.duration.observe((Date.now() - startedAt) / 1000, labels);
+          metrics.errors.inc(1, { ...labels, error: code });
+          throw error;
+        }
+
+        metrics.retries.inc(1, { ...labels, reason: code });
+        await new Promise((resolve) => setTimeout(resolve, delay));
+      }
+    }
+  }
+
+  logger.info(
+    `DynamoDB access layer enabled (max ${config.MAX_ATTEMPTS} attempts, hedged reads ${config.HEDGE_ENABLED ? "on" : "off"})`
+  );
+  return { send, raw: client };
+}
+
+module.exports = {
+  createDynamoAccess,
+  projection,
+  PROJECTIONS,
+};
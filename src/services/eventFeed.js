@@ -0,0 +1,256 @@
+const { PutCommand, QueryCommand } = require("@aws-sdk/lib-dynamodb");
+const { v4: uuidv4 } = require("uuid");
+const { TABLES, EVENT_FEED } = require("../config/constants");
+const { createCounter, createGauge } = require("../utils/metrics");
+
+// 로깅 설정
+const logger = {
+  info: (message) => console.log(`[EVENT_FEED] ${message}`),
+  error: (message) => console.error(`[EVENT_FEED] ${message}`),
+};
+
+const metrics = {
+  published: createCounter("authcore_event_feed_published_total", "Events published to the replicated feed"),
+  applied: createCounter("authcore_event_feed_applied_total", "Feed events applied on this replica"),
+  syncFailures: createCounter("authcore_event_feed_sync_failures_total", "Failed feed polls"),
+  lastSyncTimestamp: createGauge(
+    "authcore_event_feed_last_sync_timestamp_seconds",
+    "Unix time of the last successful feed poll"
+  ),
+};
+
+/**
+ * 이벤트가 속한 피드 파티션 키
+ * @param {number} publishedAtMs - 발행 시각 (ms)
+ * @returns {string}
+ */
+function bucketPartition(publishedAtMs) {
+  return `${EVENT_FEED.PARTITION}#${Math.floor(publishedAtMs / EVENT_FEED.BUCKET_MS)}`;
+}
+
+/**
+ * 레플리카 간 이벤트 피드 생성
+ *
+ * 별도 인프라(Streams 등) 없이 RefreshTokens 테이블에 이벤트를 쓰고, 각 레플리카가 user-id-index를
+ * 주기적으로 조회해 새 이벤트만 적용한다. user-id-index는 정렬 키가 없어 시간 조건을 키로 걸 수 없으므로
+ * 발행 시각의 구간(EVENT_FEED.BUCKET_MS)을 파티션 키에 넣는다. 폴링은 마지막 조회 이후의 구간만 읽으므로
+ * 읽기 비용은 최근 이벤트 수에 비례하고, 만료됐지만 TTL로 아직 지워지지 않은 이전 구간은 다시 읽지 않는다.
+ * 기동 시에는 EVENT_FEED.LOOKBACK_MS 동안의 구간을 한 번 읽는다.
+ *
+ * @param {Object} options - 옵션
+ * @param {Object} options.dynamoDBClient - DynamoDB 클라이언트
+ * @param {number} [options.pollIntervalMs] - 폴링 간격
+ * @returns {Object} 이벤트 피드
+ */
+function createEventFeed({ dynamoDBClient, pollIntervalMs = EVENT_FEED.POLL_INTERVAL_MS } = {}) {
+  if (!dynamoDBClient) {
+    throw new Error("dynamoDBClient is required for the event feed");
+  }
+
+  const handlers = new Map();
+  // 중복 적용 방지용 (이벤트 ID → 만료 시각). 만료된 항목은 동기화 때 정리
+  const seenEvents = new Map();
+  let lastPollStartedAt = 0;
+  let lastSuccessfulSyncAt = 0;
+  let timer = null;
+  let inflightSync = null;
+
+  /**
+   * 이벤트 종류별 핸들러 등록
+   * @param {string} kind - 이벤트 종류
+   * @param {Function} handler - (event) => void
+   */
+  function subscribe(kind, handler) {
+    if (!handlers.has(kind)) {
+      handlers.set(kind, []);
+    }
+    handlers.get(kind).push(handler);
+  }
+
+  function apply(event) {
+    if (seenEvents.has(event.token_id)) {
+      return;
+    }
+    seenEvents.set(event.token_id, event.expires_at);
+
+    for (const handler of handlers.get(event.kind) || []) {
+      try {
+        handler(event);
+      } catch (error) {
+        logger.error(`Handler for ${event.kind} failed: ${error.message}`);
+      }
+    }
+    metrics.applied.inc(1, { kind: event.kind });
+  }
+
+  /**
+   * 이벤트 발행 (로컬에는 즉시 적용, 다른 레플리카는 다음 폴링 때 적용)
+   * @param {string} kind - 이벤트 종류
+   * @param {string} subject - 대상 (토큰 ID, 사용자 ID 등)
+   * @param {number} expiresAt - 이벤트 만료 Unix timestamp (초)
+   * @param {Object} data - 추가 데이터
+   * @returns {Promise<Object>} 발행된 이벤트
+   */
+  async function publish(kind, subject, expiresAt, data = {}) {
+    const publishedAtMs = Date.now();
+    const event = {
+      token_id: `event#${uuidv4()}`,
+      user_id: bucketPartition(publishedAtMs),
+      item_type: EVENT_FEED.ITEM_TYPE,
+      kind,
+      subject,
+      data,
+      published_at_ms: publishedAtMs,
+      expires_at: expiresAt,
+      // revokeAllUserTokens 등 기존 토큰 조회 필터에 걸리지 않도록 함
+      is_revoked: true,
+    };
+
+    await dynamoDBClient.send(
+      new PutCommand({
+        TableName: TABLES.REFRESH_TOKENS,
+        Item: event,
+      })
+    );
+
+    metrics.published.inc(1, { kind });
+    apply(event);
+    return event;
+  }
+
+  function pruneSeenEvents(nowSeconds) {
+    for (const [eventId, expiresAt] of seenEvents) {
+      if (expiresAt <= nowSeconds) {
+        seenEvents.delete(eventId);
+      }
+    }
+  }
+
+  async function queryBucket(partition, since, nowSeconds) {
+    const events = [];
+    let exclusiveStartKey;
+    do {
+      const result = await dynamoDBClient.send(
+        new QueryCommand({
+          TableName: TABLES.REFRESH_TOKENS,
+          IndexName: "user-id-index",
+          KeyConditionExpression: "user_id = :bucket",
+          FilterExpression: "published_at_ms > :since AND expires_at > :now",
+          ExpressionAttributeValues: {
+            ":bucket": partition,
+            ":since": since,
+            ":now": nowSeconds,
+          },
+          ExclusiveStartKey: exclusiveStartKey,
+        })
+      );
+      events.push(...(result.Items || []));
+      exclusiveStartKey = result.LastEvaluatedKey;
+    } while (exclusiveStartKey);
+    return events;
+  }
+
+  async function runSync() {
+    const startedAt = Date.now();
+    const nowSeconds = Math.floor(startedAt / 1000);
+    const since = lastPollStartedAt === 0 ? startedAt - EVENT_FEED.LOOKBACK_MS : lastPollStartedAt - EVENT_FEED.OVERLAP_MS;
+
+    // since가 속한 구간부터 현재 구간까지 (평소에는 1~2개)
+    const partitions = [];
+    for (let bucketStart = since; bucketStart < startedAt; bucketStart += EVENT_FEED.BUCKET_MS) {
+      partitions.push(bucketPartition(bucketStart));
+    }
+    if (!partitions.includes(bucketPartition(startedAt))) {
+      partitions.push(bucketPartition(startedAt));
+    }
+    const results = await Promise.all(partitions.map((partition) => queryBucket(partition, since, nowSeconds)));
+
+    let applied = 0;
+    for (const event of results.flat()) {
+      if (!seenEvents.has(event.token_id)) {
+        apply(event);
+        applied += 1;
+      }
+    }
+
+    pruneSeenEvents(nowSeconds);
+    lastPollStartedAt = startedAt;
+    lastSuccessfulSyncAt = Date.now();
+    metrics.lastSyncTimestamp.set(Math.floor(lastSuccessfulSyncAt / 1000));
+    return applied;
+  }
+
+  /**
+   * 새 이벤트 조회 및 적용 (동시에 한 번만 실행)
+   * @returns {Promise<number>} 새로 적용한 이벤트 수
+   */
+  function sync() {
+    if (!inflightSync) {
+      inflightSync = runSync().finally(() => {
+        inflightSync = null;
+      });
+    }
+    return inflightSync;
+  }
+
+  function syncInBackground() {
+    sync().catch((error) => {
+      metrics.syncFailures.inc();
+      logger.error(`Feed sync failed: ${error.message}`);
+    });
+  }
+
+  /**
+   * 주기적 동기화 시작 (첫 동기화 완료를 기다림)
+   * @returns {Promise<void>}
+   */
+  async function start() {
+    if (timer) {
+      return;
+    }
+    timer = setInterval(syncInBackground, pollIntervalMs);
+    if (typeof timer.unref === "function") {
+      timer.unref();
+    }
+
+    try {
+      const applied = await sync();
+      logger.info(`Event feed started (${applied} active event(s) loaded)`);
+    } catch (error) {
+      metrics.syncFailures.inc();
+      logger.error(`Initial feed sync failed: ${error.message}`);
+    }
+  }
+
+  /**
+   * 주기적 동기화 중단
+   */
+  function stop() {
+    if (timer) {
+      clearInterval(timer);
+      timer = null;
+    }
+  }
+
+  /**
+   * 마지막 동기화 이후 경과 시간
+   * @returns {number} 밀리초 (한 번도 성공하지 않았으면 Infinity)
+   */
+  function getSyncAgeMs() {
+    return lastSuccessfulSyncAt === 0 ? Infinity : Date.now() - lastSuccessfulSyncAt;
+  }
+
+  return {
+    subscribe,
+    publish,
+    sync,
+    start,
+    stop,
+    getSyncAgeMs,
+  };
+}
+
+module.exports = {
+  bucketPartition,
+  createEventFeed,
+};
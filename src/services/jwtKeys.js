@@ -0,0 +1,74 @@
+const jwt = require("jsonwebtoken");
+const { runtimeConfig } = require("../config/runtimeConfig");
+const { createCounter } = require("../utils/metrics");
+const { withSpan } = require("../utils/tracing");
+
+// 로컬/테스트 기본 서명 키 (production은 JWT_SECRET이 없으면 기동·재로딩 모두 거부)
+const DEFAULT_JWT_SECRET = "your-super-secret-jwt-key-change-this-in-production";
+
+const previousKeyVerifications = createCounter(
+  "authcore_jwt_previous_key_verifications_total",
+  "Tokens that verified only against JWT_SECRET_PREVIOUS (drops to zero once rotation is complete)"
+);
+
+/**
+ * 현재 서명 키와 검증 전용 이전 키 (런타임 설정 스냅샷에서 한 번에 읽음)
+ * @param {Object} [config] - 런타임 설정 (테스트용)
+ * @returns {{current: string, previous: string}}
+ */
+function getJwtKeys(config = runtimeConfig) {
+  const { secrets } = config.get();
+  return {
+    current: secrets.JWT_SECRET || DEFAULT_JWT_SECRET,
+    previous: secrets.JWT_SECRET_PREVIOUS,
+  };
+}
+
+/**
+ * 현재 키로 JWT 서명
+ * @param {Object} payload - 페이로드
+ * @param {Object} options - jsonwebtoken sign 옵션
+ * @param {Object} [config] - 런타임 설정 (테스트용)
+ * @returns {string} JWT
+ */
+function signToken(payload, options, config = runtimeConfig) {
+  return withSpan("jwt.sign", null, () => jwt.sign(payload, getJwtKeys(config).current, options));
+}
+
+/**
+ * JWT 검증 (키 교체 중에는 현재 키 → 이전 키 순서로 확인)
+ *
+ * 서명이 맞지 않을 때만 이전 키로 다시 확인한다. 만료 등 다른 오류는 키와 무관하므로 그대로 던진다.
+ *
+ * @param {string} token - JWT
+ * @param {Object} [config] - 런타임 설정 (테스트용)
+ * @returns {Object} 디코딩된 페이로드
+ */
+function verifyToken(token, config = runtimeConfig) {
+  return withSpan("jwt.verify", null, () => verifyWithKeys(token, getJwtKeys(config)));
+}
+
+/**
+ * 현재 키, 이전 키 순서로 JWT 검증
+ * @param {string} token - JWT
+ * @param {{current: string, previous: string}} keys - 키
+ * @returns {Object} 디코딩된 페이로드
+ */
+function verifyWithKeys(token, { current, previous }) {
+  try {
+    return jwt.verify(token, current);
+  } catch (error) {
+    if (!previous || previous === current || error.message !== "invalid signature") {
+      throw error;
+    }
+    const decoded = jwt.verify(token, previous);
+    previousKeyVerifications.inc();
+    return decoded;
+  }
+}
+
+module.exports = {
+  getJwtKeys,
+  signToken,
+  verifyToken,
+};
@@ -0,0 +1,197 @@
+const { LOGIN_THROTTLE } = require("../config/constants");
+const { createCounter, createGauge } = require("../utils/metrics");
+const { getVerifyDurationMs } = require("./passwordHasher");
+
+// 로깅 설정
+const logger = {
+  info: (message) => console.log(`[LOGIN_THROTTLE] ${message}`),
+  error: (message) => console.error(`[LOGIN_THROTTLE] ${message}`),
+};
+
+// 피드 이벤트 종류
+const LOGIN_LOCKOUT_EVENT = "login_lockout";
+
+const metrics = {
+  blocked: createCounter(
+    "authcore_login_throttle_blocked_total",
+    "Login attempts rejected inside a lockout window before any DynamoDB or bcrypt work, by scope"
+  ),
+  cpuSaved: createCounter(
+    "authcore_login_throttle_cpu_saved_seconds_total",
+    "Estimated bcrypt CPU time not spent on rejected login attempts"
+  ),
+  lockouts: createCounter(
+    "authcore_login_throttle_lockouts_total",
+    "Lockout windows started, by scope and source (local failure or peer replica)"
+  ),
+  trackedKeys: createGauge("authcore_login_throttle_tracked_keys", "Usernames and client IPs with recent login failures"),
+};
+
+/**
+ * 로그인 실패 제한기 생성
+ *
+ * 닉네임과 클라이언트 IP마다 연속 실패 횟수를 세고, 허용 횟수를 넘으면 실패할 때마다 두 배로 늘어나는
+ * 잠금 구간을 둔다. 잠금 중인 시도는 check에서 바로 거부되므로 사용자 조회와 bcrypt 비교를 하지 않는다.
+ * 항목은 Map 삽입 순서를 LRU로 사용해 maxKeys개까지만 보관한다.
+ * feed가 있으면 shareMinLockoutMs 이상인 잠금을 이벤트로 발행하고, 다른 레플리카의 잠금을 받아 합친다.
+ *
+ * @param {Object} options - 옵션
+ * @param {Object} [options.feed] - 이벤트 피드 (createEventFeed, 없으면 레플리카 로컬)
+ * @param {number} [options.maxKeys] - 추적 항목 상한
+ * @param {Object} [options.freeFailures] - 범위별 잠금 없이 허용하는 실패 횟수 ({username, ip})
+ * @param {boolean} [options.ipScope] - IP별 제한 사용 여부 (false면 닉네임만 추적)
+ * @param {number} [options.baseLockoutMs] - 첫 잠금 시간
+ * @param {number} [options.maxLockoutMs] - 잠금 시간 상한
+ * @param {number} [options.failureWindowMs] - 마지막 실패 후 실패 횟수를 잊는 시간
+ * @param {number} [options.shareMinLockoutMs] - 피드로 공유할 최소 잠금 시간
+ * @param {Function} [options.estimateSavedMs] - 거부한 시도 하나가 아낀 CPU 시간 (ms)
+ * @param {Function} [options.now] - 시계 함수 (테스트용)
+ * @returns {Object} 로그인 실패 제한기
+ */
+function createLoginThrottle({
+  feed = null,
+  maxKeys = LOGIN_THROTTLE.MAX_TRACKED_KEYS,
+  freeFailures = {
+    username: LOGIN_THROTTLE.FREE_FAILURES_PER_USERNAME,
+    ip: LOGIN_THROTTLE.FREE_FAILURES_PER_IP,
+  },
+  ipScope = LOGIN_THROTTLE.IP_SCOPE,
+  baseLockoutMs = LOGIN_THROTTLE.BASE_LOCKOUT_MS,
+  maxLockoutMs = LOGIN_THROTTLE.MAX_LOCKOUT_MS,
+  failureWindowMs = LOGIN_THROTTLE.FAILURE_WINDOW_MS,
+  shareMinLockoutMs = LOGIN_THROTTLE.SHARE_MIN_LOCKOUT_MS,
+  estimateSavedMs = getVerifyDurationMs,
+  now = Date.now,
+} = {}) {
+  // "<범위>:<값>" → { failures, lastFailureAt, lockedUntil } (ms)
+  const entries = new Map();
+
+  function keysFor(username, ip) {
+    const keys = [];
+    if (username) {
+      keys.push(["username", `username:${username}`]);
+    }
+    if (ip && ipScope) {
+      keys.push(["ip", `ip:${ip}`]);
+    }
+    return keys;
+  }
+
+  // 최근 사용 항목을 Map 끝으로 옮기고, 상한을 넘으면 가장 앞(가장 오래 사용하지 않은) 항목 제거
+  function touch(key, entry) {
+    entries.delete(key);
+    entries.set(key, entry);
+    while (entries.size > maxKeys) {
+      entries.delete(entries.keys().next().value);
+    }
+    metrics.trackedKeys.set(entries.size);
+  }
+
+  function share(key, entry, lockoutMs) {
+    if (!feed || lockoutMs < shareMinLockoutMs) {
+      return;
+    }
+    // 응답을 기다리게 하지 않음 (발행 실패 시 이 레플리카에서만 잠금)
+    feed
+      .publish(LOGIN_LOCKOUT_EVENT, key, Math.ceil(entry.lockedUntil / 1000), {
+        failures: entry.failures,
+        locked_until_ms: entry.lockedUntil,
+      })
+      .catch((error) => {
+        logger.error(`Failed to share lockout for ${key}: ${error.message}`);
+      });
+  }
+
+  if (feed) {
+    feed.subscribe(LOGIN_LOCKOUT_EVENT, (event) => {
+      const existing = entries.get(event.subject);
+      // 자신이 발행한 이벤트도 로컬에 다시 적용되므로 큰 값만 취함
+      if (existing && existing.lockedUntil >= event.data.locked_until_ms) {
+        return;
+      }
+      touch(event.subject, {
+        failures: Math.max(event.data.failures, existing ? existing.failures : 0),
+        lastFailureAt: Math.max(event.published_at_ms, existing ? existing.lastFailureAt : 0),
+        lockedUntil: event.data.locked_until_ms,
+      });
+      metrics.lockouts.inc(1, { scope: event.subject.split(":")[0], source: "peer" });
+    });
+  }
+
+  /**
+   * 로그인 시도 허용 여부 확인 (DynamoDB 조회·비밀번호 검증 전에 호출)
+   * @param {string} username - 닉네임
+   * @param {string} ip - 클라이언트 IP
+   * @returns {{scope: string, retryAfterMs: number}|null} 잠금 중이면 가장 늦게 풀리는 잠금, 아니면 null
+   */
+  function check(username, ip) {
+    const currentTime = now();
+    let blocked = null;
+    for (const [scope, key] of keysFor(username, ip)) {
+      const entry = entries.get(key);
+      if (entry && entry.lockedUntil > currentTime) {
+        const retryAfterMs = entry.lockedUntil - currentTime;
+        if (!blocked || retryAfterMs > blocked.retryAfterMs) {
+          blocked = { scope, retryAfterMs };
+        }
+      }
+    }
+
+    if (blocked) {
+      metrics.blocked.inc(1, { scope: blocked.scope });
+      metrics.cpuSaved.inc(estimateSavedMs() / 1000);
+    }
+    return blocked;
+  }
+
+  /**
+   * 인증 실패 기록 (허용 횟수를 넘으면 잠금 시작)
+   * @param {string} username - 닉네임
+   * @param {string} ip - 클라이언트 IP
+   */
+  function recordFailure(username, ip) {
+    const currentTime = now();
+    for (const [scope, key] of keysFor(username, ip)) {
+      let entry = entries.get(key);
+      if (!entry || currentTime - entry.lastFailureAt > failureWindowMs) {
+        entry = { failures: 0, lastFailureAt: 0, lockedUntil: 0 };
+      }
+      entry.failures += 1;
+      entry.lastFailureAt = currentTime;
+
+      const excess = entry.failures - freeFailures[scope];
+      if (excess > 0) {
+        const lockoutMs = Math.min(baseLockoutMs * 2 ** (excess - 1), maxLockoutMs);
+        entry.lockedUntil = currentTime + lockoutMs;
+        metrics.lockouts.inc(1, { scope, source: "local" });
+        share(key, entry, lockoutMs);
+      }
+      touch(key, entry);
+    }
+  }
+
+  /**
+   * 로그인 성공 기록 (닉네임의 실패 횟수 초기화)
+   *
+   * IP의 실패 횟수는 유지한다. 공격자가 자기 계정으로 로그인해 IP 제한을 풀지 못하도록 하기 위함이다.
+   *
+   * @param {string} username - 닉네임
+   */
+  function recordSuccess(username) {
+    if (entries.delete(`username:${username}`)) {
+      metrics.trackedKeys.set(entries.size);
+    }
+  }
+
+  return {
+    check,
+    recordFailure,
+    recordSuccess,
+    size: () => entries.size,
+  };
+}
+
+module.exports = {
+  LOGIN_LOCKOUT_EVENT,
+  createLoginThrottle,
+};
@@ -0,0 +1,222 @@
+const { UpdateCommand } = require("@aws-sdk/lib-dynamodb");
+const { TABLES, LOGIN_WRITE_BEHIND } = require("../config/constants");
+const { createCounter, createGauge } = require("../utils/metrics");
+
+// 로깅 설정
+const logger = {
+  info: (message) => console.log(`[LOGIN_WRITE_BEHIND] ${message}`),
+  error: (message) => console.error(`[LOGIN_WRITE_BEHIND] ${message}`),
+};
+
+const metrics = {
+  buffered: createCounter(
+    "authcore_login_write_behind_buffered_total",
+    "Login timestamps accepted into the write-behind buffer"
+  ),
+  coalesced: createCounter(
+    "authcore_login_write_behind_coalesced_total",
+    "Login timestamps merged into an already pending update for the same user"
+  ),
+  flushed: createCounter(
+    "authcore_login_write_behind_flushed_total",
+    "last_login_at updates written to DynamoDB"
+  ),
+  dropped: createCounter(
+    "authcore_login_write_behind_dropped_total",
+    "Login timestamps dropped because the buffer was full or the write failed"
+  ),
+  pending: createGauge(
+    "authcore_login_write_behind_pending",
+    "Users with a pending last_login_at update"
+  ),
+};
+
+/**
+ * 조건부 업데이트 실패 여부 (다른 레플리카가 더 최신 값을 이미 기록한 경우)
+ * @param {Error} error - DynamoDB 에러
+ * @returns {boolean}
+ */
+function isConditionalCheckFailure(error) {
+  return error && error.name === "ConditionalCheckFailedException";
+}
+
+/**
+ * last_login_at write-behind 버퍼 생성
+ *
+ * 로그인마다 UpdateCommand를 기다리는 대신 메모리에 기록해두고 주기적으로 일괄 반영한다.
+ * 같은 사용자의 반복 로그인은 가장 최근 시각 하나로 합쳐지고, 버퍼가 가득 차면 새 사용자는
+ * 버려진다 (last_login_at은 정보성 필드라 유실보다 메모리 상한이 우선).
+ *
+ * @param {Object} options - 옵션
+ * @param {Object} options.dynamoDBClient - DynamoDB 클라이언트
+ * @param {number} [options.flushIntervalMs] - 주기적 flush 간격
+ * @param {number} [options.maxPending] - 버퍼에 보관할 최대 사용자 수
+ * @param {number} [options.flushConcurrency] - flush 시 동시 UpdateCommand 수
+ * @returns {Object} write-behind 버퍼
+ */
+function createLoginWriteBehind({
+  dynamoDBClient,
+  flushIntervalMs = LOGIN_WRITE_BEHIND.FLUSH_INTERVAL_MS,
+  maxPending = LOGIN_WRITE_BEHIND.MAX_PENDING,
+  flushConcurrency = LOGIN_WRITE_BEHIND.FLUSH_CONCURRENCY,
+} = {}) {
+  if (!dynamoDBClient) {
+    throw new Error("dynamoDBClient is required for login write-behind");
+  }
+
+  let pending = new Map();
+  let timer = null;
+  let inflightFlush = null;
+
+  /**
+   * 로그인 시각 기록
+   * @param {string} userId - 사용자 ID
+   * @param {string} loginAt - ISO 8601 로그인 시각
+   * @returns {boolean} 버퍼에 반영되었는지 여부
+   */
+  function record(userId, loginAt) {
+    const current = pending.get(userId);
+    if (current !== undefined) {
+      if (loginAt > current) {
+        pending.set(userId, loginAt);
+      }
+      metrics.coalesced.inc();
+      return true;
+    }
+
+    if (pending.size >= maxPending) {
+      metrics.dropped.inc();
+      flushInBackground();
+      return false;
+    }
+
+    pending.set(userId, loginAt);
+    metrics.buffered.inc();
+    metrics.pending.set(pending.size);
+
+    if (pending.size >= maxPending) {
+      flushInBackground();
+    }
+    return true;
+  }
+
+  /**
+   * 사용자 한 명의 last_login_at 업데이트
+   * 더 최신 값이 이미 기록되어 있거나 사용자가 삭제된 경우는 조건식으로 건너뛴다.
+   */
+  async function writeOne(userId, loginAt) {
+    try {
+      await dynamoDBClient.send(
+        new UpdateCommand({
+          TableName: TABLES.USERS,
+          Key: { user_id: userId },
+          UpdateExpression: "SET last_login_at = :login_time",
+          ConditionExpression:
+            "attribute_exists(user_id) AND (attribute_not_exists(last_login_at) OR last_login_at < :login_time)",
+          ExpressionAttributeValues: {
+            ":login_time": loginAt,
+          },
+        })
+      );
+      metrics.flushed.inc();
+    } catch (error) {
+      if (isConditionalCheckFailure(error)) {
+        return;
+      }
+      metrics.dropped.inc();
+      logger.error(`Failed to flush last_login_at for user ${userId}: ${error.message}`);
+    }
+  }
+
+  async function runFlush() {
+    if (pending.size === 0) {
+      return 0;
+    }
+
+    // 버퍼를 통째로 교체하여 flush 도중 들어온 로그인은 다음 배치로 넘긴다
+    const batch = Array.from(pending.entries());
+    pending = new Map();
+    metrics.pending.set(0);
+
+    for (let i = 0; i < batch.length; i += flushConcurrency) {
+      const chunk = batch.slice(i, i + flushConcurrency);
+      await Promise.all(chunk.map(([userId, loginAt]) => writeOne(userId, loginAt)));
+    }
+
+    return batch.length;
+  }
+
+  /**
+   * 대기 중인 업데이트를 DynamoDB에 반영
+   * 이미 flush가 진행 중이면 그 flush가 끝난 뒤 한 번 더 실행한다.
+   * @returns {Promise<number>} 반영을 시도한 사용자 수
+   */
+  function flush() {
+    const run = (inflightFlush || Promise.resolve()).then(runFlush);
+    const settled = run
+      .catch(() => {})
+      .then(() => {
+        if (inflightFlush === settled) {
+          inflightFlush = null;
+        }
+      });
+    inflightFlush = settled;
+    return run;
+  }
+
+  function flushInBackground() {
+    flush().catch((error) => logger.error(`Background flush failed: ${error.message}`));
+  }
+
+  /**
+   * 주기적 flush 시작
+   */
+  function start() {
+    if (timer) {
+      return;
+    }
+    timer = setInterval(flushInBackground, flushIntervalMs);
+    // 타이머 때문에 프로세스 종료가 지연되지 않도록 함
+    if (typeof timer.unref === "function") {
+      timer.unref();
+    }
+  }
+
+  /**
+   * 주기적 flush 중단 후 남은 업데이트 반영 (종료 시 호출)
+   * @returns {Promise<number>} 마지막으로 반영을 시도한 사용자 수
+   */
+  async function stop() {
+    if (timer) {
+      clearInterval(timer);
+      timer = null;
+    }
+    return flush();
+  }
+
+  /**
+   * 현재 상태 조회
+   * @returns {Object} 대기 중인 사용자 수 및 누적 카운터
+   */
+  function getStats() {
+    return {
+      pending: pending.size,
+      buffered: metrics.buffered.get(),
+      coalesced: metrics.coalesced.get(),
+      flushed: metrics.flushed.get(),
+      dropped: metrics.dropped.get(),
+    };
+  }
+
+  return {
+    record,
+    flush,
+    start,
+    stop,
+    getStats,
+  };
+}
+
+module.exports = {
+  createLoginWriteBehind,
+};
@@ -0,0 +1,243 @@
+const { performance } = require("perf_hooks");
+const bcrypt = require("bcryptjs");
+const { PASSWORD_HASH } = require("../config/constants");
+const { createCounter, createGauge } = require("../utils/metrics");
+const { withSpan } = require("../utils/tracing");
+
+// 로깅 설정
+const logger = {
+  info: (message) => console.log(`[PASSWORD_HASHER] ${message}`),
+  error: (message) => console.error(`[PASSWORD_HASHER] ${message}`),
+};
+
+const metrics = {
+  cost: createGauge("authcore_password_hash_cost", "bcrypt cost used for new password hashes"),
+  durationMs: createGauge(
+    "authcore_password_hash_duration_ms",
+    "Measured wall time of one hash at the current cost on this pod"
+  ),
+  targetMs: createGauge("authcore_password_hash_target_ms", "Calibration target for one hash"),
+  hashesPerSecond: createGauge(
+    "authcore_password_hash_max_per_second",
+    "Upper bound of hashes (logins) per second one replica can sustain at the current cost"
+  ),
+  rehashes: createCounter(
+    "authcore_password_rehash_total",
+    "Stored hashes transparently re-hashed to the current cost after login, by previous cost"
+  ),
+};
+
+// bcrypt 해시 문자열: $2a$10$<salt+hash>
+const BCRYPT_COST_PATTERN = /^\$2[abxy]?\$(\d{2})\$/;
+
+let currentCost = clampCost(PASSWORD_HASH.DEFAULT_COST);
+// 기동 시 기본값/보정값. 런타임 설정 override가 해제되면 이 값으로 돌아감
+let baselineCost = currentCost;
+let overrideCost = null;
+// 비밀번호 검증(bcrypt.compare) 한 번의 최근 평균 시간 (ms). 로그인 제한이 아낀 CPU 추정에 사용
+let verifyDurationMs = null;
+let calibratedHashMs = 0;
+metrics.cost.set(currentCost);
+metrics.targetMs.set(PASSWORD_HASH.TARGET_MS);
+
+/**
+ * 보안 하한/상한 내로 cost 제한
+ * @param {number} cost - bcrypt cost
+ * @returns {number}
+ */
+function clampCost(cost) {
+  return Math.min(PASSWORD_HASH.MAX_COST, Math.max(PASSWORD_HASH.MIN_COST, Math.round(cost)));
+}
+
+/**
+ * 현재 해시 cost 조회
+ * @returns {number}
+ */
+function getHashCost() {
+  return currentCost;
+}
+
+/**
+ * 해시 cost 설정 (보안 범위로 제한됨)
+ * @param {number} cost - bcrypt cost
+ * @returns {number} 실제 적용된 cost
+ */
+function setHashCost(cost) {
+  currentCost = clampCost(cost);
+  metrics.cost.set(currentCost);
+  return currentCost;
+}
+
+/**
+ * 런타임 설정(PASSWORD_HASH_COST)으로 cost 고정 또는 해제
+ * @param {number|null} cost - 고정할 cost (null이면 기동 시 기본값/보정값으로 복귀)
+ * @returns {number} 실제 적용된 cost
+ */
+function setHashCostOverride(cost) {
+  overrideCost = cost === null || cost === undefined ? null : clampCost(cost);
+  return setHashCost(overrideCost !== null ? overrideCost : baselineCost);
+}
+
+/**
+ * 저장된 해시에 기록된 cost 추출
+ * @param {string} hash - bcrypt 해시
+ * @returns {number|null} cost (형식이 다르면 null)
+ */
+function parseHashCost(hash) {
+  const match = BCRYPT_COST_PATTERN.exec(hash || "");
+  return match ? Number(match[1]) : null;
+}
+
+/**
+ * 저장된 해시가 현재 cost보다 낮은지 확인 (로그인 성공 후 재해시 대상)
+ *
+ * 높은 cost의 해시는 낮추지 않는다. 레플리카마다 cost가 잠시 다를 때(설정 반영 중 등)
+ * 로그인할 때마다 해시가 오가며 bcrypt와 DynamoDB 쓰기를 한 번씩 더 하지 않기 위함이다.
+ *
+ * @param {string} hash - bcrypt 해시
+ * @returns {boolean}
+ */
+function needsRehash(hash) {
+  const cost = parseHashCost(hash);
+  return cost !== null && cost < currentCost;
+}
+
+/**
+ * 현재 cost로 비밀번호 해싱
+ * @param {string} password - 평문 비밀번호
+ * @returns {Promise<string>} bcrypt 해시
+ */
+async function hashPassword(password) {
+  return withSpan("bcrypt.hash", { cost: currentCost }, () => bcrypt.hash(password, currentCost));
+}
+
+/**
+ * 저장된 해시와 비밀번호 비교 (소요 시간을 지수 이동 평균으로 기록)
+ * @param {string} password - 평문 비밀번호
+ * @param {string} hash - 저장된 bcrypt 해시
+ * @returns {Promise<boolean>} 일치 여부
+ */
+async function verifyPassword(password, hash) {
+  const startedAt = performance.now();
+  try {
+    return await withSpan("bcrypt.compare", { cost: parseHashCost(hash) }, () => bcrypt.compare(password, hash));
+  } finally {
+    const elapsedMs = performance.now() - startedAt;
+    verifyDurationMs = verifyDurationMs === null ? elapsedMs : verifyDurationMs * 0.9 + elapsedMs * 0.1;
+  }
+}
+
+/**
+ * 비밀번호 검증 한 번의 예상 시간
+ * @returns {number} 밀리초 (아직 검증한 적이 없으면 보정 때 측정한 해시 시간, 그것도 없으면 0)
+ */
+function getVerifyDurationMs() {
+  return verifyDurationMs !== null ? verifyDurationMs : calibratedHashMs;
+}
+
+/**
+ * 재해시 기록 (기존 cost별)
+ * @param {string} previousHash - 기존 해시
+ */
+function recordRehash(previousHash) {
+  metrics.rehashes.inc(1, { from_cost: String(parseHashCost(previousHash)) });
+}
+
+/**
+ * 해시 한 번의 소요 시간 측정 (여러 번 측정해 최솟값 사용 → 스케줄링 잡음 제거)
+ */
+async function measureHashMs(cost, samples, hashFn, now) {
+  let best = Infinity;
+  for (let i = 0; i < samples; i++) {
+    const startedAt = now();
+    await hashFn("calibration-password", cost);
+    best = Math.min(best, now() - startedAt);
+  }
+  return best;
+}
+
+/**
+ * 실행 중인 하드웨어(Pod CPU 제한 포함)에서 해시 시간을 측정해 목표 시간에 맞는 cost 선택
+ *
+ * 최소 cost에서 한 번 측정한 뒤 cost가 1 오를 때마다 시간이 2배가 된다는 성질로 후보를 고르고,
+ * 고른 cost에서 다시 측정해 확인한다. 목표를 크게 넘으면 한 단계 낮춘다.
+ *
+ * @param {Object} options - 옵션
+ * @param {number} [options.targetMs] - 해시 1회 목표 시간
+ * @param {number} [options.samples] - cost별 측정 횟수
+ * @param {boolean} [options.apply] - 결과를 현재 cost로 적용할지 여부
+ * @param {Function} [options.hashFn] - 해시 함수 (테스트용)
+ * @param {Function} [options.now] - 시계 함수 (테스트용)
+ * @returns {Promise<Object>} 보정 결과
+ */
+async function calibrateHashCost({
+  targetMs = PASSWORD_HASH.TARGET_MS,
+  samples = 3,
+  apply = true,
+  hashFn = bcrypt.hash,
+  now = () => performance.now(),
+} = {}) {
+  const baseCost = PASSWORD_HASH.MIN_COST;
+  const baseMs = await measureHashMs(baseCost, samples, hashFn, now);
+
+  let cost = baseCost;
+  while (cost < PASSWORD_HASH.MAX_COST && baseMs * 2 ** (cost + 1 - baseCost) <= targetMs) {
+    cost += 1;
+  }
+
+  let measuredMs = cost === baseCost ? baseMs : await measureHashMs(cost, 1, hashFn, now);
+  if (measuredMs > targetMs * 1.5 && cost > baseCost) {
+    cost -= 1;
+    measuredMs = await measureHashMs(cost, 1, hashFn, now);
+  }
+
+  const result = {
+    cost,
+    measuredMs: Math.round(measuredMs * 10) / 10,
+    targetMs,
+    baseCost,
+    baseMs: Math.round(baseMs * 10) / 10,
+    maxHashesPerSecond: Math.round((1000 / measuredMs) * 10) / 10,
+  };
+
+  metrics.targetMs.set(targetMs);
+  metrics.durationMs.set(result.measuredMs);
+  calibratedHashMs = result.measuredMs;
+  metrics.hashesPerSecond.set(result.maxHashesPerSecond);
+  if (apply) {
+    baselineCost = clampCost(cost);
+    // 런타임 설정으로 고정된 cost가 있으면 그대로 유지
+    setHashCost(overrideCost !== null ? overrideCost : baselineCost);
+  }
+
+  logger.info(
+    `Calibrated bcrypt cost ${cost} (${result.measuredMs}ms per hash, target ${targetMs}ms, ` +
+    `~${result.maxHashesPerSecond} hashes/s per replica)`
+  );
+  return result;
+}
+
+module.exports = {
+  getHashCost,
+  setHashCost,
+  setHashCostOverride,
+  parseHashCost,
+  needsRehash,
+  hashPassword,
+  verifyPassword,
+  getVerifyDurationMs,
+  recordRehash,
+  calibrateHashCost,
+};
+
+if (require.main === module) {
+  // CLI: node src/services/passwordHasher.js → 현재 머신 기준 보정 결과를 JSON으로 출력
+  calibrateHashCost({ apply: false })
+    .then((result) => {
+      console.log(JSON.stringify(result, null, 2));
+    })
+    .catch((error) => {
+      logger.error(`Calibration failed: ${error.message}`);
+      process.exit(1);
+    });
+}
@@ -0,0 +1,191 @@
+const fs = require("fs");
+const os = require("os");
+const path = require("path");
+const v8 = require("v8");
+const inspector = require("inspector");
+const { PROFILING } = require("../config/constants");
+const { createCounter } = require("../utils/metrics");
+
+// 로깅 설정
+const logger = {
+  info: (message) => console.log(`[PROFILER] ${message}`),
+  error: (message) => console.error(`[PROFILER] ${message}`),
+};
+
+const metrics = {
+  captures: createCounter("authcore_profile_captures_total", "On-demand CPU profiles and heap snapshots taken"),
+};
+
+// 동시에 하나의 캡처만 허용 (CPU 프로파일 중 힙 스냅샷이 겹치면 측정이 왜곡되고 메모리가 급증)
+let activeCapture = null;
+
+/**
+ * 캡처 진행 중 여부
+ * @returns {string|null} 진행 중인 캡처 종류
+ */
+function getActiveCapture() {
+  return activeCapture;
+}
+
+/**
+ * 캡처 슬롯 점유 (이미 진행 중이면 code=CAPTURE_IN_PROGRESS 에러)
+ * @param {string} kind - "cpu" | "heap"
+ */
+function acquire(kind) {
+  if (activeCapture) {
+    const error = new Error(`${activeCapture} capture already in progress`);
+    error.code = "CAPTURE_IN_PROGRESS";
+    throw error;
+  }
+  activeCapture = kind;
+}
+
+// cgroup v2 / v1 메모리 한도 파일 (컨테이너 밖에서는 없음)
+const CGROUP_MEMORY_LIMIT_FILES = [
+  "/sys/fs/cgroup/memory.max",
+  "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+];
+
+/**
+ * 컨테이너 메모리 한도 (cgroup, 한도가 없으면 노드 전체 메모리)
+ * @returns {number} bytes
+ */
+function getMemoryLimit() {
+  for (const file of CGROUP_MEMORY_LIMIT_FILES) {
+    let value;
+    try {
+      value = fs.readFileSync(file, "utf8").trim();
+    } catch {
+      continue;
+    }
+    const limit = Number(value);
+    // v2는 "max", v1은 무제한일 때 페이지 정렬된 매우 큰 값
+    if (Number.isFinite(limit) && limit > 0 && limit < os.totalmem()) {
+      return limit;
+    }
+  }
+  return os.totalmem();
+}
+
+/**
+ * 힙 스냅샷을 기록할 메모리 여유가 있는지 확인
+ *
+ * 스냅샷 기록에는 사용 중인 힙의 약 2배가 추가로 필요하다. 한도에 가까운 Pod에서 기록하면
+ * OOMKilled로 재시작되므로, 현재 RSS + 힙 × HEAP_SNAPSHOT_MEMORY_FACTOR가 한도를 넘으면 기록하지 않는다.
+ * @param {Object} [options]
+ * @param {number} [options.limit] - 메모리 한도 (bytes, 기본: cgroup 한도)
+ * @param {Object} [options.usage] - process.memoryUsage() 결과
+ * @returns {{ok: boolean, rss: number, heapUsed: number, required: number, limit: number}}
+ */
+function checkHeapSnapshotHeadroom({ limit = getMemoryLimit(), usage = process.memoryUsage() } = {}) {
+  const required = usage.rss + usage.heapUsed * PROFILING.HEAP_SNAPSHOT_MEMORY_FACTOR;
+  return { ok: required <= limit, rss: usage.rss, heapUsed: usage.heapUsed, required, limit };
+}
+
+/**
+ * inspector 세션 메서드 호출
+ * @param {inspector.Session} session
+ * @param {string} method
+ * @param {Object} [params]
+ * @returns {Promise<Object>}
+ */
+function post(session, method, params = {}) {
+  return new Promise((resolve, reject) => {
+    session.post(method, params, (error, result) => (error ? reject(error) : resolve(result)));
+  });
+}
+
+/**
+ * 요청한 측정 시간을 허용 범위로 제한
+ * @param {number|string} [seconds]
+ * @returns {number}
+ */
+function clampSeconds(seconds) {
+  const value = Number(seconds) || PROFILING.DEFAULT_CPU_SECONDS;
+  return Math.min(Math.max(value, 1), PROFILING.MAX_CPU_SECONDS);
+}
+
+/**
+ * 지정한 시간 동안 CPU 프로파일 수집 (.cpuprofile 형식, Chrome DevTools/speedscope에서 열림)
+ *
+ * inspector 세션은 캡처하는 동안에만 연결하므로 평소에는 오버헤드가 없다.
+ * @param {Object} [options]
+ * @param {number} [options.seconds] - 측정 시간 (1 ~ PROFILING.MAX_CPU_SECONDS)
+ * @param {number} [options.samplingIntervalUs] - 샘플링 간격 (µs)
+ * @returns {Promise<Object>} V8 CPU profile
+ */
+async function captureCpuProfile({ seconds, samplingIntervalUs = PROFILING.SAMPLING_INTERVAL_US } = {}) {
+  acquire("cpu");
+  const durationMs = clampSeconds(seconds) * 1000;
+  const session = new inspector.Session();
+
+  try {
+    session.connect();
+    await post(session, "Profiler.enable");
+    await post(session, "Profiler.setSamplingInterval", { interval: samplingIntervalUs });
+    await post(session, "Profiler.start");
+    logger.info(`CPU profile started (${durationMs / 1000}s)`);
+
+    await new Promise((resolve) => setTimeout(resolve, durationMs));
+
+    const { profile } = await post(session, "Profiler.stop");
+    await post(session, "Profiler.disable");
+    metrics.captures.inc(1, { kind: "cpu" });
+    logger.info(`CPU profile captured (${profile.samples.length} samples)`);
+    return profile;
+  } finally {
+    session.disconnect();
+    activeCapture = null;
+  }
+}
+
+/**
+ * 힙 스냅샷을 임시 파일로 기록 (.heapsnapshot)
+ *
+ * 스냅샷을 JS 힙에 모으지 않고 파일로 바로 쓰지만, 기록 중 V8이 힙의 약 2배를 추가로 사용하므로
+ * 메모리 여유가 부족하면 기록하지 않고 code=INSUFFICIENT_MEMORY 에러를 던진다 (checkHeapSnapshotHeadroom).
+ * 기록하는 동안 이벤트 루프가 멈춘다 (힙 크기에 비례, 수백 ms ~ 수 초).
+ * @param {Object} [options]
+ * @param {string} [options.directory] - 기록할 디렉터리
+ * @param {number} [options.memoryLimit] - 메모리 한도 (bytes, 기본: cgroup 한도)
+ * @returns {Promise<string>} 스냅샷 파일 경로 (호출부가 전송 후 삭제)
+ */
+async function captureHeapSnapshot({ directory = os.tmpdir(), memoryLimit } = {}) {
+  acquire("heap");
+  const headroom = checkHeapSnapshotHeadroom(memoryLimit ? { limit: memoryLimit } : {});
+  if (!headroom.ok) {
+    activeCapture = null;
+    const mb = (bytes) => Math.round(bytes / 1024 / 1024);
+    logger.error(
+      `Heap snapshot refused: needs ~${mb(headroom.required)}MB ` +
+      `(rss ${mb(headroom.rss)}MB + heap ${mb(headroom.heapUsed)}MB x ${PROFILING.HEAP_SNAPSHOT_MEMORY_FACTOR}), ` +
+      `limit ${mb(headroom.limit)}MB`
+    );
+    const error = new Error("Not enough memory headroom for a heap snapshot");
+    error.code = "INSUFFICIENT_MEMORY";
+    error.headroom = headroom;
+    throw error;
+  }
+  try {
+    const file = path.join(directory, `authcore-${process.pid}-${Date.now()}.heapsnapshot`);
+    const startedAt = Date.now();
+    v8.writeHeapSnapshot(file);
+    metrics.captures.inc(1, { kind: "heap" });
+    logger.info(`Heap snapshot written in ${Date.now() - startedAt}ms (${fs.statSync(file).size} bytes)`);
+    return file;
+  } catch (error) {
+    logger.error(`Heap snapshot failed: ${error.message}`);
+    throw error;
+  } finally {
+    activeCapture = null;
+  }
+}
+
+module.exports = {
+  captureCpuProfile,
+  captureHeapSnapshot,
+  getActiveCapture,
+  getMemoryLimit,
+  checkHeapSnapshotHeadroom,
+  clampSeconds,
+};
@@ -0,0 +1,245 @@
+const { BatchWriteCommand, DeleteCommand, QueryCommand, UpdateCommand } = require("@aws-sdk/lib-dynamodb");
+const { TABLES, SESSIONS } = require("../config/constants");
+const { runtimeConfig } = require("../config/runtimeConfig");
+const { createCounter } = require("../utils/metrics");
+const { projection } = require("./dynamoAccess");
+
+// 로깅 설정
+const logger = {
+  info: (message) => console.log(`[REFRESH_TOKENS] ${message}`),
+  error: (message) => console.error(`[REFRESH_TOKENS] ${message}`),
+};
+
+const metrics = {
+  retired: createCounter(
+    "authcore_refresh_tokens_retired_total",
+    "Refresh token items deleted (or given a short TTL), by reason (rotated/revoked/session_cap/stale)"
+  ),
+  capFailures: createCounter(
+    "authcore_refresh_tokens_session_cap_failures_total",
+    "Session cap checks that failed (the new token is still issued)"
+  ),
+};
+
+// BatchWriteItem 한 번에 보낼 수 있는 최대 요청 수
+const BATCH_WRITE_SIZE = 25;
+
+/**
+ * 조건부 쓰기 실패 여부
+ * @param {Error} error - DynamoDB 에러
+ * @returns {boolean}
+ */
+function isConditionalCheckFailure(error) {
+  return error && error.name === "ConditionalCheckFailedException";
+}
+
+/**
+ * 아직 사용할 수 있는 토큰인지 (폐기되지 않았고 만료 전)
+ * @param {Object} item - 저장된 토큰 항목
+ * @param {number} nowSeconds - 현재 Unix timestamp (초)
+ * @returns {boolean}
+ */
+function isActiveToken(item, nowSeconds) {
+  return !item.is_revoked && item.expires_at > nowSeconds;
+}
+
+/**
+ * refresh token 하나 폐기 (SESSIONS.REVOKED_MODE에 따라 삭제 또는 TTL 단축)
+ *
+ * requireActive면 아직 폐기되지 않은 토큰만 폐기한다. 회전(갱신) 시 같은 토큰으로 동시에 들어온
+ * 요청 중 하나만 새 토큰을 받도록 조건식으로 처리한다.
+ *
+ * @param {string} tokenId - 토큰 ID
+ * @param {Object} dynamoDBClient - DynamoDB 클라이언트
+ * @param {Object} [options]
+ * @param {boolean} [options.requireActive=false] - 활성 토큰일 때만 폐기
+ * @param {string} [options.reason="revoked"] - 메트릭 라벨
+ * @returns {Promise<boolean>} 폐기했으면 true (requireActive인데 이미 폐기·삭제된 토큰이면 false)
+ */
+async function retireRefreshToken(tokenId, dynamoDBClient, { requireActive = false, reason = "revoked" } = {}) {
+  const key = { token_id: tokenId };
+  const condition = requireActive
+    ? { ConditionExpression: "is_revoked = :active", ExpressionAttributeValues: { ":active": false } }
+    : {};
+
+  try {
+    if (SESSIONS.REVOKED_MODE === "ttl") {
+      await dynamoDBClient.send(
+        new UpdateCommand({
+          TableName: TABLES.REFRESH_TOKENS,
+          Key: key,
+          UpdateExpression: "SET is_revoked = :revoked, expires_at = :expiresAt",
+          // 없는 토큰에 대한 업데이트가 TTL 없는 빈 항목을 만들지 않도록 항상 존재 조건 포함
+          ConditionExpression: requireActive ? "is_revoked = :active" : "attribute_exists(token_id)",
+          ExpressionAttributeValues: {
+            ":revoked": true,
+            ":expiresAt": Math.floor(Date.now() / 1000) + SESSIONS.REVOKED_TTL_SECONDS,
+            ...(requireActive ? { ":active": false } : {}),
+          },
+        })
+      );
+    } else {
+      await dynamoDBClient.send(
+        new DeleteCommand({ TableName: TABLES.REFRESH_TOKENS, Key: key, ...condition })
+      );
+    }
+  } catch (error) {
+    if (isConditionalCheckFailure(error)) {
+      return false;
+    }
+    throw error;
+  }
+
+  metrics.retired.inc(1, { reason });
+  return true;
+}
+
+/**
+ * 여러 refresh token 폐기 (삭제 모드는 BatchWriteItem 25개씩, TTL 모드는 개별 업데이트)
+ * @param {Object[]} items - 폐기할 토큰 항목 (token_id 필수)
+ * @param {Object} dynamoDBClient - DynamoDB 클라이언트
+ * @param {string} reason - 메트릭 라벨
+ * @returns {Promise<number>} 폐기한 수
+ */
+async function retireRefreshTokens(items, dynamoDBClient, reason) {
+  if (items.length === 0) {
+    return 0;
+  }
+
+  if (SESSIONS.REVOKED_MODE === "ttl") {
+    const results = await Promise.all(
+      items.map((item) => retireRefreshToken(item.token_id, dynamoDBClient, { reason }))
+    );
+    return results.filter(Boolean).length;
+  }
+
+  for (let offset = 0; offset < items.length; offset += BATCH_WRITE_SIZE) {
+    let requests = items
+      .slice(offset, offset + BATCH_WRITE_SIZE)
+      .map((item) => ({ DeleteRequest: { Key: { token_id: item.token_id } } }));
+
+    for (let attempt = 0; requests.length > 0; attempt++) {
+      const result = await dynamoDBClient.send(
+        new BatchWriteCommand({ RequestItems: { [TABLES.REFRESH_TOKENS]: requests } })
+      );
+      requests = (result.UnprocessedItems && result.UnprocessedItems[TABLES.REFRESH_TOKENS]) || [];
+      if (requests.length > 0) {
+        if (attempt + 1 >= SESSIONS.BATCH_WRITE_MAX_ATTEMPTS) {
+          throw new Error(`${requests.length} refresh token delete(s) left unprocessed after retries`);
+        }
+        // 처리량 초과로 남은 요청은 지수 백오프 후 재요청
+        await new Promise((resolve) => setTimeout(resolve, 50 * 2 ** attempt));
+      }
+    }
+  }
+
+  metrics.retired.inc(items.length, { reason });
+  return items.length;
+}
+
+/**
+ * 사용자의 refresh token 항목 전체 (user-id-index, 폐기·만료 여부 판단에 필요한 속성만)
+ * @param {string} userId - 사용자 ID
+ * @param {Object} dynamoDBClient - DynamoDB 클라이언트
+ * @returns {Promise<Object[]>}
+ */
+async function listUserTokens(userId, dynamoDBClient) {
+  const items = [];
+  let exclusiveStartKey;
+  do {
+    const result = await dynamoDBClient.send(
+      new QueryCommand({
+        TableName: TABLES.REFRESH_TOKENS,
+        IndexName: "user-id-index",
+        KeyConditionExpression: "user_id = :userId",
+        ...projection(["token_id", "is_revoked", "expires_at"]),
+        ExpressionAttributeValues: { ":userId": userId },
+        ...(exclusiveStartKey ? { ExclusiveStartKey: exclusiveStartKey } : {}),
+      })
+    );
+    items.push(...(result.Items || []));
+    exclusiveStartKey = result.LastEvaluatedKey;
+  } while (exclusiveStartKey);
+  return items;
+}
+
+/**
+ * 새 토큰 발급 전 사용자별 세션 상한 적용
+ *
+ * 활성 토큰이 (상한 - 1)개를 넘으면 만료가 가장 이른(= 가장 오래 전에 발급된) 것부터 폐기해
+ * 새 토큰까지 상한 안에 들도록 한다. 삭제 모드에서는 이미 폐기·만료된 항목도 함께 지워
+ * TTL을 기다리지 않고 인덱스를 정리한다.
+ *
+ * @param {string} userId - 사용자 ID
+ * @param {Object} dynamoDBClient - DynamoDB 클라이언트
+ * @param {number} [maxActive] - 활성 세션 상한 (기본값: 런타임 설정 MAX_SESSIONS_PER_USER)
+ * @returns {Promise<{evicted: number, compacted: number}>}
+ */
+async function enforceSessionCap(
+  userId,
+  dynamoDBClient,
+  maxActive = runtimeConfig.get().values.MAX_SESSIONS_PER_USER
+) {
+  const nowSeconds = Math.floor(Date.now() / 1000);
+  const items = await listUserTokens(userId, dynamoDBClient);
+  const active = items
+    .filter((item) => isActiveToken(item, nowSeconds))
+    .sort((a, b) => a.expires_at - b.expires_at);
+  const stale = SESSIONS.REVOKED_MODE === "delete"
+    ? items.filter((item) => !isActiveToken(item, nowSeconds))
+    : [];
+  const excess = active.slice(0, Math.max(0, active.length - (maxActive - 1)));
+
+  const [evicted, compacted] = await Promise.all([
+    retireRefreshTokens(excess, dynamoDBClient, "session_cap"),
+    retireRefreshTokens(stale, dynamoDBClient, "stale"),
+  ]);
+  if (evicted > 0) {
+    logger.info(`Evicted ${evicted} oldest session(s) for user: ${userId}`);
+  }
+  return { evicted, compacted };
+}
+
+/**
+ * 세션 상한 적용 (실패해도 로그인·갱신은 막지 않음)
+ * @param {string} userId - 사용자 ID
+ * @param {Object} dynamoDBClient - DynamoDB 클라이언트
+ * @returns {Promise<void>}
+ */
+async function enforceSessionCapSafely(userId, dynamoDBClient) {
+  try {
+    await enforceSessionCap(userId, dynamoDBClient);
+  } catch (error) {
+    metrics.capFailures.inc();
+    logger.error(`Failed to enforce session cap for user ${userId}: ${error.message}`);
+  }
+}
+
+/**
+ * 사용자의 모든 refresh token 폐기 (삭제 모드는 이미 폐기된 항목까지 모두 삭제)
+ * @param {string} userId - 사용자 ID
+ * @param {Object} dynamoDBClient - DynamoDB 클라이언트
+ * @returns {Promise<number>} 폐기한 활성 토큰 수
+ */
+async function retireAllUserTokens(userId, dynamoDBClient) {
+  const nowSeconds = Math.floor(Date.now() / 1000);
+  const items = await listUserTokens(userId, dynamoDBClient);
+  const active = items.filter((item) => isActiveToken(item, nowSeconds));
+  const stale = items.filter((item) => !isActiveToken(item, nowSeconds));
+
+  await Promise.all([
+    retireRefreshTokens(active, dynamoDBClient, "revoked"),
+    SESSIONS.REVOKED_MODE === "delete" ? retireRefreshTokens(stale, dynamoDBClient, "stale") : 0,
+  ]);
+  return active.length;
+}
+
+module.exports = {
+  retireRefreshToken,
+  retireRefreshTokens,
+  retireAllUserTokens,
+  enforceSessionCap,
+  enforceSessionCapSafely,
+  listUserTokens,
+  isActiveToken,
+};
@@ -0,0 +1,174 @@
+const { JWT_CONFIG, STATELESS_AUTH } = require("../config/constants");
+const { createGauge } = require("../utils/metrics");
+
+// 피드 이벤트 종류
+const REVOCATION_EVENTS = {
+  ACCESS_TOKEN_REVOKED: "access_token_revoked",
+  USER_REVOKED: "user_revoked",
+};
+
+const PRUNE_INTERVAL_MS = 60 * 1000;
+
+const metrics = {
+  revokedTokens: createGauge("authcore_revoked_access_tokens", "Revoked access token IDs held in memory"),
+  revokedUsers: createGauge("authcore_revoked_users", "Users whose earlier access tokens are revoked"),
+};
+
+/**
+ * 메모리 내 폐기 목록 생성
+ *
+ * 폐기된 access token ID(jti)와 "이 시각 이전에 발급된 토큰은 모두 무효"인 사용자를 만료 시각과 함께 보관한다.
+ * access token 수명(15분)이 지나면 항목을 지우므로 크기는 최근 폐기 건수로 제한되고, 조회는 정확하다(오탐 없음).
+ *
+ * @returns {Object} 폐기 목록
+ */
+function createRevocationList() {
+  // jti → 토큰 만료 Unix timestamp (초)
+  const revokedTokens = new Map();
+  // userId → { revokedAt, expiresAt } (초)
+  const revokedUsers = new Map();
+
+  function updateGauges() {
+    metrics.revokedTokens.set(revokedTokens.size);
+    metrics.revokedUsers.set(revokedUsers.size);
+  }
+
+  function revokeToken(tokenId, expiresAt) {
+    revokedTokens.set(tokenId, expiresAt);
+    updateGauges();
+  }
+
+  function revokeUser(userId, revokedAt, expiresAt) {
+    const existing = revokedUsers.get(userId);
+    if (!existing || existing.revokedAt < revokedAt) {
+      revokedUsers.set(userId, { revokedAt, expiresAt });
+    }
+    updateGauges();
+  }
+
+  /**
+   * 토큰 폐기 여부 확인
+   * @param {Object} decoded - 검증된 access token 페이로드 (jti, userId, iat)
+   * @returns {boolean}
+   */
+  function isRevoked(decoded) {
+    if (decoded.jti && revokedTokens.has(decoded.jti)) {
+      return true;
+    }
+
+    const revokedUser = revokedUsers.get(decoded.userId);
+    return Boolean(revokedUser && decoded.iat <= revokedUser.revokedAt);
+  }
+
+  /**
+   * 만료된 항목 정리
+   * @param {number} nowSeconds - 현재 Unix timestamp (초)
+   */
+  function prune(nowSeconds) {
+    for (const [tokenId, expiresAt] of revokedTokens) {
+      if (expiresAt <= nowSeconds) {
+        revokedTokens.delete(tokenId);
+      }
+    }
+    for (const [userId, entry] of revokedUsers) {
+      if (entry.expiresAt <= nowSeconds) {
+        revokedUsers.delete(userId);
+      }
+    }
+    updateGauges();
+  }
+
+  return {
+    revokeToken,
+    revokeUser,
+    isRevoked,
+    prune,
+  };
+}
+
+/**
+ * 레플리카 간 동기화되는 access token 폐기 관리자 생성
+ * @param {Object} options - 옵션
+ * @param {Object} options.feed - 이벤트 피드 (createEventFeed)
+ * @param {number} [options.maxStalenessMs] - 이 시간 이상 동기화가 끊기면 stateless 인증을 중단
+ * @returns {Object} 폐기 관리자
+ */
+function createTokenRevocation({ feed, maxStalenessMs = STATELESS_AUTH.MAX_STALENESS_MS } = {}) {
+  if (!feed) {
+    throw new Error("feed is required for token revocation");
+  }
+
+  const revocationList = createRevocationList();
+  let pruneTimer = null;
+
+  feed.subscribe(REVOCATION_EVENTS.ACCESS_TOKEN_REVOKED, (event) => {
+    revocationList.revokeToken(event.subject, event.expires_at);
+  });
+  feed.subscribe(REVOCATION_EVENTS.USER_REVOKED, (event) => {
+    revocationList.revokeUser(event.subject, event.data.revoked_at, event.expires_at);
+  });
+
+  async function start() {
+    if (!pruneTimer) {
+      pruneTimer = setInterval(() => revocationList.prune(Math.floor(Date.now() / 1000)), PRUNE_INTERVAL_MS);
+      if (typeof pruneTimer.unref === "function") {
+        pruneTimer.unref();
+      }
+    }
+    await feed.start();
+  }
+
+  function stop() {
+    if (pruneTimer) {
+      clearInterval(pruneTimer);
+      pruneTimer = null;
+    }
+    feed.stop();
+  }
+
+  /**
+   * 폐기 목록이 최신 상태인지 (stateless 인증을 신뢰할 수 있는지)
+   * @returns {boolean}
+   */
+  function isFresh() {
+    return feed.getSyncAgeMs() <= maxStalenessMs;
+  }
+
+  /**
+   * access token 하나 폐기 (로그아웃)
+   * @param {string} tokenId - jti
+   * @param {number} expiresAt - 토큰 만료 Unix timestamp (초)
+   */
+  async function revokeAccessToken(tokenId, expiresAt) {
+    await feed.publish(REVOCATION_EVENTS.ACCESS_TOKEN_REVOKED, tokenId, expiresAt);
+  }
+
+  /**
+   * 사용자에게 지금까지 발급된 모든 access token 폐기 (계정 비활성화)
+   * @param {string} userId - 사용자 ID
+   */
+  async function revokeUser(userId) {
+    const revokedAt = Math.floor(Date.now() / 1000);
+    await feed.publish(
+      REVOCATION_EVENTS.USER_REVOKED,
+      userId,
+      revokedAt + JWT_CONFIG.ACCESS_EXPIRES_IN_SECONDS,
+      { revoked_at: revokedAt }
+    );
+  }
+
+  return {
+    start,
+    stop,
+    isFresh,
+    isRevoked: revocationList.isRevoked,
+    revokeAccessToken,
+    revokeUser,
+  };
+}
+
+module.exports = {
+  REVOCATION_EVENTS,
+  createRevocationList,
+  createTokenRevocation,
+};
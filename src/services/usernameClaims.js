@@ -0,0 +1,73 @@
+const { TABLES, USERNAME_CLAIM } = require("../config/constants");
+
+/**
+ * 닉네임 점유 항목의 키 생성
+ * @param {string} username - 사용자 닉네임
+ * @returns {string} Users 테이블의 user_id 값
+ */
+function usernameClaimKey(username) {
+  return `${USERNAME_CLAIM.KEY_PREFIX}${username}`;
+}
+
+/**
+ * 닉네임 점유 항목 Put (이미 점유된 닉네임이면 트랜잭션 전체가 취소됨)
+ * @param {string} username - 점유할 닉네임
+ * @param {string} userId - 소유자 사용자 ID
+ * @param {string} claimedAt - ISO 8601 점유 시각
+ * @returns {Object} TransactItems 원소
+ */
+function buildUsernameClaimPut(username, userId, claimedAt) {
+  return {
+    Put: {
+      TableName: TABLES.USERS,
+      Item: {
+        user_id: usernameClaimKey(username),
+        item_type: USERNAME_CLAIM.ITEM_TYPE,
+        owner_user_id: userId,
+        claimed_at: claimedAt,
+      },
+      ConditionExpression: "attribute_not_exists(user_id)",
+    },
+  };
+}
+
+/**
+ * 닉네임 점유 항목 Delete (본인 소유이거나 아직 백필되지 않은 경우에만)
+ * @param {string} username - 해제할 닉네임
+ * @param {string} userId - 소유자 사용자 ID
+ * @returns {Object} TransactItems 원소
+ */
+function buildUsernameClaimDelete(username, userId) {
+  return {
+    Delete: {
+      TableName: TABLES.USERS,
+      Key: { user_id: usernameClaimKey(username) },
+      ConditionExpression: "attribute_not_exists(user_id) OR owner_user_id = :owner_user_id",
+      ExpressionAttributeValues: {
+        ":owner_user_id": userId,
+      },
+    },
+  };
+}
+
+/**
+ * 트랜잭션이 특정 항목의 조건식 때문에 취소되었는지 확인
+ * @param {Error} error - DynamoDB 에러
+ * @param {number} itemIndex - TransactItems 내 항목 인덱스
+ * @returns {boolean}
+ */
+function isTransactionConditionFailure(error, itemIndex) {
+  if (!error || error.name !== "TransactionCanceledException") {
+    return false;
+  }
+
+  const reason = (error.CancellationReasons || [])[itemIndex];
+  return Boolean(reason && reason.Code === "ConditionalCheckFailed");
+}
+
+module.exports = {
+  usernameClaimKey,
+  buildUsernameClaimPut,
+  buildUsernameClaimDelete,
+  isTransactionConditionFailure,
+};
@@ -0,0 +1,40 @@
+const { monitorEventLoopDelay } = require("perf_hooks");
+const { createGauge } = require("./metrics");
+
+const metrics = {
+  lag: createGauge(
+    "authcore_event_loop_lag_seconds",
+    "Event loop delay p99 over the last sampling interval (HPA custom metric)"
+  ),
+  lagMax: createGauge("authcore_event_loop_lag_max_seconds", "Max event loop delay over the last sampling interval"),
+};
+
+/**
+ * 이벤트 루프 지연 측정 시작 (bcrypt 등 CPU 작업으로 요청이 밀리는지 나타내는 스케일링 신호)
+ * @param {Object} [options]
+ * @param {number} [options.intervalMs=5000] - 게이지 갱신 주기
+ * @param {number} [options.resolutionMs=20] - 샘플링 해상도
+ * @returns {Function} 측정 중단 함수
+ */
+function startEventLoopLagMonitor({ intervalMs = 5000, resolutionMs = 20 } = {}) {
+  const histogram = monitorEventLoopDelay({ resolution: resolutionMs });
+  histogram.enable();
+
+  const timer = setInterval(() => {
+    // 히스토그램 값은 나노초, 측정 해상도만큼의 기본 지연은 빼고 기록
+    const toSeconds = (nanoseconds) => Math.max(nanoseconds / 1e9 - resolutionMs / 1000, 0);
+    metrics.lag.set(toSeconds(histogram.percentile(99)));
+    metrics.lagMax.set(toSeconds(histogram.max));
+    histogram.reset();
+  }, intervalMs);
+  timer.unref();
+
+  return () => {
+    clearInterval(timer);
+    histogram.disable();
+  };
+}
+
+module.exports = {
+  startEventLoopLagMonitor,
+};
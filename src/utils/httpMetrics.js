@@ -0,0 +1,43 @@
+const { createCounter, createHistogram } = require("./metrics");
+
+// 요청 처리 시간 구간 (초). 로그인은 bcrypt 때문에 수백 ms이므로 1초 이상까지 둔다
+const DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5];
+
+// 자기 자신(스크랩/프로브) 요청은 지연 비교를 왜곡하므로 제외
+const EXCLUDED_ROUTES = new Set(["/metrics", "/health"]);
+
+const metrics = {
+  duration: createHistogram(
+    "authcore_http_request_duration_seconds",
+    "HTTP request duration in seconds",
+    DURATION_BUCKETS
+  ),
+  requests: createCounter("authcore_http_requests_total", "HTTP requests by route and status code"),
+};
+
+/**
+ * 요청별 처리 시간/상태 코드 메트릭 훅 등록 (카나리 분석에서 stable/canary Pod 비교에 사용)
+ * @param {Object} app - Fastify 인스턴스
+ */
+function registerHttpMetrics(app) {
+  app.addHook("onRequest", async (request) => {
+    request.metricsStartedAt = process.hrtime.bigint();
+  });
+
+  app.addHook("onResponse", async (request, reply) => {
+    // 매칭된 라우트 패턴 사용 (경로 파라미터별로 시리즈가 늘어나지 않도록)
+    const route = request.routeOptions?.url || "unmatched";
+    if (EXCLUDED_ROUTES.has(route) || request.metricsStartedAt === undefined) {
+      return;
+    }
+
+    const seconds = Number(process.hrtime.bigint() - request.metricsStartedAt) / 1e9;
+    metrics.duration.observe(seconds, { method: request.method, route });
+    metrics.requests.inc(1, { method: request.method, route, status: reply.statusCode });
+  });
+}
+
+module.exports = {
+  registerHttpMetrics,
+  DURATION_BUCKETS,
+};
@@ -0,0 +1,182 @@
+// 프로세스 내 메트릭 레지스트리 (Prometheus text format으로 노출)
+
+const registry = new Map();
+
+/**
+ * 라벨 객체를 Prometheus 라벨 문자열로 변환
+ * @param {Object} labels - 라벨 key/value
+ * @returns {string} 예: {route="/auth/login"}
+ */
+function formatLabels(labels = {}) {
+  const entries = Object.entries(labels);
+  if (entries.length === 0) {
+    return "";
+  }
+
+  const body = entries
+    .map(([key, value]) => `${key}="${String(value).replace(/\\/g, "\\\\").replace(/"/g, '\\"')}"`)
+    .join(",");
+  return `{${body}}`;
+}
+
+/**
+ * 이미 등록된 메트릭이 있으면 재사용 (모듈 재로딩/테스트 시 중복 등록 방지)
+ * @param {string} name - 메트릭 이름
+ * @param {string} type - counter | gauge | histogram
+ * @param {string} help - 설명
+ * @returns {Object} 메트릭 엔트리
+ */
+function getOrRegister(name, type, help) {
+  const existing = registry.get(name);
+  if (existing) {
+    if (existing.type !== type) {
+      throw new Error(`Metric ${name} already registered as ${existing.type}`);
+    }
+    return existing;
+  }
+
+  const entry = { name, type, help, values: new Map() };
+  registry.set(name, entry);
+  return entry;
+}
+
+/**
+ * Counter 생성 (단조 증가)
+ * @param {string} name - 메트릭 이름
+ * @param {string} help - 설명
+ * @returns {{inc: Function, get: Function}}
+ */
+function createCounter(name, help) {
+  const entry = getOrRegister(name, "counter", help);
+
+  return {
+    inc(value = 1, labels = {}) {
+      const key = formatLabels(labels);
+      entry.values.set(key, (entry.values.get(key) || 0) + value);
+    },
+    get(labels = {}) {
+      return entry.values.get(formatLabels(labels)) || 0;
+    },
+  };
+}
+
+/**
+ * Gauge 생성 (임의 값 설정)
+ * @param {string} name - 메트릭 이름
+ * @param {string} help - 설명
+ * @returns {{set: Function, inc: Function, dec: Function, get: Function}}
+ */
+function createGauge(name, help) {
+  const entry = getOrRegister(name, "gauge", help);
+
+  return {
+    set(value, labels = {}) {
+      entry.values.set(formatLabels(labels), value);
+    },
+    inc(value = 1, labels = {}) {
+      const key = formatLabels(labels);
+      entry.values.set(key, (entry.values.get(key) || 0) + value);
+    },
+    dec(value = 1, labels = {}) {
+      const key = formatLabels(labels);
+      entry.values.set(key, (entry.values.get(key) || 0) - value);
+    },
+    get(labels = {}) {
+      return entry.values.get(formatLabels(labels)) || 0;
+    },
+  };
+}
+
+/**
+ * Histogram 생성 (구간별 누적 카운트 + 합계, 분위수는 수집 측에서 계산)
+ * @param {string} name - 메트릭 이름
+ * @param {string} help - 설명
+ * @param {number[]} buckets - 구간 상한값 (오름차순, +Inf는 자동 추가)
+ * @returns {{observe: Function, get: Function}}
+ */
+function createHistogram(name, help, buckets) {
+  const entry = getOrRegister(name, "histogram", help);
+  entry.buckets = [...buckets].sort((a, b) => a - b);
+
+  return {
+    observe(value, labels = {}) {
+      const key = formatLabels(labels);
+      let series = entry.values.get(key);
+      if (!series) {
+        series = { labels, counts: new Array(entry.buckets.length).fill(0), sum: 0, count: 0 };
+        entry.values.set(key, series);
+      }
+
+      // 값이 들어가는 첫 구간에만 더하고 직렬화할 때 누적
+      const index = entry.buckets.findIndex((upperBound) => value <= upperBound);
+      if (index !== -1) {
+        series.counts[index] += 1;
+      }
+      series.sum += value;
+      series.count += 1;
+    },
+    get(labels = {}) {
+      const series = entry.values.get(formatLabels(labels));
+      return series ? { sum: series.sum, count: series.count } : { sum: 0, count: 0 };
+    },
+  };
+}
+
+/**
+ * Histogram 시리즈 하나를 _bucket/_sum/_count 라인으로 변환
+ * @param {Object} entry - 메트릭 엔트리
+ * @param {Object} series - 라벨별 관측값
+ * @returns {string[]}
+ */
+function renderHistogramSeries(entry, series) {
+  const lines = [];
+  let cumulative = 0;
+
+  entry.buckets.forEach((upperBound, index) => {
+    cumulative += series.counts[index];
+    lines.push(`${entry.name}_bucket${formatLabels({ ...series.labels, le: upperBound })} ${cumulative}`);
+  });
+  lines.push(`${entry.name}_bucket${formatLabels({ ...series.labels, le: "+Inf" })} ${series.count}`);
+  lines.push(`${entry.name}_sum${formatLabels(series.labels)} ${series.sum}`);
+  lines.push(`${entry.name}_count${formatLabels(series.labels)} ${series.count}`);
+  return lines;
+}
+
+/**
+ * 등록된 모든 메트릭을 Prometheus text format으로 직렬화
+ * @returns {string}
+ */
+function renderMetrics() {
+  const lines = [];
+
+  for (const entry of registry.values()) {
+    lines.push(`# HELP ${entry.name} ${entry.help}`);
+    lines.push(`# TYPE ${entry.name} ${entry.type}`);
+    for (const [labels, value] of entry.values) {
+      if (entry.type === "histogram") {
+        lines.push(...renderHistogramSeries(entry, value));
+      } else {
+        lines.push(`${entry.name}${labels} ${value}`);
+      }
+    }
+  }
+
+  return `${lines.join("\n")}\n`;
+}
+
+/**
+ * 모든 메트릭 값 초기화 (테스트용)
+ */
+function resetMetrics() {
+  for (const entry of registry.values()) {
+    entry.values.clear();
+  }
+}
+
+module.exports = {
+  createCounter,
+  createGauge,
+  createHistogram,
+  renderMetrics,
+  resetMetrics,
+};
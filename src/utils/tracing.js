@@ -0,0 +1,474 @@
+const fs = require("fs");
+const net = require("net");
+const crypto = require("crypto");
+const { AsyncLocalStorage } = require("async_hooks");
+const { performance } = require("perf_hooks");
+const { TRACING } = require("../config/constants");
+const { createCounter } = require("./metrics");
+
+// 로깅 설정
+const logger = {
+  info: (message) => console.log(`[TRACING] ${message}`),
+  error: (message) => console.error(`[TRACING] ${message}`),
+};
+
+const metrics = {
+  traces: createCounter(
+    "authcore_traces_sampled_total",
+    "Requests traced, by sampling reason (upstream = trusted caller asked for it, local = TRACING_SAMPLE_RATE)"
+  ),
+  spans: createCounter(
+    "authcore_trace_spans_total",
+    "Spans handed to the exporter, by result (exported/dropped)"
+  ),
+};
+
+// 스팬을 만들지 않는 경로 (스크랩/프로브)
+const EXCLUDED_ROUTES = new Set(["/metrics", "/health"]);
+
+// W3C traceparent: 00-<trace id 32자리>-<parent id 16자리>-<flags>
+const TRACEPARENT_PATTERN = /^[\da-f]{2}-([\da-f]{32})-([\da-f]{16})-([\da-f]{2})$/;
+// API Gateway/X-Ray: Root=1-<시각 8자리>-<24자리>;Parent=<16자리>;Sampled=<0|1>
+const AMZN_ROOT_PATTERN = /Root=1-([\da-f]{8})-([\da-f]{24})/i;
+const AMZN_PARENT_PATTERN = /Parent=([\da-f]{16})/i;
+const AMZN_SAMPLED_PATTERN = /Sampled=1/;
+
+// 현재 비동기 흐름의 { trace, span } (샘플링되지 않은 요청은 undefined)
+const storage = new AsyncLocalStorage();
+
+/**
+ * 밀리초 단위 현재 시각 (Unix epoch 기준, 소수점 이하 정밀도)
+ * @returns {number}
+ */
+function nowMs() {
+  return performance.timeOrigin + performance.now();
+}
+
+/**
+ * 무작위 16진수 ID
+ * @param {number} bytes - 바이트 수 (trace 16, span 8)
+ * @returns {string}
+ */
+function randomId(bytes) {
+  return crypto.randomBytes(bytes).toString("hex");
+}
+
+/**
+ * 요청 헤더에서 상위 trace context 추출 (traceparent 우선, 없으면 X-Amzn-Trace-Id)
+ * @param {Object} headers - 요청 헤더
+ * @returns {{traceId: string, parentId: string|null, sampled: boolean}|null}
+ */
+function parseTraceContext(headers) {
+  const traceparent = TRACEPARENT_PATTERN.exec(String(headers.traceparent || "").trim().toLowerCase());
+  if (traceparent) {
+    return {
+      traceId: traceparent[1],
+      parentId: traceparent[2],
+      sampled: (parseInt(traceparent[3], 16) & 1) === 1,
+    };
+  }
+
+  const amzn = String(headers["x-amzn-trace-id"] || "");
+  const root = AMZN_ROOT_PATTERN.exec(amzn);
+  if (!root) {
+    return null;
+  }
+  const parent = AMZN_PARENT_PATTERN.exec(amzn);
+  return {
+    traceId: `${root[1]}${root[2]}`.toLowerCase(),
+    parentId: parent ? parent[1].toLowerCase() : null,
+    sampled: AMZN_SAMPLED_PATTERN.test(amzn),
+  };
+}
+
+/**
+ * 요청 샘플링 결정
+ *
+ * 상위의 sampled 플래그는 trustUpstream일 때만 따른다. 신뢰하지 않으면 클라이언트가 플래그를 세워
+ * 모든 요청을 추적하게 만들 수 있으므로(스팬 내보내기 부하) 로컬 비율만 적용한다.
+ *
+ * @param {Object|null} upstream - parseTraceContext 결과
+ * @param {Object} [options]
+ * @param {boolean} [options.trustUpstream] - 상위 샘플링 결정을 따를지 여부
+ * @param {number} [options.sampleRate] - 로컬 샘플링 비율
+ * @param {Function} [options.random] - 0 이상 1 미만 난수 (테스트용)
+ * @returns {"upstream"|"local"|null} 샘플링 이유 (샘플링하지 않으면 null)
+ */
+function sampleDecision(upstream, {
+  trustUpstream = TRACING.TRUST_UPSTREAM_SAMPLING,
+  sampleRate = TRACING.SAMPLE_RATE,
+  random = Math.random,
+} = {}) {
+  if (trustUpstream && upstream && upstream.sampled) {
+    return "upstream";
+  }
+  return random() < sampleRate ? "local" : null;
+}
+
+/**
+ * 스팬 내보내기 (버퍼에 모아 주기적으로 JSON Lines로 기록)
+ *
+ * 요청 경로에서는 버퍼에 넣기만 하고, 쓰기는 타이머가 한 번에 한다. 대상이 느리거나 끊겨 있으면
+ * 기다리지 않고 스팬을 버린다 (authcore_trace_spans_total{result="dropped"}).
+ *
+ * @param {Object} [options]
+ * @param {string} [options.target] - file:<경로> | unix:<경로> | tcp:<호스트>:<포트>
+ * @param {number} [options.flushIntervalMs] - 기록 주기
+ * @param {number} [options.maxBufferedSpans] - 버퍼 상한
+ * @returns {Object} 내보내기
+ */
+function createSpanExporter({
+  target = TRACING.EXPORT_TARGET,
+  flushIntervalMs = TRACING.FLUSH_INTERVAL_MS,
+  maxBufferedSpans = TRACING.MAX_BUFFERED_SPANS,
+} = {}) {
+  const separator = target.indexOf(":");
+  const scheme = target.slice(0, separator);
+  const address = target.slice(separator + 1);
+  if (!["file", "unix", "tcp"].includes(scheme) || !address) {
+    throw new Error(`Unsupported TRACING_EXPORT target: ${target}`);
+  }
+
+  let buffer = [];
+  let sink = null;
+  let writable = true;
+  let failing = false;
+  let timer = null;
+
+  function open() {
+    if (scheme === "file") {
+      sink = fs.createWriteStream(address, { flags: "a" });
+    } else if (scheme === "unix") {
+      sink = net.createConnection({ path: address });
+    } else {
+      const portSeparator = address.lastIndexOf(":");
+      sink = net.createConnection({ host: address.slice(0, portSeparator), port: Number(address.slice(portSeparator + 1)) });
+    }
+    const current = sink;
+    writable = true;
+    current.on("drain", () => {
+      writable = true;
+    });
+    current.on("error", (error) => {
+      // 같은 원인으로 flush마다 로그가 쌓이지 않도록 연속 실패는 한 번만 기록
+      if (!failing) {
+        logger.error(`Span export to ${target} failed, dropping spans until it recovers: ${error.message}`);
+      }
+      failing = true;
+      if (sink === current) {
+        sink = null;
+      }
+      current.destroy();
+    });
+  }
+
+  /**
+   * 끝난 스팬 추가
+   * @param {Object} span - 스팬 레코드
+   */
+  function record(span) {
+    if (buffer.length >= maxBufferedSpans) {
+      metrics.spans.inc(1, { result: "dropped" });
+      return;
+    }
+    buffer.push(span);
+  }
+
+  /**
+   * 버퍼의 스팬 기록 (다음 연결 시도는 다음 flush에서)
+   */
+  function flush() {
+    if (buffer.length === 0) {
+      return;
+    }
+    const spans = buffer;
+    buffer = [];
+
+    if (!sink) {
+      open();
+    }
+    if (!writable) {
+      metrics.spans.inc(spans.length, { result: "dropped" });
+      return;
+    }
+    writable = sink.write(spans.map((span) => JSON.stringify(span)).join("\n") + "\n", (error) => {
+      if (!error) {
+        failing = false;
+      }
+    });
+    metrics.spans.inc(spans.length, { result: "exported" });
+  }
+
+  function start() {
+    if (!timer) {
+      timer = setInterval(flush, flushIntervalMs);
+      timer.unref();
+    }
+  }
+
+  /**
+   * 남은 스팬을 기록하고 닫기
+   * @returns {Promise<void>}
+   */
+  async function stop() {
+    clearInterval(timer);
+    timer = null;
+    flush();
+    if (sink) {
+      const current = sink;
+      sink = null;
+      await new Promise((resolve) => current.end(resolve));
+    }
+  }
+
+  return { record, flush, start, stop };
+}
+
+/**
+ * 끝난 스팬을 내보내기에 전달
+ * @param {Object} span - startSpan이 만든 스팬
+ * @param {Error} [error] - 실패 원인
+ */
+function endSpan(span, error) {
+  if (span.ended) {
+    return;
+  }
+  span.ended = true;
+  const { trace } = span;
+  trace.exporter.record({
+    traceId: trace.traceId,
+    spanId: span.spanId,
+    parentId: span.parentId,
+    name: span.name,
+    kind: span.kind,
+    start: Math.round(span.start * 1000) / 1000,
+    durationMs: Math.round((nowMs() - span.start) * 1000) / 1000,
+    attributes: span.attributes,
+    ...(error ? { error: error.name || "Error" } : {}),
+  });
+}
+
+/**
+ * 스팬 시작
+ * @param {Object} trace - { traceId, exporter }
+ * @param {string} name - 스팬 이름
+ * @param {Object} options
+ * @param {string|null} options.parentId - 부모 스팬 ID
+ * @param {string} [options.kind="internal"] - server | internal | client
+ * @param {Object} [options.attributes] - 속성
+ * @returns {Object} 스팬
+ */
+function startSpan(trace, name, { parentId, kind = "internal", attributes = {} }) {
+  return { trace, spanId: randomId(8), parentId, name, kind, attributes, start: nowMs(), ended: false };
+}
+
+/**
+ * 현재 trace 안에서 함수를 자식 스팬으로 감싸 실행 (샘플링되지 않은 흐름이면 그대로 실행)
+ *
+ * 동기 함수와 Promise를 반환하는 함수 모두 지원한다. 안에서 시작된 스팬은 이 스팬의 자식이 된다.
+ *
+ * @param {string} name - 스팬 이름
+ * @param {Object|null} attributes - 속성
+ * @param {Function} fn - 실행할 함수
+ * @param {string} [kind="internal"] - 스팬 종류
+ * @returns {*} fn의 반환값
+ */
+function withSpan(name, attributes, fn, kind = "internal") {
+  const context = storage.getStore();
+  if (!context) {
+    return fn();
+  }
+
+  const span = startSpan(context.trace, name, { parentId: context.span.spanId, kind, attributes: attributes || {} });
+  let result;
+  try {
+    result = storage.run({ trace: context.trace, span }, fn);
+  } catch (error) {
+    endSpan(span, error);
+    throw error;
+  }
+  if (result && typeof result.then === "function") {
+    return result.then(
+      (value) => {
+        endSpan(span);
+        return value;
+      },
+      (error) => {
+        endSpan(span, error);
+        throw error;
+      }
+    );
+  }
+  endSpan(span);
+  return result;
+}
+
+/**
+ * 함수 모음을 각각 스팬으로 감쌈 (예: authService.loginUser)
+ * @param {string} prefix - 스팬 이름 접두사
+ * @param {Object} functions - 이름 → 함수
+ * @returns {Object} 같은 이름의 감싼 함수
+ */
+function traceFunctions(prefix, functions) {
+  const traced = {};
+  for (const [name, fn] of Object.entries(functions)) {
+    traced[name] = function (...args) {
+      return withSpan(`${prefix}.${name}`, null, () => fn.apply(this, args));
+    };
+  }
+  return traced;
+}
+
+/**
+ * DynamoDB 명령의 스팬 속성 (테이블, 인덱스)
+ * @param {Object} command - lib-dynamodb 명령
+ * @returns {Object}
+ */
+function commandAttributes(command) {
+  const input = command.input || {};
+  if (input.TableName) {
+    return input.IndexName ? { table: input.TableName, index: input.IndexName } : { table: input.TableName };
+  }
+  if (input.RequestItems) {
+    return { table: Object.keys(input.RequestItems).join(",") };
+  }
+  if (input.TransactItems) {
+    return { items: input.TransactItems.length };
+  }
+  return {};
+}
+
+/**
+ * send마다 client 스팬(dynamodb.<명령>)을 남기는 DynamoDB 클라이언트 (트레이싱이 꺼져 있으면 그대로 반환)
+ * @param {Object} client - DynamoDB 클라이언트 (SDK 또는 접근 계층)
+ * @returns {Object}
+ */
+function traceDynamoClient(client) {
+  if (!TRACING.ENABLED) {
+    return client;
+  }
+  const traced = Object.create(client);
+  traced.send = (command, options) =>
+    withSpan(`dynamodb.${command.constructor.name}`, commandAttributes(command), () => client.send(command, options), "client");
+  return traced;
+}
+
+/**
+ * 샘플링된 trace 안에서 함수 실행 (루트 스팬 포함, 벤치마크/테스트용)
+ * @param {Object} exporter - 스팬 내보내기
+ * @param {string} name - 루트 스팬 이름
+ * @param {Function} fn - 실행할 함수
+ * @returns {Promise<*>}
+ */
+async function runTraced(exporter, name, fn) {
+  const trace = { traceId: randomId(16), exporter };
+  const root = startSpan(trace, name, { parentId: null, kind: "server" });
+  try {
+    return await storage.run({ trace, span: root }, fn);
+  } finally {
+    endSpan(root);
+  }
+}
+
+/**
+ * 요청 트레이싱 훅 등록 (TRACING_ENABLED=true일 때만)
+ *
+ * 루트 스팬(요청 전체) 아래에 스키마 검증(fastify.validation)과 핸들러(fastify.handler) 스팬을 만들고,
+ * 핸들러 안의 authService 함수와 DynamoDB 호출은 그 자식이 된다. 상위 trace id가 있으면 이어 쓰고,
+ * 상위 샘플링 결정은 TRACING_TRUST_UPSTREAM_SAMPLING=true일 때만 따른다 (sampleDecision).
+ *
+ * @param {Object} app - Fastify 인스턴스
+ * @param {Object} [exporter] - 스팬 내보내기 (기본: TRACING_EXPORT 대상)
+ */
+function registerTracing(app, exporter = null) {
+  if (!TRACING.ENABLED) {
+    return;
+  }
+  exporter = exporter || createSpanExporter();
+  exporter.start();
+  logger.info(
+    `Tracing ${TRACING.SAMPLE_RATE * 100}% of requests to ${TRACING.EXPORT_TARGET}` +
+      (TRACING.TRUST_UPSTREAM_SAMPLING ? " (plus upstream-sampled requests)" : "")
+  );
+
+  app.addHook("onRequest", (request, reply, done) => {
+    const route = request.routeOptions?.url;
+    if (!route || EXCLUDED_ROUTES.has(route)) {
+      return done();
+    }
+    const upstream = parseTraceContext(request.headers);
+    const reason = sampleDecision(upstream);
+    if (!reason) {
+      return done();
+    }
+
+    metrics.traces.inc(1, { reason });
+    const trace = { traceId: upstream ? upstream.traceId : randomId(16), exporter };
+    const root = startSpan(trace, `${request.method} ${route}`, {
+      parentId: upstream ? upstream.parentId : null,
+      kind: "server",
+      attributes: { method: request.method, route },
+    });
+    request.traceRoot = root;
+    reply.header("x-trace-id", trace.traceId);
+    // 이후 훅과 핸들러가 같은 비동기 컨텍스트에서 실행되도록 done을 컨텍스트 안에서 호출
+    storage.run({ trace, span: root }, done);
+  });
+
+  app.addHook("preValidation", (request, reply, done) => {
+    if (request.traceRoot) {
+      request.traceValidation = startSpan(request.traceRoot.trace, "fastify.validation", {
+        parentId: request.traceRoot.spanId,
+      });
+    }
+    done();
+  });
+
+  app.addHook("preHandler", (request, reply, done) => {
+    const root = request.traceRoot;
+    if (!root) {
+      return done();
+    }
+    if (request.traceValidation) {
+      endSpan(request.traceValidation);
+    }
+    // 라우트별 preHandler(인증 미들웨어)도 핸들러 스팬에 포함
+    request.traceHandler = startSpan(root.trace, "fastify.handler", { parentId: root.spanId });
+    storage.run({ trace: root.trace, span: request.traceHandler }, done);
+  });
+
+  app.addHook("onSend", (request, reply, payload, done) => {
+    if (request.traceHandler) {
+      endSpan(request.traceHandler);
+    }
+    done(null, payload);
+  });
+
+  app.addHook("onResponse", (request, reply, done) => {
+    const root = request.traceRoot;
+    if (root) {
+      // 검증 실패(400) 등으로 핸들러까지 가지 않은 경우
+      if (request.traceValidation) {
+        endSpan(request.traceValidation);
+      }
+      root.attributes.status = reply.statusCode;
+      endSpan(root);
+    }
+    done();
+  });
+
+  app.addHook("onClose", async () => {
+    await exporter.stop();
+  });
+}
+
+module.exports = {
+  registerTracing,
+  withSpan,
+  traceFunctions,
+  traceDynamoClient,
+  createSpanExporter,
+  parseTraceContext,
+  sampleDecision,
+  runTraced,
+};
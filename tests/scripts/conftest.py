@@ -0,0 +1,68 @@
+"""배포 스크립트(scripts/) 테스트 공통 설정: import 경로, 가짜 kubectl, 가짜 AWS 클라이언트"""
+
+import base64
+import json
+import os
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+FAKE_KUBECTL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_kubectl.py')
+
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+
+class FakeKubectl:
+    """fake_kubectl.py 호출 기록 조회"""
+
+    def __init__(self, log_path, state_dir):
+        self.log_path = log_path
+        self.state_dir = state_dir
+
+    def calls(self):
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def call_for(self, target):
+        """해당 Kind/name을 적용한 첫 호출"""
+        return next(call for call in self.calls() if call['target'] == target)
+
+
+@pytest.fixture
+def fake_kubectl(tmp_path, monkeypatch):
+    """KUBECTL을 가짜 kubectl로 바꾸고 호출 기록을 tmp_path에 남김"""
+    state_dir = tmp_path / 'cluster'
+    state_dir.mkdir()
+    kubeconfig = tmp_path / 'kubeconfig'
+    kubeconfig.write_text('apiVersion: v1\nkind: Config\n')
+
+    monkeypatch.setenv('KUBECTL', f"{sys.executable} {FAKE_KUBECTL}")
+    monkeypatch.setenv('FAKE_KUBECTL_LOG', str(tmp_path / 'kubectl.log'))
+    monkeypatch.setenv('FAKE_KUBECTL_STATE', str(state_dir))
+    monkeypatch.setenv('KUBECONFIG', str(kubeconfig))
+    monkeypatch.delenv('KUBE_CONTEXT', raising=False)
+    return FakeKubectl(str(tmp_path / 'kubectl.log'), str(state_dir))
+
+
+class FakeEcr:
+    def get_authorization_token(self):
+        token = base64.b64encode(b'AWS:fake-password').decode('ascii')
+        return {'authorizationData': [{'authorizationToken': token}]}
+
+
+class FakeSecretsManager:
+    def describe_secret(self, SecretId):
+        return {'ARN': f"arn:aws:secretsmanager:ap-northeast-2:000000000000:secret:{SecretId}"}
+
+    def get_secret_value(self, SecretId):
+        return {'SecretString': json.dumps({'JWT_SECRET': 'secret-from-secrets-manager'})}
+
+
+@pytest.fixture
+def fake_aws():
+    """boto3 없이 쓰는 가짜 AWS 클라이언트 (DeployContext(clients=...)에 전달)"""
+    return {'ecr': FakeEcr(), 'secretsmanager': FakeSecretsManager()}
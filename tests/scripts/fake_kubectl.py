@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+테스트용 가짜 kubectl (KUBECTL="python fake_kubectl.py"로 지정)
+
+호출마다 FAKE_KUBECTL_LOG에 한 줄(JSON)을 남긴다. apply/create/replace는 -f 파일의 kind/name을,
+exec/get 등은 인자를 기록한다. 클러스터 상태는 FAKE_KUBECTL_STATE 디렉터리에 객체별 파일로 저장해
+get configmap/secret이 앞서 쓴 값을 돌려준다. KUBECONFIG가 JSON이고 현재 컨텍스트의 server가
+http://로 시작하면 같은 기록을 그 주소(가짜 API 서버)에 POST해 어느 클러스터로 간 호출인지 확인할 수 있다.
+
+    FAKE_KUBECTL_FAIL   이 문자열이 명령(또는 -f 파일의 kind/name)에 포함되면 실패
+    FAKE_KUBECTL_DELAY  apply/create/replace 한 번에 걸리는 시간(초)
+"""
+
+import json
+import os
+import re
+import sys
+import time
+import urllib.request
+
+
+def describe_file(path):
+    """매니페스트 파일의 Kind/name (YAML은 첫 kind/name 줄만 읽음)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    try:
+        document = json.loads(content)
+        return f"{document['kind']}/{document['metadata']['name']}", document
+    except ValueError:
+        kind = re.search(r'^kind:\s*(\S+)', content, re.M)
+        name = re.search(r'^\s+name:\s*(\S+)', content, re.M)
+        return f"{kind.group(1) if kind else '?'}/{name.group(1) if name else '?'}", None
+
+
+def resolve_server(context):
+    """JSON kubeconfig에서 컨텍스트(없으면 current-context)의 API 서버 주소 (알 수 없으면 None)"""
+    try:
+        with open(os.environ['KUBECONFIG'], 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        name = context or config['current-context']
+        cluster = next(item['context']['cluster'] for item in config['contexts'] if item['name'] == name)
+        return next(item['cluster']['server'] for item in config['clusters'] if item['name'] == cluster)
+    except (KeyError, OSError, StopIteration, ValueError):
+        return None
+
+
+def state_path(kind, name):
+    return os.path.join(os.environ['FAKE_KUBECTL_STATE'], f"{kind.lower()}-{name}.json")
+
+
+def main(argv):
+    # --context=... 같은 전역 옵션은 기록만 하고 건너뜀
+    context = next((arg.split('=', 1)[1] for arg in argv if arg.startswith('--context=')), None)
+    args = [arg for arg in argv if not arg.startswith('--context=')]
+    verb = args[0] if args else ''
+    target = None
+    document = None
+    if '-f' in args:
+        target, document = describe_file(args[args.index('-f') + 1])
+
+    entry = {
+        'verb': verb,
+        'args': args,
+        'target': target,
+        'context': context,
+        'kubeconfig': os.environ.get('KUBECONFIG'),
+        'started': time.time(),
+    }
+
+    failure = os.getenv('FAKE_KUBECTL_FAIL')
+    failed = bool(failure) and (failure in ' '.join(args) or (target and failure in target))
+    if verb in ('apply', 'create', 'replace') and not failed:
+        time.sleep(float(os.getenv('FAKE_KUBECTL_DELAY', '0')))
+
+    entry['finished'] = time.time()
+    entry['server'] = resolve_server(context)
+    with open(os.environ['FAKE_KUBECTL_LOG'], 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + '\n')
+    if entry['server'] and entry['server'].startswith('http://'):
+        request = urllib.request.Request(entry['server'], data=json.dumps(entry).encode('utf-8'), method='POST')
+        urllib.request.urlopen(request, timeout=5).close()
+
+    if failed:
+        print(f"error: injected failure for {failure}", file=sys.stderr)
+        return 1
+
+    if verb in ('version', 'cluster-info', 'delete', 'rollout'):
+        return 0
+    if verb in ('apply', 'create', 'replace'):
+        if document and document['kind'] in ('ConfigMap', 'Secret'):
+            path = state_path(document['kind'], document['metadata']['name'])
+            if verb == 'replace' and not os.path.exists(path):
+                print(f"Error from server (NotFound): {target} not found", file=sys.stderr)
+                return 1
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(document, f)
+        print(f"{target} configured")
+        return 0
+    if verb == 'get' and len(args) > 2 and args[1] in ('configmap', 'secret'):
+        path = state_path(args[1], args[2])
+        if not os.path.exists(path):
+            print(f"Error from server (NotFound): {args[1]} \"{args[2]}\" not found", file=sys.stderr)
+            return 1
+        with open(path, 'r', encoding='utf-8') as f:
+            print(f.read())
+        return 0
+    if verb == 'get' and len(args) > 1 and args[1] == 'namespace':
+        print(f"Error from server (NotFound): namespaces \"{args[2]}\" not found", file=sys.stderr)
+        return 1
+    if verb == 'get' and len(args) > 1 and args[1] == 'nodes':
+        print("NAME     STATUS   ROLES                  AGE   VERSION\nnode-1   Ready    control-plane,master   1d    v1.29.0")
+        return 0
+    # get pods/deployment/all/hpa 등: 빈 결과
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,198 @@
+"""DagExecutor와 deploy_to_k8s 배포 그래프 테스트 (가짜 kubectl, 가짜 AWS 클라이언트)"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import deploy_to_k8s
+from common import DeployContext
+from conftest import SCRIPTS_DIR
+from dag_executor import CANCELLED, FAILED, SUCCEEDED, DagError, DagExecutor
+
+
+class TestDagExecutor:
+    def test_runs_steps_after_their_dependencies_and_passes_results(self):
+        # Given
+        finished = []
+        dag = DagExecutor(max_workers=4)
+        dag.add('a', lambda _: finished.append('a') or 1)
+        dag.add('b', lambda r: finished.append('b') or r['a'] + 1, deps=['a'])
+        dag.add('c', lambda r: finished.append('c') or r['a'] + r['b'], deps=['a', 'b'])
+
+        # When
+        results = dag.run()
+
+        # Then
+        assert results == {'a': 1, 'b': 2, 'c': 3}
+        assert finished == ['a', 'b', 'c']
+        assert dag.critical_path() == ['a', 'b', 'c']
+
+    def test_runs_independent_steps_concurrently(self):
+        # Given: 두 단계가 동시에 실행되어야만 통과하는 장벽
+        barrier = threading.Barrier(2, timeout=5)
+        dag = DagExecutor(max_workers=2)
+        dag.add('left', lambda _: barrier.wait())
+        dag.add('right', lambda _: barrier.wait())
+        dag.add('join', lambda _: 'done', deps=['left', 'right'])
+
+        # When
+        results = dag.run()
+
+        # Then
+        assert results['join'] == 'done'
+        left, right = dag.records['left'], dag.records['right']
+        assert left['started_at'] < right['finished_at'] and right['started_at'] < left['finished_at']
+
+    def test_failure_cancels_dependents_and_waits_for_running_steps(self):
+        # Given
+        def fail(_):
+            raise RuntimeError('boom')
+
+        def slow(_):
+            time.sleep(0.2)
+            return 'slow'
+
+        dag = DagExecutor(max_workers=4)
+        dag.add('bad', fail)
+        dag.add('slow', slow)
+        dag.add('after_bad', lambda _: 'never', deps=['bad'])
+        dag.add('after_slow', lambda _: 'never', deps=['slow'])
+
+        # When
+        with pytest.raises(DagError) as excinfo:
+            dag.run()
+
+        # Then
+        statuses = {step['name']: step['status'] for step in dag.report()['steps']}
+        assert statuses == {'bad': FAILED, 'slow': SUCCEEDED, 'after_bad': CANCELLED, 'after_slow': CANCELLED}
+        assert excinfo.value.failed == {'bad': 'RuntimeError: boom'}
+
+    def test_sys_exit_in_a_step_is_a_step_failure(self):
+        # Given
+        dag = DagExecutor()
+        dag.add('exit', lambda _: sys.exit(3))
+
+        # When
+        with pytest.raises(DagError) as excinfo:
+            dag.run()
+
+        # Then
+        assert excinfo.value.failed == {'exit': 'exited with code 3'}
+
+    def test_rejects_unknown_dependencies(self):
+        with pytest.raises(ValueError):
+            DagExecutor().add('a', lambda _: None, deps=['missing'])
+
+
+@pytest.fixture
+def deploy_env(fake_kubectl, tmp_path, monkeypatch):
+    """이미지 URI·ECR·용량 프로파일 없음(레플리카 1개) 상태의 배포 환경"""
+    monkeypatch.setenv('IMAGE_URI', '000000000000.dkr.ecr.ap-northeast-2.amazonaws.com/authcore:test')
+    monkeypatch.setenv('ECR_REPOSITORY_URI', '000000000000.dkr.ecr.ap-northeast-2.amazonaws.com/authcore')
+    monkeypatch.setenv('CAPACITY_PROFILE', str(tmp_path / 'no-profile.json'))
+    monkeypatch.delenv('JWT_SECRET', raising=False)
+    monkeypatch.delenv('SECRETS_MANAGER_ARN', raising=False)
+    monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+    return fake_kubectl
+
+
+def deploy_config(namespace='authcore', strategy='rolling'):
+    return {
+        'kubeconfig': os.environ['KUBECONFIG'],
+        'namespace': namespace,
+        'environment': 'test',
+        'ecr_repo_url': os.environ['ECR_REPOSITORY_URI'],
+        'max_workers': 4,
+        'strategy': strategy,
+        'canary_report': os.devnull,
+        'configmap': deploy_to_k8s.build_configmap('ap-northeast-2', 'test'),
+    }
+
+
+class TestDeployDag:
+    def test_applies_namespace_before_dependent_objects_and_rolls_out_last(self, deploy_env, fake_aws):
+        # Given
+        dag = deploy_to_k8s.build_deploy_dag(DeployContext(clients=fake_aws), deploy_config())
+
+        # When
+        dag.run()
+
+        # Then
+        namespace = deploy_env.call_for('Namespace/authcore')
+        for target in ('ConfigMap/authcore-config', 'Secret/authcore-secrets',
+                       'Secret/ecr-registry-secret', 'Deployment/authcore-api', 'Service/authcore-api'):
+            assert deploy_env.call_for(target)['started'] >= namespace['finished'], target
+        rollout = next(call for call in deploy_env.calls() if call['verb'] == 'rollout')
+        assert rollout['started'] >= deploy_env.call_for('Deployment/authcore-api')['finished']
+
+    def test_uses_stubbed_aws_for_jwt_secret_and_registry_credentials(self, deploy_env, fake_aws):
+        # Given
+        dag = deploy_to_k8s.build_deploy_dag(DeployContext(clients=fake_aws), deploy_config())
+
+        # When
+        results = dag.run()
+
+        # Then
+        assert results['jwt_secret'] == 'secret-from-secrets-manager'
+        assert results['ecr_token']['auths']['000000000000.dkr.ecr.ap-northeast-2.amazonaws.com']['username'] == 'AWS'
+        secret, _ = deploy_to_k8s.get_object_data('authcore', 'secret', 'authcore-secrets')
+        assert secret == {'JWT_SECRET': 'secret-from-secrets-manager'}
+
+    def test_failed_deployment_apply_cancels_rollout_but_keeps_finished_steps(self, deploy_env, fake_aws, monkeypatch):
+        # Given
+        monkeypatch.setenv('FAKE_KUBECTL_FAIL', 'Deployment/authcore-api')
+        dag = deploy_to_k8s.build_deploy_dag(DeployContext(clients=fake_aws), deploy_config())
+
+        # When
+        with pytest.raises(DagError) as excinfo:
+            dag.run()
+
+        # Then
+        statuses = {step['name']: step['status'] for step in dag.report()['steps']}
+        assert list(excinfo.value.failed) == ['deployment']
+        assert statuses['rollout'] == CANCELLED
+        assert statuses['configmap'] == SUCCEEDED and statuses['service'] == SUCCEEDED
+        assert not any(call['verb'] == 'rollout' for call in deploy_env.calls())
+
+    def test_applies_independent_objects_concurrently(self, deploy_env, fake_aws, monkeypatch):
+        # Given: apply 한 번에 0.5초
+        monkeypatch.setenv('FAKE_KUBECTL_DELAY', '0.5')
+        dag = deploy_to_k8s.build_deploy_dag(DeployContext(clients=fake_aws), deploy_config())
+
+        # When
+        dag.run()
+
+        # Then: 네임스페이스 이후 ConfigMap/Secret/Service 적용 구간이 겹침
+        configmap = deploy_env.call_for('ConfigMap/authcore-config')
+        service = deploy_env.call_for('Service/authcore-api')
+        assert configmap['started'] < service['finished'] and service['started'] < configmap['finished']
+
+
+class TestDeployCli:
+    def test_help_does_not_deploy(self, deploy_env, tmp_path):
+        # Given
+        report = tmp_path / 'timing.json'
+        env = {**os.environ, 'DEPLOY_TIMING_REPORT': str(report)}
+
+        # When
+        result = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, 'deploy_to_k8s.py'), '--help'],
+                                capture_output=True, text=True, env=env, cwd=tmp_path)
+
+        # Then
+        assert result.returncode == 0
+        assert 'usage: deploy_to_k8s' in result.stdout
+        assert deploy_env.calls() == []
+        assert not report.exists()
+
+    def test_unknown_arguments_are_rejected(self, deploy_env, tmp_path):
+        # When
+        result = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, 'deploy_to_k8s.py'), '--dry-run'],
+                                capture_output=True, text=True, cwd=tmp_path)
+
+        # Then
+        assert result.returncode == 2
+        assert deploy_env.calls() == []
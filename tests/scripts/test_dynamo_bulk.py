@@ -0,0 +1,197 @@
+"""dynamo_bulk.py 테스트: generate/import 대상 테이블·비밀번호 확인, export/import 체크포인트 (가짜 DynamoDB 클라이언트)"""
+
+import json
+import os
+
+import pytest
+
+import dynamo_bulk
+
+
+class FakeDynamoDB:
+    """Scan(세그먼트·페이지), DescribeTable, BatchWriteItem만 흉내 내는 메모리 테이블"""
+
+    def __init__(self, count=0, fail_on_scan=None):
+        self.items = [{'user_id': {'S': f"u{index:03d}"}} for index in range(count)]
+        self.written = []
+        self.scans = 0
+        # 이 번째 Scan 호출에서 한 번 실패 (중단 재현)
+        self.fail_on_scan = fail_on_scan
+
+    def describe_table(self, TableName):
+        return {'Table': {'KeySchema': [{'AttributeName': 'user_id', 'KeyType': 'HASH'}]}}
+
+    def scan(self, TableName, Segment, TotalSegments, Limit, ReturnConsumedCapacity, ExclusiveStartKey=None):
+        self.scans += 1
+        if self.scans == self.fail_on_scan:
+            self.fail_on_scan = None
+            raise ConnectionError('connection reset')
+        segment_items = [item for index, item in enumerate(self.items) if index % TotalSegments == Segment]
+        start = segment_items.index(ExclusiveStartKey) + 1 if ExclusiveStartKey else 0
+        page = segment_items[start:start + Limit]
+        response = {'Items': page}
+        if start + Limit < len(segment_items):
+            response['LastEvaluatedKey'] = page[-1]
+        return response
+
+    def batch_write_item(self, RequestItems, ReturnConsumedCapacity):
+        for requests in RequestItems.values():
+            self.written.extend(request['PutRequest']['Item'] for request in requests)
+        return {}
+
+
+def exported_items(table_dir):
+    return sorted(item['user_id']['S'] for path in dynamo_bulk.data_files(table_dir)
+                  for item in dynamo_bulk.read_items(path))
+
+
+@pytest.fixture
+def checkpoint_path(tmp_path):
+    return str(tmp_path / 'checkpoint.json')
+
+
+def export(client, out_dir, checkpoint_path, segments=2, page_size=4):
+    checkpoint = dynamo_bulk.Checkpoint(checkpoint_path)
+    dynamo_bulk.export_table(client, 'load_Users', str(out_dir), segments, page_size,
+                             dynamo_bulk.CapacityLimiter(0), checkpoint)
+    return checkpoint
+
+
+def import_dir(client, table_dir, checkpoint_path):
+    checkpoint = dynamo_bulk.Checkpoint(checkpoint_path)
+    dynamo_bulk.import_files(client, 'load_Users', dynamo_bulk.data_files(str(table_dir)), 2,
+                             dynamo_bulk.CapacityLimiter(0), checkpoint, 0)
+    return checkpoint
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    """generate_users 호출 인자 기록 (실제 해시 계산/파일 생성 없이)"""
+    calls = []
+    monkeypatch.setattr(dynamo_bulk, 'generate_users', lambda *args: calls.append(args))
+    return calls
+
+
+class TestTargetTable:
+    def test_generate_and_import_require_table(self, capsys):
+        for argv in (['generate', '--count', '10'], ['import', 'seed-dir']):
+            with pytest.raises(SystemExit) as excinfo:
+                dynamo_bulk.parse_args(argv)
+            assert excinfo.value.code == 2
+        assert '--table' in capsys.readouterr().err
+
+    def test_refuses_table_without_test_or_load_prefix(self, generated, monkeypatch):
+        # Given
+        monkeypatch.setenv('LOADTEST_PASSWORD', 'pw')
+
+        # When
+        with pytest.raises(SystemExit) as excinfo:
+            dynamo_bulk.main(['generate', '--count', '10', '--table', 'AuthCore_Users'])
+
+        # Then
+        assert excinfo.value.code == 1
+        assert generated == []
+
+    def test_allow_production_permits_other_tables(self, generated, monkeypatch):
+        # Given
+        monkeypatch.setenv('LOADTEST_PASSWORD', 'pw')
+
+        # When
+        dynamo_bulk.main(['generate', '--count', '10', '--table', 'AuthCore_Users', '--allow-production'])
+
+        # Then
+        assert generated[0][0] == 'AuthCore_Users'
+
+    def test_refuses_import_into_production_table(self, tmp_path):
+        with pytest.raises(SystemExit) as excinfo:
+            dynamo_bulk.main(['import', str(tmp_path), '--table', 'AuthCore_RefreshTokens',
+                              '--checkpoint', os.devnull])
+        assert excinfo.value.code == 1
+
+
+class TestGeneratePassword:
+    def test_requires_password_from_environment(self, generated, monkeypatch):
+        # Given
+        monkeypatch.delenv('LOADTEST_PASSWORD', raising=False)
+
+        # When
+        with pytest.raises(SystemExit) as excinfo:
+            dynamo_bulk.main(['generate', '--count', '10', '--table', 'load_AuthCore_Users'])
+
+        # Then
+        assert excinfo.value.code == 1
+        assert generated == []
+
+    def test_uses_password_from_environment(self, generated, monkeypatch):
+        # Given
+        monkeypatch.setenv('LOADTEST_PASSWORD', 'from-env')
+
+        # When
+        dynamo_bulk.main(['generate', '--count', '10', '--table', 'Test_Users', '--workers', '1'])
+
+        # Then
+        table, _, count, _, prefix, password = generated[0][:6]
+        assert (table, count, prefix, password) == ('Test_Users', 10, 'load_', 'from-env')
+
+
+class TestExport:
+    def test_finished_export_is_scanned_again_on_the_next_run(self, tmp_path, checkpoint_path):
+        # Given
+        client = FakeDynamoDB(count=20)
+        checkpoint = export(client, tmp_path / 'day1', checkpoint_path)
+        first_scans = client.scans
+
+        # When: 다음 날 같은 테이블을 새 디렉토리로 내보내기
+        export(client, tmp_path / 'day2', checkpoint_path)
+
+        # Then
+        assert checkpoint.state == {}
+        assert client.scans == first_scans * 2
+        assert exported_items(tmp_path / 'day2' / 'load_Users') == exported_items(tmp_path / 'day1' / 'load_Users')
+        assert len(exported_items(tmp_path / 'day2' / 'load_Users')) == 20
+
+    def test_resumes_interrupted_segment_without_duplicates(self, tmp_path, checkpoint_path):
+        # Given: 세그먼트 하나만, 두 번째 페이지에서 연결이 끊김
+        client = FakeDynamoDB(count=10, fail_on_scan=2)
+        with pytest.raises(ConnectionError):
+            export(client, tmp_path, checkpoint_path, segments=1)
+        with open(checkpoint_path) as f:
+            saved = json.load(f)
+        assert [state['items'] for state in saved.values()] == [4]
+
+        # When
+        export(client, tmp_path, checkpoint_path, segments=1)
+
+        # Then: 첫 페이지는 다시 Scan하지 않고 나머지만 이어 씀
+        assert client.scans == 1 + 1 + 2
+        assert exported_items(tmp_path / 'load_Users') == [f"u{index:03d}" for index in range(10)]
+
+    def test_restart_keeps_progress_of_other_jobs(self, checkpoint_path):
+        # Given: 다른 작업(compact_refresh_tokens.py)과 같은 체크포인트 파일
+        with open(checkpoint_path, 'w') as f:
+            json.dump({'compact:load_Tokens:0/4': {'last_key': 'k'}, 'export:load_Users:/out/segment': {'items': 3}}, f)
+
+        # When
+        checkpoint = dynamo_bulk.Checkpoint(checkpoint_path, restart=('export:load_Users:',))
+        checkpoint.save()
+
+        # Then
+        with open(checkpoint_path) as f:
+            assert json.load(f) == {'compact:load_Tokens:0/4': {'last_key': 'k'}}
+
+
+class TestImport:
+    def test_reimport_after_completion_writes_every_item_again(self, tmp_path, checkpoint_path):
+        # Given
+        export(FakeDynamoDB(count=60), tmp_path, checkpoint_path)
+        target = FakeDynamoDB()
+        import_dir(target, tmp_path / 'load_Users', checkpoint_path)
+        assert len(target.written) == 60
+
+        # When: 테이블을 비운 뒤 같은 디렉토리를 다시 가져오기
+        target.written.clear()
+        checkpoint = import_dir(target, tmp_path / 'load_Users', checkpoint_path)
+
+        # Then
+        assert len(target.written) == 60
+        assert checkpoint.state == {}
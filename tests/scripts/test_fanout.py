@@ -0,0 +1,131 @@
+"""fanout.py 다중 대상 배포 테스트 (대상마다 가짜 API 서버, 가짜 kubectl)"""
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from fanout import run_fanout
+
+
+class FakeApiServer:
+    """가짜 kubectl이 POST한 호출 기록을 모으는 API 서버"""
+
+    def __init__(self):
+        received = self.received = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                received.append(json.loads(self.rfile.read(int(self.headers['Content-Length']))))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def namespaces(self):
+        return {call['args'][call['args'].index('-n') + 1] for call in self.received if '-n' in call['args']}
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def api_servers():
+    servers = {}
+
+    def start(name):
+        servers[name] = FakeApiServer()
+        return servers[name]
+
+    yield start
+    for server in servers.values():
+        server.close()
+
+
+@pytest.fixture
+def fanout_env(fake_kubectl, tmp_path, monkeypatch):
+    monkeypatch.setenv('FANOUT_LOG_DIR', str(tmp_path / 'targets'))
+    monkeypatch.setenv('FANOUT_REPORT', str(tmp_path / 'fanout.json'))
+    monkeypatch.setenv('JWT_SECRET', 'fanout-test-secret')
+    monkeypatch.delenv('DEPLOY_TARGETS', raising=False)
+    monkeypatch.delenv('API_GATEWAY_ID', raising=False)
+    return fake_kubectl
+
+
+def shared_kubeconfig(path, servers):
+    """한 파일에 대상별 컨텍스트를 모두 담은 kubeconfig (JSON)"""
+    path.write_text(json.dumps({
+        'apiVersion': 'v1',
+        'kind': 'Config',
+        'current-context': next(iter(servers)),
+        'clusters': [{'name': name, 'cluster': {'server': server.url}} for name, server in servers.items()],
+        'contexts': [{'name': name, 'context': {'cluster': name, 'user': 'admin'}} for name in servers],
+        'users': [{'name': 'admin', 'user': {'token': 'fake'}}],
+    }))
+    return str(path)
+
+
+def make_target(name, wave, kubeconfig, tmp_path, **env):
+    state = tmp_path / f"state-{name}"
+    state.mkdir()
+    return {
+        'name': name,
+        'wave': wave,
+        'kubeconfig': kubeconfig,
+        'context': name,
+        'namespace': f"ns-{name}",
+        'env': {'FAKE_KUBECTL_STATE': str(state), **env},
+    }
+
+
+class TestFanout:
+    def test_each_target_gets_its_own_kubeconfig_and_reaches_only_its_cluster(self, fanout_env, api_servers, tmp_path):
+        # Given: 두 대상이 같은 kubeconfig 파일을 공유
+        servers = {name: api_servers(name) for name in ('apne2', 'use1')}
+        kubeconfig = shared_kubeconfig(tmp_path / 'shared-kubeconfig', servers)
+        original = open(kubeconfig, encoding='utf-8').read()
+        targets = [make_target(name, 0, kubeconfig, tmp_path) for name in servers]
+
+        # When
+        ok = run_fanout(targets, ['config'], max_parallel=2)
+
+        # Then
+        assert ok
+        assert servers['apne2'].namespaces() == {'ns-apne2'}
+        assert servers['use1'].namespaces() == {'ns-use1'}
+        used = {name: {call['kubeconfig'] for call in server.received} for name, server in servers.items()}
+        for name, paths in used.items():
+            assert len(paths) == 1
+            path = paths.pop()
+            assert path != kubeconfig
+            assert os.path.basename(os.path.dirname(path)) == name
+            assert not os.path.exists(path)
+        assert open(kubeconfig, encoding='utf-8').read() == original
+
+    def test_failed_target_cancels_later_waves_before_they_touch_their_cluster(self, fanout_env, api_servers, tmp_path):
+        # Given
+        servers = {name: api_servers(name) for name in ('staging', 'prod')}
+        kubeconfig = shared_kubeconfig(tmp_path / 'shared-kubeconfig', servers)
+        targets = [
+            make_target('staging', 0, kubeconfig, tmp_path, FAKE_KUBECTL_FAIL='cluster-info'),
+            make_target('prod', 1, kubeconfig, tmp_path),
+        ]
+
+        # When
+        ok = run_fanout(targets, ['config'], max_parallel=2)
+
+        # Then
+        assert not ok
+        assert servers['staging'].received
+        assert servers['prod'].received == []
+        with open(tmp_path / 'fanout.json', encoding='utf-8') as f:
+            statuses = {target['name']: target['status'] for target in json.load(f)['targets']}
+        assert statuses == {'staging': 'failed', 'prod': 'cancelled'}
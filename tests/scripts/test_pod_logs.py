@@ -0,0 +1,41 @@
+"""pod_logs.LogAnalyzer 테스트"""
+
+import json
+
+from pod_logs import OTHER_ROUTE, LogAnalyzer
+
+
+def request_lines(req_id, url, at=1_700_000_000_000):
+    return [
+        json.dumps({'time': at, 'reqId': req_id, 'req': {'method': 'GET', 'url': url}}),
+        json.dumps({'time': at + 5, 'reqId': req_id, 'res': {'statusCode': 404}, 'responseTime': 5}),
+    ]
+
+
+class TestLogAnalyzer:
+    def test_routes_beyond_the_limit_are_merged_into_other(self):
+        # Given: 정규화되지 않는 임의 경로를 두드리는 스캐너
+        analyzer = LogAnalyzer(max_routes=3)
+
+        # When
+        for i in range(50):
+            for line in request_lines(f"req-{i}", f"/probe-{i}.php"):
+                analyzer.feed('pod-a', line)
+
+        # Then
+        report = analyzer.report()
+        assert len(analyzer.total) == 4
+        assert len(analyzer.rolling()) == 4
+        assert report['routes'][OTHER_ROUTE]['requests'] == 47
+        assert report['other_route_requests'] == 47
+
+    def test_known_routes_keep_their_own_stats_after_the_limit(self):
+        # Given
+        analyzer = LogAnalyzer(max_routes=1)
+        for line in request_lines('a', '/auth/verify') + request_lines('b', '/scan-1') + request_lines('c', '/auth/verify'):
+            analyzer.feed('pod-a', line)
+
+        # Then
+        routes = analyzer.report()['routes']
+        assert routes['GET /auth/verify']['requests'] == 2
+        assert routes[OTHER_ROUTE]['requests'] == 1
@@ -0,0 +1,89 @@
+"""ConfigMap/Secret 갱신 테스트: 지정한 키만 덮어쓰고 나머지는 유지, 지우는 것은 명시적으로 (가짜 kubectl)"""
+
+import base64
+import json
+import os
+
+import pytest
+
+import deploy_to_k8s
+
+NAMES = {'configmap': 'authcore-config', 'secret': 'authcore-secrets'}
+
+@pytest.fixture
+def cluster(fake_kubectl, monkeypatch):
+    """authcore-config, authcore-secrets가 이미 있는 클러스터"""
+    for key in ('ADMIN_TOKEN', 'RUNTIME_CONFIG_UNSET', *deploy_to_k8s.RUNTIME_TUNABLES):
+        monkeypatch.delenv(key, raising=False)
+
+    def write(kind, data):
+        document = {'apiVersion': 'v1', 'kind': kind, 'metadata': {'name': NAMES[kind.lower()], 'namespace': 'authcore'}, 'data': data}
+        with open(os.path.join(fake_kubectl.state_dir, f"{kind.lower()}-{NAMES[kind.lower()]}.json"), 'w', encoding='utf-8') as f:
+            json.dump(document, f)
+
+    write('ConfigMap', {'AWS_REGION': 'ap-northeast-2', 'RATE_LIMIT_MAX': '200', 'PASSWORD_HASH_COST': '12'})
+    secret = {'JWT_SECRET': 'current-secret', 'ADMIN_TOKEN': 'admin-token'}
+    write('Secret', {key: base64.b64encode(value.encode('utf-8')).decode('ascii') for key, value in secret.items()})
+    return fake_kubectl
+
+
+def read(kind):
+    data, _ = deploy_to_k8s.get_object_data('authcore', kind, NAMES[kind])
+    return data
+
+
+class TestCreateConfigmap:
+    def test_keeps_tunables_that_were_not_provided(self, cluster):
+        # When: 한 값만 지정
+        changed = deploy_to_k8s.create_configmap('authcore', {'AWS_REGION': 'ap-northeast-2', 'RATE_LIMIT_MAX': '300'})
+
+        # Then
+        assert changed
+        assert read('configmap') == {'AWS_REGION': 'ap-northeast-2', 'RATE_LIMIT_MAX': '300', 'PASSWORD_HASH_COST': '12'}
+
+    def test_unset_removes_only_the_named_key(self, cluster):
+        # When
+        changed = deploy_to_k8s.create_configmap('authcore', {'AWS_REGION': 'ap-northeast-2'}, ['RATE_LIMIT_MAX'])
+
+        # Then
+        assert changed
+        assert read('configmap') == {'AWS_REGION': 'ap-northeast-2', 'PASSWORD_HASH_COST': '12'}
+
+    def test_same_key_set_and_unset_is_rejected(self, cluster):
+        with pytest.raises(SystemExit):
+            deploy_to_k8s.create_configmap('authcore', {'RATE_LIMIT_MAX': '300'}, ['RATE_LIMIT_MAX'])
+        assert read('configmap')['RATE_LIMIT_MAX'] == '200'
+
+
+class TestCreateSecrets:
+    def test_keeps_admin_token_when_not_in_environment(self, cluster):
+        # When
+        changed = deploy_to_k8s.create_secrets('authcore', 'current-secret')
+
+        # Then
+        assert not changed
+        assert read('secret') == {'JWT_SECRET': 'current-secret', 'ADMIN_TOKEN': 'admin-token'}
+
+    def test_unset_removes_admin_token(self, cluster):
+        # When
+        changed = deploy_to_k8s.create_secrets('authcore', 'current-secret', ['ADMIN_TOKEN'])
+
+        # Then
+        assert changed
+        assert read('secret') == {'JWT_SECRET': 'current-secret'}
+
+    def test_jwt_secret_cannot_be_unset(self, cluster):
+        with pytest.raises(SystemExit):
+            deploy_to_k8s.create_secrets('authcore', 'current-secret', ['JWT_SECRET'])
+
+
+class TestUnsetOption:
+    def test_reads_keys_from_environment_and_flags(self, monkeypatch):
+        # Given
+        monkeypatch.setenv('RUNTIME_CONFIG_UNSET', 'RATE_LIMIT_MAX, ADMIN_TOKEN')
+
+        # When
+        args = deploy_to_k8s.parse_args(['--unset', 'PASSWORD_HASH_COST'])
+
+        # Then
+        assert args.unset == ['RATE_LIMIT_MAX', 'ADMIN_TOKEN', 'PASSWORD_HASH_COST']
@@ -0,0 +1,54 @@
+"""용량 프로파일 로드 테스트 (capacity_planner.py가 생성한 프로파일만 배포에 적용)"""
+
+import json
+import os
+
+import pytest
+
+import scaling
+from conftest import SCRIPTS_DIR
+
+MANUAL_PROFILE = {
+    'source': 'initial estimate',
+    'per_replica_rps': 30,
+    'cpu_millicores_per_rps': 5,
+    'peak_rps': 100,
+}
+
+
+@pytest.fixture
+def profile_file(tmp_path, monkeypatch):
+    monkeypatch.delenv('CAPACITY_PROFILE_ALLOW_MANUAL', raising=False)
+
+    def write(profile):
+        path = tmp_path / 'capacity-profile.json'
+        path.write_text(json.dumps(profile))
+        return str(path)
+
+    return write
+
+
+class TestLoadProfile:
+    def test_ignores_hand_written_profile(self, profile_file):
+        assert scaling.load_profile(profile_file(MANUAL_PROFILE)) is None
+
+    def test_applies_hand_written_profile_only_with_explicit_opt_in(self, profile_file, monkeypatch):
+        # Given
+        monkeypatch.setenv('CAPACITY_PROFILE_ALLOW_MANUAL', 'true')
+
+        # When
+        profile = scaling.load_profile(profile_file(MANUAL_PROFILE))
+
+        # Then
+        assert profile['per_replica_rps'] == 30
+
+    def test_does_not_trust_source_without_generated_resources(self, profile_file):
+        profile = {**MANUAL_PROFILE, 'source': 'capacity_planner.py (hand edited)'}
+        assert scaling.load_profile(profile_file(profile)) is None
+
+    def test_committed_profile_is_generated_by_capacity_planner(self):
+        # k8s/capacity-profile.json은 손으로 고치지 않고 capacity_planner.py로 다시 생성해야 함
+        path = os.path.join(os.path.dirname(SCRIPTS_DIR), scaling.DEFAULT_PROFILE)
+        profile = scaling.load_profile(path)
+        assert profile is not None
+        assert scaling.is_generated(profile)
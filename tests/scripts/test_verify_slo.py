@@ -0,0 +1,43 @@
+"""verify_slo.py 부하 테스트 (로컬 대역 서버 두 개를 게이트웨이·백엔드로 사용)"""
+
+import threading
+from http.server import ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from verify_slo import _StandinHandler, run_load
+
+
+@pytest.fixture
+def standins():
+    servers = []
+
+    def start():
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _StandinHandler)
+        server.daemon_threads = True
+        server.options = SimpleNamespace(delay_ms=0.0, jitter_ms=0.0, error_rate=0.0)
+        server.lock = threading.Lock()
+        server.state = {'users': {}, 'access': {}, 'refresh': {}}
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class TestRunLoad:
+    def test_rate_is_a_total_budget_shared_by_all_targets(self, standins):
+        # Given: 같은 IP에서 두 경로로 보내는 부하
+        targets = {'gateway': standins(), 'backend': standins()}
+
+        # When: 전체 초당 10개, 2초
+        results = run_load(targets, None, rate=10, duration=2, workers=2)
+
+        # Then: 대상마다 절반씩, 합계가 예산(20개)을 넘지 않음
+        counts = {target: stats['all']['count'] for target, stats in results.items()}
+        assert sum(counts.values()) <= 20
+        assert all(8 <= count <= 10 for count in counts.values()), counts
@@ -0,0 +1,84 @@
+// admissionControl 유닛테스트
+const {
+  ROUTE_CLASSES,
+  classifyRoute,
+  createAdmissionController
+} = require('../../src/middleware/admissionControl');
+
+const limits = {
+  lagMs: { cheap: 500, expensive: 150 },
+  maxInFlight: { cheap: 3, expensive: 2 }
+};
+
+describe('admissionControl', () => {
+  describe('classifyRoute', () => {
+    it('프로브·메트릭·관리 라우트는 예외, bcrypt 라우트는 비싼 라우트로 분류해야 함', () => {
+      // When & Then
+      expect(classifyRoute('/health')).toBe(ROUTE_CLASSES.EXEMPT);
+      expect(classifyRoute('/metrics')).toBe(ROUTE_CLASSES.EXEMPT);
+      expect(classifyRoute('/admin/profile/cpu')).toBe(ROUTE_CLASSES.EXEMPT);
+      expect(classifyRoute('/auth/login')).toBe(ROUTE_CLASSES.EXPENSIVE);
+      expect(classifyRoute('/auth/register')).toBe(ROUTE_CLASSES.EXPENSIVE);
+      expect(classifyRoute('/auth/password')).toBe(ROUTE_CLASSES.EXPENSIVE);
+      expect(classifyRoute('/auth/me')).toBe(ROUTE_CLASSES.CHEAP);
+      expect(classifyRoute(undefined)).toBe(ROUTE_CLASSES.CHEAP);
+    });
+  });
+
+  describe('createAdmissionController', () => {
+    it('이벤트 루프 지연이 커지면 비싼 라우트부터 거부해야 함', () => {
+      // Given
+      let lagMs = 0;
+      const controller = createAdmissionController({ getLagMs: () => lagMs, getLimits: () => limits });
+
+      // When: 지연 200ms (비싼 라우트 기준 150ms 초과, 가벼운 라우트 기준 500ms 미만)
+      lagMs = 200;
+
+      // Then
+      expect(controller.admit(ROUTE_CLASSES.EXPENSIVE)).toBe('event_loop_lag');
+      expect(controller.admit(ROUTE_CLASSES.CHEAP)).toBeNull();
+
+      // When: 지연 800ms
+      lagMs = 800;
+
+      // Then: 가벼운 라우트도 거부하지만 프로브는 항상 수락
+      expect(controller.admit(ROUTE_CLASSES.CHEAP)).toBe('event_loop_lag');
+      expect(controller.admit(ROUTE_CLASSES.EXEMPT)).toBeNull();
+    });
+
+    it('라우트 종류별 처리 중 요청 수 상한을 지키고, 완료되면 다시 수락해야 함', () => {
+      // Given
+      const controller = createAdmissionController({ getLagMs: () => 0, getLimits: () => limits });
+
+      // When
+      expect(controller.admit(ROUTE_CLASSES.EXPENSIVE)).toBeNull();
+      expect(controller.admit(ROUTE_CLASSES.EXPENSIVE)).toBeNull();
+
+      // Then
+      expect(controller.admit(ROUTE_CLASSES.EXPENSIVE)).toBe('in_flight');
+      expect(controller.admit(ROUTE_CLASSES.CHEAP)).toBeNull();
+      expect(controller.getInFlight(ROUTE_CLASSES.EXPENSIVE)).toBe(2);
+
+      // When
+      controller.release(ROUTE_CLASSES.EXPENSIVE);
+
+      // Then
+      expect(controller.admit(ROUTE_CLASSES.EXPENSIVE)).toBeNull();
+    });
+
+    it('예외 라우트는 처리 중 요청 수에 포함하지 않아야 함', () => {
+      // Given
+      const controller = createAdmissionController({ getLagMs: () => 0, getLimits: () => limits });
+
+      // When
+      for (let i = 0; i < 10; i += 1) {
+        controller.admit(ROUTE_CLASSES.EXEMPT);
+      }
+      controller.release(ROUTE_CLASSES.EXEMPT);
+
+      // Then
+      expect(controller.getInFlight(ROUTE_CLASSES.CHEAP)).toBe(0);
+      expect(controller.getInFlight(ROUTE_CLASSES.EXPENSIVE)).toBe(0);
+    });
+  });
+});
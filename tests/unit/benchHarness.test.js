@@ -0,0 +1,133 @@
+// 벤치마크 예산 확인 유닛테스트
+const { checkBudget, runBenchmark } = require('../../bench/harness');
+const { createFakeDynamoClient } = require('../../bench/fakeDynamoClient');
+const { TABLES } = require('../../src/config/constants');
+
+const budgets = {
+  tolerance: { opsPerSec: 0.2, cpuUsPerOp: 0.2 },
+  max: { dynamoCallsPerOp: 10 },
+  functions: {
+    verifyAccessToken: { max: { blockingMaxMs: 5 } }
+  }
+};
+
+function result(overrides = {}) {
+  return {
+    name: 'verifyAccessToken',
+    opsPerSec: 1000,
+    cpuUsPerOp: 100,
+    blockingMaxMs: 1,
+    dynamoCallsPerOp: 0,
+    ...overrides
+  };
+}
+
+describe('bench harness', () => {
+  describe('checkBudget', () => {
+    it('기준선 대비 허용 범위 안이면 위반이 없어야 함', () => {
+      // When
+      const { deltas, violations } = checkBudget(result({ cpuUsPerOp: 110 }), result(), budgets);
+
+      // Then
+      expect(deltas.cpuUsPerOp).toBeCloseTo(0.1);
+      expect(violations).toEqual([]);
+    });
+
+    it('CPU 증가와 처리량 감소가 예산을 넘으면 위반으로 보고해야 함', () => {
+      // When
+      const { violations } = checkBudget(result({ cpuUsPerOp: 150, opsPerSec: 700 }), result(), budgets);
+
+      // Then
+      expect(violations).toHaveLength(2);
+      expect(violations[0]).toContain('opsPerSec');
+      expect(violations[1]).toContain('cpuUsPerOp');
+    });
+
+    it('처리량 증가는 위반이 아니어야 함', () => {
+      const { violations } = checkBudget(result({ opsPerSec: 2000 }), result(), budgets);
+
+      expect(violations).toEqual([]);
+    });
+
+    it('기준선이 없어도 함수별 절대 상한은 확인해야 함', () => {
+      const { violations } = checkBudget(result({ blockingMaxMs: 12 }), undefined, budgets);
+
+      expect(violations).toEqual(['blockingMaxMs 12.00 exceeds limit 5']);
+    });
+  });
+
+  describe('runBenchmark', () => {
+    const options = { iterations: 10, warmup: 1, concurrency: 1, allocationIterations: 5 };
+
+    function busyWait(ms) {
+      const until = Date.now() + ms;
+      while (Date.now() < until) {
+        // 의도적으로 이벤트 루프를 막음
+      }
+    }
+
+    it('양보하지 않는 op의 블로킹을 측정해 예산 위반으로 보고해야 함', async () => {
+      // Given: 가짜 DynamoDB 지연 0처럼 마이크로태스크만 거치며 20ms 동안 루프를 막는 op
+      const benchmark = {
+        name: 'verifyAccessToken',
+        setup: async () => ({}),
+        op: async () => {
+          await Promise.resolve();
+          busyWait(20);
+        }
+      };
+
+      // When
+      const measured = await runBenchmark(benchmark, options);
+      const { violations } = checkBudget(measured, undefined, budgets);
+
+      // Then
+      expect(measured.blockingMaxMs).toBeGreaterThanOrEqual(19);
+      expect(violations).toHaveLength(1);
+      expect(violations[0]).toContain('blockingMaxMs');
+    });
+
+    it('I/O를 기다리는 동안은 블로킹으로 세지 않아야 함', async () => {
+      // Given
+      const benchmark = {
+        name: 'verifyAccessToken',
+        setup: async () => ({}),
+        op: () => new Promise((resolve) => setTimeout(resolve, 20))
+      };
+
+      // When
+      const measured = await runBenchmark(benchmark, options);
+
+      // Then: 20ms 대기 중 루프는 계속 돌고 있음 (스케줄링 잡음만 남음)
+      expect(measured.blockingMaxMs).toBeLessThan(15);
+    });
+  });
+
+  describe('fakeDynamoClient', () => {
+    class PutCommand { constructor(input) { this.input = input; } }
+    class QueryCommand { constructor(input) { this.input = input; } }
+
+    it('GSI 조회와 조건부 쓰기를 처리해야 함', async () => {
+      // Given
+      const client = createFakeDynamoClient();
+      client.seed(TABLES.USERS, [{ user_id: 'u1', username: 'alice' }]);
+
+      // When
+      const found = await client.send(new QueryCommand({
+        TableName: TABLES.USERS,
+        IndexName: 'username-index',
+        KeyConditionExpression: 'username = :username',
+        ExpressionAttributeValues: { ':username': 'alice' }
+      }));
+
+      // Then
+      expect(found.Items).toEqual([{ user_id: 'u1', username: 'alice' }]);
+      await expect(client.send(new PutCommand({
+        TableName: TABLES.USERS,
+        Item: { user_id: 'u1' },
+        ConditionExpression: 'attribute_not_exists(user_id)'
+      }))).rejects.toMatchObject({ name: 'ConditionalCheckFailedException' });
+      expect(client.calls).toEqual({ QueryCommand: 1, PutCommand: 1 });
+    });
+  });
+});
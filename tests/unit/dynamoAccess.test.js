@@ -0,0 +1,223 @@
+// DynamoDB 접근 계층 유닛테스트 (재시도, 시도별 타임아웃, 헤지 읽기, 프로젝션)
+const { createDynamoAccess, projection, PROJECTIONS } = require('../../src/services/dynamoAccess');
+
+class GetCommand { constructor(input) { this.input = input; } }
+class PutCommand { constructor(input) { this.input = input; } }
+class QueryCommand { constructor(input) { this.input = input; } }
+class TransactWriteCommand { constructor(input) { this.input = input; } }
+
+function awsError(name) {
+  const error = new Error(name);
+  error.name = name;
+  return error;
+}
+
+// abortSignal을 따르는 지연 (SDK와 같이 중단 시 AbortError)
+function delay(ms, signal) {
+  return new Promise((resolve, reject) => {
+    const timer = setTimeout(resolve, ms);
+    if (signal) {
+      signal.addEventListener('abort', () => {
+        clearTimeout(timer);
+        reject(awsError('AbortError'));
+      });
+    }
+  });
+}
+
+describe('dynamoAccess', () => {
+  describe('projection', () => {
+    it('모든 속성을 #이름으로 치환해야 함', () => {
+      // When
+      const result = projection(['user_id', 'level']);
+
+      // Then
+      expect(result).toEqual({
+        ProjectionExpression: '#user_id, #level',
+        ExpressionAttributeNames: { '#user_id': 'user_id', '#level': 'level' }
+      });
+    });
+
+    it('인증 미들웨어 프로젝션은 비밀번호 해시를 읽지 않아야 함', () => {
+      expect(PROJECTIONS.AUTH_USER).not.toContain('password_hash');
+      expect(PROJECTIONS.LOGIN_USER).toContain('password_hash');
+    });
+  });
+
+  describe('createDynamoAccess', () => {
+    it('스로틀링 오류는 새 명령 인스턴스로 재시도해야 함', async () => {
+      // Given
+      const commands = [];
+      const client = {
+        send: jest.fn(async (command) => {
+          commands.push(command);
+          if (commands.length < 3) {
+            throw awsError('ThrottlingException');
+          }
+          return { ok: true };
+        })
+      };
+      const access = createDynamoAccess(client, { BACKOFF_BASE_MS: 1 });
+      const command = new PutCommand({ TableName: 'T', Item: { id: 1 } });
+
+      // When
+      const result = await access.send(command);
+
+      // Then
+      expect(result).toEqual({ ok: true });
+      expect(client.send).toHaveBeenCalledTimes(3);
+      expect(commands[1]).not.toBe(commands[0]);
+      expect(commands[1].input).toEqual(command.input);
+    });
+
+    it('읽기는 시도별 타임아웃 후 재시도해야 함', async () => {
+      // Given
+      let attempts = 0;
+      const client = {
+        send: jest.fn(async (command, { abortSignal }) => {
+          attempts++;
+          await delay(attempts === 1 ? 500 : 1, abortSignal);
+          return { Item: { id: 1 } };
+        })
+      };
+      const access = createDynamoAccess(client, { TIMEOUTS_MS: { GetCommand: [20, 300] } });
+
+      // When
+      const result = await access.send(new GetCommand({ TableName: 'T', Key: { id: 1 } }));
+
+      // Then
+      expect(result).toEqual({ Item: { id: 1 } });
+      expect(attempts).toBe(2);
+    });
+
+    it('조건부 쓰기는 타임아웃 시 재시도하지 않아야 함', async () => {
+      // Given
+      const client = { send: jest.fn((command, { abortSignal }) => delay(500, abortSignal)) };
+      const access = createDynamoAccess(client, { TIMEOUTS_MS: { PutCommand: [20, 300] } });
+
+      // When & Then
+      await expect(access.send(new PutCommand({
+        TableName: 'T',
+        Item: { id: 1 },
+        ConditionExpression: 'attribute_not_exists(id)'
+      }))).rejects.toMatchObject({ name: 'TimeoutError' });
+      expect(client.send).toHaveBeenCalledTimes(1);
+    });
+
+    it('트랜잭션 재시도는 같은 ClientRequestToken을 사용해야 함', async () => {
+      // Given
+      const tokens = [];
+      const client = {
+        send: jest.fn(async (command) => {
+          tokens.push(command.input.ClientRequestToken);
+          if (tokens.length === 1) {
+            const error = awsError('TransactionCanceledException');
+            error.CancellationReasons = [{ Code: 'TransactionConflict' }];
+            throw error;
+          }
+          return {};
+        })
+      };
+      const access = createDynamoAccess(client, { BACKOFF_BASE_MS: 1 });
+
+      // When
+      await access.send(new TransactWriteCommand({ TransactItems: [] }));
+
+      // Then
+      expect(tokens).toHaveLength(2);
+      expect(tokens[0]).toBeTruthy();
+      expect(tokens[1]).toBe(tokens[0]);
+    });
+
+    it('재시도 예산이 바닥나면 더 이상 재시도하지 않아야 함', async () => {
+      // Given
+      const client = { send: jest.fn(async () => { throw awsError('ThrottlingException'); }) };
+      const access = createDynamoAccess(client, { BACKOFF_BASE_MS: 0, RETRY_BUDGET_INITIAL: 2 });
+
+      // When
+      for (let i = 0; i < 5; i++) {
+        await expect(access.send(new PutCommand({ TableName: 'T' }))).rejects.toMatchObject({
+          name: 'ThrottlingException'
+        });
+      }
+
+      // Then: 첫 요청의 재시도 2번 이후로는 요청당 한 번만 전송
+      expect(client.send).toHaveBeenCalledTimes(7);
+    });
+
+    it('검증 오류는 재시도하지 않아야 함', async () => {
+      // Given
+      const client = { send: jest.fn(async () => { throw awsError('ValidationException'); }) };
+      const access = createDynamoAccess(client);
+
+      // When & Then
+      await expect(access.send(new GetCommand({ TableName: 'T' }))).rejects.toMatchObject({
+        name: 'ValidationException'
+      });
+      expect(client.send).toHaveBeenCalledTimes(1);
+    });
+
+    it('느린 읽기는 헤지 요청이 먼저 응답해야 함', async () => {
+      // Given: 지연 분포를 채운 뒤 다음 요청만 느리게
+      let slow = false;
+      const client = {
+        send: jest.fn(async (command, { abortSignal }) => {
+          const wait = slow ? 300 : 2;
+          slow = false;
+          await delay(wait, abortSignal);
+          return { Item: { id: 1 } };
+        })
+      };
+      const access = createDynamoAccess(client, {
+        HEDGE_ENABLED: true,
+        HEDGE_MIN_SAMPLES: 10,
+        RETRY_BUDGET_INITIAL: 10,
+        TIMEOUTS_MS: { GetCommand: [1000, 2000] }
+      });
+      for (let i = 0; i < 10; i++) {
+        await access.send(new GetCommand({ TableName: 'T', Key: { id: 1 } }));
+      }
+      client.send.mockClear();
+      slow = true;
+
+      // When
+      const startedAt = Date.now();
+      const result = await access.send(new GetCommand({ TableName: 'T', Key: { id: 1 } }));
+
+      // Then
+      expect(result).toEqual({ Item: { id: 1 } });
+      expect(client.send).toHaveBeenCalledTimes(2);
+      expect(Date.now() - startedAt).toBeLessThan(200);
+    });
+    it('Query는 느려도 헤지하지 않아야 함 (기본 대상은 GetCommand)', async () => {
+      // Given
+      let slow = false;
+      const client = {
+        send: jest.fn(async (command, { abortSignal }) => {
+          const wait = slow ? 100 : 2;
+          slow = false;
+          await delay(wait, abortSignal);
+          return { Items: [] };
+        })
+      };
+      const access = createDynamoAccess(client, {
+        HEDGE_ENABLED: true,
+        HEDGE_MIN_SAMPLES: 10,
+        RETRY_BUDGET_INITIAL: 10,
+        TIMEOUTS_MS: { QueryCommand: [1000, 2000] }
+      });
+      for (let i = 0; i < 10; i++) {
+        await access.send(new QueryCommand({ TableName: 'T', KeyConditionExpression: 'id = :id' }));
+      }
+      client.send.mockClear();
+      slow = true;
+
+      // When
+      const result = await access.send(new QueryCommand({ TableName: 'T', KeyConditionExpression: 'id = :id' }));
+
+      // Then
+      expect(result).toEqual({ Items: [] });
+      expect(client.send).toHaveBeenCalledTimes(1);
+    });
+  });
+});
@@ -0,0 +1,136 @@
+// loginThrottle 유닛테스트
+const { createLoginThrottle, LOGIN_LOCKOUT_EVENT } = require('../../src/services/loginThrottle');
+
+/**
+ * 발행한 이벤트를 구독자에게 바로 전달하는 가짜 피드 (레플리카 두 개가 공유)
+ */
+function createFakeFeed() {
+  const handlers = [];
+  return {
+    published: [],
+    subscribe: (kind, handler) => handlers.push({ kind, handler }),
+    publish: async function (kind, subject, expiresAt, data) {
+      const event = { kind, subject, expires_at: expiresAt, data, published_at_ms: Date.now() };
+      this.published.push(event);
+      handlers.filter((entry) => entry.kind === kind).forEach((entry) => entry.handler(event));
+      return event;
+    }
+  };
+}
+
+describe('loginThrottle', () => {
+  let clock;
+  const now = () => clock;
+
+  beforeEach(() => {
+    clock = 1000000;
+  });
+
+  it('허용 횟수를 넘긴 닉네임은 실패할 때마다 두 배씩 잠가야 함', () => {
+    // Given
+    const throttle = createLoginThrottle({ freeFailures: { username: 3, ip: 100 }, baseLockoutMs: 1000, now });
+
+    // When
+    for (let i = 0; i < 3; i += 1) {
+      throttle.recordFailure('alice', '10.0.0.1');
+    }
+
+    // Then
+    expect(throttle.check('alice', '10.0.0.1')).toBeNull();
+
+    // When: 4번째 실패 → 1초, 잠금이 풀린 뒤 5번째 실패 → 2초
+    throttle.recordFailure('alice', '10.0.0.1');
+    expect(throttle.check('alice', '10.0.0.2')).toEqual({ scope: 'username', retryAfterMs: 1000 });
+    clock += 1000;
+    expect(throttle.check('alice', '10.0.0.2')).toBeNull();
+    throttle.recordFailure('alice', '10.0.0.1');
+
+    // Then
+    expect(throttle.check('alice', '10.0.0.2')).toEqual({ scope: 'username', retryAfterMs: 2000 });
+    expect(throttle.check('bob', '10.0.0.2')).toBeNull();
+  });
+
+  it('여러 닉네임을 시도하는 IP도 잠가야 하고, 로그인 성공은 IP 잠금을 풀지 않아야 함', () => {
+    // Given
+    const throttle = createLoginThrottle({ freeFailures: { username: 5, ip: 2 }, ipScope: true, baseLockoutMs: 1000, now });
+
+    // When
+    ['u1', 'u2', 'u3'].forEach((username) => throttle.recordFailure(username, '10.0.0.9'));
+    throttle.recordSuccess('attacker');
+
+    // Then
+    expect(throttle.check('u4', '10.0.0.9')).toEqual({ scope: 'ip', retryAfterMs: 1000 });
+    expect(throttle.check('u4', '10.0.0.10')).toBeNull();
+  });
+
+  it('IP 범위가 꺼져 있으면 한 프록시 IP를 공유하는 여러 사용자가 함께 잠기지 않아야 함', () => {
+    // Given: TRUST_PROXY 없이 모든 요청이 프록시(servicelb) 주소로 들어옴
+    const throttle = createLoginThrottle({ freeFailures: { username: 5, ip: 20 }, ipScope: false, baseLockoutMs: 1000, now });
+
+    // When: 50명이 각자 비밀번호를 두 번씩 틀림
+    for (let i = 0; i < 50; i += 1) {
+      throttle.recordFailure(`user${i}`, '10.42.0.1');
+      throttle.recordFailure(`user${i}`, '10.42.0.1');
+    }
+
+    // Then: 다른 사용자는 로그인할 수 있고, 닉네임별 제한은 그대로 동작
+    expect(throttle.check('newcomer', '10.42.0.1')).toBeNull();
+    expect(throttle.check('user0', '10.42.0.1')).toBeNull();
+    for (let i = 0; i < 4; i += 1) {
+      throttle.recordFailure('user0', '10.42.0.1');
+    }
+    expect(throttle.check('user0', '10.42.0.1')).toEqual({ scope: 'username', retryAfterMs: 1000 });
+    expect(throttle.check('user1', '10.42.0.1')).toBeNull();
+  });
+
+  it('로그인 성공 시 닉네임 실패 횟수를 초기화하고, 오래된 실패는 잊어야 함', () => {
+    // Given
+    const throttle = createLoginThrottle({
+      freeFailures: { username: 1, ip: 100 },
+      failureWindowMs: 60000,
+      now
+    });
+
+    // When & Then
+    throttle.recordFailure('alice', '10.0.0.1');
+    throttle.recordSuccess('alice');
+    throttle.recordFailure('alice', '10.0.0.1');
+    expect(throttle.check('alice', '10.0.0.1')).toBeNull();
+
+    clock += 60001;
+    throttle.recordFailure('alice', '10.0.0.1');
+    expect(throttle.check('alice', '10.0.0.1')).toBeNull();
+  });
+
+  it('추적 항목 수는 상한을 넘지 않아야 함 (가장 오래 사용하지 않은 항목부터 제거)', () => {
+    // Given
+    const throttle = createLoginThrottle({ maxKeys: 4, now });
+
+    // When
+    for (let i = 0; i < 10; i += 1) {
+      throttle.recordFailure(`user-${i}`, `10.0.0.${i}`);
+    }
+
+    // Then
+    expect(throttle.size()).toBe(4);
+  });
+
+  it('긴 잠금은 피드로 다른 레플리카에 공유해야 함', async () => {
+    // Given
+    const feed = createFakeFeed();
+    const options = { feed, freeFailures: { username: 1, ip: 100 }, baseLockoutMs: 20000, shareMinLockoutMs: 10000, now };
+    const replicaA = createLoginThrottle(options);
+    const replicaB = createLoginThrottle(options);
+
+    // When
+    replicaA.recordFailure('alice', '10.0.0.1');
+    replicaA.recordFailure('alice', '10.0.0.1');
+    await Promise.resolve();
+
+    // Then
+    expect(feed.published.length).toBe(1);
+    expect(feed.published[0].kind).toBe(LOGIN_LOCKOUT_EVENT);
+    expect(feed.published[0].subject).toBe('username:alice');
+    expect(replicaB.check('alice', '10.0.0.7')).toEqual({ scope: 'username', retryAfterMs: 20000 });
+  });
+});
@@ -0,0 +1,82 @@
+// loginWriteBehind 유닛테스트
+const { createLoginWriteBehind } = require('../../src/services/loginWriteBehind');
+const { resetMetrics } = require('../../src/utils/metrics');
+
+jest.mock('@aws-sdk/lib-dynamodb', () => ({
+  UpdateCommand: jest.fn().mockImplementation((params) => ({ ...params, _command: 'UpdateCommand' }))
+}));
+
+describe('loginWriteBehind', () => {
+  let mockDynamoDBClient;
+
+  beforeEach(() => {
+    resetMetrics();
+    mockDynamoDBClient = {
+      send: jest.fn().mockResolvedValue({})
+    };
+  });
+
+  it('같은 사용자의 반복 로그인은 최신 시각 하나로 합쳐져야 함', async () => {
+    // Given
+    const buffer = createLoginWriteBehind({ dynamoDBClient: mockDynamoDBClient });
+
+    // When
+    buffer.record('user-1', '2025-10-04T06:00:00.000Z');
+    buffer.record('user-1', '2025-10-04T06:05:00.000Z');
+    buffer.record('user-1', '2025-10-04T06:01:00.000Z');
+    const flushed = await buffer.flush();
+
+    // Then
+    expect(flushed).toBe(1);
+    expect(mockDynamoDBClient.send).toHaveBeenCalledTimes(1);
+    expect(mockDynamoDBClient.send.mock.calls[0][0]).toMatchObject({
+      Key: { user_id: 'user-1' },
+      ExpressionAttributeValues: { ':login_time': '2025-10-04T06:05:00.000Z' }
+    });
+    expect(buffer.getStats()).toMatchObject({ buffered: 1, coalesced: 2, flushed: 1, pending: 0 });
+  });
+
+  it('버퍼가 가득 차면 새 사용자는 버려야 함', async () => {
+    // Given
+    const buffer = createLoginWriteBehind({ dynamoDBClient: mockDynamoDBClient, maxPending: 2 });
+
+    // When
+    buffer.record('user-1', '2025-10-04T06:00:00.000Z');
+    buffer.record('user-2', '2025-10-04T06:00:00.000Z');
+    const accepted = buffer.record('user-3', '2025-10-04T06:00:00.000Z');
+    await buffer.flush();
+
+    // Then
+    expect(accepted).toBe(false);
+    expect(buffer.getStats().dropped).toBe(1);
+    expect(mockDynamoDBClient.send).toHaveBeenCalledTimes(2);
+  });
+
+  it('더 최신 값이 이미 기록된 경우(조건식 실패)는 유실로 세지 않아야 함', async () => {
+    // Given
+    const conditionalError = Object.assign(new Error('conditional'), { name: 'ConditionalCheckFailedException' });
+    mockDynamoDBClient.send.mockRejectedValueOnce(conditionalError);
+    const buffer = createLoginWriteBehind({ dynamoDBClient: mockDynamoDBClient });
+
+    // When
+    buffer.record('user-1', '2025-10-04T06:00:00.000Z');
+    await buffer.flush();
+
+    // Then
+    expect(buffer.getStats()).toMatchObject({ flushed: 0, dropped: 0 });
+  });
+
+  it('stop 호출 시 남은 업데이트를 반영해야 함', async () => {
+    // Given
+    const buffer = createLoginWriteBehind({ dynamoDBClient: mockDynamoDBClient });
+    buffer.start();
+    buffer.record('user-1', '2025-10-04T06:00:00.000Z');
+
+    // When
+    const flushed = await buffer.stop();
+
+    // Then
+    expect(flushed).toBe(1);
+    expect(mockDynamoDBClient.send).toHaveBeenCalledTimes(1);
+  });
+});
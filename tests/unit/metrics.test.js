@@ -0,0 +1,54 @@
+// metrics 유닛테스트 (histogram 직렬화)
+const { createCounter, createHistogram, renderMetrics, resetMetrics } = require('../../src/utils/metrics');
+
+describe('metrics', () => {
+  beforeEach(() => {
+    resetMetrics();
+  });
+
+  describe('createHistogram', () => {
+    it('구간별 누적 카운트와 합계/개수를 직렬화해야 함', () => {
+      // Given
+      const histogram = createHistogram('test_duration_seconds', 'test', [0.1, 0.5, 1]);
+
+      // When
+      histogram.observe(0.05, { route: '/a' });
+      histogram.observe(0.3, { route: '/a' });
+      histogram.observe(2, { route: '/a' });
+
+      // Then
+      const output = renderMetrics();
+      expect(output).toContain('# TYPE test_duration_seconds histogram');
+      expect(output).toContain('test_duration_seconds_bucket{route="/a",le="0.1"} 1');
+      expect(output).toContain('test_duration_seconds_bucket{route="/a",le="0.5"} 2');
+      expect(output).toContain('test_duration_seconds_bucket{route="/a",le="1"} 2');
+      expect(output).toContain('test_duration_seconds_bucket{route="/a",le="+Inf"} 3');
+      expect(output).toContain('test_duration_seconds_sum{route="/a"} 2.35');
+      expect(output).toContain('test_duration_seconds_count{route="/a"} 3');
+    });
+
+    it('라벨별로 시리즈를 분리해야 함', () => {
+      // Given
+      const histogram = createHistogram('test_duration_seconds', 'test', [0.1, 0.5, 1]);
+
+      // When
+      histogram.observe(0.2, { route: '/a' });
+      histogram.observe(0.2, { route: '/b' });
+      histogram.observe(0.4, { route: '/b' });
+
+      // Then
+      expect(histogram.get({ route: '/a' }).count).toBe(1);
+      expect(histogram.get({ route: '/b' }).count).toBe(2);
+      expect(histogram.get({ route: '/b' }).sum).toBeCloseTo(0.6);
+      expect(histogram.get({ route: '/c' })).toEqual({ sum: 0, count: 0 });
+    });
+
+    it('다른 타입으로 등록된 이름은 거부해야 함', () => {
+      // Given
+      createHistogram('test_duration_seconds', 'test', [0.1]);
+
+      // Then
+      expect(() => createCounter('test_duration_seconds', 'test')).toThrow('already registered as histogram');
+    });
+  });
+});
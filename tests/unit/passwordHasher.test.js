@@ -0,0 +1,97 @@
+// passwordHasher 유닛테스트
+const {
+  getHashCost,
+  setHashCost,
+  parseHashCost,
+  needsRehash,
+  calibrateHashCost
+} = require('../../src/services/passwordHasher');
+
+/**
+ * cost가 1 오를 때마다 2배씩 느려지는 가짜 해시 함수와 시계
+ * @param {number} msAtCost10 - cost 10에서의 해시 시간
+ */
+function createFakeHasher(msAtCost10) {
+  let clock = 0;
+  return {
+    now: () => clock,
+    hashFn: jest.fn(async (password, cost) => {
+      clock += msAtCost10 * 2 ** (cost - 10);
+      return `$2a$${cost}$hash`;
+    })
+  };
+}
+
+describe('passwordHasher', () => {
+  afterEach(() => {
+    setHashCost(10);
+  });
+
+  describe('parseHashCost', () => {
+    it('bcrypt 해시에서 cost를 추출해야 함', () => {
+      expect(parseHashCost('$2a$10$test.hash.here')).toBe(10);
+      expect(parseHashCost('$2b$12$abcdefghijklmnopqrstuv')).toBe(12);
+    });
+
+    it('bcrypt 형식이 아니면 null을 반환해야 함', () => {
+      expect(parseHashCost('plain-text')).toBeNull();
+      expect(parseHashCost(undefined)).toBeNull();
+    });
+  });
+
+  describe('needsRehash', () => {
+    it('현재 cost보다 낮은 해시만 재해시 대상이어야 함 (높은 cost는 낮추지 않음)', () => {
+      setHashCost(11);
+
+      expect(needsRehash('$2a$10$test.hash.here')).toBe(true);
+      expect(needsRehash('$2a$12$test.hash.here')).toBe(false);
+      expect(needsRehash('$2a$11$test.hash.here')).toBe(false);
+      expect(needsRehash('unknown-format')).toBe(false);
+    });
+  });
+
+  describe('setHashCost', () => {
+    it('보안 하한/상한 범위로 제한해야 함', () => {
+      expect(setHashCost(4)).toBe(10);
+      expect(setHashCost(20)).toBe(14);
+    });
+  });
+
+  describe('calibrateHashCost', () => {
+    it('목표 시간 안에 들어오는 가장 높은 cost를 선택해야 함', async () => {
+      // Given - cost 10에서 60ms → 11: 120ms, 12: 240ms, 13: 480ms
+      const { hashFn, now } = createFakeHasher(60);
+
+      // When
+      const result = await calibrateHashCost({ targetMs: 250, hashFn, now });
+
+      // Then
+      expect(result.cost).toBe(12);
+      expect(result.measuredMs).toBe(240);
+      expect(getHashCost()).toBe(12);
+    });
+
+    it('느린 CPU에서는 최소 cost 아래로 내려가지 않아야 함', async () => {
+      // Given - cost 10에서 이미 목표 초과
+      const { hashFn, now } = createFakeHasher(400);
+
+      // When
+      const result = await calibrateHashCost({ targetMs: 250, hashFn, now });
+
+      // Then
+      expect(result.cost).toBe(10);
+    });
+
+    it('apply가 false면 현재 cost를 바꾸지 않아야 함', async () => {
+      // Given
+      const { hashFn, now } = createFakeHasher(10);
+
+      // When
+      const result = await calibrateHashCost({ targetMs: 250, hashFn, now, apply: false });
+
+      // Then
+      expect(result.cost).toBe(14);
+      expect(getHashCost()).toBe(10);
+    });
+  });
+});
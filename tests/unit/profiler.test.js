@@ -0,0 +1,101 @@
+// profiler 유닛테스트
+const fs = require('fs');
+const os = require('os');
+const {
+  captureCpuProfile,
+  captureHeapSnapshot,
+  checkHeapSnapshotHeadroom,
+  getActiveCapture,
+  clampSeconds
+} = require('../../src/services/profiler');
+const { PROFILING } = require('../../src/config/constants');
+
+describe('profiler', () => {
+  beforeEach(() => {
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  describe('clampSeconds', () => {
+    it('측정 시간을 1초 ~ 최대값으로 제한해야 함', () => {
+      expect(clampSeconds(0.2)).toBe(1);
+      expect(clampSeconds(5)).toBe(5);
+      expect(clampSeconds(10000)).toBe(PROFILING.MAX_CPU_SECONDS);
+      expect(clampSeconds(undefined)).toBe(PROFILING.DEFAULT_CPU_SECONDS);
+    });
+  });
+
+  describe('captureCpuProfile', () => {
+    it('V8 CPU 프로파일을 반환하고 캡처 슬롯을 해제해야 함', async () => {
+      // When
+      const profile = await captureCpuProfile({ seconds: 1 });
+
+      // Then
+      expect(Array.isArray(profile.nodes)).toBe(true);
+      expect(Array.isArray(profile.samples)).toBe(true);
+      expect(profile.endTime).toBeGreaterThan(profile.startTime);
+      expect(getActiveCapture()).toBeNull();
+    });
+
+    it('캡처 중 다른 캡처 요청은 CAPTURE_IN_PROGRESS로 거부해야 함', async () => {
+      // Given
+      const running = captureCpuProfile({ seconds: 1 });
+
+      // When / Then
+      expect(getActiveCapture()).toBe('cpu');
+      await expect(captureHeapSnapshot()).rejects.toMatchObject({ code: 'CAPTURE_IN_PROGRESS' });
+      await running;
+    });
+  });
+
+  describe('checkHeapSnapshotHeadroom', () => {
+    const MB = 1024 * 1024;
+
+    it('RSS + 힙 x 배수가 한도 이내면 허용해야 함', () => {
+      // When
+      const result = checkHeapSnapshotHeadroom({ limit: 128 * MB, usage: { rss: 60 * MB, heapUsed: 20 * MB } });
+
+      // Then
+      expect(result.ok).toBe(true);
+      expect(result.required).toBe(60 * MB + 20 * MB * PROFILING.HEAP_SNAPSHOT_MEMORY_FACTOR);
+    });
+
+    it('한도에 가까운 Pod에서는 거부해야 함', () => {
+      // When
+      const result = checkHeapSnapshotHeadroom({ limit: 128 * MB, usage: { rss: 100 * MB, heapUsed: 40 * MB } });
+
+      // Then
+      expect(result.ok).toBe(false);
+      expect(result.limit).toBe(128 * MB);
+    });
+  });
+
+  describe('captureHeapSnapshot', () => {
+    it('메모리 여유가 부족하면 기록하지 않고 INSUFFICIENT_MEMORY로 거부해야 함', async () => {
+      // Given
+      jest.spyOn(console, 'error').mockImplementation(() => {});
+
+      // When / Then
+      await expect(captureHeapSnapshot({ directory: os.tmpdir(), memoryLimit: 1024 }))
+        .rejects.toMatchObject({ code: 'INSUFFICIENT_MEMORY' });
+      expect(getActiveCapture()).toBeNull();
+    });
+
+    it('힙 스냅샷을 파일로 기록해야 함', async () => {
+      // When
+      const file = await captureHeapSnapshot({ directory: os.tmpdir() });
+
+      // Then
+      try {
+        const head = fs.readFileSync(file, 'utf8').slice(0, 20);
+        expect(head).toContain('snapshot');
+        expect(getActiveCapture()).toBeNull();
+      } finally {
+        fs.unlinkSync(file);
+      }
+    });
+  });
+});
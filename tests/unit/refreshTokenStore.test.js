@@ -0,0 +1,103 @@
+// refresh token 세션 상한 / 폐기 정리 유닛테스트
+const {
+  retireRefreshToken,
+  retireAllUserTokens,
+  enforceSessionCap
+} = require('../../src/services/refreshTokenStore');
+const { createFakeDynamoClient } = require('../../bench/fakeDynamoClient');
+const { TABLES, EVENT_FEED } = require('../../src/config/constants');
+
+const nowSeconds = () => Math.floor(Date.now() / 1000);
+
+function token(id, overrides = {}) {
+  return {
+    token_id: id,
+    user_id: 'user-1',
+    token_hash: 'hash',
+    expires_at: nowSeconds() + 3600,
+    is_revoked: false,
+    ...overrides
+  };
+}
+
+function storedIds(client) {
+  return [...client.tables.get(TABLES.REFRESH_TOKENS).keys()].sort();
+}
+
+describe('refreshTokenStore', () => {
+  let client;
+
+  beforeEach(() => {
+    client = createFakeDynamoClient();
+  });
+
+  describe('enforceSessionCap', () => {
+    it('상한을 넘는 가장 오래된 세션과 폐기/만료된 항목을 삭제해야 함', async () => {
+      // Given: 활성 4개(만료 순서 t1 < t2 < t3 < t4), 폐기 1개, 만료 1개
+      client.seed(TABLES.REFRESH_TOKENS, [
+        token('t3', { expires_at: nowSeconds() + 300 }),
+        token('t1', { expires_at: nowSeconds() + 100 }),
+        token('t4', { expires_at: nowSeconds() + 400 }),
+        token('t2', { expires_at: nowSeconds() + 200 }),
+        token('revoked', { is_revoked: true }),
+        token('expired', { expires_at: nowSeconds() - 1 })
+      ]);
+
+      // When: 새 토큰 포함 상한 3 → 기존 활성은 2개만 남아야 함
+      const result = await enforceSessionCap('user-1', client, 3);
+
+      // Then
+      expect(result).toEqual({ evicted: 2, compacted: 2 });
+      expect(storedIds(client)).toEqual(['t3', 't4']);
+    });
+
+    it('상한 이하이면 활성 세션을 지우지 않아야 함', async () => {
+      // Given
+      client.seed(TABLES.REFRESH_TOKENS, [token('t1'), token('t2')]);
+
+      // When
+      const result = await enforceSessionCap('user-1', client, 10);
+
+      // Then
+      expect(result).toEqual({ evicted: 0, compacted: 0 });
+      expect(client.calls.BatchWriteCommand).toBeUndefined();
+    });
+  });
+
+  describe('retireRefreshToken', () => {
+    it('회전 시 같은 토큰은 한 번만 폐기되어야 함', async () => {
+      // Given
+      client.seed(TABLES.REFRESH_TOKENS, [token('t1')]);
+
+      // When
+      const first = await retireRefreshToken('t1', client, { requireActive: true, reason: 'rotated' });
+      const second = await retireRefreshToken('t1', client, { requireActive: true, reason: 'rotated' });
+
+      // Then
+      expect(first).toBe(true);
+      expect(second).toBe(false);
+      expect(storedIds(client)).toEqual([]);
+    });
+  });
+
+  describe('retireAllUserTokens', () => {
+    it('사용자의 모든 항목을 삭제하고 다른 사용자와 이벤트 피드는 남겨야 함', async () => {
+      // Given
+      client.seed(TABLES.REFRESH_TOKENS, [
+        token('t1'),
+        token('t2'),
+        token('old', { is_revoked: true }),
+        token('other', { user_id: 'user-2' }),
+        token('event#1', { user_id: EVENT_FEED.PARTITION, is_revoked: true })
+      ]);
+
+      // When
+      const revoked = await retireAllUserTokens('user-1', client);
+
+      // Then
+      expect(revoked).toBe(2);
+      expect(storedIds(client)).toEqual(['event#1', 'other']);
+      expect(client.calls.BatchWriteCommand).toBe(2);
+    });
+  });
+});
@@ -0,0 +1,117 @@
+// 런타임 설정 재로딩 / JWT 이중 키 검증 유닛테스트
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const jwt = require('jsonwebtoken');
+const { createRuntimeConfig } = require('../../src/config/runtimeConfig');
+const { signToken, verifyToken } = require('../../src/services/jwtKeys');
+
+/**
+ * kubelet처럼 새 버전 디렉터리를 만든 뒤 ..data 링크를 바꿔 ConfigMap 볼륨을 갱신
+ * @param {string} dir - 마운트 디렉터리
+ * @param {Object} files - 키 → 값
+ */
+function writeVolume(dir, files) {
+  const version = `..${Date.now()}_${Math.random().toString(36).slice(2)}`;
+  fs.mkdirSync(path.join(dir, version));
+  for (const [key, value] of Object.entries(files)) {
+    fs.writeFileSync(path.join(dir, version, key), `${value}\n`);
+  }
+  fs.symlinkSync(version, path.join(dir, '..data_tmp'));
+  fs.renameSync(path.join(dir, '..data_tmp'), path.join(dir, '..data'));
+  for (const key of Object.keys(files)) {
+    const link = path.join(dir, key);
+    if (!fs.existsSync(link)) {
+      fs.symlinkSync(path.join('..data', key), link);
+    }
+  }
+}
+
+/**
+ * 고정된 비밀 값을 돌려주는 런타임 설정
+ * @param {Object} secrets - JWT_SECRET, JWT_SECRET_PREVIOUS
+ */
+function staticConfig(secrets) {
+  return { get: () => ({ secrets }) };
+}
+
+describe('runtimeConfig', () => {
+  let configDir;
+  let secretsDir;
+
+  beforeEach(() => {
+    const root = fs.mkdtempSync(path.join(os.tmpdir(), 'authcore-runtime-'));
+    configDir = path.join(root, 'config');
+    secretsDir = path.join(root, 'secrets');
+    fs.mkdirSync(configDir);
+    fs.mkdirSync(secretsDir);
+  });
+
+  it('볼륨이 바뀌면 새 스냅샷을 적용하고 구독자에게 알려야 함', () => {
+    // Given
+    writeVolume(configDir, { RATE_LIMIT_MAX: '100' });
+    writeVolume(secretsDir, { JWT_SECRET: 'key-1' });
+    const config = createRuntimeConfig({ configDir, secretsDir, requireJwtSecret: true });
+    const listener = jest.fn();
+    config.subscribe(listener);
+    expect(config.get().values.RATE_LIMIT_MAX).toBe(100);
+
+    // When
+    writeVolume(configDir, { RATE_LIMIT_MAX: '250', LOG_LEVEL: 'warn' });
+    const applied = config.reload();
+
+    // Then
+    expect(applied).toBe(true);
+    expect(config.get().generation).toBe(2);
+    expect(config.get().values.RATE_LIMIT_MAX).toBe(250);
+    expect(config.get().values.LOG_LEVEL).toBe('warn');
+    expect(config.get().secrets.JWT_SECRET).toBe('key-1');
+    expect(listener).toHaveBeenCalledTimes(1);
+    expect(config.reload()).toBe(false);
+  });
+
+  it('잘못된 값이 하나라도 있으면 전체를 거부하고 이전 스냅샷을 유지해야 함', () => {
+    // Given
+    writeVolume(configDir, { RATE_LIMIT_MAX: '100', MAX_SESSIONS_PER_USER: '10' });
+    writeVolume(secretsDir, { JWT_SECRET: 'key-1' });
+    const config = createRuntimeConfig({ configDir, secretsDir, requireJwtSecret: true });
+    const before = config.get();
+
+    // When: 한도는 올바르지만 세션 상한이 잘못됨 / JWT_SECRET이 비어 있음
+    writeVolume(configDir, { RATE_LIMIT_MAX: '500', MAX_SESSIONS_PER_USER: 'ten' });
+    const invalidValue = config.reload();
+    writeVolume(configDir, { RATE_LIMIT_MAX: '100', MAX_SESSIONS_PER_USER: '10' });
+    writeVolume(secretsDir, { JWT_SECRET: '' });
+    const emptySecret = config.reload();
+
+    // Then
+    expect(invalidValue).toBe(false);
+    expect(emptySecret).toBe(false);
+    expect(config.get()).toBe(before);
+    expect(config.get().values.RATE_LIMIT_MAX).toBe(100);
+  });
+});
+
+describe('jwtKeys', () => {
+  it('교체 중에는 이전 키로 서명된 토큰도 검증해야 함', () => {
+    // Given: key-1로 발급된 토큰
+    const token = signToken({ userId: 'user-1', type: 'access' }, { expiresIn: '15m' }, staticConfig({ JWT_SECRET: 'key-1' }));
+
+    // When: 서명 키가 key-2로 바뀌고 key-1은 검증 전용으로 남음
+    const rotating = staticConfig({ JWT_SECRET: 'key-2', JWT_SECRET_PREVIOUS: 'key-1' });
+    const decoded = verifyToken(token, rotating);
+
+    // Then
+    expect(decoded.userId).toBe('user-1');
+    expect(jwt.verify(signToken({ userId: 'user-2' }, {}, rotating), 'key-2').userId).toBe('user-2');
+  });
+
+  it('교체가 끝나 이전 키가 빠지면 이전 키 토큰을 거부해야 함', () => {
+    // Given
+    const token = signToken({ userId: 'user-1' }, {}, staticConfig({ JWT_SECRET: 'key-1' }));
+
+    // When & Then
+    expect(() => verifyToken(token, staticConfig({ JWT_SECRET: 'key-2', JWT_SECRET_PREVIOUS: '' })))
+      .toThrow('invalid signature');
+  });
+});
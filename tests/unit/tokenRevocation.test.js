@@ -0,0 +1,134 @@
+// tokenRevocation / eventFeed 유닛테스트
+const { bucketPartition, createEventFeed } = require('../../src/services/eventFeed');
+const { createRevocationList, createTokenRevocation } = require('../../src/services/tokenRevocation');
+
+jest.mock('@aws-sdk/lib-dynamodb', () => ({
+  PutCommand: jest.fn().mockImplementation((params) => ({ ...params, _command: 'PutCommand' })),
+  QueryCommand: jest.fn().mockImplementation((params) => ({ ...params, _command: 'QueryCommand' }))
+}));
+
+// uuid 모킹 (이벤트 ID가 매번 달라야 중복 제거를 검증할 수 있음)
+let mockUuidCounter = 0;
+jest.mock('uuid', () => ({
+  v4: jest.fn(() => `uuid-${++mockUuidCounter}`)
+}));
+
+const nowSeconds = () => Math.floor(Date.now() / 1000);
+
+describe('tokenRevocation', () => {
+  describe('createRevocationList', () => {
+    it('폐기된 jti의 토큰만 거부해야 함', () => {
+      // Given
+      const list = createRevocationList();
+      list.revokeToken('jti-1', nowSeconds() + 900);
+
+      // Then
+      expect(list.isRevoked({ jti: 'jti-1', userId: 'user-1', iat: nowSeconds() })).toBe(true);
+      expect(list.isRevoked({ jti: 'jti-2', userId: 'user-1', iat: nowSeconds() })).toBe(false);
+    });
+
+    it('사용자 폐기 시각 이전에 발급된 토큰만 거부해야 함', () => {
+      // Given
+      const list = createRevocationList();
+      const revokedAt = nowSeconds();
+      list.revokeUser('user-1', revokedAt, revokedAt + 900);
+
+      // Then
+      expect(list.isRevoked({ jti: 'a', userId: 'user-1', iat: revokedAt - 10 })).toBe(true);
+      expect(list.isRevoked({ jti: 'b', userId: 'user-1', iat: revokedAt + 10 })).toBe(false);
+      expect(list.isRevoked({ jti: 'c', userId: 'user-2', iat: revokedAt - 10 })).toBe(false);
+    });
+
+    it('만료된 항목은 정리되어야 함', () => {
+      // Given
+      const list = createRevocationList();
+      list.revokeToken('jti-1', nowSeconds() - 1);
+
+      // When
+      list.prune(nowSeconds());
+
+      // Then
+      expect(list.isRevoked({ jti: 'jti-1', userId: 'user-1', iat: 0 })).toBe(false);
+    });
+  });
+
+  describe('createTokenRevocation', () => {
+    let mockDynamoDBClient;
+
+    beforeEach(() => {
+      mockDynamoDBClient = { send: jest.fn().mockResolvedValue({ Items: [] }) };
+    });
+
+    it('발행한 폐기 이벤트는 로컬에 즉시 적용되어야 함', async () => {
+      // Given
+      const feed = createEventFeed({ dynamoDBClient: mockDynamoDBClient });
+      const revocation = createTokenRevocation({ feed });
+
+      // When
+      await revocation.revokeAccessToken('jti-1', nowSeconds() + 900);
+
+      // Then
+      expect(revocation.isRevoked({ jti: 'jti-1', userId: 'user-1', iat: nowSeconds() })).toBe(true);
+      expect(mockDynamoDBClient.send.mock.calls[0][0].Item).toMatchObject({
+        user_id: bucketPartition(mockDynamoDBClient.send.mock.calls[0][0].Item.published_at_ms),
+        kind: 'access_token_revoked',
+        subject: 'jti-1'
+      });
+    });
+
+    it('다른 레플리카가 발행한 이벤트를 동기화로 적용해야 함', async () => {
+      // Given
+      const remoteEvent = {
+        token_id: 'event#remote-1',
+        user_id: bucketPartition(Date.now()),
+        kind: 'user_revoked',
+        subject: 'user-1',
+        data: { revoked_at: nowSeconds() },
+        published_at_ms: Date.now(),
+        expires_at: nowSeconds() + 900
+      };
+      mockDynamoDBClient.send.mockResolvedValue({ Items: [remoteEvent] });
+      const feed = createEventFeed({ dynamoDBClient: mockDynamoDBClient });
+      const revocation = createTokenRevocation({ feed });
+
+      // When
+      const firstApplied = await feed.sync();
+      const secondApplied = await feed.sync(); // 겹치는 조회 구간에서 같은 이벤트가 다시 와도 한 번만 적용
+
+      // Then
+      expect(firstApplied).toBe(1);
+      expect(secondApplied).toBe(0);
+      expect(revocation.isFresh()).toBe(true);
+      expect(revocation.isRevoked({ jti: 'x', userId: 'user-1', iat: nowSeconds() - 60 })).toBe(true);
+    });
+
+    it('기동 후에는 마지막 조회 이후의 시간 구간 파티션만 조회해야 함', async () => {
+      // Given
+      const feed = createEventFeed({ dynamoDBClient: mockDynamoDBClient });
+      const queriedBuckets = () => mockDynamoDBClient.send.mock.calls
+        .map(([command]) => command)
+        .filter((command) => command._command === 'QueryCommand')
+        .map((command) => command.ExpressionAttributeValues[':bucket']);
+
+      // When: 첫 동기화는 LOOKBACK_MS(15분) 동안의 구간을 읽음
+      await feed.sync();
+      const initialBuckets = queriedBuckets();
+      mockDynamoDBClient.send.mockClear();
+      await feed.sync();
+
+      // Then
+      expect(initialBuckets.length).toBeGreaterThanOrEqual(15);
+      expect(queriedBuckets().length).toBeLessThanOrEqual(2);
+      expect(queriedBuckets()).toContain(bucketPartition(Date.now()));
+    });
+
+    it('동기화된 적이 없으면 최신 상태로 보지 않아야 함', () => {
+      // Given
+      const feed = createEventFeed({ dynamoDBClient: mockDynamoDBClient });
+      const revocation = createTokenRevocation({ feed });
+
+      // Then
+      expect(revocation.isFresh()).toBe(false);
+    });
+  });
+});
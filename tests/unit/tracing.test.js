@@ -0,0 +1,100 @@
+// 요청 트레이싱 유닛테스트
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const {
+  withSpan,
+  runTraced,
+  createSpanExporter,
+  parseTraceContext,
+  sampleDecision
+} = require('../../src/utils/tracing');
+
+describe('tracing', () => {
+  describe('parseTraceContext', () => {
+    it('traceparent 헤더에서 trace id, 부모 스팬, 샘플링 여부를 읽어야 함', () => {
+      // When
+      const context = parseTraceContext({
+        traceparent: '00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01'
+      });
+
+      // Then
+      expect(context).toEqual({
+        traceId: '4bf92f3577b34da6a3ce929d0e0e4736',
+        parentId: '00f067aa0ba902b7',
+        sampled: true
+      });
+    });
+
+    it('API Gateway의 X-Amzn-Trace-Id를 32자리 trace id로 변환해야 함', () => {
+      // When
+      const context = parseTraceContext({
+        'x-amzn-trace-id': 'Root=1-5759e988-bd862e3fe1be46a994272793;Sampled=0'
+      });
+
+      // Then
+      expect(context).toEqual({
+        traceId: '5759e988bd862e3fe1be46a994272793',
+        parentId: null,
+        sampled: false
+      });
+      expect(parseTraceContext({})).toBeNull();
+    });
+  });
+
+  describe('sampleDecision', () => {
+    const sampledUpstream = { traceId: '4bf92f3577b34da6a3ce929d0e0e4736', parentId: null, sampled: true };
+
+    it('상위를 신뢰하지 않으면 sampled 플래그가 있어도 로컬 비율만 적용해야 함', () => {
+      // When
+      const decisions = [0.5, 0.005].map((value) =>
+        sampleDecision(sampledUpstream, { trustUpstream: false, sampleRate: 0.01, random: () => value })
+      );
+
+      // Then
+      expect(decisions).toEqual([null, 'local']);
+    });
+
+    it('상위를 신뢰하면 sampled 플래그를 따라야 함', () => {
+      // When
+      const decision = sampleDecision(sampledUpstream, { trustUpstream: true, sampleRate: 0, random: () => 0.5 });
+
+      // Then
+      expect(decision).toBe('upstream');
+      expect(sampleDecision({ ...sampledUpstream, sampled: false }, { trustUpstream: true, sampleRate: 0, random: () => 0.5 })).toBeNull();
+    });
+  });
+
+  describe('withSpan', () => {
+    it('trace 밖에서는 스팬 없이 함수를 그대로 실행해야 함', () => {
+      // When & Then
+      expect(withSpan('noop', null, () => 42)).toBe(42);
+    });
+
+    it('중첩된 호출을 부모-자식 스팬으로 기록해야 함', async () => {
+      // Given
+      const file = path.join(fs.mkdtempSync(path.join(os.tmpdir(), 'authcore-trace-')), 'spans.jsonl');
+      const exporter = createSpanExporter({ target: `file:${file}` });
+
+      // When
+      await runTraced(exporter, 'POST /auth/login', async () => {
+        await withSpan('authService.loginUser', null, async () => {
+          await withSpan('dynamodb.QueryCommand', { table: 'users' }, async () => 'user', 'client');
+          withSpan('jwt.sign', null, () => 'token');
+        });
+      });
+      await exporter.stop();
+
+      // Then
+      const spans = fs.readFileSync(file, 'utf8').trim().split('\n').map((line) => JSON.parse(line));
+      const byName = Object.fromEntries(spans.map((span) => [span.name, span]));
+      expect(spans.length).toBe(4);
+      expect(new Set(spans.map((span) => span.traceId)).size).toBe(1);
+      expect(byName['POST /auth/login'].parentId).toBeNull();
+      expect(byName['authService.loginUser'].parentId).toBe(byName['POST /auth/login'].spanId);
+      expect(byName['dynamodb.QueryCommand'].parentId).toBe(byName['authService.loginUser'].spanId);
+      expect(byName['dynamodb.QueryCommand'].attributes).toEqual({ table: 'users' });
+      expect(byName['jwt.sign'].parentId).toBe(byName['authService.loginUser'].spanId);
+    });
+  });
+});
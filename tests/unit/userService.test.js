@@ -6,9 +6,13 @@ const {
   loginUser,
   getUserByUsername,
   getUserById,
+  getUsersByIds,
   updateUsername,
-  updatePassword
+  updatePassword,
+  generateAccessToken,
+  introspectTokens
 } = require('../../src/services/authService');
+const { TABLES } = require('../../src/config/constants');
 
 const {
   mockUser,
@@ -31,7 +35,9 @@ jest.mock('@aws-sdk/lib-dynamodb', () => ({
   PutCommand: jest.fn().mockImplementation((params) => ({ ...params, _command: 'PutCommand' })),
   GetCommand: jest.fn().mockImplementation((params) => ({ ...params, _command: 'GetCommand' })),
   UpdateCommand: jest.fn().mockImplementation((params) => ({ ...params, _command: 'UpdateCommand' })),
-  QueryCommand: jest.fn().mockImplementation((params) => ({ ...params, _command: 'QueryCommand' }))
+  QueryCommand: jest.fn().mockImplementation((params) => ({ ...params, _command: 'QueryCommand' })),
+  TransactWriteCommand: jest.fn().mockImplementation((params) => ({ ...params, _command: 'TransactWriteCommand' })),
+  BatchGetCommand: jest.fn().mockImplementation((params) => ({ ...params, _command: 'BatchGetCommand' }))
 }));
 
 // bcrypt 모킹
@@ -59,9 +65,7 @@ describe('userService', () => {
   describe('registerUser', () => {
     it('새 사용자를 성공적으로 등록해야 함', async () => {
       // Given
-      mockDynamoDBClient.send
-        .mockResolvedValueOnce({ Items: [] }) // 닉네임 중복 검사 - 중복 없음
-        .mockResolvedValueOnce({}); // 사용자 등록 성공
+      mockDynamoDBClient.send.mockResolvedValueOnce({}); // 사용자 + 닉네임 점유 트랜잭션 성공
 
       // When
       const result = await registerUser(mockNewUser.username, mockNewUser.password, mockDynamoDBClient);
@@ -74,6 +78,14 @@ describe('userService', () => {
       });
       expect(result.password_hash).toBeUndefined();
       expect(bcrypt.hash).toHaveBeenCalledWith(mockNewUser.password, 10);
+      expect(mockDynamoDBClient.send).toHaveBeenCalledTimes(1);
+
+      const { TransactItems } = mockDynamoDBClient.send.mock.calls[0][0];
+      expect(TransactItems[0].Put.Item).toMatchObject({ user_id: 'test-uuid-123', username: mockNewUser.username });
+      expect(TransactItems[1].Put).toMatchObject({
+        Item: { user_id: `USERNAME#${mockNewUser.username}`, owner_user_id: 'test-uuid-123' },
+        ConditionExpression: 'attribute_not_exists(user_id)'
+      });
     });
 
     it('닉네임이 3자 미만이면 에러를 던져야 함', async () => {
@@ -96,7 +108,11 @@ describe('userService', () => {
 
     it('이미 존재하는 닉네임이면 에러를 던져야 함', async () => {
       // Given
-      mockDynamoDBClient.send.mockResolvedValueOnce({ Items: [mockUser] }); // 닉네임 중복
+      const cancelled = Object.assign(new Error('Transaction cancelled'), {
+        name: 'TransactionCanceledException',
+        CancellationReasons: [{ Code: 'None' }, { Code: 'ConditionalCheckFailed' }]
+      });
+      mockDynamoDBClient.send.mockRejectedValueOnce(cancelled); // 닉네임 점유 항목 조건식 실패
 
       // When & Then
       await expect(registerUser(mockNewUser.username, mockNewUser.password, mockDynamoDBClient))
@@ -124,6 +140,44 @@ describe('userService', () => {
       expect(bcrypt.compare).toHaveBeenCalledWith(mockLoginData.password, mockUser.password_hash);
     });
 
+    it('write-behind 버퍼가 주어지면 업데이트 없이 로그인 시각만 기록해야 함', async () => {
+      // Given
+      const lastLoginRecorder = { record: jest.fn() };
+      mockDynamoDBClient.send.mockResolvedValueOnce({ Items: [mockUser] }); // 사용자 조회
+
+      // When
+      const result = await loginUser(
+        mockLoginData.username,
+        mockLoginData.password,
+        mockDynamoDBClient,
+        lastLoginRecorder
+      );
+
+      // Then
+      expect(mockDynamoDBClient.send).toHaveBeenCalledTimes(1);
+      expect(lastLoginRecorder.record).toHaveBeenCalledWith(mockUser.user_id, result.last_login_at);
+    });
+
+    it('다른 클라이언트를 주입하면 기본 write-behind 버퍼 대신 그 클라이언트로 로그인 시각을 업데이트해야 함', async () => {
+      // Given: 모듈의 클라이언트와 다른 클라이언트
+      const injectedClient = {
+        send: jest.fn()
+          .mockResolvedValueOnce({ Items: [mockUser] }) // 사용자 조회
+          .mockResolvedValueOnce({}) // 마지막 로그인 시간 업데이트
+      };
+
+      // When
+      const result = await loginUser(mockLoginData.username, mockLoginData.password, injectedClient);
+
+      // Then
+      expect(injectedClient.send).toHaveBeenCalledTimes(2);
+      expect(injectedClient.send.mock.calls[1][0]).toMatchObject({
+        _command: 'UpdateCommand',
+        Key: { user_id: mockUser.user_id },
+        ExpressionAttributeValues: { ':login_time': result.last_login_at }
+      });
+    });
+
     it('존재하지 않는 사용자면 에러를 던져야 함', async () => {
       // Given
       mockDynamoDBClient.send.mockResolvedValueOnce({ Items: [] }); // 사용자 없음
@@ -205,15 +259,90 @@ describe('userService', () => {
     });
   });
 
+  describe('getUsersByIds', () => {
+    it('처리되지 않은 키는 다시 요청해야 함', async () => {
+      // Given
+      const otherUser = { ...mockUser, user_id: 'other-user-id', username: 'otheruser' };
+      mockDynamoDBClient.send
+        .mockResolvedValueOnce({
+          Responses: { [TABLES.USERS]: [mockUser] },
+          UnprocessedKeys: { [TABLES.USERS]: { Keys: [{ user_id: 'other-user-id' }] } }
+        })
+        .mockResolvedValueOnce({ Responses: { [TABLES.USERS]: [otherUser] } });
+
+      // When
+      const result = await getUsersByIds([mockUser.user_id, 'other-user-id'], mockDynamoDBClient);
+
+      // Then
+      expect(result.get(mockUser.user_id)).toEqual(mockUser);
+      expect(result.get('other-user-id')).toEqual(otherUser);
+      expect(mockDynamoDBClient.send).toHaveBeenCalledTimes(2);
+      expect(mockDynamoDBClient.send.mock.calls[1][0].RequestItems[TABLES.USERS].Keys)
+        .toEqual([{ user_id: 'other-user-id' }]);
+    });
+  });
+
+  describe('introspectTokens', () => {
+    it('같은 사용자의 토큰들은 한 번의 BatchGetItem으로 검사해야 함', async () => {
+      // Given
+      const token = generateAccessToken(mockUser.user_id, mockUser.username);
+      mockDynamoDBClient.send.mockResolvedValueOnce({
+        Responses: { [TABLES.USERS]: [{ user_id: mockUser.user_id, username: mockUser.username, is_active: true }] }
+      });
+
+      // When
+      const results = await introspectTokens([token, token, 'not-a-jwt'], mockDynamoDBClient);
+
+      // Then
+      expect(mockDynamoDBClient.send).toHaveBeenCalledTimes(1);
+      expect(mockDynamoDBClient.send.mock.calls[0][0].RequestItems[TABLES.USERS].Keys)
+        .toEqual([{ user_id: mockUser.user_id }]);
+      expect(results[0]).toMatchObject({
+        active: true,
+        user_id: mockUser.user_id,
+        username: mockUser.username,
+        token_id: 'test-uuid-123'
+      });
+      expect(results[0].cache_ttl_seconds).toBeGreaterThan(0);
+      expect(results[0].cache_ttl_seconds).toBeLessThanOrEqual(30);
+      expect(results[1]).toEqual(results[0]);
+      expect(results[2]).toEqual({ active: false, reason: 'invalid_token' });
+    });
+
+    it('비활성화되었거나 없는 사용자의 토큰은 active가 false여야 함', async () => {
+      // Given
+      const inactiveToken = generateAccessToken('inactive-user-id', 'inactiveuser');
+      const deletedToken = generateAccessToken('deleted-user-id', 'deleteduser');
+      mockDynamoDBClient.send.mockResolvedValueOnce({
+        Responses: { [TABLES.USERS]: [{ user_id: 'inactive-user-id', username: 'inactiveuser', is_active: false }] }
+      });
+
+      // When
+      const results = await introspectTokens([inactiveToken, deletedToken], mockDynamoDBClient);
+
+      // Then
+      expect(results).toEqual([
+        { active: false, reason: 'user_inactive' },
+        { active: false, reason: 'user_not_found' }
+      ]);
+    });
+
+    it('유효한 토큰이 없으면 DynamoDB를 호출하지 않아야 함', async () => {
+      // When
+      const results = await introspectTokens(['invalid-token'], mockDynamoDBClient);
+
+      // Then
+      expect(results).toEqual([{ active: false, reason: 'invalid_token' }]);
+      expect(mockDynamoDBClient.send).not.toHaveBeenCalled();
+    });
+  });
+
   describe('updateUsername', () => {
     it('닉네임을 성공적으로 변경해야 함', async () => {
       // Given
-      const updatedUser = { ...mockUser, username: mockUpdateUsernameData.newUsername };
       mockDynamoDBClient.send
         .mockResolvedValueOnce({ Item: mockUser }) // 사용자 조회
-        .mockResolvedValueOnce({ Items: [] }) // 새 닉네임 중복 검사
-        .mockResolvedValueOnce({}) // 닉네임 업데이트
-        .mockResolvedValueOnce({ Item: updatedUser }); // 업데이트된 사용자 조회
+        .mockResolvedValueOnce({}); // 닉네임 점유 + 사용자 갱신 트랜잭션
 
       // When
       const result = await updateUsername(
@@ -228,10 +357,36 @@ describe('userService', () => {
         user_id: mockUser.user_id,
         username: mockUpdateUsernameData.newUsername
       });
+      expect(result.password_hash).toBeUndefined();
       expect(bcrypt.compare).toHaveBeenCalledWith(
         mockUpdateUsernameData.password,
         mockUser.password_hash
       );
+      expect(mockDynamoDBClient.send).toHaveBeenCalledTimes(2);
+
+      const { TransactItems } = mockDynamoDBClient.send.mock.calls[1][0];
+      expect(TransactItems[0].Put.Item.user_id).toBe(`USERNAME#${mockUpdateUsernameData.newUsername}`);
+      expect(TransactItems[1].Delete.Key.user_id).toBe(`USERNAME#${mockUser.username}`);
+      expect(TransactItems[2].Update.Key).toEqual({ user_id: mockUser.user_id });
+    });
+
+    it('새 닉네임이 이미 점유되어 있으면 에러를 던져야 함', async () => {
+      // Given
+      const cancelled = Object.assign(new Error('Transaction cancelled'), {
+        name: 'TransactionCanceledException',
+        CancellationReasons: [{ Code: 'ConditionalCheckFailed' }, { Code: 'None' }, { Code: 'None' }]
+      });
+      mockDynamoDBClient.send
+        .mockResolvedValueOnce({ Item: mockUser }) // 사용자 조회
+        .mockRejectedValueOnce(cancelled); // 새 닉네임 점유 실패
+
+      // When & Then
+      await expect(updateUsername(
+        mockUser.user_id,
+        mockUpdateUsernameData.newUsername,
+        mockUpdateUsernameData.password,
+        mockDynamoDBClient
+      )).rejects.toThrow('이미 사용 중인 닉네임입니다.');
     });
 
     it('현재 비밀번호가 틀리면 에러를 던져야 함', async () => {